@@ -3,10 +3,14 @@
 # ===========================================
 
 import anthropic
-import pandas as pd
 import json
 import os
 from dotenv import load_dotenv
+from data_repository import get_repository
+from lenguajes import COLUMNA_CODIGO, codigo
+from pronostico import obtener_pronostico
+from ranking_historico import obtener_historial_ranking
+from tendencias import obtener_tendencias
 
 # Cargar variables de entorno
 load_dotenv()
@@ -17,12 +21,13 @@ class CodeTrendsAgent:
     Utiliza Claude API de Anthropic.
     """
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, repository=None):
         """
         Inicializar el agente con la API key de Claude.
 
         Args:
             api_key: API key de Anthropic. Si no se proporciona, se busca en .env
+            repository: Repositorio de datos (por defecto el compartido con el dashboard)
         """
         self.api_key = api_key or os.getenv('CLAUDE_API_KEY')
 
@@ -35,11 +40,32 @@ class CodeTrendsAgent:
             )
 
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.repository = repository or get_repository()
         self.knowledge_base = self._load_knowledge_base()
+        self._system_prompt = self._build_system_prompt()
         self.conversation_history = []
 
-    def _load_knowledge_base(self):
+    def recargar_datos(self, repository=None):
+        """
+        Cambiar a otra versión de los datos sin perder la conversación.
+
+        El contexto nuevo se construye completo antes de reemplazar el
+        anterior, así que una consulta en curso usa uno u otro, nunca una mezcla.
+
+        Args:
+            repository: Repositorio nuevo (por defecto el compartido vigente)
+        """
+        repository = repository or get_repository()
+        knowledge_base = self._load_knowledge_base(repository)
+        system_prompt = self._build_system_prompt(knowledge_base)
+
+        self._system_prompt = system_prompt
+        self.knowledge_base = knowledge_base
+        self.repository = repository
+
+    def _load_knowledge_base(self, repository=None):
         """Cargar todos los datasets y crear contexto para la IA"""
+        repository = repository or self.repository
         knowledge = {
             'metadata': {
                 'period': '2020-2025',
@@ -49,7 +75,7 @@ class CodeTrendsAgent:
                     'PHP', 'Kotlin', 'R', 'MATLAB', 'Perl', 'Assembly', 'Fortran'
                 ]
             },
-            'insights': self._generate_insights(),
+            'insights': self._generate_insights(repository),
             'datasets': {}
         }
 
@@ -57,7 +83,7 @@ class CodeTrendsAgent:
         
         # 1. Series de tiempo TIOBE
         try:
-            tiobe_df = pd.read_csv('Datos/Series_de_Tiempo.csv')
+            tiobe_df = repository.get('series_tiempo')
             knowledge['datasets']['series_tiempo'] = {
                 'descripcion': 'Series temporales del índice TIOBE',
                 'resumen': self._summarize_tiobe(tiobe_df),
@@ -69,11 +95,11 @@ class CodeTrendsAgent:
 
         # 2. Ranking TIOBE 2025
         try:
-            ranking_df = pd.read_csv('Datos/RankingTIOBE2025.csv')
+            ranking_df = repository.get('ranking_tiobe')
             top_10 = ranking_df.head(10) if len(ranking_df) >= 10 else ranking_df
             knowledge['datasets']['ranking_tiobe'] = {
                 'descripcion': 'Ranking actual TIOBE 2025',
-                'top_10': top_10.to_dict('records'),
+                'top_10': top_10.drop(columns=COLUMNA_CODIGO).to_dict('records'),
                 'filas': len(ranking_df)
             }
         except Exception as e:
@@ -81,7 +107,7 @@ class CodeTrendsAgent:
 
         # 3. Top Repositorios
         try:
-            top_repos_df = pd.read_csv('Datos/TopRepositorios.csv')
+            top_repos_df = repository.get('top_repositorios')
             knowledge['datasets']['top_repositorios'] = {
                 'descripcion': 'Top repositorios de GitHub',
                 'total_repos': len(top_repos_df),
@@ -92,7 +118,7 @@ class CodeTrendsAgent:
 
         # 4. Top Repos por Lenguaje
         try:
-            repos_lang_df = pd.read_csv('Datos/TopReposXLenguajes.csv')
+            repos_lang_df = repository.get('repos_por_lenguaje')
             knowledge['datasets']['repos_por_lenguaje'] = {
                 'descripcion': 'Repositorios agrupados por lenguaje',
                 'total_repos': len(repos_lang_df),
@@ -103,7 +129,7 @@ class CodeTrendsAgent:
 
         # 5. Madnight Pull Requests (original)
         try:
-            madnight_df = pd.read_csv('Datos/MadnightPullRequests.csv')
+            madnight_df = repository.get('madnight_original')
             knowledge['datasets']['madnight_original'] = {
                 'descripcion': 'Pull Requests Madnight (datos originales)',
                 'filas': len(madnight_df),
@@ -116,7 +142,7 @@ class CodeTrendsAgent:
 
         # 6. Estadísticas de Lenguajes (GitHub)
         try:
-            github_df = pd.read_csv('Datos_procesados/Estadisticas_lenguajes.csv')
+            github_df = repository.get('estadisticas_github')
             knowledge['datasets']['estadisticas_github'] = {
                 'descripcion': 'Estadísticas procesadas de GitHub',
                 'resumen': self._summarize_github(github_df),
@@ -127,7 +153,7 @@ class CodeTrendsAgent:
 
         # 7. Pull Requests Limpio
         try:
-            pr_clean_df = pd.read_csv('Datos_procesados/MadnightPullRequests_cleaned.csv')
+            pr_clean_df = repository.get('pull_requests')
             knowledge['datasets']['pull_requests'] = {
                 'descripcion': 'Pull Requests procesados y limpios',
                 'resumen': self._summarize_pr(pr_clean_df),
@@ -138,7 +164,7 @@ class CodeTrendsAgent:
 
         # 8. Distribución de Lenguajes
         try:
-            dist_df = pd.read_csv('Datos_procesados/Distribucion_lenguajes.csv')
+            dist_df = repository.get('distribucion_lenguajes')
             knowledge['datasets']['distribucion_lenguajes'] = {
                 'descripcion': 'Distribución de lenguajes en el ecosistema',
                 'lenguajes': len(dist_df),
@@ -149,10 +175,10 @@ class CodeTrendsAgent:
 
         # 9. Promedio Estrellas Top 10
         try:
-            prom_stars_df = pd.read_csv('Datos_procesados/Promedio_estrellas_top10.csv')
+            prom_stars_df = repository.get('promedio_estrellas')
             knowledge['datasets']['promedio_estrellas'] = {
                 'descripcion': 'Promedio de estrellas en top 10 repos por lenguaje',
-                'datos': prom_stars_df.to_dict('records'),
+                'datos': prom_stars_df.drop(columns=COLUMNA_CODIGO).to_dict('records'),
                 'filas': len(prom_stars_df)
             }
         except Exception as e:
@@ -160,10 +186,10 @@ class CodeTrendsAgent:
 
         # 10. Rating Promedio
         try:
-            rating_df = pd.read_csv('Datos_procesados/Rating_promedio.csv')
+            rating_df = repository.get('rating_promedio')
             knowledge['datasets']['rating_promedio'] = {
                 'descripcion': 'Rating promedio de lenguajes (TIOBE)',
-                'datos': rating_df.to_dict('records'),
+                'datos': rating_df.drop(columns=COLUMNA_CODIGO).to_dict('records'),
                 'filas': len(rating_df)
             }
         except Exception as e:
@@ -171,7 +197,7 @@ class CodeTrendsAgent:
 
         # 11. Repos por Lenguaje Clean
         try:
-            repos_clean_df = pd.read_csv('Datos_procesados/Repos_por_lenguaje_clean.csv')
+            repos_clean_df = repository.get('repos_lenguaje_clean')
             knowledge['datasets']['repos_lenguaje_clean'] = {
                 'descripcion': 'Repositorios por lenguaje (procesado)',
                 'total': len(repos_clean_df),
@@ -182,7 +208,7 @@ class CodeTrendsAgent:
 
         # 12. Top Repos Clean
         try:
-            top_clean_df = pd.read_csv('Datos_procesados/Top_repos_clean.csv')
+            top_clean_df = repository.get('top_repos_clean')
             knowledge['datasets']['top_repos_clean'] = {
                 'descripcion': 'Top repositorios (procesado y limpio)',
                 'total': len(top_clean_df),
@@ -197,39 +223,61 @@ class CodeTrendsAgent:
         
         return knowledge
 
-    def _generate_insights(self):
-        """Generar insights clave del análisis"""
-        return """
-        INSIGHTS PRINCIPALES DEL ANALISIS 2020-2025:
-
-        1. PYTHON - LIDER ABSOLUTO:
-           - 50 meses como #1 en TIOBE (70.4% del periodo)
-           - Crecimiento: +14.59 puntos (10.07% -> 24.66%)
-           - Promedio estrellas GitHub: 26,328
-           - Pull Requests promedio: 17.55%
-           - Dominios: IA, ML, Data Science, Automatizacion
-
-        2. LENGUAJES EN ASCENSO:
-           - Go: Crecimiento constante, popular en cloud/DevOps
-           - Rust: Mayor crecimiento relativo, enfoque en seguridad
-           - Kotlin: Adopcion en Android, respaldado por Google
-
-        3. LENGUAJES ESTABLES:
-           - Java: Mantiene relevancia empresarial (11.35% PR promedio)
-           - JavaScript: Dominio en web frontend/backend
-           - C++: Estable en sistemas y gaming
-
-        4. LENGUAJES EN DECLIVE:
-           - PHP: Perdida gradual de popularidad
-           - Perl: Uso muy reducido
-           - Assembly: Nicho muy especializado
-
-        5. TENDENCIAS CLAVE:
-           - IA/ML impulsa Python dramaticamente desde 2023
-           - Cloud computing favorece Go y Rust
-           - Desarrollo movil consolida Kotlin y Swift
-           - WebAssembly abre nuevas posibilidades para Rust/C++
+    def _generate_insights(self, repository=None):
         """
+        Generar insights clave del análisis.
+
+        Las cifras salen del motor de tendencias (tendencias.py), del
+        historial de posiciones (ranking_historico.py), del pronóstico
+        (pronostico.py) y de los datasets del repositorio, así que se actualizan con cada versión de
+        datos; el contexto cualitativo no lleva números.
+        """
+        repository = repository or self.repository
+        try:
+            tendencias = obtener_tendencias(repository)
+            secciones = [tendencias.texto_insights()]
+            lider = tendencias.destacados()['lider']
+        except Exception as e:
+            secciones = [f"Estadisticas TIOBE no disponibles: {e}"]
+            lider = None
+        try:
+            secciones.append(obtener_historial_ranking(repository).texto_insights())
+        except Exception:
+            pass
+        try:
+            secciones.append(obtener_pronostico(repository).texto_insights())
+        except Exception:
+            pass
+
+        if lider is not None:
+            lenguaje = tendencias.lenguajes[lider]
+            # Cruce entre fuentes por código de lenguaje (cada una lo escribe a su manera)
+            codigo_lider = codigo(lenguaje)
+            try:
+                estrellas = repository.get('promedio_estrellas')
+                fila = estrellas[estrellas[COLUMNA_CODIGO] == codigo_lider]
+                if len(fila):
+                    secciones.append(f"- {lenguaje}: promedio de estrellas GitHub {fila['Promedio_Stars'].iloc[0]:,.0f}")
+            except Exception:
+                pass
+            try:
+                prs = repository.get('pull_requests')
+                porcentaje = prs.loc[prs[COLUMNA_CODIGO] == codigo_lider, 'Porcentaje']
+                if len(porcentaje):
+                    secciones.append(f"- {lenguaje}: Pull Requests promedio {porcentaje.mean():.2f}%")
+            except Exception:
+                pass
+
+        secciones.append("""
+        CONTEXTO CUALITATIVO (usar junto con las cifras calculadas):
+           - Python: IA, ML, Data Science, Automatizacion
+           - Go y Rust: cloud/DevOps y programacion de sistemas con enfoque en seguridad
+           - Kotlin: Android, respaldado por Google
+           - Java: relevancia empresarial; JavaScript: web frontend/backend; C++: sistemas y gaming
+           - PHP, Perl y Assembly: usos cada vez mas de nicho
+           - WebAssembly abre nuevas posibilidades para Rust/C++
+        """)
+        return "\n".join(secciones)
 
     def _summarize_tiobe(self, df):
         """Resumir datos de TIOBE"""
@@ -256,12 +304,13 @@ class CodeTrendsAgent:
         except:
             return "Resumen PR no disponible"
 
-    def _build_system_prompt(self):
+    def _build_system_prompt(self, knowledge_base=None):
         """Construir el prompt del sistema con todo el contexto"""
+        knowledge_base = knowledge_base or self.knowledge_base
         return f"""Eres "CodeTrends AI", un asistente experto en analisis de lenguajes de programacion.
 
 CONTEXTO Y DATOS DISPONIBLES:
-{json.dumps(self.knowledge_base, indent=2, ensure_ascii=False)}
+{json.dumps(knowledge_base, indent=2, ensure_ascii=False)}
 
 TU ROL:
 1. Responder preguntas sobre tendencias de lenguajes de programacion (2020-2025)
@@ -311,7 +360,8 @@ EJEMPLOS DE PREGUNTAS QUE PUEDES RESPONDER:
             response = self.client.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=1024,
-                system=self._build_system_prompt(),
+                # El prompt se arma una vez por versión de datos (ver recargar_datos)
+                system=self._system_prompt,
                 messages=self.conversation_history
             )
 
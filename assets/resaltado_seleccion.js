@@ -0,0 +1,267 @@
+// ===========================================
+// Resaltado de Selección en el navegador
+// ===========================================
+//
+// Versión clientside de resaltado_seleccion.py: cuando cambia
+// selected-language-store, las figuras ya dibujadas se atenúan o resaltan
+// aquí mismo, sin ir al servidor. Cada función calcula la misma lista de
+// cambios (ruta, valor) que su par en Python y la aplica sobre una copia de
+// la figura actual (valor null elimina la propiedad). La equivalencia con el
+// servidor la verifica tests/test_resaltado_seleccion.py (requiere node).
+
+(function () {
+    'use strict';
+
+    var AZUL_SELECCION = '#084594';
+    var AZUL_ATENUADO = '#c6dbef';
+    // Traza de la serie completa del gráfico de tendencia WebGL (main.py)
+    var UID_SERIE_COMPLETA = 'serie-completa';
+
+    function noActualizar() {
+        return window.dash_clientside.no_update;
+    }
+
+    function aplicar(figura, cambios) {
+        var copia = JSON.parse(JSON.stringify(figura));
+        cambios.forEach(function (cambio) {
+            var ruta = cambio[0];
+            var objeto = copia;
+            for (var i = 0; i < ruta.length - 1; i++) {
+                if (objeto[ruta[i]] === undefined || objeto[ruta[i]] === null) {
+                    objeto[ruta[i]] = {};
+                }
+                objeto = objeto[ruta[i]];
+            }
+            var clave = ruta[ruta.length - 1];
+            if (cambio[1] === null) {
+                delete objeto[clave];
+            } else {
+                objeto[clave] = cambio[1];
+            }
+        });
+        return copia;
+    }
+
+    // ========================================================================
+    // CAMBIOS POR FIGURA (mismo orden y valores que en Python)
+    // ========================================================================
+
+    function cambiosLineas(nombres, seleccionado) {
+        var cambios = [];
+        nombres.forEach(function (nombre, i) {
+            var ancho = null, marcador = null, opacidad = null;
+            if (seleccionado && nombre === seleccionado) {
+                ancho = 4;
+                marcador = 10;
+            } else if (seleccionado) {
+                ancho = 1;
+                opacidad = 0.2;
+            }
+            cambios.push([['data', i, 'line', 'width'], ancho]);
+            cambios.push([['data', i, 'marker', 'size'], marcador]);
+            cambios.push([['data', i, 'opacity'], opacidad]);
+        });
+        return cambios;
+    }
+
+    function cambiosBarras(categorias, valores, seleccionado, ejeColor, soloSiPresente) {
+        var colores, opacidades, escala;
+        if (seleccionado && (categorias.indexOf(seleccionado) >= 0 || !soloSiPresente)) {
+            colores = categorias.map(function (c) { return c === seleccionado ? AZUL_SELECCION : AZUL_ATENUADO; });
+            opacidades = categorias.map(function (c) { return c === seleccionado ? 1 : 0.3; });
+            escala = false;
+        } else {
+            colores = valores.slice();
+            opacidades = null;
+            escala = null;
+        }
+        var cambios = [
+            [['data', 0, 'marker', 'color'], colores],
+            [['data', 0, 'marker', 'opacity'], opacidades]
+        ];
+        if (ejeColor) {
+            cambios.push([['layout', 'coloraxis', 'showscale'], escala]);
+        }
+        return cambios;
+    }
+
+    function cambiosHeatmap(lenguajes, numPeriodos, seleccionado) {
+        if (!seleccionado || lenguajes.indexOf(seleccionado) < 0) {
+            return [[['layout', 'shapes'], null]];
+        }
+        var velos = [];
+        lenguajes.forEach(function (lang, i) {
+            if (lang !== seleccionado) {
+                velos.push({
+                    type: 'rect',
+                    xref: 'x',
+                    yref: 'y',
+                    x0: -0.5,
+                    x1: numPeriodos - 0.5,
+                    y0: i - 0.5,
+                    y1: i + 0.5,
+                    fillcolor: 'rgba(255, 255, 255, 0.7)',
+                    line: {width: 0},
+                    layer: 'above'
+                });
+            }
+        });
+        return [[['layout', 'shapes'], velos]];
+    }
+
+    function colorMedidor(porcentaje) {
+        if (porcentaje > 10) { return '#084594'; }
+        if (porcentaje > 5) { return '#2171b5'; }
+        return '#4292c6';
+    }
+
+    function estiloMedidor(porcentaje, activo) {
+        return [
+            [['number', 'font', 'color'], activo ? '#08306b' : '#c6dbef'],
+            [['delta', 'increasing', 'color'], activo ? '#084594' : '#deebf7'],
+            [['delta', 'decreasing', 'color'], activo ? '#9ecae1' : '#f7fbff'],
+            [['gauge', 'axis', 'tickfont', 'color'], activo ? '#08306b' : '#deebf7'],
+            [['gauge', 'bar', 'color'], activo ? colorMedidor(porcentaje) : '#deebf7'],
+            [['gauge', 'bordercolor'], activo ? '#c6dbef' : '#f7fbff'],
+            [['gauge', 'steps', 1, 'color'], activo ? '#deebf7' : '#f7fbff'],
+            [['gauge', 'steps', 2, 'color'], activo ? '#c6dbef' : '#f7fbff'],
+            [['gauge', 'threshold', 'line', 'color'], activo ? '#2171b5' : '#f7fbff']
+        ];
+    }
+
+    function tituloMedidor(lenguaje, seleccionado) {
+        if (seleccionado && lenguaje === seleccionado) { return '<b>' + lenguaje + '</b>'; }
+        if (seleccionado) { return "<span style='opacity:0.3'>" + lenguaje + '</span>'; }
+        return lenguaje;
+    }
+
+    function cambiosMedidores(lenguajes, porcentajes, seleccionado) {
+        var cambios = [];
+        lenguajes.forEach(function (lang, i) {
+            var activo = !seleccionado || lang === seleccionado;
+            estiloMedidor(porcentajes[i], activo).forEach(function (cambio) {
+                cambios.push([['data', i].concat(cambio[0]), cambio[1]]);
+            });
+            cambios.push([['layout', 'annotations', i, 'text'], tituloMedidor(lang, seleccionado)]);
+        });
+        return cambios;
+    }
+
+    function reglasTabla(seleccionado) {
+        if (!seleccionado) { return []; }
+        return [
+            {
+                'if': {'filter_query': "{Language} = '" + seleccionado + "'"},
+                backgroundColor: '#2171b5',
+                color: 'white',
+                fontWeight: 'bold'
+            },
+            {
+                'if': {'filter_query': "{Language} != '" + seleccionado + "'"},
+                opacity: '0.4'
+            }
+        ];
+    }
+
+    function esReglaSeleccion(regla) {
+        var condicion = regla['if'] || {};
+        return typeof condicion.filter_query === 'string' && condicion.filter_query.indexOf('{Language}') === 0;
+    }
+
+    // ========================================================================
+    // CALLBACKS CLIENTSIDE
+    // ========================================================================
+
+    function nombres(figura) {
+        return figura.data.map(function (traza) { return traza.name; });
+    }
+
+    function tieneSerieCompleta(figura) {
+        return Boolean(figura && figura.data && figura.data.length
+            && figura.data[figura.data.length - 1].uid === UID_SERIE_COMPLETA);
+    }
+
+    var resaltado = {
+        lineas: function (seleccionado, figura) {
+            if (!figura || !figura.data) { return noActualizar(); }
+            return aplicar(figura, cambiosLineas(nombres(figura), seleccionado));
+        },
+
+        ganadores: function (seleccionado, figura) {
+            if (!figura || !figura.data || !figura.data.length) { return noActualizar(); }
+            var traza = figura.data[0];
+            return aplicar(figura, cambiosBarras(traza.x || [], traza.y || [], seleccionado,
+                'coloraxis' in (figura.layout || {}), false));
+        },
+
+        estrellas: function (seleccionado, figura) {
+            if (!figura || !figura.data || !figura.data.length) { return noActualizar(); }
+            var traza = figura.data[0];
+            return aplicar(figura, cambiosBarras(traza.x || [], traza.y || [], seleccionado,
+                'coloraxis' in (figura.layout || {}), true));
+        },
+
+        heatmap: function (seleccionado, figura) {
+            if (!figura || !figura.data || !figura.data.length) { return noActualizar(); }
+            var traza = figura.data[0];
+            return aplicar(figura, cambiosHeatmap(traza.y, traza.x.length, seleccionado));
+        },
+
+        medidores: function (seleccionado, figura) {
+            if (!figura || !figura.data) { return noActualizar(); }
+            var porcentajes = figura.data.map(function (traza) { return traza.value; });
+            return aplicar(figura, cambiosMedidores(nombres(figura), porcentajes, seleccionado));
+        },
+
+        // Gráfico de tendencia: la serie completa solo se pide al servidor
+        // si la figura está submuestreada (tiene la traza que la recibe)
+        pedirSerieCompleta: function (seleccionado, figura, rango) {
+            if (!tieneSerieCompleta(figura)) { return noActualizar(); }
+            return {lenguaje: seleccionado, rango: rango};
+        },
+
+        // Respuesta de update_line_chart_resolution: se descarta si mientras
+        // tanto cambió la selección, el rango o la figura
+        serieCompleta: function (datos, seleccionado, figura, rango) {
+            if (!datos || !tieneSerieCompleta(figura) || datos.lenguaje !== seleccionado
+                    || JSON.stringify(datos.rango) !== JSON.stringify(rango)
+                    || datos.trazas !== figura.data.length) {
+                return noActualizar();
+            }
+            return aplicar(figura, datos.cambios);
+        },
+
+        tabla: function (seleccionado, estilos) {
+            var base = (estilos || []).filter(function (regla) { return !esReglaSeleccion(regla); });
+            return base.concat(reglasTabla(seleccionado));
+        },
+
+        // Clic en la tabla o en el gráfico de estrellas (mismo criterio que
+        // update_selected_language): un segundo clic sobre el mismo lenguaje deselecciona
+        seleccionar: function (celdaActiva, clicEstrellas, datosTabla, seleccionActual) {
+            var contexto = window.dash_clientside.callback_context;
+            var disparado = contexto.triggered.length ? contexto.triggered[0].prop_id.split('.')[0] : null;
+            var lenguaje = null;
+            if (disparado === 'tabla-indicador' && celdaActiva) {
+                lenguaje = datosTabla[celdaActiva.row].Language;
+            } else if (disparado === 'grafico-promedio-estrellas' && clicEstrellas) {
+                lenguaje = clicEstrellas.points[0].x;
+            } else {
+                return seleccionActual;
+            }
+            return lenguaje === seleccionActual ? null : lenguaje;
+        },
+
+        sincronizarDropdown: function (seleccionado, opciones) {
+            var disponible = (opciones || []).some(function (opcion) { return opcion.value === seleccionado; });
+            return seleccionado && disponible ? seleccionado : noActualizar();
+        }
+    };
+
+    if (typeof window !== 'undefined') {
+        window.dash_clientside = Object.assign({}, window.dash_clientside, {resaltado: resaltado});
+    }
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = resaltado;
+    }
+})();
@@ -0,0 +1,175 @@
+# ===========================================
+# Benchmark - Servidor de desarrollo vs gunicorn
+# ===========================================
+#
+# Levanta cada servidor en un subproceso y lo somete a la misma carga:
+# clientes concurrentes que piden la página y disparan los callbacks de las
+# figuras con argumentos variados. Reporta peticiones por segundo y latencias.
+# Cada servidor empieza con su propia cache de figuras en disco, vacía, para
+# que ninguno aproveche las figuras que dejó el otro.
+#
+# Uso:
+#   python benchmark_servidor.py [--clientes 16] [--segundos 20] [--workers 3]
+
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+PUERTO_DESARROLLO = 8050
+PUERTO_GUNICORN = 8051
+
+
+def _callback(salidas, entradas):
+    """Cuerpo de una petición a /_dash-update-component"""
+    outputs = [{'id': i, 'property': p} for i, p in salidas]
+    return {
+        'output': '..' + '...'.join(f'{i}.{p}' for i, p in salidas) + '..' if len(salidas) > 1
+        else f'{salidas[0][0]}.{salidas[0][1]}',
+        'outputs': outputs if len(salidas) > 1 else outputs[0],
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in entradas],
+        'changedPropIds': [f'{entradas[0][0]}.{entradas[0][1]}'],
+        'state': [],
+    }
+
+
+def peticiones():
+    """Mezcla de peticiones que recorre los controles del dashboard"""
+    seccion1 = [
+        ('POST', _callback(
+            [('periodo-base-slider', 'value'), ('periodo-comparado-slider', 'value'),
+             ('timeseries-container', 'children'), ('winners-container', 'children'),
+             ('resumen-tendencias', 'children')],
+            [('year-range-slider', 'value', [a1, a2])]))
+        for a1 in range(2020, 2026) for a2 in range(a1 + 1, 2026)
+    ]
+    # Tabla de indicadores con periodos de meses (ordinales año * 12 + mes - 1)
+    tabla = [
+        ('POST', _callback(
+            [('tabla-container', 'children')],
+            [('periodo-base-slider', 'value', [a1 * 12 + m, a1 * 12 + 11]),
+             ('periodo-comparado-slider', 'value', [a2 * 12, a2 * 12 + m])]))
+        for a1 in range(2020, 2025) for a2 in range(a1 + 1, 2026) for m in (0, 5)
+    ]
+    heatmap = [
+        ('POST', _callback(
+            [('heatmap-quarters', 'figure')],
+            [('dropdown-anio', 'value', anio), ('dropdown-num-lenguajes', 'value', n),
+             ('selected-language-store', 'data', lenguaje)]))
+        for anio in ['Todos', 2020, 2022, 2024] for n in (5, 10, 15)
+        for lenguaje in (None, 'Python', 'Rust')
+    ]
+    repos = [
+        ('POST', _callback([('grafico-repos-por-lenguaje', 'figure')],
+                           [('dropdown-lenguaje', 'value', lenguaje)]))
+        for lenguaje in ('Python', 'JavaScript', 'Go', 'Rust', 'Java', 'C++')
+    ]
+    pagina = [('GET', None)]
+    return [p for grupo in itertools.zip_longest(seccion1, tabla, heatmap, repos, pagina) for p in grupo if p]
+
+
+def _pedir(base, metodo, cuerpo):
+    if metodo == 'GET':
+        solicitud = urllib.request.Request(base + '/')
+    else:
+        solicitud = urllib.request.Request(
+            base + '/_dash-update-component', data=json.dumps(cuerpo).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(solicitud, timeout=120) as respuesta:
+        respuesta.read()
+    return time.perf_counter() - inicio
+
+
+def _esperar(base, proceso, limite=180):
+    fin = time.time() + limite
+    while time.time() < fin:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"El servidor terminó con código {proceso.returncode}")
+        try:
+            _pedir(base, 'GET', None)
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"{base} no respondió en {limite} s")
+
+
+def medir(comando, puerto, clientes, segundos):
+    """Levantar un servidor, aplicar la carga y devolver sus métricas"""
+    cache = tempfile.TemporaryDirectory()
+    entorno = dict(os.environ, CODETRENDS_FIGURE_CACHE_PATH=os.path.join(cache.name, 'figuras.sqlite'),
+                   CODETRENDS_RELOAD_SEGUNDOS='0')
+    proceso = subprocess.Popen(comando, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{puerto}'
+    try:
+        _esperar(base, proceso)
+        mezcla = peticiones()
+        # Una pasada previa llena la cache de figuras: se mide el estado estable
+        for metodo, cuerpo in mezcla:
+            _pedir(base, metodo, cuerpo)
+        fin = time.perf_counter() + segundos
+
+        def cliente(desplazamiento):
+            latencias, errores = [], 0
+            for metodo, cuerpo in itertools.islice(itertools.cycle(mezcla), desplazamiento, None):
+                if time.perf_counter() >= fin:
+                    break
+                try:
+                    latencias.append(_pedir(base, metodo, cuerpo))
+                except OSError:
+                    errores += 1
+            return latencias, errores
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(clientes) as ejecutor:
+            resultados = list(ejecutor.map(cliente, range(0, clientes * 7, 7)))
+        duracion = time.perf_counter() - inicio
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+        cache.cleanup()
+
+    latencias = sorted(l for lista, _ in resultados for l in lista)
+    return {
+        'peticiones': len(latencias),
+        'errores': sum(e for _, e in resultados),
+        'por_segundo': len(latencias) / duracion,
+        'p50_ms': latencias[len(latencias) // 2] * 1000 if latencias else float('nan'),
+        'p95_ms': latencias[int(len(latencias) * 0.95)] * 1000 if latencias else float('nan'),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Comparar el servidor de desarrollo con gunicorn")
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--segundos', type=float, default=20)
+    parser.add_argument('--workers', type=int, default=None, help="Workers de gunicorn (por defecto los de gunicorn.conf.py)")
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    gunicorn = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                '-b', f'127.0.0.1:{PUERTO_GUNICORN}', '--access-logfile', '/dev/null']
+    if args.workers:
+        gunicorn += ['-w', str(args.workers)]
+    if args.threads:
+        gunicorn += ['--threads', str(args.threads)]
+    gunicorn.append('wsgi:server')
+
+    servidores = [
+        ('desarrollo (python main.py)', [sys.executable, 'main.py'], PUERTO_DESARROLLO),
+        ('gunicorn (wsgi:server)', gunicorn, PUERTO_GUNICORN),
+    ]
+    print(f"{args.clientes} clientes concurrentes, {args.segundos:.0f} s por servidor, "
+          f"{os.cpu_count()} núcleo(s)")
+    print(f"{'servidor':<30} {'peticiones':>10} {'errores':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for nombre, comando, puerto in servidores:
+        m = medir(comando, puerto, args.clientes, args.segundos)
+        print(f"{nombre:<30} {m['peticiones']:>10} {m['errores']:>8} {m['por_segundo']:>8.1f} "
+              f"{m['p50_ms']:>8.1f} {m['p95_ms']:>8.1f}")
@@ -0,0 +1,302 @@
+# ===========================================
+# Build Pipeline - Construcción incremental de Datos_procesados
+# ===========================================
+#
+# Cada dataset procesado se declara como un nodo con sus entradas y su
+# transformación. Solo se reconstruyen los nodos cuyas entradas (o cuyo código
+# de transformación) cambiaron según el hash de su contenido; los nodos
+# independientes se ejecutan en paralelo. El resultado queda registrado en
+# Datos_procesados/manifest.json, que el dashboard usa como versión de datos.
+# Al terminar, los snapshots nuevos de GitHub Trending se agregan al
+# historial (historial_trending.py).
+#
+# Uso:
+#   python build_pipeline.py                 # reconstruir lo que cambió
+#   python build_pipeline.py --forzar        # reconstruir todo
+#   python build_pipeline.py rating_promedio # un nodo (y lo que depende de él)
+#   python build_pipeline.py --sin-historial # sin agregar el snapshot de trending al historial
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from deteccion_eventos import detectar_eventos
+from escritura_atomica import archivo_atomico, escribir_atomico
+from historial_trending import ingerir
+from lenguajes import codificar
+from limpieza_madnight import limpiar_dataframe
+from snapshot_store import hash_archivo
+
+MANIFEST_PATH = 'Datos_procesados/manifest.json'
+MANIFEST_FORMATO = 1
+
+# Lenguajes de interés para el rating promedio (Tiobe_EDA.ipynb)
+LENGUAJES_TIOBE = [
+    "Python", "C", "C#", "C++", "Java", "JavaScript", "Assembly", "R",
+    "Perl", "Fortran", "Rust", "MATLAB", "PHP", "Go", "Kotlin",
+]
+
+
+# ============================================================================
+# TRANSFORMACIONES
+# ============================================================================
+
+def limpiar_numeros(df, columnas=('NumberOfStar', 'NumberOfFork')):
+    """Convierte columnas con números formateados (e.g., '6,702') a enteros"""
+    df = df.copy()
+    for col in columnas:
+        df[col] = df[col].astype(str).str.replace(',', '').str.replace('"', '').astype(int)
+    return df
+
+
+def estadisticas_por_lenguaje(df_repos_lang):
+    """Estrellas y forks agregados por lenguaje, ordenados por total de estrellas"""
+    stats = df_repos_lang.groupby('Language').agg({
+        'NumberOfStar': ['sum', 'mean', 'count'],
+        'NumberOfFork': ['sum', 'mean']
+    }).round(0)
+    stats.columns = ['Total_Stars', 'Promedio_Stars', 'Num_Repos', 'Total_Forks', 'Promedio_Forks']
+    return stats.reset_index().sort_values('Total_Stars', ascending=False)
+
+
+def promedio_estrellas_top10(stats_por_lenguaje):
+    """Los 10 lenguajes con mayor promedio de estrellas"""
+    promedio = stats_por_lenguaje[['Language', 'Promedio_Stars', 'Num_Repos']]
+    return promedio.sort_values('Promedio_Stars', ascending=False).head(10)
+
+
+def distribucion_lenguajes(df_repos_lang):
+    """Cantidad de repositorios por lenguaje"""
+    distribucion = df_repos_lang['Language'].value_counts().reset_index()
+    distribucion.columns = ['Language', 'Count']
+    return distribucion
+
+
+def rating_promedio(df_series):
+    """Rating TIOBE promedio por lenguaje y año (2020-2025)"""
+    df = df_series[(df_series['Year'] >= 2020) & (df_series['Year'] <= 2025)]
+    df = df[np.isin(codificar(df['Language']), codificar(LENGUAJES_TIOBE))]
+    pivot = df.pivot_table(values='Rating', index='Language', columns='Year', aggfunc='mean').round(2)
+    return pivot.reset_index()
+
+
+def limpiar_madnight(df):
+    """Limpiar la columna 'Porcentaje' de MadnightPullRequests (vectorizado)"""
+    df_limpio, _ = limpiar_dataframe(df, ['Porcentaje'])
+    return df_limpio
+
+
+def eventos_series(df_series, df_prs):
+    """Cambios de nivel y anomalías de las series TIOBE y de Pull Requests (deteccion_eventos.py)"""
+    return detectar_eventos(df_series, df_prs)
+
+
+# ============================================================================
+# GRAFO DE CONSTRUCCIÓN
+# ============================================================================
+
+# Nodo -> salida, entradas (rutas de CSV) y transformación; la transformación
+# recibe los DataFrames de las entradas en el mismo orden
+PIPELINE = {
+    'top_repos_clean': {
+        'salida': 'Datos_procesados/Top_repos_clean.csv',
+        'entradas': ['Datos/TopRepositorios.csv'],
+        'transform': limpiar_numeros,
+    },
+    'repos_lenguaje_clean': {
+        'salida': 'Datos_procesados/Repos_por_lenguaje_clean.csv',
+        'entradas': ['Datos/TopReposXLenguajes.csv'],
+        'transform': limpiar_numeros,
+    },
+    'estadisticas_github': {
+        'salida': 'Datos_procesados/Estadisticas_lenguajes.csv',
+        'entradas': ['Datos_procesados/Repos_por_lenguaje_clean.csv'],
+        'transform': estadisticas_por_lenguaje,
+    },
+    'promedio_estrellas': {
+        'salida': 'Datos_procesados/Promedio_estrellas_top10.csv',
+        'entradas': ['Datos_procesados/Estadisticas_lenguajes.csv'],
+        'transform': promedio_estrellas_top10,
+    },
+    'distribucion_lenguajes': {
+        'salida': 'Datos_procesados/Distribucion_lenguajes.csv',
+        'entradas': ['Datos_procesados/Repos_por_lenguaje_clean.csv'],
+        'transform': distribucion_lenguajes,
+    },
+    'rating_promedio': {
+        'salida': 'Datos_procesados/Rating_promedio.csv',
+        'entradas': ['Datos/Series_de_Tiempo.csv'],
+        'transform': rating_promedio,
+    },
+    'pull_requests': {
+        'salida': 'Datos_procesados/MadnightPullRequests_cleaned.csv',
+        'entradas': ['Datos/MadnightPullRequests.csv'],
+        'transform': limpiar_madnight,
+    },
+    'eventos': {
+        'salida': 'Datos_procesados/Eventos_detectados.csv',
+        'entradas': ['Datos/Series_de_Tiempo.csv', 'Datos_procesados/MadnightPullRequests_cleaned.csv'],
+        'transform': eventos_series,
+    },
+}
+
+
+def niveles(pipeline=None):
+    """
+    Ordenar los nodos en niveles: cada nivel solo depende de los anteriores,
+    así que los nodos de un mismo nivel pueden ejecutarse en paralelo.
+    """
+    pipeline = pipeline or PIPELINE
+    productor = {nodo['salida']: nombre for nombre, nodo in pipeline.items()}
+    dependencias = {
+        nombre: {productor[e] for e in nodo['entradas'] if e in productor}
+        for nombre, nodo in pipeline.items()
+    }
+
+    resultado, hechos = [], set()
+    while len(hechos) < len(pipeline):
+        nivel = sorted(n for n, deps in dependencias.items() if n not in hechos and deps <= hechos)
+        if not nivel:
+            raise ValueError(f"Ciclo en el pipeline: {sorted(set(pipeline) - hechos)}")
+        resultado.append(nivel)
+        hechos.update(nivel)
+    return resultado
+
+
+def huella_transform(transform):
+    """Hash del código de una transformación (y de las funciones que usa directamente)"""
+    sha = hashlib.sha256(inspect.getsource(transform).encode('utf-8'))
+    for nombre in transform.__code__.co_names:
+        auxiliar = transform.__globals__.get(nombre)
+        if inspect.isfunction(auxiliar) and auxiliar is not transform:
+            sha.update(inspect.getsource(auxiliar).encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+def leer_manifest(path=MANIFEST_PATH):
+    """Leer el manifest de construcción (None si no existe o es inválido)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('formato') == MANIFEST_FORMATO else None
+
+
+def version_manifest(nodos):
+    """Versión de datos: hash de las entradas y salidas de todos los nodos"""
+    sha = hashlib.sha256()
+    for nombre in sorted(nodos):
+        nodo = nodos[nombre]
+        sha.update(nombre.encode('utf-8'))
+        for ruta, hash_entrada in sorted(nodo['entradas'].items()):
+            sha.update(f"{ruta}={hash_entrada}".encode('utf-8'))
+        sha.update(nodo['sha256'].encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+def construir(objetivos=None, forzar=False, jobs=None, base_dir='.', pipeline=None):
+    """
+    Reconstruir los nodos cuyas entradas o transformación cambiaron.
+
+    Args:
+        objetivos: Nodos a considerar (None = todos); también se incluyen los
+            nodos que dependen de ellos (los que leen sus salidas), no los
+            nodos de los que ellos dependen
+        forzar: Reconstruir aunque nada haya cambiado
+        jobs: Hilos para ejecutar los nodos de un mismo nivel
+        base_dir: Carpeta raíz del proyecto
+
+    Returns:
+        Lista de dicts con nodo, estado ('reconstruido' o 'al día') y ms
+    """
+    pipeline = pipeline or PIPELINE
+    manifest_path = os.path.join(base_dir, MANIFEST_PATH)
+    anterior = (leer_manifest(manifest_path) or {}).get('nodos', {})
+    nodos = dict(anterior)
+
+    if objetivos:
+        incluidos = set()
+        for nivel in niveles(pipeline):
+            for nombre in nivel:
+                entradas = pipeline[nombre]['entradas']
+                if nombre in objetivos or any(pipeline[d]['salida'] in entradas for d in incluidos):
+                    incluidos.add(nombre)
+    else:
+        incluidos = set(pipeline)
+
+    def ruta(relativa):
+        return os.path.join(base_dir, relativa)
+
+    def ejecutar(nombre):
+        nodo = pipeline[nombre]
+        inicio = time.perf_counter()
+        entradas = {e: hash_archivo(ruta(e)) for e in nodo['entradas']}
+        huella = huella_transform(nodo['transform'])
+        previo = anterior.get(nombre)
+        salida = ruta(nodo['salida'])
+
+        al_dia = (
+            not forzar and previo is not None
+            and previo['entradas'] == entradas and previo['transform'] == huella
+            and os.path.exists(salida) and hash_archivo(salida) == previo['sha256']
+        )
+        if not al_dia:
+            frames = [pd.read_csv(ruta(e)) for e in nodo['entradas']]
+            df = nodo['transform'](*frames)
+            with archivo_atomico(salida) as tmp_path:
+                df.to_csv(tmp_path, index=False)
+
+        registro = {
+            'salida': nodo['salida'],
+            'entradas': entradas,
+            'transform': huella,
+            'sha256': hash_archivo(salida),
+        }
+        estado = 'al día' if al_dia else 'reconstruido'
+        return nombre, registro, estado, (time.perf_counter() - inicio) * 1000
+
+    reporte = []
+    with ThreadPoolExecutor(max_workers=jobs) as ejecutor:
+        for nivel in niveles(pipeline):
+            # Un nivel termina antes de empezar el siguiente: sus salidas son entradas
+            for nombre, registro, estado, ms in ejecutor.map(ejecutar, [n for n in nivel if n in incluidos]):
+                nodos[nombre] = registro
+                reporte.append({'nodo': nombre, 'estado': estado, 'ms': round(ms, 1)})
+
+    nodos = {nombre: nodos[nombre] for nombre in sorted(nodos) if nombre in pipeline}
+    manifest = {'formato': MANIFEST_FORMATO, 'version': version_manifest(nodos), 'nodos': nodos}
+    if manifest != leer_manifest(manifest_path):
+        contenido = json.dumps(manifest, indent=2, ensure_ascii=False) + '\n'
+        escribir_atomico(manifest_path, lambda f: f.write(contenido.encode('utf-8')))
+    return reporte
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Construir Datos_procesados de forma incremental")
+    parser.add_argument('nodos', nargs='*', help=f"Nodos a construir ({', '.join(PIPELINE)})")
+    parser.add_argument('--forzar', action='store_true', help="Reconstruir aunque no haya cambios")
+    parser.add_argument('--jobs', type=int, default=None, help="Hilos por nivel")
+    parser.add_argument('--sin-historial', action='store_true', help="No agregar el snapshot de trending al historial")
+    args = parser.parse_args()
+
+    desconocidos = set(args.nodos) - set(PIPELINE)
+    if desconocidos:
+        parser.error(f"Nodos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    inicio = time.perf_counter()
+    for fila in construir(args.nodos, forzar=args.forzar, jobs=args.jobs):
+        print(f"  {fila['nodo']:<24} {fila['estado']:<13} {fila['ms']:>8.1f} ms")
+    print(f"Manifest: {MANIFEST_PATH} (versión {leer_manifest()['version']}) "
+          f"en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    if not args.sin_historial:
+        for fila in ingerir():
+            print(f"  historial {fila['tabla']:<14} {fila['estado']:<13} {fila['ms']:>8.1f} ms")
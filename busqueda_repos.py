@@ -0,0 +1,233 @@
+# ===========================================
+# BusquedaRepos - Búsqueda de repositorios y usuarios por prefijo y subcadena
+# ===========================================
+#
+# Índice en memoria sobre "usuario/repositorio" de GitHub Trending (snapshot
+# actual e historial, sin repetir repositorios) para el autocompletado del
+# dashboard y el endpoint /api/buscar:
+#
+#   - Prefijo: las claves "repositorio" y "usuario/repositorio" en minúsculas
+#     se guardan ordenadas como bytes; un prefijo es un rango que se encuentra
+#     con dos búsquedas binarias (np.searchsorted).
+#   - Subcadena: índice invertido de trigramas (3 bytes -> filas que lo
+#     contienen, en formato CSR). Una consulta de 3 o más caracteres cruza las
+#     listas de sus trigramas empezando por la más corta y confirma la
+#     subcadena solo en las candidatas.
+#
+# Las filas están ordenadas de mayor a menor estrellas, así que el número de
+# fila es el puesto: los mejores resultados son los offsets más chicos y la
+# búsqueda termina apenas junta el límite pedido.
+#
+# Uso:
+#   python busqueda_repos.py                # búsquedas de ejemplo sobre los datos actuales
+#   python busqueda_repos.py --benchmark    # construcción y latencia con 1M de repositorios
+
+import numpy as np
+import pandas as pd
+
+# Datasets de GitHub Trending que entran al índice
+TABLAS_BUSQUEDA = ('top_repos_clean', 'repos_lenguaje_clean')
+
+# Columnas de cada resultado
+COLUMNAS_RESULTADO = ['User', 'Repository', 'Language', 'NumberOfStar']
+
+# Largo mínimo de una consulta para buscar subcadenas (un trigrama)
+MINIMO_SUBCADENA = 3
+
+
+def normalizar_consulta(texto):
+    """Texto de búsqueda como bytes en minúsculas (los nombres de GitHub son ASCII)"""
+    return str(texto or '').strip().lower().encode('ascii', 'ignore')
+
+
+def _como_bytes(valores):
+    """Array 'S' (ancho fijo, relleno con ceros) de textos en minúsculas"""
+    textos = pd.Series(valores, dtype=object).astype(str).str.lower().str.encode('ascii', 'ignore')
+    return textos.to_numpy().astype('S')
+
+
+def _trigramas(matriz):
+    """
+    Códigos de trigramas de una matriz (filas x ancho) de bytes.
+
+    Returns:
+        (códigos uint32, fila de cada código) sin los que tocan el relleno
+    """
+    if matriz.shape[1] < 3:
+        return np.empty(0, np.uint32), np.empty(0, np.int32)
+    m = matriz.astype(np.uint32)
+    codigos = (m[:, :-2] << 16) | (m[:, 1:-1] << 8) | m[:, 2:]
+    validos = matriz[:, 2:] != 0
+    filas = np.broadcast_to(np.arange(len(matriz), dtype=np.int32)[:, None], codigos.shape)
+    return codigos[validos], filas[validos]
+
+
+def _contenidos(candidatos, lista):
+    """Los candidatos (ordenados) que también están en otra lista ordenada"""
+    posiciones = np.searchsorted(lista, candidatos)
+    encontrados = posiciones < len(lista)
+    encontrados[encontrados] = lista[posiciones[encontrados]] == candidatos[encontrados]
+    return candidatos[encontrados]
+
+
+class IndiceBusqueda:
+    """
+    Índice de prefijos y trigramas sobre usuario/repositorio.
+
+    Attributes:
+        repos: DataFrame con un repositorio por fila (COLUMNAS_RESULTADO),
+            de mayor a menor estrellas
+        claves, filas_claves: Claves de prefijo ordenadas y su fila
+        trigramas, inicios, filas_trigramas: Índice invertido (CSR)
+    """
+
+    def __init__(self, repos):
+        self.repos = repos[COLUMNAS_RESULTADO].reset_index(drop=True)
+        # Sin lenguaje conocido: None (el endpoint responde JSON)
+        self.repos['Language'] = self.repos['Language'].astype(object).where(self.repos['Language'].notna(), None)
+        self._columnas = {columna: self.repos[columna].to_numpy() for columna in COLUMNAS_RESULTADO}
+        completos = _como_bytes(self.repos['User'].astype(str) + '/' + self.repos['Repository'].astype(str))
+        self.completos = completos
+
+        # Prefijos: "repositorio" y "usuario/repositorio"
+        claves = np.concatenate([_como_bytes(self.repos['Repository'].astype(str)).astype(completos.dtype),
+                                 completos])
+        filas = np.concatenate([np.arange(len(completos), dtype=np.int32)] * 2)
+        orden = np.argsort(claves)
+        self.claves, self.filas_claves = claves[orden], filas[orden]
+
+        # Trigramas: (código << 32 | fila) ordenado deja cada lista de filas ordenada y sin repetidos
+        matriz = completos.view(np.uint8).reshape(len(completos), completos.dtype.itemsize)
+        codigos, filas = _trigramas(matriz)
+        pares = np.unique((codigos.astype(np.uint64) << np.uint64(32)) | filas.astype(np.uint64))
+        codigos = (pares >> np.uint64(32)).astype(np.uint32)
+        self.filas_trigramas = (pares & np.uint64(0xFFFFFFFF)).astype(np.int32)
+        self.trigramas, self.inicios = np.unique(codigos, return_index=True)
+        self.inicios = np.append(self.inicios, len(codigos)).astype(np.int64)
+
+    @classmethod
+    def desde_tablas(cls, tablas):
+        """
+        Índice de varias tablas de trending: un repositorio por usuario/repositorio,
+        con su mayor cantidad de estrellas y el primer lenguaje conocido
+        """
+        frames = [df[COLUMNAS_RESULTADO] for df in tablas if len(df)]
+        if not frames:
+            return cls(pd.DataFrame({columna: pd.Series(dtype=object) for columna in COLUMNAS_RESULTADO}))
+        filas = pd.concat(frames, ignore_index=True).dropna(subset=['User', 'Repository'])
+        grupos = filas.groupby(['User', 'Repository'], sort=False)
+        repos = grupos.agg(Language=('Language', 'first'), NumberOfStar=('NumberOfStar', 'max')).reset_index()
+        return cls(repos.sort_values('NumberOfStar', ascending=False, kind='stable'))
+
+    @property
+    def nbytes(self):
+        return (self.completos.nbytes + self.claves.nbytes + self.filas_claves.nbytes
+                + self.trigramas.nbytes + self.inicios.nbytes + self.filas_trigramas.nbytes)
+
+    def _por_prefijo(self, consulta, limite):
+        """Mejores filas con un prefijo de repositorio o de usuario/repositorio"""
+        inicio = np.searchsorted(self.claves, consulta, side='left')
+        fin = np.searchsorted(self.claves, consulta + b'\xff', side='left')
+        filas = self.filas_claves[inicio:fin]
+        # Cada fila aparece a lo sumo dos veces: las 2*limite menores alcanzan
+        if len(filas) > 2 * limite:
+            filas = np.partition(filas, 2 * limite - 1)[:2 * limite]
+        return np.unique(filas)[:limite]
+
+    def _lista(self, trigrama):
+        i = np.searchsorted(self.trigramas, trigrama)
+        if i == len(self.trigramas) or self.trigramas[i] != trigrama:
+            return self.filas_trigramas[:0]
+        return self.filas_trigramas[self.inicios[i]:self.inicios[i + 1]]
+
+    def _por_subcadena(self, consulta, limite, excluidas):
+        """Mejores filas que contienen la consulta (sin las ya encontradas por prefijo)"""
+        codigos, _ = _trigramas(np.frombuffer(consulta, np.uint8)[None, :])
+        listas = sorted((self._lista(t) for t in np.unique(codigos)), key=len)
+        candidatos = listas[0]
+        for lista in listas[1:]:
+            if not len(candidatos):
+                break
+            candidatos = _contenidos(candidatos, lista)
+        encontradas = []
+        for fila in candidatos:
+            # Los trigramas no garantizan la subcadena contigua ("abcxbcd" no contiene "abcd")
+            if fila not in excluidas and consulta in self.completos[fila]:
+                encontradas.append(fila)
+                if len(encontradas) == limite:
+                    break
+        return encontradas
+
+    def obtener(self, completo):
+        """Repositorio 'usuario/repositorio' exacto (dict con COLUMNAS_RESULTADO) o None"""
+        consulta = normalizar_consulta(completo)
+        inicio = np.searchsorted(self.claves, consulta, side='left')
+        fin = np.searchsorted(self.claves, consulta, side='right')
+        for fila in self.filas_claves[inicio:fin]:
+            if self.completos[fila] == consulta:
+                return {columna: self._columnas[columna][fila:fila + 1].tolist()[0] for columna in COLUMNAS_RESULTADO}
+        return None
+
+    def buscar(self, texto, limite=10):
+        """
+        Repositorios cuyo nombre o usuario empieza con el texto (primero) o lo
+        contiene, de mayor a menor estrellas.
+
+        Returns:
+            Lista de dicts con COLUMNAS_RESULTADO
+        """
+        consulta = normalizar_consulta(texto)
+        if not consulta or not len(self.completos):
+            return []
+        filas = [int(f) for f in self._por_prefijo(consulta, limite)]
+        if len(filas) < limite and len(consulta) >= MINIMO_SUBCADENA:
+            filas += [int(f) for f in self._por_subcadena(consulta, limite - len(filas), set(filas))]
+        # tolist() entrega tipos de Python (serializables a JSON)
+        valores = [self._columnas[columna][filas].tolist() for columna in COLUMNAS_RESULTADO]
+        return [dict(zip(COLUMNAS_RESULTADO, fila)) for fila in zip(*valores)]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if '--benchmark' in sys.argv:
+        # 1M de repositorios sintéticos con nombres tipo GitHub
+        rng = np.random.default_rng(24)
+        total = 1_000_000
+        silabas = np.array(['ai', 'py', 'go', 'js', 'rs', 'net', 'web', 'ml', 'db', 'kit', 'lab', 'hub',
+                            'dev', 'app', 'api', 'cli', 'ui', 'io', 'core', 'data', 'fast', 'open'])
+        partes = rng.integers(0, len(silabas), (total, 4))
+        usuarios = pd.Series(silabas[partes[:, 0]]).str.cat(rng.integers(0, 50_000, total).astype(str))
+        nombres = (pd.Series(silabas[partes[:, 1]]) + '-' + silabas[partes[:, 2]] + silabas[partes[:, 3]]
+                   + '-' + rng.integers(0, 1000, total).astype(str))
+        repos = pd.DataFrame({
+            'User': usuarios, 'Repository': nombres,
+            'Language': np.array(['Python', 'Go', 'Rust', 'C++'], dtype=object)[rng.integers(0, 4, total)],
+            'NumberOfStar': rng.integers(0, 200_000, total),
+        }).drop_duplicates(['User', 'Repository']).sort_values('NumberOfStar', ascending=False, kind='stable')
+        inicio = time.perf_counter()
+        indice = IndiceBusqueda(repos)
+        construir = time.perf_counter() - inicio
+        print(f"{len(repos):,} repositorios: índice en {construir:.1f} s, {indice.nbytes / 1e6:.0f} MB")
+
+        consultas = ['f', 'fa', 'fast', 'ai123', 'net-kit', 'kitlab', 'coreapi-9', 'data4999', 'zzz', 'hub-ai']
+        tiempos = []
+        for consulta in consultas * 20:
+            inicio = time.perf_counter()
+            indice.buscar(consulta)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        print(f"Consulta (10 resultados): mediana {np.median(tiempos):.2f} ms, p99 {np.percentile(tiempos, 99):.2f} ms, "
+              f"máx {max(tiempos):.2f} ms")
+    else:
+        from data_repository import get_repository
+
+        repositorio = get_repository()
+        indice = IndiceBusqueda.desde_tablas([repositorio.get(tabla) for tabla in TABLAS_BUSQUEDA])
+        print(f"{len(indice.repos)} repositorios, {len(indice.trigramas)} trigramas ({indice.nbytes} bytes)")
+        for consulta in ['micro', 'google', 'rust', 'lang']:
+            resultados = indice.buscar(consulta, limite=5)
+            print(f"\n'{consulta}':")
+            for r in resultados:
+                completo = f"{r['User']}/{r['Repository']}"
+                print(f"  {completo:45s} {str(r['Language']):12s} {r['NumberOfStar']:>8,}")
@@ -0,0 +1,172 @@
+# ===========================================
+# Recarga de Datos en Caliente
+# ===========================================
+#
+# Un hilo revisa cada cierto tiempo la versión de los datos (manifest de
+# build_pipeline + hash de los CSV). Cuando aparece una versión nueva arma un
+# DataRepository nuevo en segundo plano (datasets y estructuras derivadas) y lo
+# publica reemplazando una sola referencia; los callbacks en curso siguen con
+# el repositorio que tenían fijado. Después se avisa a los oyentes (cache de
+# figuras, layout, agente IA) para que descarten lo ligado a la versión anterior.
+#
+# Uso:
+#   python data_reload.py            # revisar una vez y recargar si hay cambios
+#   CODETRENDS_RELOAD_SEGUNDOS=30    # intervalo del hilo en el dashboard (0 = apagado)
+
+import os
+import threading
+import time
+
+from data_repository import (
+    DataRepository, get_repository, reemplazar_repositorio, repositorio_vigente, usar_repositorio,
+)
+
+INTERVALO_SEGUNDOS = float(os.getenv('CODETRENDS_RELOAD_SEGUNDOS', '30'))
+
+
+class RecargaDatos:
+    """
+    Vigila la versión de los datos y publica un repositorio nuevo cuando cambia.
+
+    Una versión nueva se publica solo si se ve igual en dos revisiones
+    seguidas, para no cargar archivos que el scraping o el pipeline todavía
+    están escribiendo.
+    """
+
+    def __init__(self, intervalo=INTERVALO_SEGUNDOS, confirmaciones=2):
+        self.intervalo = intervalo
+        self.confirmaciones = confirmaciones
+        self._oyentes = []
+        self._candidata = None
+        self._vistas = 0
+        self._hilo = None
+        self._detener = threading.Event()
+        self._lock = threading.Lock()
+        self.recargas = []
+
+    def al_recargar(self, oyente):
+        """
+        Registrar una función oyente(nuevo, anterior) que se llama después de
+        publicar cada repositorio nuevo. Se puede usar como decorador.
+        """
+        self._oyentes.append(oyente)
+        return oyente
+
+    def revisar(self):
+        """
+        Revisar la versión una vez y recargar si cambió.
+
+        Returns:
+            True si se publicó un repositorio nuevo
+        """
+        with self._lock:
+            actual = repositorio_vigente()
+            candidato = DataRepository(actual.base_dir, actual.datasets, actual.snapshot_dir)
+            version = candidato.version
+            if version == actual.version:
+                self._candidata, self._vistas = None, 0
+                return False
+
+            if version != self._candidata:
+                self._candidata, self._vistas = version, 0
+            self._vistas += 1
+            if self._vistas < self.confirmaciones:
+                return False
+
+            inicio = time.perf_counter()
+            # Fijado mientras se construye: un builder que llame a get_repository()
+            # (directamente o a través de otro derivado) ve el candidato, no la versión anterior
+            with usar_repositorio(candidato):
+                candidato.warm()
+                candidato.construir_derivados_de(actual)
+            if candidato.version != version:
+                # Los archivos cambiaron mientras se cargaban: se intenta en la siguiente revisión
+                self._candidata, self._vistas = None, 0
+                return False
+
+            anterior = reemplazar_repositorio(candidato)
+            self._candidata, self._vistas = None, 0
+            # Los oyentes trabajan con el repositorio nuevo aunque otro hilo publique otro
+            with usar_repositorio(candidato):
+                for oyente in self._oyentes:
+                    try:
+                        oyente(candidato, anterior)
+                    except Exception as e:
+                        print(f"Recarga de datos: fallo en {getattr(oyente, '__name__', oyente)}: {e}")
+
+            self.recargas.append({
+                'desde': anterior.version,
+                'hacia': version,
+                'segundos': round(time.perf_counter() - inicio, 3),
+                'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+            return True
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                if self.revisar():
+                    print(f"Datos recargados: versión {self.recargas[-1]['hacia']}")
+            except Exception as e:
+                print(f"Recarga de datos: no se pudo revisar la versión: {e}")
+
+    def iniciar(self):
+        """Iniciar el hilo de revisión (no hace nada si el intervalo es 0)"""
+        if self.intervalo > 0 and (self._hilo is None or not self._hilo.is_alive()):
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._bucle, name='recarga-datos', daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        """Detener el hilo de revisión"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def estado(self):
+        """Versión vigente, candidata pendiente y recargas realizadas"""
+        return {
+            'version': repositorio_vigente().version,
+            'intervalo_segundos': self.intervalo,
+            'activo': self._hilo is not None and self._hilo.is_alive(),
+            'candidata': self._candidata,
+            'recargas': list(self.recargas),
+        }
+
+
+# Instancia compartida por el proceso
+recarga_datos = RecargaDatos()
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    # Simulación sobre una copia de los datos: un callback fijado al
+    # repositorio original sigue viéndolo completo mientras se publica el nuevo
+    with tempfile.TemporaryDirectory() as base:
+        for carpeta in ('Datos', 'Datos_procesados'):
+            shutil.copytree(carpeta, os.path.join(base, carpeta))
+        original = DataRepository(base, snapshot_dir=os.path.join(base, 'Datos_cache')).warm()
+        reemplazar_repositorio(original)
+        print(f"Versión inicial: {original.version}")
+
+        recarga = RecargaDatos(intervalo=0)
+        recarga.al_recargar(lambda nuevo, anterior: print(f"  oyente: {anterior.version} -> {nuevo.version}"))
+
+        ranking = os.path.join(base, 'Datos', 'RankingTIOBE2025.csv')
+        with open(ranking, encoding='utf-8') as f:
+            lineas = f.readlines()
+        with open(ranking, 'a', encoding='utf-8') as f:
+            f.write(lineas[-1])
+
+        with usar_repositorio() as fijado:
+            print(f"Primera revisión (sin confirmar): {recarga.revisar()}")
+            print(f"Segunda revisión: {recarga.revisar()}")
+            filas = len(fijado.get('ranking_tiobe'))
+            print(f"Callback en curso: versión {fijado.version}, {filas} filas de ranking")
+        nuevo = get_repository()
+        print(f"Callback siguiente: versión {nuevo.version}, {len(nuevo.get('ranking_tiobe'))} filas de ranking")
+        print(f"Recarga en {recarga.recargas[-1]['segundos']} s")
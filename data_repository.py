@@ -0,0 +1,304 @@
+# ===========================================
+# DataRepository - Datasets compartidos
+# ===========================================
+#
+# Un único punto de acceso a los datasets del proyecto. Cada dataset se carga
+# la primera vez que se pide (a través de los snapshots columnares), queda en
+# memoria una sola vez y se entrega como vista sin copia compartida entre el
+# dashboard (main.py) y el agente IA (ai_agent.py). La vista no protege los
+# datos: quien escribe en el lugar trabaja sobre una copia (vista_compartida).
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from build_pipeline import MANIFEST_PATH, leer_manifest
+from historial_trending import INDICE_TRENDING
+from snapshot_store import fuente_sha256, hash_archivo, load_csv
+
+# Catálogo de datasets: nombre -> CSV fuente y opciones de tipado ('lenguaje'
+# es la columna de la que sale el código canónico COLUMNA_CODIGO, ver lenguajes.py)
+DATASETS = {
+    # Datos originales (carpeta Datos)
+    'series_tiempo': {'path': 'Datos/Series_de_Tiempo.csv', 'parse_dates': ['Date'], 'lenguaje': 'Language'},
+    'ranking_tiobe': {'path': 'Datos/RankingTIOBE2025.csv', 'lenguaje': 'Language'},
+    'top_repositorios': {'path': 'Datos/TopRepositorios.csv', 'lenguaje': 'Language'},
+    'repos_por_lenguaje': {'path': 'Datos/TopReposXLenguajes.csv', 'lenguaje': 'Language'},
+    'madnight_original': {'path': 'Datos/MadnightPullRequests.csv', 'categories': ['Lenguaje'],
+                          'lenguaje': 'Lenguaje'},
+    # Datos procesados (carpeta Datos_procesados)
+    'estadisticas_github': {'path': 'Datos_procesados/Estadisticas_lenguajes.csv', 'lenguaje': 'Language'},
+    'pull_requests': {'path': 'Datos_procesados/MadnightPullRequests_cleaned.csv', 'lenguaje': 'Lenguaje'},
+    'distribucion_lenguajes': {'path': 'Datos_procesados/Distribucion_lenguajes.csv', 'lenguaje': 'Language'},
+    'promedio_estrellas': {'path': 'Datos_procesados/Promedio_estrellas_top10.csv', 'lenguaje': 'Language'},
+    'rating_promedio': {'path': 'Datos_procesados/Rating_promedio.csv', 'lenguaje': 'Language'},
+    'repos_lenguaje_clean': {'path': 'Datos_procesados/Repos_por_lenguaje_clean.csv', 'lenguaje': 'Language'},
+    'top_repos_clean': {'path': 'Datos_procesados/Top_repos_clean.csv', 'lenguaje': 'Language'},
+    'eventos': {'path': 'Datos_procesados/Eventos_detectados.csv', 'parse_dates': ['Fecha'], 'lenguaje': 'Lenguaje'},
+}
+
+
+def vista_compartida(df):
+    """
+    Vista sin copia de datos de un frame compartido: cada dataset existe una
+    sola vez en memoria. Agregar o reemplazar columnas (df['x'] = ..., assign)
+    solo cambia la vista, pero nada impide las escrituras en el lugar
+    (loc/iloc/at, inplace=True): esas llegan al frame compartido y las ven
+    todos los callbacks e hilos, así que quien las necesite trabaja sobre una
+    copia (df.copy()).
+    """
+    return df.copy(deep=False)
+
+
+class DataRepository:
+    """
+    Repositorio perezoso de datasets.
+
+    Los datasets se cargan bajo demanda y una sola vez por repositorio, y se
+    entregan como vistas compartidas sin copia (ver vista_compartida). Las
+    estructuras derivadas (filtros, matrices, índices) también se calculan una
+    vez y quedan asociadas al repositorio, de modo que una nueva versión de
+    los datos corresponde simplemente a un nuevo repositorio.
+    """
+
+    def __init__(self, base_dir='.', datasets=None, snapshot_dir=None):
+        """
+        Args:
+            base_dir: Carpeta raíz del proyecto (donde están Datos/ y Datos_procesados/)
+            datasets: Catálogo de datasets (por defecto DATASETS)
+            snapshot_dir: Carpeta de snapshots columnares
+        """
+        self.base_dir = base_dir
+        self.datasets = datasets or DATASETS
+        self.snapshot_dir = snapshot_dir
+        self._frames = {}
+        self._derivados = {}
+        self._builders = {}
+        self._estadisticas = {}
+        self._version = None
+        self._lock = threading.RLock()
+
+    def _ruta(self, nombre):
+        if nombre not in self.datasets:
+            raise KeyError(f"Dataset desconocido: {nombre}")
+        return os.path.join(self.base_dir, self.datasets[nombre]['path'])
+
+    def get(self, nombre):
+        """
+        Obtener un dataset como vista del DataFrame compartido.
+
+        Args:
+            nombre: Nombre del dataset (ver DATASETS)
+
+        Returns:
+            Vista sin copia; no escribir en el lugar (ver vista_compartida)
+        """
+        frame = self._frames.get(nombre)
+        if frame is not None:
+            return vista_compartida(frame)
+
+        with self._lock:
+            if nombre in self._frames:
+                return vista_compartida(self._frames[nombre])
+
+            spec = self.datasets.get(nombre, {})
+            inicio = time.perf_counter()
+            frame = load_csv(
+                self._ruta(nombre),
+                parse_dates=spec.get('parse_dates', ()),
+                categories=spec.get('categories', ()),
+                snapshot_dir=self.snapshot_dir,
+                lenguaje=spec.get('lenguaje')
+            )
+            self._estadisticas[nombre] = {
+                'segundos': time.perf_counter() - inicio,
+                'bytes': int(frame.memory_usage(deep=True).sum()),
+            }
+            self._frames[nombre] = frame
+            return vista_compartida(frame)
+
+    __getitem__ = get
+
+    def derived(self, nombre, builder):
+        """
+        Obtener una estructura derivada, calculándola solo la primera vez.
+
+        Args:
+            nombre: Identificador de la estructura derivada
+            builder: Función que recibe el repositorio y construye la estructura
+
+        Returns:
+            La estructura derivada, compartida (los DataFrames se devuelven
+            como vistas, ver vista_compartida)
+        """
+        if nombre not in self._derivados:
+            self._construir_derivado(nombre, builder)
+            self._builders.setdefault(nombre, builder)
+
+        resultado = self._derivados[nombre]
+        if isinstance(resultado, pd.DataFrame):
+            return vista_compartida(resultado)
+        return resultado
+
+    def _construir_derivado(self, nombre, builder):
+        """Construir una estructura derivada una sola vez (con lock)"""
+        with self._lock:
+            if nombre not in self._derivados:
+                inicio = time.perf_counter()
+                resultado = builder(self)
+                self._estadisticas[nombre] = {
+                    'segundos': time.perf_counter() - inicio,
+                    'bytes': _tamano_bytes(resultado),
+                }
+                self._derivados[nombre] = resultado
+
+    @property
+    def version(self):
+        """
+        Identificador de la versión de los datos.
+
+        Es la versión del manifest de build_pipeline cuando todos los CSV del
+        catálogo coinciden con lo registrado ahí; los datasets que el manifest
+        no cubre (o que cambiaron desde la última construcción) y el índice del
+        historial de GitHub Trending se agregan con el hash de su contenido.
+        """
+        if self._version is None:
+            manifest = leer_manifest(os.path.join(self.base_dir, MANIFEST_PATH))
+            registrados = {}
+            if manifest is not None:
+                for nodo in manifest['nodos'].values():
+                    registrados.update(nodo['entradas'])
+                    registrados[nodo['salida']] = nodo['sha256']
+
+            extras = []
+            for nombre in sorted(self.datasets):
+                sha256 = fuente_sha256(self._ruta(nombre), self.snapshot_dir)
+                if registrados.get(self.datasets[nombre]['path']) != sha256:
+                    extras.append(f"{nombre}={sha256}")
+            indice_trending = os.path.join(self.base_dir, INDICE_TRENDING)
+            if os.path.exists(indice_trending):
+                extras.append(f"historial_trending={hash_archivo(indice_trending)}")
+
+            if manifest is not None and not extras:
+                self._version = manifest['version']
+            else:
+                sha = hashlib.sha256(manifest['version'].encode('utf-8') if manifest else b'')
+                for extra in extras:
+                    sha.update(extra.encode('utf-8'))
+                self._version = sha.hexdigest()[:16]
+        return self._version
+
+    def warm(self):
+        """Cargar todos los datasets del catálogo"""
+        for nombre in self.datasets:
+            self.get(nombre)
+        return self
+
+    def construir_derivados_de(self, otro):
+        """Construir las mismas estructuras derivadas que ya tiene otro repositorio"""
+        for nombre, builder in list(otro._builders.items()):
+            self.derived(nombre, builder)
+        return self
+
+    def report(self):
+        """
+        Reporte de carga por dataset.
+
+        Returns:
+            Lista de dicts con nombre, filas, tiempo de carga (ms) y memoria (KB)
+        """
+        filas = []
+        for nombre, stats in self._estadisticas.items():
+            frame = self._frames.get(nombre)
+            filas.append({
+                'dataset': nombre,
+                'tipo': 'dataset' if frame is not None else 'derivado',
+                'filas': len(frame) if frame is not None else None,
+                'carga_ms': round(stats['segundos'] * 1000, 2),
+                'memoria_kb': round(stats['bytes'] / 1024, 1),
+            })
+        return filas
+
+
+def _tamano_bytes(objeto):
+    """Estimar la memoria de una estructura derivada"""
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True).sum())
+    if isinstance(objeto, np.ndarray):
+        return int(objeto.nbytes)
+    nbytes = getattr(objeto, 'nbytes', None)
+    return int(nbytes) if nbytes is not None else 0
+
+
+# Repositorio compartido por el proceso. Una nueva versión de los datos se
+# publica reemplazando esta única referencia (ver reemplazar_repositorio).
+_repositorio = None
+_repositorio_lock = threading.Lock()
+
+# Repositorio fijado por hilo: mientras una petición está en curso ve siempre
+# el mismo repositorio, aunque otro hilo publique una versión nueva
+_fijado = threading.local()
+
+
+def get_repository():
+    """Obtener el repositorio de datos (el fijado en este hilo o el compartido)"""
+    fijado = getattr(_fijado, 'repositorio', None)
+    if fijado is not None:
+        return fijado
+    return repositorio_vigente()
+
+
+def repositorio_vigente():
+    """Obtener el repositorio compartido del proceso, ignorando el fijado por hilo"""
+    global _repositorio
+    if _repositorio is None:
+        with _repositorio_lock:
+            if _repositorio is None:
+                _repositorio = DataRepository()
+    return _repositorio
+
+
+def reemplazar_repositorio(nuevo):
+    """
+    Publicar un repositorio nuevo (ya cargado) como el compartido.
+
+    Returns:
+        El repositorio anterior
+    """
+    global _repositorio
+    with _repositorio_lock:
+        anterior, _repositorio = _repositorio, nuevo
+    return anterior
+
+
+def fijar_repositorio(repositorio=None):
+    """Fijar el repositorio del hilo actual (por defecto el compartido vigente)"""
+    liberar_repositorio()
+    _fijado.repositorio = repositorio or get_repository()
+
+
+def liberar_repositorio():
+    """Quitar el repositorio fijado del hilo actual"""
+    _fijado.repositorio = None
+
+
+@contextmanager
+def usar_repositorio(repositorio=None):
+    """Bloque en el que get_repository() devuelve siempre el mismo repositorio"""
+    anterior = getattr(_fijado, 'repositorio', None)
+    _fijado.repositorio = repositorio or anterior or get_repository()
+    try:
+        yield _fijado.repositorio
+    finally:
+        _fijado.repositorio = anterior
+
+
+if __name__ == "__main__":
+    repositorio = get_repository().warm()
+    print(f"Versión de datos: {repositorio.version}")
+    print(pd.DataFrame(repositorio.report()).to_string(index=False))
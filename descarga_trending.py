@@ -0,0 +1,479 @@
+# ===========================================
+# Descarga Trending - GitHub Trending en Python, concurrente y condicional
+# ===========================================
+#
+# Versión en Python de Scrapping/GitHubScraper.rb: mismas páginas (/trending y
+# /trending/<lenguaje>?since=daily para LENGUAJES_TRENDING) y mismos CSV
+# (Datos/TopRepositorios.csv y Datos/TopReposXLenguajes.csv), pero:
+#
+#   - Las 16 páginas se piden a la vez (asyncio) sobre un pool de conexiones
+#     HTTP/1.1 persistentes al mismo host, en vez de una conexión nueva por
+#     página y una página detrás de otra.
+#   - Cada página guarda su ETag y Last-Modified en Datos_cache/trending_http.json
+#     junto con las filas ya parseadas; la siguiente descarga manda
+#     If-None-Match / If-Modified-Since y una respuesta 304 reutiliza esas filas
+#     sin bajar ni parsear el HTML.
+#   - El HTML se parsea con html.parser de la biblioteca estándar, con los
+#     mismos selectores que el scraper de Ruby ('div[data-hpc] article.Box-row').
+#
+# Los CSV se escriben solo si todas las páginas respondieron y solo si cambió
+# su contenido. Después se reconstruye Datos_procesados (build_pipeline.py) y
+# el snapshot nuevo se agrega al historial (historial_trending.py).
+#
+# Uso:
+#   python descarga_trending.py                 # descargar, reconstruir y agregar al historial
+#   python descarga_trending.py --sin-pipeline  # solo descargar los CSV de Datos/
+#   python descarga_trending.py --benchmark     # secuencial vs concurrente contra Scrapping/fixtures en local
+
+import asyncio
+import csv
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from escritura_atomica import escribir_atomico
+
+BASE_URL = 'https://github.com'
+RUTA_TRENDING = '/trending'
+
+# Mismos lenguajes y en el mismo orden que LANGUAGES de GitHubScraper.rb
+LENGUAJES_TRENDING = ["python", "c", "cpp", "c%23", "java", "javascript", "assembly", "r", "perl", "fortran",
+                      "rust", "matlab", "php", "go", "kotlin"]
+
+ARCHIVO_TOP_REPOS = 'Datos/TopRepositorios.csv'
+ARCHIVO_TOP_LENGUAJES = 'Datos/TopReposXLenguajes.csv'
+ENCABEZADOS_TOP_REPOS = ["Repository", "User", "URL", "Language", "NumberOfStar", "NumberOfFork"]
+ENCABEZADOS_TOP_LENGUAJES = ["Language", "Repository", "User", "URL", "NumberOfStar", "NumberOfFork"]
+
+# ETag, Last-Modified y filas parseadas de cada página
+CACHE_HTTP = 'Datos_cache/trending_http.json'
+FORMATO_CACHE = 1
+
+# Conexiones persistentes simultáneas al host
+CONEXIONES = int(os.environ.get('CODETRENDS_TRENDING_CONEXIONES', '4'))
+
+# HTML guardado de cada página (gzip, como lo sirve GitHub) y CSV esperados (pruebas y --benchmark)
+FIXTURES_DIR = 'Scrapping/fixtures'
+
+USER_AGENT = 'CodeTrends-Dashboard/1.0 (+https://github.com/aszurita/Proyecto_G12_Final)'
+
+
+def rutas_trending():
+    """Rutas en el orden de los CSV: /trending y luego cada lenguaje"""
+    return [RUTA_TRENDING] + [f"{RUTA_TRENDING}/{lenguaje}?since=daily" for lenguaje in LENGUAJES_TRENDING]
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+class ParserTrending(HTMLParser):
+    """
+    Repositorios de una página de GitHub Trending.
+
+    Equivale a los selectores de GitHubScraper.rb: cada 'article.Box-row'
+    dentro de un 'div[data-hpc]'; usuario y repositorio del texto del enlace
+    del h2; lenguaje, estrellas y forks del último div del artículo (su span
+    itemprop="programmingLanguage" y sus dos primeros enlaces).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.repos = []
+        self._divs = 0            # divs abiertos
+        self._div_hpc = None      # nivel del div[data-hpc] abierto
+        self._articulo = None     # repositorio en curso
+        self._caracteristicas = None
+        self._texto = None        # destino del texto que se está leyendo
+        self._cierre = None       # etiqueta que termina ese texto
+
+    def handle_starttag(self, tag, attrs):
+        atributos = dict(attrs)
+        if tag == 'div':
+            self._divs += 1
+            if self._div_hpc is None and 'data-hpc' in atributos:
+                self._div_hpc = self._divs
+            elif self._articulo is not None:
+                # El último div del artículo es el que queda al final
+                self._caracteristicas = {'lenguaje': None, 'enlaces': [], 'nivel': self._divs}
+        elif tag == 'article' and self._div_hpc is not None and 'Box-row' in (atributos.get('class') or '').split():
+            self._articulo = {'h2': False, 'href': None, 'titulo': []}
+            self._caracteristicas = None
+        elif self._articulo is None:
+            return
+        elif tag == 'h2':
+            self._articulo['h2'] = True
+        elif tag == 'a' and self._articulo['h2'] and self._articulo['href'] is None:
+            self._articulo['href'] = atributos.get('href', '')
+            self._texto, self._cierre = self._articulo['titulo'], 'a'
+        elif self._caracteristicas is not None and self._divs >= self._caracteristicas['nivel']:
+            if tag == 'a':
+                self._texto, self._cierre = [], 'a'
+                self._caracteristicas['enlaces'].append(self._texto)
+            elif tag == 'span' and atributos.get('itemprop') == 'programmingLanguage':
+                self._texto, self._cierre = [], 'span'
+                self._caracteristicas['lenguaje'] = self._texto
+
+    def handle_endtag(self, tag):
+        if tag == 'div':
+            if self._caracteristicas is not None and self._divs == self._caracteristicas['nivel']:
+                self._caracteristicas['nivel'] = float('inf')  # cerrado: ya no recibe enlaces
+            if self._div_hpc == self._divs:
+                self._div_hpc = None
+            self._divs -= 1
+        elif tag == self._cierre:
+            self._texto = self._cierre = None
+        elif tag == 'h2' and self._articulo is not None:
+            self._articulo['h2'] = False
+        elif tag == 'article' and self._articulo is not None:
+            self._cerrar_articulo()
+
+    def handle_data(self, data):
+        if self._texto is not None:
+            self._texto.append(data)
+
+    def _cerrar_articulo(self):
+        articulo, caracteristicas = self._articulo, self._caracteristicas or {'lenguaje': None, 'enlaces': []}
+        self._articulo = self._caracteristicas = self._texto = self._cierre = None
+        titulo = ''.join(articulo['titulo']).split()
+        enlaces = [''.join(texto).strip() for texto in caracteristicas['enlaces']]
+        if not titulo or len(enlaces) < 2:
+            return
+        lenguaje = ''.join(caracteristicas['lenguaje']).strip() if caracteristicas['lenguaje'] is not None else ''
+        self.repos.append({
+            'url': f"{BASE_URL}{articulo['href']}",
+            'nombre_repo': titulo[-1],
+            'nombre_user': titulo[0],
+            'lenguaje': lenguaje or 'n/a',
+            'estrellas': enlaces[0],
+            'forks': enlaces[1],
+        })
+
+
+def parsear_trending(html):
+    """Lista de repositorios (dicts) de una página de GitHub Trending"""
+    parser = ParserTrending()
+    parser.feed(html)
+    parser.close()
+    return parser.repos
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+class PoolHTTP:
+    """
+    Conexiones HTTP/1.1 persistentes a un host, compartidas entre hilos.
+
+    Cada petición toma una conexión libre (o abre una nueva si todavía no hay
+    `tamano`), y la devuelve al terminar si el servidor no pidió cerrarla.
+    """
+
+    def __init__(self, base_url=BASE_URL, tamano=CONEXIONES, timeout=30):
+        partes = urlsplit(base_url)
+        self._clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self._host, self._puerto = partes.hostname, partes.port
+        self._timeout = timeout
+        self._libres = queue.LifoQueue()
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._bloqueo = threading.Lock()
+        self.abiertas = 0
+
+    def _tomar(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            with self._bloqueo:
+                self.abiertas += 1
+            return self._clase(self._host, self._puerto, timeout=self._timeout)
+
+    def get(self, ruta, cabeceras):
+        """
+        GET sobre una conexión del pool.
+
+        Returns:
+            (status, cabeceras de la respuesta, cuerpo en bytes)
+        """
+        with self._cupos:
+            conexion = self._tomar()
+            try:
+                try:
+                    conexion.request('GET', ruta, headers=cabeceras)
+                    respuesta = conexion.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # El servidor cerró la conexión mientras estaba libre: un reintento sobre una nueva
+                    conexion.close()
+                    conexion.request('GET', ruta, headers=cabeceras)
+                    respuesta = conexion.getresponse()
+                cuerpo = respuesta.read()
+            except BaseException:
+                conexion.close()
+                raise
+            if respuesta.will_close:
+                conexion.close()
+            else:
+                self._libres.put(conexion)
+            return respuesta.status, respuesta.headers, cuerpo
+
+    def cerrar(self):
+        while not self._libres.empty():
+            self._libres.get_nowait().close()
+
+
+def leer_cache(path):
+    """Cache HTTP de las páginas (vacía si no existe o es de otro formato)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = None
+    if cache is None or cache.get('formato') != FORMATO_CACHE:
+        return {'formato': FORMATO_CACHE, 'paginas': {}}
+    return cache
+
+
+def descargar_pagina(pool, ruta, paginas):
+    """
+    Repositorios de una página, con petición condicional si ya está en la cache.
+
+    Returns:
+        Dict con ruta, estado ('descargada' o 'sin cambios'), repos y ms
+    """
+    inicio = time.perf_counter()
+    anterior = paginas.get(ruta)
+    cabeceras = {'User-Agent': USER_AGENT, 'Accept': 'text/html', 'Accept-Encoding': 'gzip'}
+    if anterior is not None:
+        if anterior.get('etag'):
+            cabeceras['If-None-Match'] = anterior['etag']
+        if anterior.get('last_modified'):
+            cabeceras['If-Modified-Since'] = anterior['last_modified']
+
+    status, respuesta, cuerpo = pool.get(ruta, cabeceras)
+    if status == 304 and anterior is not None:
+        repos, estado = anterior['repos'], 'sin cambios'
+    elif status == 200:
+        if respuesta.get('Content-Encoding') == 'gzip':
+            cuerpo = gzip.decompress(cuerpo)
+        html = cuerpo.decode(respuesta.get_content_charset() or 'utf-8', 'replace')
+        repos, estado = parsear_trending(html), 'descargada'
+        paginas[ruta] = {'etag': respuesta.get('ETag'), 'last_modified': respuesta.get('Last-Modified'), 'repos': repos}
+    else:
+        raise RuntimeError(f"{ruta}: HTTP {status}")
+    return {'ruta': ruta, 'estado': estado, 'repos': repos, 'ms': (time.perf_counter() - inicio) * 1000}
+
+
+async def descargar_paginas(pool, rutas, paginas):
+    """Todas las páginas a la vez (los cupos del pool limitan las simultáneas), en el orden de rutas"""
+    return await asyncio.gather(*(asyncio.to_thread(descargar_pagina, pool, ruta, paginas) for ruta in rutas))
+
+
+def csv_trending(encabezados, filas):
+    """Contenido de un CSV con el formato de GitHubScraper.rb (comillas solo si hacen falta, '\\n')"""
+    salida = io.StringIO()
+    escritor = csv.writer(salida, lineterminator='\n')
+    escritor.writerow(encabezados)
+    escritor.writerows(filas)
+    return salida.getvalue().encode('utf-8')
+
+
+def _escribir_si_cambia(path, contenido):
+    """Reemplazar un archivo solo si cambia su contenido (no se toca su fecha de captura)"""
+    try:
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(contenido).digest():
+                return False
+    except OSError:
+        pass
+    escribir_atomico(path, lambda f: f.write(contenido))
+    return True
+
+
+def descargar(base_url=BASE_URL, base_dir='.', conexiones=CONEXIONES, cache_path=CACHE_HTTP):
+    """
+    Descargar GitHub Trending y escribir los CSV de Datos/.
+
+    Args:
+        base_url: Host de GitHub (otro para los fixtures)
+        base_dir: Raíz del proyecto
+        conexiones: Conexiones persistentes simultáneas
+        cache_path: Cache HTTP, relativa a base_dir
+
+    Returns:
+        (reporte por página, archivos reescritos, conexiones abiertas)
+    """
+    cache_path = os.path.join(base_dir, cache_path)
+    cache = leer_cache(cache_path)
+    pool = PoolHTTP(base_url, conexiones)
+    try:
+        reporte = asyncio.run(descargar_paginas(pool, rutas_trending(), cache['paginas']))
+    finally:
+        pool.cerrar()
+
+    top, por_lenguaje = reporte[0]['repos'], [repo for pagina in reporte[1:] for repo in pagina['repos']]
+    archivos = {
+        ARCHIVO_TOP_REPOS: csv_trending(ENCABEZADOS_TOP_REPOS, [
+            [r['nombre_repo'], r['nombre_user'], r['url'], r['lenguaje'], r['estrellas'], r['forks']] for r in top]),
+        ARCHIVO_TOP_LENGUAJES: csv_trending(ENCABEZADOS_TOP_LENGUAJES, [
+            [r['lenguaje'], r['nombre_repo'], r['nombre_user'], r['url'], r['estrellas'], r['forks']]
+            for r in por_lenguaje]),
+    }
+    escritos = [archivo for archivo, contenido in archivos.items()
+                if _escribir_si_cambia(os.path.join(base_dir, archivo), contenido)]
+    if any(pagina['estado'] == 'descargada' for pagina in reporte):
+        escribir_atomico(cache_path, lambda f: f.write(json.dumps(cache, ensure_ascii=False).encode('utf-8')))
+    return reporte, escritos, pool.abiertas
+
+
+# ============================================================================
+# SERVIDOR DE FIXTURES (pruebas y --benchmark)
+# ============================================================================
+
+def archivo_fixture(ruta):
+    """Archivo de Scrapping/fixtures de una ruta ('/trending/c%23?since=daily' -> 'trending_c%23.html.gz')"""
+    partes = urlsplit(ruta).path.strip('/').split('/')
+    return '_'.join(partes) + '.html.gz'
+
+
+def servidor_fixtures(directorio, latencia=0.0):
+    """
+    Servidor HTTP/1.1 local que responde las rutas de trending con los HTML
+    guardados, con ETag/Last-Modified, 304 y gzip como GitHub.
+
+    Returns:
+        (servidor, contadores) con contadores['conexiones'], ['200'] y ['304'];
+        servidor.contenidos permite reemplazar el HTML de una ruta
+    """
+    from email.utils import formatdate, parsedate_to_datetime
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    contadores = {'conexiones': 0, '200': 0, '304': 0}
+    bloqueo = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            with bloqueo:
+                contadores['conexiones'] += 1
+
+        def do_GET(self):
+            time.sleep(latencia)
+            nombre = archivo_fixture(self.path)
+            contenido = servidor.contenidos.get(nombre)
+            if contenido is None:
+                path = os.path.join(directorio, nombre)
+                if not os.path.exists(path):
+                    self.send_error(404)
+                    return
+                with gzip.open(path, 'rb') as f:
+                    contenido = f.read()
+            etag = f'"{hashlib.sha256(contenido).hexdigest()[:16]}"'
+            modificado = servidor.modificado.get(nombre, 0)
+            if self.headers.get('If-None-Match') == etag or (
+                    'If-None-Match' not in self.headers and self.headers.get('If-Modified-Since')
+                    and parsedate_to_datetime(self.headers['If-Modified-Since']).timestamp() >= modificado):
+                with bloqueo:
+                    contadores['304'] += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            with bloqueo:
+                contadores['200'] += 1
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                contenido = gzip.compress(contenido)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(contenido)))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', formatdate(modificado, usegmt=True))
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Manejador)
+    servidor.daemon_threads = True
+    servidor.contenidos, servidor.modificado = {}, {}
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, contadores
+
+
+if __name__ == "__main__":
+    import argparse
+    import shutil
+    import urllib.request
+
+    parser = argparse.ArgumentParser(description="Descargar GitHub Trending a Datos/")
+    parser.add_argument('--conexiones', type=int, default=CONEXIONES, help="Conexiones persistentes simultáneas")
+    parser.add_argument('--sin-pipeline', action='store_true', help="No reconstruir Datos_procesados ni el historial")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Medir la descarga de los fixtures desde un servidor local")
+    parser.add_argument('--latencia', type=float, default=50, help="Latencia simulada del servidor local (ms)")
+    args = parser.parse_args()
+
+    def imprimir(reporte, escritos, abiertas):
+        for pagina in reporte:
+            print(f"  {pagina['ruta']:<36} {pagina['estado']:<12} {len(pagina['repos']):>3} repos "
+                  f"{pagina['ms']:>8.1f} ms")
+        print(f"  {abiertas} conexiones; CSV reescritos: {', '.join(escritos) or 'ninguno'}")
+
+    if not args.benchmark:
+        inicio = time.perf_counter()
+        imprimir(*descargar(conexiones=args.conexiones))
+        print(f"Descarga en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+        if not args.sin_pipeline:
+            from build_pipeline import construir
+            from historial_trending import ingerir
+
+            for fila in construir():
+                print(f"  {fila['nodo']:<24} {fila['estado']:<13} {fila['ms']:>8.1f} ms")
+            for fila in ingerir():
+                print(f"  historial {fila['tabla']:<14} {fila['estado']:<13} {fila['ms']:>8.1f} ms")
+    else:
+        # Benchmark contra los fixtures servidos en local con latencia simulada;
+        # que los CSV, los 304 y el pool sean correctos lo verifica
+        # tests/test_descarga_trending.py
+        servidor, _ = servidor_fixtures(FIXTURES_DIR, args.latencia / 1000)
+        base_url = f"http://127.0.0.1:{servidor.server_address[1]}"
+        base_dir = tempfile.mkdtemp(prefix='trending_')
+        try:
+            # Flujo del scraper de Ruby: una página detrás de otra, conexión nueva cada vez
+            inicio = time.perf_counter()
+            for ruta in rutas_trending():
+                with urllib.request.urlopen(base_url + ruta) as respuesta:
+                    parsear_trending(respuesta.read().decode('utf-8'))
+            secuencial = (time.perf_counter() - inicio) * 1000
+
+            inicio = time.perf_counter()
+            reporte, escritos, abiertas = descargar(base_url, base_dir, args.conexiones)
+            concurrente = (time.perf_counter() - inicio) * 1000
+            print(f"Primera descarga ({concurrente:.0f} ms):")
+            imprimir(reporte, escritos, abiertas)
+
+            inicio = time.perf_counter()
+            reporte, escritos, abiertas = descargar(base_url, base_dir, args.conexiones)
+            condicional = (time.perf_counter() - inicio) * 1000
+            print(f"Segunda descarga, sin cambios en el servidor ({condicional:.0f} ms):")
+            imprimir(reporte, escritos, abiertas)
+
+            print(f"\n{len(rutas_trending())} páginas con {args.latencia:.0f} ms de latencia: secuencial "
+                  f"{secuencial:.0f} ms, concurrente con {args.conexiones} conexiones {concurrente:.0f} ms, "
+                  f"con 304 {condicional:.0f} ms")
+        finally:
+            servidor.shutdown()
+            shutil.rmtree(base_dir, ignore_errors=True)
@@ -0,0 +1,214 @@
+# ===========================================
+# Detección de Eventos - Cambios de nivel y anomalías en las series
+# ===========================================
+#
+# Recorre todas las series a la vez (matriz lenguaje x periodo) y marca dos
+# tipos de evento:
+#   - cambio_nivel: el promedio de las `ventana` observaciones siguientes se
+#     separa del de las `ventana` anteriores más de lo que explica el ruido
+#     de la serie (p. ej. el salto de Python en 2024 o la caída de C).
+#   - anomalia: una observación aislada que se aleja de sus dos vecinas en
+#     la misma dirección (un pico o un valle de un solo periodo).
+#
+# El ruido de cada serie es la dispersión robusta (MAD) de sus diferencias
+# entre periodos seguidos, descontando su deriva típica, así que un lenguaje
+# que sube o baja parejo no genera eventos. Es un nodo de build_pipeline.py:
+# los eventos se calculan al reconstruir Datos_procesados y quedan en
+# Eventos_detectados.csv (y en su snapshot); el dashboard solo los lee.
+#
+# Uso:
+#   python deteccion_eventos.py    # eventos de los datos actuales y benchmark con 50 lenguajes x 25 años
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Parámetros por fuente: observaciones por lado para el cambio de nivel,
+# puntuaciones mínimas y cambios mínimos en puntos porcentuales
+PARAMETROS = {
+    'tiobe': {'ventana': 6, 'umbral_nivel': 2.0, 'minimo_nivel': 1.0,
+              'umbral_anomalia': 3.0, 'minimo_anomalia': 0.3},
+    'pull_requests': {'ventana': 2, 'umbral_nivel': 2.0, 'minimo_nivel': 0.5,
+                      'umbral_anomalia': 3.0, 'minimo_anomalia': 0.3},
+}
+
+COLUMNAS = ['Fuente', 'Lenguaje', 'Fecha', 'Periodo', 'Tipo', 'Valor', 'Referencia', 'Nivel', 'Puntuacion']
+
+
+def matriz_series(df, columna_serie, columna_fecha, columna_valor):
+    """
+    Pasar un DataFrame largo a matriz (series, fechas) con NaN donde no hay dato.
+
+    Returns:
+        Tupla (nombres, fechas ordenadas, matriz)
+    """
+    i_serie, nombres = pd.factorize(df[columna_serie], sort=True)
+    fechas, i_fecha = np.unique(df[columna_fecha].to_numpy(dtype='datetime64[ns]'), return_inverse=True)
+    valores = np.full((len(nombres), len(fechas)), np.nan)
+    valores[i_serie, i_fecha] = df[columna_valor].to_numpy(dtype=float)
+    return np.asarray(nombres, dtype=object), fechas, valores
+
+
+def escala_ruido(valores):
+    """
+    Desviación robusta de las diferencias entre periodos seguidos de cada
+    serie, sin su deriva (mediana de las diferencias).
+
+    Returns:
+        Tupla (escala, deriva), cada una (series,); NaN con menos de dos diferencias
+    """
+    diferencias = np.diff(valores, axis=1)
+    # nanmedian avisa en las filas sin diferencias (quedan en NaN)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        deriva = np.nanmedian(diferencias, axis=1)
+        escala = 1.4826 * np.nanmedian(np.abs(diferencias - deriva[:, None]), axis=1)
+    return np.where(escala > 0, escala, np.nan), deriva
+
+
+def cambios_de_nivel(valores, ventana, umbral, minimo):
+    """
+    Cambios de nivel de todas las series.
+
+    La puntuación es la diferencia de promedios (sin la deriva esperada en
+    `ventana` periodos) dividida por su desviación bajo un paseo aleatorio con
+    el ruido de la serie, sigma * sqrt(2 ventana / 3). De cada grupo de
+    posiciones seguidas solo queda la de mayor puntuación.
+
+    Returns:
+        Tupla (serie, columna del primer periodo del nuevo nivel, nivel previo,
+        nivel nuevo, puntuación), arrays alineados
+    """
+    filas, periodos = valores.shape
+    if periodos < 2 * ventana:
+        vacio = np.array([], dtype=np.int64)
+        return vacio, vacio, np.array([]), np.array([]), np.array([])
+
+    # Sumas prefijas sin NaN: una ventana con huecos no se evalúa
+    con_dato = ~np.isnan(valores)
+    ceros = np.zeros((filas, 1))
+    suma = np.hstack([ceros, np.cumsum(np.where(con_dato, valores, 0.0), axis=1)])
+    conteo = np.hstack([ceros, np.cumsum(con_dato, axis=1)])
+    corte = np.arange(ventana, periodos - ventana + 1)
+    completas = ((conteo[:, corte] - conteo[:, corte - ventana]) == ventana) & \
+                ((conteo[:, corte + ventana] - conteo[:, corte]) == ventana)
+    antes = (suma[:, corte] - suma[:, corte - ventana]) / ventana
+    despues = (suma[:, corte + ventana] - suma[:, corte]) / ventana
+
+    escala, deriva = escala_ruido(valores)
+    with np.errstate(invalid='ignore'):
+        puntuacion = (despues - antes - deriva[:, None] * ventana) / (escala[:, None] * np.sqrt(2 * ventana / 3))
+    magnitud = np.where(completas, np.abs(np.nan_to_num(puntuacion)), 0.0)
+
+    # Supresión de no máximos: cada cambio es el máximo de su vecindario
+    vecindario = np.pad(magnitud, ((0, 0), (ventana, ventana)), constant_values=-np.inf)
+    maximo = sliding_window_view(vecindario, 2 * ventana + 1, axis=1).max(axis=2)
+    elegidos = (magnitud >= umbral) & (magnitud == maximo) & (np.abs(despues - antes) >= minimo)
+    serie, k = np.nonzero(elegidos)
+    return serie, corte[k], antes[serie, k], despues[serie, k], puntuacion[serie, k]
+
+
+def anomalias(valores, umbral, minimo):
+    """
+    Picos y valles de un solo periodo en todas las series.
+
+    La puntuación compara la observación con el promedio de sus dos vecinas,
+    en unidades de la desviación de esa diferencia bajo el ruido de la serie
+    (sigma / sqrt(2)).
+
+    Returns:
+        Tupla (serie, columna, valor esperado, puntuación), arrays alineados
+    """
+    esperado = np.full(valores.shape, np.nan)
+    esperado[:, 1:-1] = (valores[:, :-2] + valores[:, 2:]) / 2
+    residuo = valores - esperado
+    escala, _ = escala_ruido(valores)
+    with np.errstate(invalid='ignore'):
+        puntuacion = residuo / (escala[:, None] / np.sqrt(2))
+        # Pico o valle: las dos vecinas quedan del mismo lado
+        extremo = np.zeros(valores.shape, dtype=bool)
+        extremo[:, 1:-1] = np.sign(valores[:, 1:-1] - valores[:, :-2]) == np.sign(valores[:, 1:-1] - valores[:, 2:])
+        elegidos = (np.abs(puntuacion) >= umbral) & (np.abs(residuo) >= minimo) & extremo
+    serie, columna = np.nonzero(elegidos)
+    return serie, columna, esperado[serie, columna], puntuacion[serie, columna]
+
+
+def eventos_de_matriz(fuente, nombres, fechas, valores, etiquetas, parametros):
+    """
+    Eventos de una matriz como filas del CSV de eventos.
+
+    Args:
+        etiquetas: Texto del periodo de cada columna ('2024-09', '2022-Q3')
+    """
+    filas = []
+    serie, columna, antes, despues, puntuacion = cambios_de_nivel(
+        valores, parametros['ventana'], parametros['umbral_nivel'], parametros['minimo_nivel'])
+    filas += [
+        (fuente, nombres[s], fechas[c], etiquetas[c], 'cambio_nivel', valores[s, c], a, d, p)
+        for s, c, a, d, p in zip(serie, columna, antes, despues, puntuacion)
+    ]
+    serie, columna, esperado, puntuacion = anomalias(
+        valores, parametros['umbral_anomalia'], parametros['minimo_anomalia'])
+    filas += [
+        (fuente, nombres[s], fechas[c], etiquetas[c], 'anomalia', valores[s, c], e, np.nan, p)
+        for s, c, e, p in zip(serie, columna, esperado, puntuacion)
+    ]
+    return filas
+
+
+def detectar_eventos(df_series, df_prs):
+    """
+    Eventos de las series TIOBE (mensuales) y de Pull Requests (trimestrales).
+
+    Args:
+        df_series: Series_de_Tiempo (Language, Date, Rating)
+        df_prs: MadnightPullRequests limpio (Año, Quarter, Lenguaje, Porcentaje)
+
+    Returns:
+        DataFrame con COLUMNAS, ordenado por fuente, fecha y lenguaje
+    """
+    filas = []
+    series = df_series.assign(Date=pd.to_datetime(df_series['Date']))
+    nombres, fechas, valores = matriz_series(series, 'Language', 'Date', 'Rating')
+    etiquetas = [str(f)[:7] for f in fechas.astype('datetime64[M]')]
+    filas += eventos_de_matriz('tiobe', nombres, fechas, valores, etiquetas, PARAMETROS['tiobe'])
+
+    prs = df_prs.assign(Fecha=pd.to_datetime(pd.DataFrame(
+        {'year': df_prs['Año'], 'month': 3 * df_prs['Quarter'] - 2, 'day': 1})))
+    nombres, fechas, valores = matriz_series(prs, 'Lenguaje', 'Fecha', 'Porcentaje')
+    trimestres = pd.DatetimeIndex(fechas)
+    etiquetas = [f'{a}-Q{q}' for a, q in zip(trimestres.year, trimestres.quarter)]
+    filas += eventos_de_matriz('pull_requests', nombres, fechas, valores, etiquetas, PARAMETROS['pull_requests'])
+
+    eventos = pd.DataFrame(filas, columns=COLUMNAS)
+    eventos['Fecha'] = pd.to_datetime(eventos['Fecha']).dt.strftime('%Y-%m-%d')
+    for columna in ('Valor', 'Referencia', 'Nivel'):
+        eventos[columna] = eventos[columna].astype(float).round(4)
+    eventos['Puntuacion'] = eventos['Puntuacion'].astype(float).round(2)
+    return eventos.sort_values(['Fuente', 'Fecha', 'Lenguaje'], kind='stable').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import time
+
+    df_series = pd.read_csv('Datos/Series_de_Tiempo.csv')
+    df_prs = pd.read_csv('Datos_procesados/MadnightPullRequests_cleaned.csv')
+    eventos = detectar_eventos(df_series, df_prs)
+    with pd.option_context('display.width', 140, 'display.max_rows', 100):
+        print(eventos.to_string(index=False))
+
+    # Benchmark: 50 lenguajes, 25 años de observaciones mensuales
+    rng = np.random.default_rng(2)
+    fechas = pd.date_range('2001-01-01', '2025-12-01', freq='MS')
+    valores = np.clip(np.cumsum(rng.normal(0, 0.3, (50, len(fechas))), axis=1) + rng.uniform(1, 15, (50, 1)), 0.1, None)
+    sinteticas = pd.DataFrame({
+        'Language': np.repeat([f'Lenguaje{i:02d}' for i in range(50)], len(fechas)),
+        'Date': np.tile(fechas, 50),
+        'Rating': valores.ravel(),
+    })
+    inicio = time.perf_counter()
+    grandes = detectar_eventos(sinteticas, df_prs)
+    duracion = (time.perf_counter() - inicio) * 1000
+    print(f"\n50 lenguajes x {len(fechas)} meses + Pull Requests: {len(grandes)} eventos en {duracion:.1f} ms")
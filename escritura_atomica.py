@@ -0,0 +1,62 @@
+# ===========================================
+# Escritura atómica - Temporal + reemplazo
+# ===========================================
+#
+# Los CSV procesados, el manifest, los snapshots, el historial y las páginas
+# descargadas se escriben primero en un temporal de la misma carpeta y se
+# reemplazan con os.replace: quien los lee (el dashboard, la recarga de
+# datos) ve el archivo anterior o el nuevo, nunca uno a medias.
+#
+# mkstemp crea el temporal con permisos 0600 y os.replace los conserva; antes
+# de reemplazar se aplican los permisos de un archivo normal (0666 menos la
+# umask del proceso). Solo usa la librería estándar.
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def _leer_umask():
+    # os.umask solo se puede leer cambiándola: se hace una vez al importar,
+    # antes de que haya hilos creando archivos
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+PERMISOS_ARCHIVO = 0o666 & ~_leer_umask()
+
+
+@contextmanager
+def archivo_atomico(path):
+    """
+    Ruta temporal junto a path; al salir sin errores reemplaza path, y si hay
+    una excepción borra el temporal.
+
+    Uso:
+        with archivo_atomico('Datos_procesados/x.csv') as tmp_path:
+            df.to_csv(tmp_path, index=False)
+    """
+    directorio = os.path.dirname(path) or '.'
+    os.makedirs(directorio, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, PERMISOS_ARCHIVO)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def escribir_atomico(path, escribir):
+    """
+    Args:
+        path: Archivo de destino
+        escribir: Función que recibe el archivo temporal abierto en modo 'wb'
+    """
+    with archivo_atomico(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            escribir(f)
@@ -0,0 +1,340 @@
+# ===========================================
+# Figure Cache - Memoización de figuras Plotly
+# ===========================================
+#
+# Las figuras del dashboard dependen solo de sus argumentos (años, lenguaje
+# seleccionado, top N...) y de la versión de los datos. Este módulo las
+# memoiza con la clave (función, argumentos normalizados, versión de datos)
+# en dos niveles:
+#   1. Memoria del proceso: LRU con presupuesto de bytes.
+#   2. Disco (SQLite): compartido entre procesos/workers, también LRU con
+#      presupuesto de bytes. Se desactiva con CODETRENDS_FIGURE_CACHE_PATH=''.
+
+import atexit
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+from data_repository import get_repository, usar_repositorio
+from snapshot_store import SNAPSHOT_DIR
+
+MEGABYTE = 1024 * 1024
+
+# Configuración (variables de entorno)
+MEMORIA_MAX_BYTES = int(float(os.getenv('CODETRENDS_FIGURE_CACHE_MB', '64')) * MEGABYTE)
+DISCO_MAX_BYTES = int(float(os.getenv('CODETRENDS_FIGURE_CACHE_DISK_MB', '256')) * MEGABYTE)
+DISCO_PATH = os.getenv('CODETRENDS_FIGURE_CACHE_PATH', os.path.join(SNAPSHOT_DIR, 'figuras.sqlite'))
+# Cada cuánto, como máximo, una lectura del disco vuelca los accesos acumulados
+DISCO_VOLCADO_SEGUNDOS = float(os.getenv('CODETRENDS_FIGURE_CACHE_FLUSH_S', '30'))
+
+
+class _DiscoSQLite:
+    """
+    Nivel compartido en disco: una tabla SQLite con LRU por último acceso.
+
+    Las lecturas no escriben (no toman el lock de escritura de SQLite): los
+    aciertos/fallos y el último acceso de cada figura se acumulan en memoria
+    y se vuelcan en la transacción del siguiente put, antes de expulsar, o
+    cada DISCO_VOLCADO_SEGUNDOS si el proceso solo lee (y al terminar).
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pendientes = {'hits': 0, 'misses': 0}
+        self._accesos = {}  # clave -> último acceso todavía no escrito
+        self._ultimo_volcado = time.monotonic()
+        atexit.register(self.volcar)
+
+    def _conexion(self):
+        # Una conexión por hilo y por proceso (las conexiones no sobreviven a un fork)
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conexion = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            conexion.execute(
+                'CREATE TABLE IF NOT EXISTS figuras ('
+                ' clave TEXT PRIMARY KEY, version TEXT, datos BLOB,'
+                ' bytes INTEGER, ultimo_acceso REAL)'
+            )
+            conexion.execute(
+                'CREATE TABLE IF NOT EXISTS contadores (nombre TEXT PRIMARY KEY, valor INTEGER)'
+            )
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+    def _contar(self, conexion, nombre, cantidad=1):
+        conexion.execute(
+            'INSERT INTO contadores VALUES (?, ?) '
+            'ON CONFLICT(nombre) DO UPDATE SET valor = valor + excluded.valor', (nombre, cantidad)
+        )
+
+    def _volcar(self, conexion):
+        """Escribir los contadores y accesos acumulados (dentro de una transacción)"""
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, dict.fromkeys(self._pendientes, 0)
+            accesos, self._accesos = self._accesos, {}
+        conexion.executemany(
+            'UPDATE figuras SET ultimo_acceso = MAX(ultimo_acceso, ?) WHERE clave = ?',
+            [(momento, clave) for clave, momento in accesos.items()]
+        )
+        for nombre, cantidad in pendientes.items():
+            if cantidad:
+                self._contar(conexion, nombre, cantidad)
+
+    def volcar(self):
+        """Escribir ya los contadores y accesos acumulados"""
+        with self._lock:
+            if not self._accesos and not any(self._pendientes.values()):
+                return
+        try:
+            conexion = self._conexion()
+            with conexion:
+                self._volcar(conexion)
+        except (sqlite3.Error, OSError):
+            pass
+
+    def get(self, clave):
+        fila = self._conexion().execute('SELECT datos FROM figuras WHERE clave = ?', (clave,)).fetchone()
+        with self._lock:
+            self._pendientes['hits' if fila is not None else 'misses'] += 1
+            if fila is not None:
+                self._accesos[clave] = time.time()
+            volcar = time.monotonic() - self._ultimo_volcado >= DISCO_VOLCADO_SEGUNDOS
+            if volcar:
+                self._ultimo_volcado = time.monotonic()
+        if volcar:
+            self.volcar()
+        return None if fila is None else fila[0].decode('utf-8')
+
+    def put(self, clave, version, datos):
+        if len(datos) > self.max_bytes:
+            return
+        conexion = self._conexion()
+        with conexion:
+            self._volcar(conexion)
+            conexion.execute(
+                'INSERT OR REPLACE INTO figuras VALUES (?, ?, ?, ?, ?)',
+                (clave, version, datos.encode('utf-8'), len(datos), time.time())
+            )
+            total = conexion.execute('SELECT COALESCE(SUM(bytes), 0) FROM figuras').fetchone()[0]
+            if total > self.max_bytes:
+                # Expulsar las figuras usadas hace más tiempo hasta volver al presupuesto
+                exceso = total - self.max_bytes
+                for clave_vieja, bytes_viejos in conexion.execute(
+                        'SELECT clave, bytes FROM figuras ORDER BY ultimo_acceso').fetchall():
+                    conexion.execute('DELETE FROM figuras WHERE clave = ?', (clave_vieja,))
+                    self._contar(conexion, 'expulsiones')
+                    exceso -= bytes_viejos
+                    if exceso <= 0:
+                        break
+
+    def invalidar(self, version_vigente):
+        conexion = self._conexion()
+        with conexion:
+            conexion.execute('DELETE FROM figuras WHERE version != ?', (version_vigente,))
+
+    def stats(self):
+        conexion = self._conexion()
+        contadores = dict(conexion.execute('SELECT nombre, valor FROM contadores').fetchall())
+        with self._lock:
+            for nombre, cantidad in self._pendientes.items():
+                contadores[nombre] = contadores.get(nombre, 0) + cantidad
+        entradas, total = conexion.execute(
+            'SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM figuras').fetchone()
+        return {
+            'hits': contadores.get('hits', 0),
+            'misses': contadores.get('misses', 0),
+            'expulsiones': contadores.get('expulsiones', 0),
+            'entradas': entradas,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+        }
+
+
+class FigureCache:
+    """
+    Cache de figuras con LRU por bytes en memoria y nivel compartido en disco.
+
+    Las figuras se guardan serializadas (JSON de Plotly); cada acierto
+    devuelve un dict nuevo, así que quien lo reciba puede modificarlo sin
+    afectar a la cache.
+    """
+
+    def __init__(self, max_bytes=MEMORIA_MAX_BYTES, disk_path=DISCO_PATH, disk_max_bytes=DISCO_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()  # clave -> (version, json)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._contadores = {'hits_memoria': 0, 'hits_disco': 0, 'misses': 0, 'expulsiones': 0}
+        self.disco = _DiscoSQLite(disk_path, disk_max_bytes) if disk_path else None
+
+    def _guardar_en_memoria(self, clave, version, datos):
+        if len(datos) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior[1])
+            self._entradas[clave] = (version, datos)
+            self._bytes += len(datos)
+            while self._bytes > self.max_bytes:
+                _, (_, expulsado) = self._entradas.popitem(last=False)
+                self._bytes -= len(expulsado)
+                self._contadores['expulsiones'] += 1
+
+    def get(self, clave):
+        """Buscar una figura; devuelve el JSON o None si no está"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self._contadores['hits_memoria'] += 1
+                return entrada[1]
+
+        if self.disco is not None:
+            try:
+                datos = self.disco.get(clave)
+            except sqlite3.Error:
+                datos = None
+            if datos is not None:
+                with self._lock:
+                    self._contadores['hits_disco'] += 1
+                self._guardar_en_memoria(clave, clave.split(':', 1)[0], datos)
+                return datos
+
+        with self._lock:
+            self._contadores['misses'] += 1
+        return None
+
+    def put(self, clave, version, datos):
+        """Guardar el JSON de una figura en memoria y en disco"""
+        self._guardar_en_memoria(clave, version, datos)
+        if self.disco is not None:
+            try:
+                self.disco.put(clave, version, datos)
+            except sqlite3.Error:
+                pass
+
+    def invalidar(self, version_vigente):
+        """Eliminar las figuras de versiones de datos distintas a la vigente"""
+        with self._lock:
+            for clave in [c for c, (v, _) in self._entradas.items() if v != version_vigente]:
+                self._bytes -= len(self._entradas.pop(clave)[1])
+        if self.disco is not None:
+            try:
+                self.disco.invalidar(version_vigente)
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        """Contadores de aciertos/fallos y uso de bytes de ambos niveles"""
+        with self._lock:
+            memoria = dict(self._contadores, entradas=len(self._entradas),
+                           bytes=self._bytes, max_bytes=self.max_bytes)
+        resultado = {'memoria': memoria}
+        if self.disco is not None:
+            try:
+                resultado['disco'] = self.disco.stats()
+            except sqlite3.Error as e:
+                resultado['disco'] = f"Error: {e}"
+        return resultado
+
+
+# Cache compartida por todas las funciones decoradas del proceso
+figure_cache = FigureCache()
+
+
+def _normalizar(valor):
+    """Normalizar un argumento para la clave ('2020' y 2020 son el mismo año)"""
+    if isinstance(valor, str) and valor.isdigit():
+        return int(valor)
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return valor
+
+
+# Módulos de los que dependen las figuras memoizadas: el resto del proyecto
+# (servidor, agente, descargas, benchmarks...) no cambia ninguna figura
+MODULOS_FIGURAS = (
+    'main.py', 'figure_cache.py', 'build_pipeline.py', 'lenguajes.py', 'tiobe_matrix.py',
+    'pr_cube.py', 'submuestreo.py', 'ranking_historico.py', 'pronostico.py',
+    'historial_trending.py', 'indice_repos.py', 'resaltado_seleccion.py',
+)
+
+
+def _huella_codigo(directorio, modulos=MODULOS_FIGURAS):
+    """Hash de los módulos que construyen figuras: un cambio de código invalida las figuras en disco"""
+    sha = hashlib.sha1()
+    for nombre in sorted(modulos):
+        ruta = os.path.join(directorio, nombre)
+        if os.path.isfile(ruta):
+            with open(ruta, 'rb') as f:
+                sha.update(nombre.encode('utf-8'))
+                sha.update(f.read())
+    return sha.hexdigest()[:12]
+
+
+# Se calcula una sola vez al importar, no por cada función decorada
+HUELLA_CODIGO = _huella_codigo(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cached_figure(func):
+    """
+    Decorador para funciones que construyen figuras a partir de sus argumentos.
+
+    La clave es (función, argumentos normalizados, versión de datos, huella
+    de MODULOS_FIGURAS). Si la función recibe un DataFrame explícito no
+    se usa la cache, porque la versión de datos solo describe los datasets
+    del repositorio.
+
+    Returns:
+        La figura como dict (JSON de Plotly ya decodificado)
+    """
+    firma = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        argumentos = firma.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        if any(isinstance(v, pd.DataFrame) for v in argumentos.arguments.values()):
+            return json.loads(to_json_plotly(func(*args, **kwargs)))
+
+        # La versión de la clave y los datos de la figura salen del mismo
+        # repositorio aunque se publique otro durante la construcción
+        repositorio = get_repository()
+        version = repositorio.version
+        normalizados = {k: _normalizar(v) for k, v in argumentos.arguments.items()}
+        firma_clave = json.dumps([func.__qualname__, HUELLA_CODIGO, normalizados], sort_keys=True, default=str)
+        clave = f"{version}:{hashlib.sha1(firma_clave.encode('utf-8')).hexdigest()}"
+
+        datos = figure_cache.get(clave)
+        if datos is None:
+            with usar_repositorio(repositorio):
+                datos = to_json_plotly(func(*args, **kwargs))
+            figure_cache.put(clave, version, datos)
+        return json.loads(datos)
+
+    wrapper.sin_cache = func
+    return wrapper
+
+
+if __name__ == "__main__":
+    # Estado del nivel compartido en disco
+    print(json.dumps(figure_cache.stats(), indent=2))
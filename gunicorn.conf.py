@@ -0,0 +1,49 @@
+# ===========================================
+# Configuración de gunicorn para el dashboard
+# ===========================================
+#
+#   gunicorn -c gunicorn.conf.py wsgi:server
+#
+# Concurrencia: `workers` procesos (cada uno con su propio GIL) y `threads`
+# hilos por proceso. Los callbacks de figuras son trabajo de CPU y escalan con
+# los procesos; handle_chat pasa la mayor parte del tiempo esperando a la API
+# de Claude, así que los hilos evitan que una conversación bloquee al worker.
+# Peticiones simultáneas atendidas = workers x threads.
+#
+# Variables de entorno:
+#   CODETRENDS_BIND     dirección de escucha (por defecto 0.0.0.0:8050)
+#   CODETRENDS_WORKERS  procesos (por defecto 2 x núcleos + 1, máximo 8)
+#   CODETRENDS_THREADS  hilos por proceso (por defecto 4)
+#   CODETRENDS_TIMEOUT  segundos antes de reiniciar un worker colgado (por defecto 120)
+
+import multiprocessing
+import os
+
+bind = os.getenv('CODETRENDS_BIND', '0.0.0.0:8050')
+workers = int(os.getenv('CODETRENDS_WORKERS', min(2 * multiprocessing.cpu_count() + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.getenv('CODETRENDS_THREADS', '4'))
+
+# Los datos se cargan una vez en el maestro (wsgi.py) y los workers los
+# comparten copy-on-write
+preload_app = True
+
+# Una respuesta del agente IA puede tardar varios segundos; el timeout cubre
+# la petición más lenta esperada con margen
+timeout = int(os.getenv('CODETRENDS_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Los hilos no sobreviven al fork: cada worker inicia su propia revisión
+    # de la versión de datos (data_reload.py)
+    from data_reload import recarga_datos
+    recarga_datos.iniciar()
+    # El agente IA (cliente de la API) no se crea en el maestro: cada worker
+    # arma el suyo para no compartir conexiones heredadas por fork
+    from main import obtener_agente
+    obtener_agente()
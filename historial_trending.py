@@ -0,0 +1,409 @@
+# ===========================================
+# Historial de Trending - Snapshots diarios de GitHub Trending
+# ===========================================
+#
+# Cada corrida de GitHubScraper.rb reemplaza Datos/TopRepositorios.csv y
+# Datos/TopReposXLenguajes.csv, y build_pipeline.py reemplaza sus copias
+# limpias, así que el dashboard solo conocía "hoy". Esta etapa agrega cada
+# snapshot limpio a un almacén columnar particionado por fecha (un .npz por
+# tabla y día en Historial/trending) sin reescribir nunca otros días. Dentro
+# de un día no se repite (User, Repository): una segunda corrida el mismo
+# día solo agrega los repositorios que faltaban.
+#
+# indice.json lista las particiones de cada tabla ordenadas por fecha, con
+# su cantidad de filas y el hash de los CSV que las originaron; un día o una
+# ventana se resuelven con búsqueda binaria sobre el índice y solo se abren
+# esas particiones. El hash del índice forma parte de la versión de datos
+# (data_repository.py), así que un snapshot nuevo recarga el dashboard.
+#
+# Velocidad: NumberOfStar y NumberOfFork son totales, así que cada ingesta
+# los compara (una pasada vectorizada) con la última observación de cada
+# repositorio, guardada en <tabla>/ultimo.npz, y agrega a la partición las
+# estrellas y forks por día. También guarda la suma por lenguaje del día en
+# <tabla>/lenguajes/, de modo que el promedio de cualquier ventana se arma
+# sumando esos resúmenes, sin recalcular nada de días anteriores. Un día
+# anterior al último registrado se agrega sin velocidad.
+#
+# Uso:
+#   python historial_trending.py                     # agregar el snapshot actual (fecha de captura del scraper)
+#   python historial_trending.py --fecha 2025-12-01  # con otra fecha de captura
+#   python historial_trending.py --resumen           # particiones registradas y benchmark con un año de ingestas
+
+import bisect
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from escritura_atomica import escribir_atomico
+from lenguajes import COLUMNA_CODIGO, codificar, codigos_grupo
+from snapshot_store import hash_archivo
+
+# Carpeta del historial (relativa a la raíz del proyecto)
+HISTORIAL_DIR = os.getenv('CODETRENDS_HISTORIAL_DIR', os.path.join('Historial', 'trending'))
+INDICE_TRENDING = os.path.join(HISTORIAL_DIR, 'indice.json')
+
+# Versión del formato del índice y de las particiones
+FORMATO_HISTORIAL = 1
+
+# Tabla -> CSV limpio que se archiva y CSV del scraper cuya fecha de
+# modificación es la fecha de captura
+TABLAS = {
+    'top_repos_clean': {
+        'fuente': 'Datos_procesados/Top_repos_clean.csv',
+        'captura': 'Datos/TopRepositorios.csv',
+    },
+    'repos_lenguaje_clean': {
+        'fuente': 'Datos_procesados/Repos_por_lenguaje_clean.csv',
+        'captura': 'Datos/TopReposXLenguajes.csv',
+    },
+}
+
+# Un repositorio aparece una sola vez por día y tabla
+CLAVE = ['User', 'Repository']
+
+# Velocidad -> total del que sale (por día desde la observación anterior)
+COLUMNAS_VELOCIDAD = {'EstrellasDia': 'NumberOfStar', 'ForksDia': 'NumberOfFork'}
+
+# Última observación de cada repositorio (Fecha como 'YYYY-MM-DD')
+COLUMNAS_ESTADO = CLAVE + ['Fecha'] + list(COLUMNAS_VELOCIDAD.values())
+
+
+def guardar_particion(path, df):
+    """Guardar un DataFrame como .npz columnar (texto sin objetos Python; nulo = '')"""
+    arrays = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if serie.dtype == object:
+            arrays[columna] = serie.fillna('').astype(str).to_numpy(dtype=str)
+        else:
+            arrays[columna] = serie.to_numpy()
+    escribir_atomico(path, lambda f: np.savez(f, **arrays))
+
+
+def leer_particion(path):
+    """Leer una partición guardada con guardar_particion"""
+    with np.load(path, allow_pickle=False) as datos:
+        columnas = {}
+        for columna in datos.files:
+            valores = datos[columna]
+            if valores.dtype.kind == 'U':
+                valores = valores.astype(object)
+                valores[valores == ''] = np.nan
+            columnas[columna] = valores
+    return pd.DataFrame(columnas)
+
+
+def leer_indice(directorio=HISTORIAL_DIR):
+    """Índice del historial (vacío si todavía no hay snapshots)"""
+    try:
+        with open(os.path.join(directorio, 'indice.json'), encoding='utf-8') as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        indice = None
+    if indice is None or indice.get('formato') != FORMATO_HISTORIAL:
+        return {'formato': FORMATO_HISTORIAL, 'tablas': {}}
+    return indice
+
+
+def calcular_velocidades(snapshot, estado, dia):
+    """
+    Estrellas y forks por día de cada repositorio del snapshot respecto de
+    su última observación, en una sola pasada vectorizada.
+
+    Args:
+        snapshot: Filas nuevas del día
+        estado: Última observación de cada repositorio (COLUMNAS_ESTADO)
+        dia: Fecha del snapshot 'YYYY-MM-DD'
+
+    Returns:
+        Tupla (snapshot con COLUMNAS_VELOCIDAD, estado actualizado); NaN para
+        los repositorios sin observación anterior
+    """
+    previo = snapshot[CLAVE].merge(estado, on=CLAVE, how='left')
+    dias = (pd.Timestamp(dia) - pd.to_datetime(previo['Fecha'])).dt.days.to_numpy(dtype=float)
+    posterior = dias > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        velocidades = {
+            velocidad: np.where(posterior, (snapshot[total].to_numpy(dtype=float)
+                                            - previo[total].to_numpy(dtype=float)) / dias, np.nan)
+            for velocidad, total in COLUMNAS_VELOCIDAD.items()
+        }
+
+    # El estado avanza solo con observaciones más nuevas que la guardada
+    avanza = posterior | np.isnan(dias)
+    recientes = snapshot.loc[avanza, CLAVE + list(COLUMNAS_VELOCIDAD.values())].assign(Fecha=dia)
+    estado = (pd.concat([estado, recientes[COLUMNAS_ESTADO]], ignore_index=True)
+              .drop_duplicates(CLAVE, keep='last')
+              .reset_index(drop=True))
+    return snapshot.assign(**velocidades), estado
+
+
+def resumen_lenguajes(particion):
+    """
+    Suma de velocidades por lenguaje de un día y cantidad de repositorios con
+    velocidad (sumando días se obtiene el promedio de cualquier ventana). Los
+    lenguajes fuera del catálogo se agrupan por nombre, no todos juntos.
+    """
+    con_velocidad = particion.dropna(subset=list(COLUMNAS_VELOCIDAD))
+    grupos, _ = codigos_grupo(con_velocidad['Language'], con_velocidad[COLUMNA_CODIGO])
+    return con_velocidad.groupby(grupos, sort=True).agg(
+        **{COLUMNA_CODIGO: (COLUMNA_CODIGO, 'first')},
+        Language=('Language', 'first'),
+        EstrellasDia=('EstrellasDia', 'sum'),
+        ForksDia=('ForksDia', 'sum'),
+        Repos=('EstrellasDia', 'size'),
+    ).reset_index(drop=True)
+
+
+def leer_estado(directorio, tabla, particiones):
+    """
+    Última observación de cada repositorio de una tabla; si el archivo no
+    existe (historial anterior a las velocidades) se reconstruye una vez
+    desde las particiones.
+    """
+    ruta = os.path.join(directorio, tabla, 'ultimo.npz')
+    if os.path.exists(ruta):
+        return leer_particion(ruta)
+    frames = [leer_particion(os.path.join(directorio, p['archivo'])).assign(Fecha=p['fecha']) for p in particiones]
+    if not frames:
+        return pd.DataFrame({columna: pd.Series(dtype=object if columna in CLAVE + ['Fecha'] else float)
+                             for columna in COLUMNAS_ESTADO})
+    return pd.concat(frames, ignore_index=True)[COLUMNAS_ESTADO].drop_duplicates(CLAVE, keep='last')
+
+
+def ingerir(fecha=None, base_dir='.', directorio=None, tablas=None):
+    """
+    Agregar el snapshot actual de cada tabla al historial.
+
+    Un snapshot cuyo CSV ya está registrado (mismo hash) no se vuelve a
+    agregar, así que se puede llamar después de cada build_pipeline.py.
+
+    Args:
+        fecha: Fecha de captura 'YYYY-MM-DD' (por defecto, la fecha de
+            modificación del CSV del scraper)
+        base_dir: Carpeta raíz del proyecto
+        directorio: Carpeta del historial (por defecto HISTORIAL_DIR)
+        tablas: Catálogo de tablas (por defecto TABLAS)
+
+    Returns:
+        Lista de dicts con tabla, fecha, estado, filas nuevas y ms
+    """
+    directorio = os.path.join(base_dir, directorio or HISTORIAL_DIR)
+    indice = leer_indice(directorio)
+    reporte = []
+
+    for tabla, spec in (tablas or TABLAS).items():
+        inicio = time.perf_counter()
+        fuente = os.path.join(base_dir, spec['fuente'])
+        sha256 = hash_archivo(fuente)
+        particiones = indice['tablas'].setdefault(tabla, [])
+        if any(sha256 in particion['fuentes'] for particion in particiones):
+            reporte.append({'tabla': tabla, 'fecha': None, 'estado': 'ya registrado', 'filas': 0,
+                            'ms': round((time.perf_counter() - inicio) * 1000, 1)})
+            continue
+
+        dia = fecha or date.fromtimestamp(os.stat(os.path.join(base_dir, spec['captura'])).st_mtime).isoformat()
+        nuevo = pd.read_csv(fuente).drop_duplicates(CLAVE)
+        nuevo[COLUMNA_CODIGO] = codificar(nuevo['Language'])
+
+        fechas = [particion['fecha'] for particion in particiones]
+        posicion = bisect.bisect_left(fechas, dia)
+        archivo = f"{tabla}/{dia}.npz"
+        mismo_dia = posicion < len(fechas) and fechas[posicion] == dia
+        if mismo_dia:
+            # Mismo día: se conservan las filas ya guardadas y se agregan las que faltan
+            existente = leer_particion(os.path.join(directorio, archivo))
+            claves = pd.MultiIndex.from_frame(existente[CLAVE])
+            nuevo = nuevo[~pd.MultiIndex.from_frame(nuevo[CLAVE]).isin(claves)]
+
+        nuevo, estado = calcular_velocidades(nuevo, leer_estado(directorio, tabla, particiones), dia)
+        if mismo_dia:
+            particion = particiones[posicion]
+            combinado = pd.concat([existente, nuevo[existente.columns]], ignore_index=True)
+        else:
+            particion = {'fecha': dia, 'archivo': archivo, 'lenguajes': f"{tabla}/lenguajes/{dia}.npz",
+                         'filas': 0, 'fuentes': []}
+            particiones.insert(posicion, particion)
+            combinado = nuevo
+
+        guardar_particion(os.path.join(directorio, archivo), combinado)
+        guardar_particion(os.path.join(directorio, particion['lenguajes']), resumen_lenguajes(combinado))
+        guardar_particion(os.path.join(directorio, tabla, 'ultimo.npz'), estado)
+        particion['filas'] = len(combinado)
+        particion['fuentes'].append(sha256)
+        reporte.append({'tabla': tabla, 'fecha': dia, 'estado': 'agregado', 'filas': len(nuevo),
+                        'ms': round((time.perf_counter() - inicio) * 1000, 1)})
+
+    if any(fila['estado'] == 'agregado' for fila in reporte):
+        contenido = json.dumps(indice, indent=2, ensure_ascii=False) + '\n'
+        escribir_atomico(os.path.join(directorio, 'indice.json'), lambda f: f.write(contenido.encode('utf-8')))
+    return reporte
+
+
+class HistorialTrending:
+    """
+    Lector del historial: resuelve días y ventanas sobre el índice y abre
+    solo las particiones necesarias (cada una se lee una vez).
+    """
+
+    def __init__(self, directorio=HISTORIAL_DIR):
+        self.directorio = directorio
+        self._tablas = leer_indice(directorio)['tablas']
+        self._fechas = {tabla: [p['fecha'] for p in particiones] for tabla, particiones in self._tablas.items()}
+        self._cargadas = {}
+
+    @property
+    def nbytes(self):
+        return sum(int(df.memory_usage(deep=True).sum()) for df in self._cargadas.values())
+
+    def fechas(self, tabla):
+        """Fechas con snapshot de una tabla ('YYYY-MM-DD', de la más antigua a la más reciente)"""
+        return list(self._fechas.get(tabla, []))
+
+    def particiones(self, tabla, desde=None, hasta=None):
+        """Entradas del índice con desde <= fecha <= hasta (búsqueda binaria)"""
+        fechas = self._fechas.get(tabla, [])
+        inicio = 0 if desde is None else bisect.bisect_left(fechas, desde)
+        fin = len(fechas) if hasta is None else bisect.bisect_right(fechas, hasta)
+        return self._tablas.get(tabla, [])[inicio:fin]
+
+    def _particion(self, particion, clave='archivo'):
+        archivo = particion[clave]
+        if archivo not in self._cargadas:
+            self._cargadas[archivo] = leer_particion(os.path.join(self.directorio, archivo))
+        return self._cargadas[archivo]
+
+    def leer(self, tabla, desde=None, hasta=None):
+        """
+        Filas de todos los snapshots de un día o una ventana.
+
+        Returns:
+            DataFrame con la columna Fecha (datetime64) y las columnas de la tabla
+        """
+        frames = [self._particion(p).assign(Fecha=np.datetime64(p['fecha'], 'ns'))
+                  for p in self.particiones(tabla, desde, hasta)]
+        if not frames:
+            # Sin snapshots en el rango: mismas columnas que el último snapshot
+            particiones = self._tablas.get(tabla, [])
+            if not particiones:
+                return pd.DataFrame(columns=CLAVE + ['Fecha'])
+            return self._particion(particiones[-1]).iloc[:0].assign(Fecha=pd.Series(dtype='datetime64[ns]'))
+        return pd.concat(frames, ignore_index=True)
+
+    def ultimos(self, tabla, desde=None, hasta=None):
+        """
+        Última observación de cada repositorio en una ventana.
+
+        Returns:
+            DataFrame con las columnas de la tabla, Fecha (último día visto),
+            Dias (días de la ventana en que estuvo en trending) y las
+            velocidades promedio de la ventana
+        """
+        filas = self.leer(tabla, desde, hasta)
+        if filas.empty:
+            return filas.assign(Dias=pd.Series(dtype=np.int64))
+        grupos = filas.groupby(CLAVE, sort=False)
+        promedios = {columna: grupos[columna].transform('mean') for columna in COLUMNAS_VELOCIDAD if columna in filas}
+        return (filas.assign(Dias=grupos['Fecha'].transform('size'), **promedios)
+                .sort_values('Fecha', kind='stable')
+                .drop_duplicates(CLAVE, keep='last')
+                .reset_index(drop=True))
+
+    def velocidad_lenguajes(self, tabla, desde=None, hasta=None):
+        """
+        Estrellas y forks por día de los repositorios de cada lenguaje en una
+        ventana, a partir de los resúmenes diarios guardados en cada ingesta.
+
+        Returns:
+            DataFrame (COLUMNA_CODIGO, Language, EstrellasDia, ForksDia, Repos)
+            ordenado por EstrellasDia descendente; Repos cuenta observaciones
+            con velocidad
+        """
+        frames = [self._particion(p, 'lenguajes') for p in self.particiones(tabla, desde, hasta) if 'lenguajes' in p]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame({COLUMNA_CODIGO: pd.Series(dtype=np.int16), 'Language': pd.Series(dtype=object),
+                                 'EstrellasDia': pd.Series(dtype=float), 'ForksDia': pd.Series(dtype=float),
+                                 'Repos': pd.Series(dtype=np.int64)})
+        dias = pd.concat(frames, ignore_index=True)
+        grupos, _ = codigos_grupo(dias['Language'], dias[COLUMNA_CODIGO])
+        total = dias.groupby(grupos, sort=True).agg(
+            **{COLUMNA_CODIGO: (COLUMNA_CODIGO, 'first')}, Language=('Language', 'first'),
+            EstrellasDia=('EstrellasDia', 'sum'), ForksDia=('ForksDia', 'sum'), Repos=('Repos', 'sum'))
+        total[list(COLUMNAS_VELOCIDAD)] = total[list(COLUMNAS_VELOCIDAD)].div(total['Repos'], axis=0)
+        return total.sort_values('EstrellasDia', ascending=False, kind='stable', ignore_index=True)
+
+
+def ventana(periodo, fechas):
+    """
+    Rango de fechas de un periodo del selector del dashboard.
+
+    Args:
+        periodo: 'YYYY-MM-DD' (un día) o 'ultimos-N' (N días hasta el último snapshot)
+        fechas: Fechas disponibles (ordenadas)
+
+    Returns:
+        Tupla (desde, hasta) en 'YYYY-MM-DD'
+    """
+    if periodo.startswith('ultimos-'):
+        hasta = fechas[-1] if fechas else date.today().isoformat()
+        desde = date.fromisoformat(hasta) - timedelta(days=int(periodo.split('-')[1]) - 1)
+        return desde.isoformat(), hasta
+    return periodo, periodo
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Agregar el snapshot de GitHub Trending al historial")
+    parser.add_argument('--fecha', help="Fecha de captura YYYY-MM-DD (por defecto, la del CSV del scraper)")
+    parser.add_argument('--resumen', action='store_true', help="Solo mostrar las particiones y medir la lectura")
+    args = parser.parse_args()
+
+    if not args.resumen:
+        for fila in ingerir(args.fecha):
+            print(f"  {fila['tabla']:<22} {fila['estado']:<14} {fila['fecha'] or '':<11} {fila['filas']:>4} filas "
+                  f"{fila['ms']:>7.1f} ms")
+
+    historial = HistorialTrending()
+    for tabla in TABLAS:
+        fechas = historial.fechas(tabla)
+        rango = f"{fechas[0]} a {fechas[-1]}" if fechas else "sin snapshots"
+        print(f"{tabla}: {len(fechas)} particiones ({rango})")
+
+    if args.resumen:
+        # Benchmark: un año de ingestas diarias sintéticas en una carpeta temporal;
+        # cada repositorio gana una cantidad fija de estrellas por día
+        rng = np.random.default_rng(7)
+        tabla = 'repos_lenguaje_clean'
+        spec = TABLAS[tabla]
+        base = pd.read_csv(spec['fuente'])
+        ritmo = rng.integers(0, 500, len(base))
+        dias = [(date(2025, 1, 1) + timedelta(days=i)).isoformat() for i in range(365)]
+        with tempfile.TemporaryDirectory() as carpeta:
+            os.makedirs(os.path.join(carpeta, os.path.dirname(spec['fuente'])))
+            tiempos = []
+            for n, dia in enumerate(dias):
+                base.assign(NumberOfStar=base['NumberOfStar'] + ritmo * n).to_csv(
+                    os.path.join(carpeta, spec['fuente']), index=False)
+                inicio = time.perf_counter()
+                ingerir(dia, base_dir=carpeta, tablas={tabla: spec})
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            print(f"Ingesta de {len(base)} repositorios: {np.mean(tiempos[1:31]):.1f} ms los primeros días, "
+                  f"{np.mean(tiempos[-30:]):.1f} ms con {len(dias)} días registrados")
+
+            for desde in (dias[-1], dias[-7], dias[-30]):
+                lector = HistorialTrending(os.path.join(carpeta, HISTORIAL_DIR))
+                inicio = time.perf_counter()
+                filas = lector.ultimos(tabla, desde, dias[-1])
+                ms_repos = (time.perf_counter() - inicio) * 1000
+                inicio = time.perf_counter()
+                lenguajes = lector.velocidad_lenguajes(tabla, desde, dias[-1])
+                ms_lenguajes = (time.perf_counter() - inicio) * 1000
+                print(f"Ventana {desde} a {dias[-1]}: {len(filas)} repositorios en {ms_repos:.1f} ms, "
+                      f"{len(lenguajes)} lenguajes en {ms_lenguajes:.1f} ms")
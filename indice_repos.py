@@ -0,0 +1,133 @@
+# ===========================================
+# IndiceRepos - Top N de repositorios por lenguaje como slices
+# ===========================================
+#
+# El gráfico de repositorios por lenguaje filtraba el DataFrame con una
+# máscara booleana y llamaba a nlargest en cada cambio del dropdown. Aquí las
+# filas se ordenan una sola vez por versión de datos, agrupadas por código de
+# lenguaje (lenguajes.py; los lenguajes fuera del catálogo, por nombre) y de
+# mayor a menor estrellas (y, aparte, forks); cada lenguaje queda como un
+# rango [inicio, fin) de ese orden, así que el top N de cualquier lenguaje,
+# con cualquier N y cualquiera de las dos métricas, es un slice de offsets.
+#
+# Uso:
+#   python indice_repos.py    # benchmark con 1M de repositorios contra máscara + nlargest
+
+import numpy as np
+
+from lenguajes import COLUMNA_CODIGO, SIN_CODIGO, codificar, codigo, codigos_grupo, normalizar
+
+# Métrica del drill-down -> columna del dataset
+METRICAS_REPOS = {'estrellas': 'NumberOfStar', 'forks': 'NumberOfFork'}
+
+
+class IndiceRepos:
+    """
+    Offsets de filas ordenados por lenguaje y métrica.
+
+    Los empates conservan el orden de las filas (igual que nlargest con
+    keep='first'). Los lenguajes sin código en el catálogo no se juntan:
+    cada nombre tiene su propio rango (codigos_grupo).
+
+    Attributes:
+        codigos: Código de cada lenguaje con repositorios (ordenados)
+        lenguajes: Nombre de cada lenguaje (el de su primera fila)
+        inicios, fines: Rango de cada lenguaje en los órdenes
+        ordenes: Métrica -> int32 con los offsets de fila ordenados
+    """
+
+    def __init__(self, df):
+        self.df = df
+        codigos, self._desconocidos = codigos_grupo(
+            df['Language'], df[COLUMNA_CODIGO].to_numpy() if COLUMNA_CODIGO in df else None)
+        self.ordenes = {}
+        for metrica, columna in METRICAS_REPOS.items():
+            valores = df[columna].to_numpy(dtype=float)
+            # Dos ordenamientos estables: de mayor a menor y luego por código
+            # (equivale a np.lexsort((-valores, codigos)), pero el segundo es
+            # un radix sort sobre enteros)
+            orden = np.argsort(-valores, kind='stable')
+            orden = orden[np.argsort(codigos[orden], kind='stable')]
+            self.ordenes[metrica] = orden.astype(np.int32)
+
+        ordenados = codigos[self.ordenes['estrellas']]
+        self.codigos, self.inicios, cantidades = np.unique(ordenados, return_index=True, return_counts=True)
+        self.fines = self.inicios + cantidades
+        nombres = df['Language'].to_numpy(dtype=object)
+        self.lenguajes = nombres[self.ordenes['estrellas'][self.inicios]] if len(df) else nombres[:0]
+        self._posicion = {int(c): i for i, c in enumerate(self.codigos)}
+
+    @property
+    def nbytes(self):
+        return sum(orden.nbytes for orden in self.ordenes.values()) + self.inicios.nbytes + self.fines.nbytes
+
+    def _rango(self, lenguaje):
+        """Posición del lenguaje en codigos/inicios/fines (None si no tiene repositorios)"""
+        codigo_lenguaje = codigo(lenguaje)
+        if codigo_lenguaje == SIN_CODIGO and lenguaje is not None:
+            codigo_lenguaje = self._desconocidos.get(normalizar(lenguaje))
+        return self._posicion.get(codigo_lenguaje)
+
+    def offsets(self, lenguaje, n=5, metrica='estrellas'):
+        """Filas de los n repositorios con más estrellas/forks de un lenguaje (nombre o alias)"""
+        i = self._rango(lenguaje)
+        if i is None:
+            return self.ordenes[metrica][:0]
+        inicio = self.inicios[i]
+        return self.ordenes[metrica][inicio:min(inicio + n, self.fines[i])]
+
+    def top(self, lenguaje, n=5, metrica='estrellas'):
+        """Los n repositorios de un lenguaje, de mayor a menor según la métrica"""
+        return self.df.iloc[self.offsets(lenguaje, n, metrica)]
+
+    def posicion(self, lenguaje, usuario, repositorio):
+        """Offset de fila de un repositorio dentro de su lenguaje (None si no está)"""
+        i = self._rango(lenguaje)
+        if i is None:
+            return None
+        filas = self.ordenes['estrellas'][self.inicios[i]:self.fines[i]]
+        coinciden = ((self.df['User'].to_numpy()[filas] == usuario)
+                     & (self.df['Repository'].to_numpy()[filas] == repositorio))
+        return int(filas[coinciden][0]) if coinciden.any() else None
+
+    def cantidad(self, lenguaje):
+        """Repositorios de un lenguaje"""
+        i = self._rango(lenguaje)
+        return 0 if i is None else int(self.fines[i] - self.inicios[i])
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    from data_repository import get_repository
+
+    df = get_repository().get('repos_lenguaje_clean')
+    indice = IndiceRepos(df)
+    print(f"{len(df)} repositorios, {len(indice.codigos)} lenguajes ({indice.nbytes} bytes de offsets)")
+
+    # Benchmark: 1M de repositorios de 95 lenguajes
+    rng = np.random.default_rng(9)
+    filas = 1_000_000
+    from lenguajes import CATALOGO
+    grande = pd.DataFrame({
+        'Language': np.array(CATALOGO, dtype=object)[rng.integers(0, len(CATALOGO), filas)],
+        'NumberOfStar': rng.integers(0, 500_000, filas),
+        'NumberOfFork': rng.integers(0, 50_000, filas),
+    })
+    grande[COLUMNA_CODIGO] = codificar(grande['Language'])
+    inicio = time.perf_counter()
+    indice = IndiceRepos(grande)
+    construir = (time.perf_counter() - inicio) * 1000
+    consultas = [('Python', 5, 'estrellas'), ('Rust', 20, 'forks'), ('Go', 10, 'estrellas')]
+    inicio = time.perf_counter()
+    for lenguaje, n, metrica in consultas:
+        grande[grande['Language'] == lenguaje].nlargest(n, METRICAS_REPOS[metrica])
+    filtrar = (time.perf_counter() - inicio) * 1000 / len(consultas)
+    inicio = time.perf_counter()
+    for lenguaje, n, metrica in consultas:
+        indice.top(lenguaje, n, metrica)
+    cortar = (time.perf_counter() - inicio) * 1000 / len(consultas)
+    print(f"{filas:,} repositorios: índice en {construir:.0f} ms; top N por consulta: máscara + nlargest "
+          f"{filtrar:.1f} ms, slice {cortar:.3f} ms")
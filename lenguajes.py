@@ -0,0 +1,188 @@
+# ===========================================
+# Lenguajes - Tabla canónica de lenguajes con códigos enteros
+# ===========================================
+#
+# Cada fuente escribe los lenguajes a su manera: el scraper de GitHub pide
+# `c%23` y `cpp`, TIOBE publica "C#", "C++" y "Assembly language", Madnight
+# usa "Visual Basic .NET". Aquí hay un único catálogo de nombres canónicos y
+# una tabla de alias; el código de un lenguaje es su posición en CATALOGO.
+#
+# Los snapshots (snapshot_store.py) agregan la columna COLUMNA_CODIGO (int16)
+# a cada dataset al compilarlo, así que los cruces, filtros y selecciones
+# entre fuentes comparan enteros en vez de textos. Las columnas de texto se
+# conservan para las etiquetas de los gráficos.
+#
+# CATALOGO solo crece al final: reordenar o quitar nombres cambia códigos que
+# ya están guardados en los snapshots (VERSION_CATALOGO los invalida).
+#
+# Uso:
+#   python lenguajes.py    # códigos de cada dataset, nombres sin código y comparación de memoria/velocidad
+
+import hashlib
+import re
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+
+# Nombre de la columna con el código en todos los datasets
+COLUMNA_CODIGO = 'LangID'
+
+# Código de los nombres que no están en el catálogo
+SIN_CODIGO = -1
+
+# Nombres canónicos; el código es la posición (solo se agregan al final)
+CATALOGO = (
+    # Series TIOBE del dashboard y lenguajes del scraper de GitHub
+    'Python', 'C', 'C++', 'C#', 'Java', 'JavaScript', 'Assembly', 'R', 'Perl', 'Fortran', 'Rust',
+    'MATLAB', 'PHP', 'Go', 'Kotlin', 'Ada', 'Delphi/Object Pascal', 'SQL', 'Scratch', 'Visual Basic',
+    'TypeScript',
+    # Resto del ranking TIOBE 2025
+    '(Visual) FoxPro', 'ABAP', 'Apex', 'Bash', 'COBOL', 'Classic Visual Basic', 'Dart', 'Elixir',
+    'Erlang', 'Haskell', 'Julia', 'LabVIEW', 'Ladder Logic', 'Lisp', 'Lua', 'ML', 'Objective-C',
+    'PL/SQL', 'PowerShell', 'Prolog', 'RPG', 'Ruby', 'SAS', 'Scala', 'Solidity', 'Swift', 'VBScript',
+    'Wolfram', 'Zig',
+    # Resto de los lenguajes de Madnight (GitHut)
+    'ANTLR', 'Bicep', 'Clojure', 'CodeQL', 'CoffeeScript', 'Common Lisp', 'Coq', 'Crystal', 'Cuda',
+    'Cython', 'DM', 'Elm', 'Emacs Lisp', 'F#', 'FreeMarker', 'GAP', 'GLSL', 'Groovy', 'Haml', 'Haxe',
+    'JetBrains MPS', 'Lean', 'MLIR', 'Mustache', 'Nim', 'Nix', 'OCaml', 'Pascal', 'Puppet',
+    'PureScript', 'Raku', 'SWIG', 'Sass', 'Scheme', 'Shell', 'Smalltalk', 'SourcePawn',
+    'SystemVerilog', 'TSQL', 'Vala', 'Verilog', 'Vim Script', 'WebAssembly', 'ZAP', 'hoon',
+)
+
+# Otras formas de escribir un lenguaje -> nombre canónico (los slugs con
+# %xx de las URLs de GitHub se decodifican antes, 'c%23' llega como 'c#')
+ALIAS = {
+    'csharp': 'C#',
+    'c sharp': 'C#',
+    'cpp': 'C++',
+    'cplusplus': 'C++',
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'golang': 'Go',
+    'py': 'Python',
+    'assembly language': 'Assembly',
+    'asm': 'Assembly',
+    'delphi': 'Delphi/Object Pascal',
+    'object pascal': 'Delphi/Object Pascal',
+    'visual basic .net': 'Visual Basic',
+    'vb.net': 'Visual Basic',
+    'objc': 'Objective-C',
+    'fsharp': 'F#',
+    'viml': 'Vim Script',
+    'vimscript': 'Vim Script',
+    'elisp': 'Emacs Lisp',
+    't-sql': 'TSQL',
+    'plsql': 'PL/SQL',
+}
+
+
+def normalizar(nombre):
+    """Clave de comparación: sin %xx, sin espacios extremos, sin mayúsculas y con '-'/'_' como espacio"""
+    return re.sub(r'[\s_-]+', ' ', unquote(str(nombre)).strip()).casefold()
+
+
+_CODIGOS = {normalizar(nombre): i for i, nombre in enumerate(CATALOGO)}
+_CODIGOS.update({normalizar(alias): _CODIGOS[normalizar(nombre)] for alias, nombre in ALIAS.items()})
+
+# Cambia si cambia el catálogo o los alias (los snapshots lo guardan en sus opciones)
+VERSION_CATALOGO = hashlib.sha256(repr((CATALOGO, sorted(ALIAS.items()))).encode('utf-8')).hexdigest()[:16]
+
+
+def codigo(nombre):
+    """Código de un lenguaje (SIN_CODIGO si no está en el catálogo)"""
+    if nombre is None or (isinstance(nombre, float) and np.isnan(nombre)):
+        return SIN_CODIGO
+    return _CODIGOS.get(normalizar(nombre), SIN_CODIGO)
+
+
+def codificar(valores):
+    """
+    Códigos de una secuencia de nombres.
+
+    Cada nombre distinto se normaliza una sola vez (pd.factorize), así que el
+    costo por fila es el de un take sobre enteros.
+
+    Returns:
+        Array int16 alineado con valores; SIN_CODIGO para nulos o desconocidos
+    """
+    posiciones, unicos = pd.factorize(pd.Series(valores, dtype=object), use_na_sentinel=True)
+    tabla = np.array([codigo(nombre) for nombre in unicos] + [SIN_CODIGO], dtype=np.int16)
+    # El centinela -1 de los nulos toma el último elemento de la tabla
+    return tabla[posiciones]
+
+
+def codigos_grupo(valores, codigos=None):
+    """
+    Códigos para agrupar por lenguaje sin juntar los desconocidos.
+
+    Todos los nombres fuera del catálogo comparten SIN_CODIGO (en trending
+    aparecen HTML, Jupyter Notebook, ...): aquí cada nombre desconocido
+    distinto (normalizado) recibe len(CATALOGO) + i en orden de aparición.
+    Esos códigos solo valen dentro del arreglo del que salen; los nulos
+    quedan en SIN_CODIGO.
+
+    Args:
+        valores: Nombres de lenguaje
+        codigos: Sus códigos (por defecto codificar(valores))
+
+    Returns:
+        Tupla (int32 alineado con valores, dict nombre normalizado -> código
+        de los desconocidos)
+    """
+    codigos = (codificar(valores) if codigos is None else np.asarray(codigos)).astype(np.int32)
+    sin_codigo = codigos == SIN_CODIGO
+    if not sin_codigo.any():
+        return codigos, {}
+    nombres = pd.Series(valores, dtype=object).to_numpy()[sin_codigo]
+    conocidos = pd.notna(nombres)
+    claves = np.array([normalizar(n) for n in nombres[conocidos]], dtype=object)
+    posiciones, unicos = pd.factorize(claves)
+    extra = codigos[sin_codigo]
+    extra[conocidos] = len(CATALOGO) + posiciones
+    codigos[sin_codigo] = extra
+    return codigos, {clave: len(CATALOGO) + i for i, clave in enumerate(unicos)}
+
+
+def nombre(codigo_lenguaje):
+    """Nombre canónico de un código"""
+    return CATALOGO[codigo_lenguaje]
+
+
+def desconocidos(valores):
+    """Nombres (sin repetir) que no tienen código"""
+    valores = pd.Series(valores, dtype=object).dropna().unique()
+    return sorted(str(v) for v, c in zip(valores, codificar(valores)) if c == SIN_CODIGO)
+
+
+if __name__ == "__main__":
+    import time
+
+    from data_repository import DATASETS, get_repository
+
+    repositorio = get_repository()
+    print(f"Catálogo: {len(CATALOGO)} lenguajes, {len(ALIAS)} alias (versión {VERSION_CATALOGO})")
+    for nombre_dataset, spec in DATASETS.items():
+        columna = spec.get('lenguaje')
+        if columna is None:
+            continue
+        df = repositorio.get(nombre_dataset)
+        sin_codigo = desconocidos(df[columna])
+        print(f"{nombre_dataset:24s} {columna:9s} {df[COLUMNA_CODIGO].nunique():3d} códigos"
+              + (f"; sin código: {sin_codigo}" if sin_codigo else ""))
+
+    # Memoria y velocidad de un filtro por lenguaje: texto vs código
+    rng = np.random.default_rng(3)
+    filas = 1_000_000
+    textos = pd.Series(np.array(CATALOGO, dtype=object)[rng.integers(0, len(CATALOGO), filas)])
+    codigos = codificar(textos)
+    buscados = ['Python', 'C', 'C++', 'C#', 'Java', 'JavaScript']
+    print(f"\n{filas:,} filas: texto {textos.memory_usage(deep=True, index=False) / 1e6:.1f} MB, "
+          f"código {codigos.nbytes / 1e6:.1f} MB")
+    inicio = time.perf_counter()
+    por_texto = textos.isin(buscados).to_numpy()
+    texto_ms = (time.perf_counter() - inicio) * 1000
+    inicio = time.perf_counter()
+    por_codigo = np.isin(codigos, codificar(buscados))
+    codigo_ms = (time.perf_counter() - inicio) * 1000
+    print(f"Filtro de {len(buscados)} lenguajes: texto {texto_ms:.1f} ms, código {codigo_ms:.1f} ms")
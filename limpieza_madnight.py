@@ -0,0 +1,280 @@
+# ===========================================
+# Limpieza Madnight - Porcentajes de Pull Requests
+# ===========================================
+#
+# El scraping de Madnight concatena el porcentaje con la variación del
+# periodo ('17.4850.254' -> 17.485). La limpieza extrae el primer número con
+# decimales de forma vectorizada (sobre la matriz de caracteres de numpy) y
+# solo recurre a Python para las filas que no tienen esa forma. Para
+# exportaciones grandes hay un modo por bloques que lee, limpia y escribe el
+# CSV sin cargarlo completo.
+#
+# Uso:
+#   python limpieza_madnight.py entrada.csv salida.csv [--chunksize 500000]
+#   python limpieza_madnight.py --benchmark [--filas 10000 1000000 10000000]
+
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from escritura_atomica import archivo_atomico
+
+# Primer número con parte decimal al inicio del texto (igual que re.match)
+PATRON_PORCENTAJE = r'^(\d+\.\d+)'
+
+# Motivos por los que una fila termina en 0.0
+MOTIVO_VACIO = 'texto vacío'
+MOTIVO_NO_NUMERICO = 'sin número reconocible'
+
+
+def limpiar_porcentaje(valor):
+    """
+    Versión fila por fila (referencia para la verificación y el benchmark).
+
+    Extrae solo el porcentaje principal del valor
+    Ej: '17.4850.254' -> '17.485'
+        '0.107' -> '0.107'
+    """
+    valor_str = str(valor)
+    match = re.match(PATRON_PORCENTAJE, valor_str)
+    if match:
+        return float(match.group(1))
+    # Si no tiene punto decimal, devolver como está
+    try:
+        return float(valor_str)
+    except ValueError:
+        return 0.0
+
+
+# Hasta 15 dígitos la mantisa es exacta en float64 (< 2**53); más largos van por el respaldo
+_MAX_DIGITOS = 15
+_FILAS_POR_BLOQUE = 1 << 18
+
+# Estados del recorrido por columnas
+_ENTERO, _FRACCION, _FIN = 0, 1, 2
+
+
+def _extraer_bloque(columnas):
+    """
+    Extraer '^\\d+\\.\\d+' de un bloque de textos sin pasar por Python.
+
+    Recorre los caracteres columna por columna (todas las filas a la vez)
+    acumulando la mantisa entera sin el punto; el valor es mantisa / 10**b,
+    una sola división correctamente redondeada, que da el mismo float que
+    float('17.4850').
+
+    Args:
+        columnas: uint8 (ancho, filas) con los caracteres de cada texto
+            (los no ASCII ya convertidos a 255)
+
+    Returns:
+        float64 con el valor extraído (NaN donde el patrón no aplica)
+    """
+    filas = columnas.shape[1]
+    mantisa = np.zeros(filas, dtype=np.int64)
+    a = np.zeros(filas, dtype=np.int32)  # dígitos de la parte entera
+    b = np.zeros(filas, dtype=np.int32)  # dígitos de la parte decimal
+    estado = np.full(filas, _ENTERO, dtype=np.uint8)
+
+    for caracteres in columnas:
+        digito = caracteres - np.uint8(48)
+        es_digito = digito < 10
+        activo = estado != _FIN
+        suma = es_digito & activo
+
+        np.multiply(mantisa, 10, out=mantisa, where=suma)
+        np.add(mantisa, digito, out=mantisa, where=suma)
+        a += suma & (estado == _ENTERO)
+        b += suma & (estado == _FRACCION)
+
+        punto = (estado == _ENTERO) & (caracteres == 46) & (a >= 1)
+        estado[activo & ~es_digito] = _FIN
+        estado[punto] = _FRACCION
+
+    validos = (b >= 1) & (a + b <= _MAX_DIGITOS)
+    resultado = np.full(filas, np.nan)
+    resultado[validos] = mantisa[validos] / (10.0 ** b[validos])
+    return resultado
+
+
+def _extraer_vectorizado(texto):
+    """Aplicar _extraer_bloque por bloques para acotar la memoria temporal"""
+    unicode = texto.to_numpy(dtype=str)
+    resultado = np.full(len(unicode), np.nan)
+    ancho = unicode.dtype.itemsize // 4
+    if ancho == 0:
+        return resultado
+    codigos = unicode.view(np.uint32).reshape(len(unicode), ancho)
+    for inicio in range(0, len(unicode), _FILAS_POR_BLOQUE):
+        bloque = codigos[inicio:inicio + _FILAS_POR_BLOQUE]
+        # Traspuesto y en uint8: cada columna de caracteres queda contigua
+        columnas = np.ascontiguousarray(np.minimum(bloque, 255).astype(np.uint8).T)
+        resultado[inicio:inicio + len(bloque)] = _extraer_bloque(columnas)
+    return resultado
+
+
+def _respaldo(valor_str):
+    """Ruta fila por fila de limpiar_porcentaje, con None en vez de 0.0 si falla"""
+    match = re.match(PATRON_PORCENTAJE, valor_str)
+    if match:
+        return float(match.group(1))
+    try:
+        return float(valor_str)
+    except ValueError:
+        return None
+
+
+def limpiar_porcentajes(serie):
+    """
+    Limpiar una columna de porcentajes de forma vectorizada.
+
+    Da el mismo resultado que aplicar limpiar_porcentaje a cada fila (los
+    nulos quedan como NaN y los textos sin número pasan a 0.0). Solo las
+    filas que no empiezan con '<dígitos>.<dígitos>' ('12', '-1.5', '1e-05',
+    ' 3.2', nulos, textos no numéricos) pasan por Python.
+
+    Args:
+        serie: Serie con los valores originales (texto o numéricos)
+
+    Returns:
+        Tupla (valores float64, motivos) donde motivos es una Serie con el
+        motivo de las filas que pasaron a 0.0 (solo esas filas)
+    """
+    texto = serie.astype(str)
+    valores = pd.Series(_extraer_vectorizado(texto), index=serie.index)
+
+    pendientes = valores.isna().to_numpy()
+    motivos = pd.Series([], dtype=object)
+    if pendientes.any():
+        respaldo = [_respaldo(valor) for valor in texto[pendientes]]
+        fallidos = np.array([valor is None for valor in respaldo])
+        valores[pendientes] = [0.0 if valor is None else valor for valor in respaldo]
+        indices = serie.index[pendientes][fallidos]
+        if len(indices):
+            vacios = texto[indices].str.strip() == ''
+            motivos = pd.Series(np.where(vacios, MOTIVO_VACIO, MOTIVO_NO_NUMERICO), index=indices)
+
+    return valores, motivos
+
+
+def _nuevo_reporte():
+    return {'filas': 0, 'nulos': 0, 'en_cero': {}, 'ejemplos': {}}
+
+
+def _acumular(reporte, serie, valores, motivos, max_ejemplos=5):
+    reporte['filas'] += len(serie)
+    reporte['nulos'] += int(valores.isna().sum())
+    for motivo, indices in motivos.groupby(motivos).groups.items():
+        reporte['en_cero'][motivo] = reporte['en_cero'].get(motivo, 0) + len(indices)
+        ejemplos = reporte['ejemplos'].setdefault(motivo, [])
+        faltan = max_ejemplos - len(ejemplos)
+        if faltan > 0:
+            ejemplos.extend(serie[indices[:faltan]].astype(str).tolist())
+
+
+def limpiar_dataframe(df, columnas=('Porcentaje',)):
+    """
+    Limpiar las columnas de porcentaje de un DataFrame.
+
+    Returns:
+        Tupla (DataFrame limpio, reporte)
+    """
+    df = df.copy()
+    reporte = _nuevo_reporte()
+    for columna in columnas:
+        valores, motivos = limpiar_porcentajes(df[columna])
+        _acumular(reporte, df[columna], valores, motivos)
+        df[columna] = valores
+    return df, reporte
+
+
+def limpiar_csv_por_bloques(entrada, salida, columnas=('Porcentaje',), chunksize=500_000):
+    """
+    Limpiar un CSV por bloques, con memoria acotada por el tamaño del bloque.
+
+    Sirve para exportaciones completas de Madnight (todas las métricas y
+    años): las columnas que no se limpian se copian tal cual. La salida se
+    escribe en un temporal y se reemplaza al terminar.
+
+    Returns:
+        Reporte de la limpieza (filas, nulos y filas en 0.0 por motivo)
+    """
+    reporte = _nuevo_reporte()
+    reporte['bloques'] = 0
+    # Las columnas a limpiar se leen como texto para que todos los bloques
+    # tengan el mismo tipo aunque alguno no traiga valores concatenados
+    lector = pd.read_csv(entrada, chunksize=chunksize, dtype={c: str for c in columnas})
+    try:
+        with archivo_atomico(salida) as tmp_path:
+            for i, bloque in enumerate(lector):
+                for columna in columnas:
+                    valores, motivos = limpiar_porcentajes(bloque[columna])
+                    _acumular(reporte, bloque[columna], valores, motivos)
+                    bloque[columna] = valores
+                bloque.to_csv(tmp_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                reporte['bloques'] += 1
+    finally:
+        lector.close()
+    return reporte
+
+
+def imprimir_reporte(reporte):
+    """Resumen de texto de la limpieza"""
+    print(f"Filas procesadas: {reporte['filas']:,}")
+    print(f"Valores nulos (se mantienen como NaN): {reporte['nulos']:,}")
+    if not reporte['en_cero']:
+        print("Filas en 0.0: 0")
+    for motivo, cantidad in reporte['en_cero'].items():
+        ejemplos = ', '.join(repr(e) for e in reporte['ejemplos'].get(motivo, []))
+        print(f"Filas en 0.0 por '{motivo}': {cantidad:,} (ej: {ejemplos})")
+
+
+def _datos_sinteticos(filas, semilla=12):
+    """Valores de Porcentaje muestreados del CSV real más algunos casos de respaldo"""
+    reales = pd.read_csv('Datos/MadnightPullRequests.csv', dtype={'Porcentaje': str})['Porcentaje'].to_numpy()
+    especiales = np.array(['12', '-1.5', '1e-05', ' 3.2', 'n/a', '', '1,5'], dtype=object)
+    rng = np.random.default_rng(semilla)
+    valores = rng.choice(reales, size=filas)
+    posiciones = rng.choice(filas, size=max(1, filas // 1000), replace=False)
+    valores[posiciones] = rng.choice(especiales, size=len(posiciones))
+    return pd.Series(valores, dtype=object)
+
+
+def benchmark(tamanos=(10_000, 1_000_000, 10_000_000)):
+    """Comparar la limpieza fila por fila contra la vectorizada"""
+    print(f"{'filas':>12} {'fila a fila':>14} {'vectorizada':>14} {'aceleración':>12}")
+    for filas in tamanos:
+        serie = _datos_sinteticos(filas)
+
+        inicio = time.perf_counter()
+        serie.apply(limpiar_porcentaje)
+        t_anterior = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        limpiar_porcentajes(serie)
+        t_nuevo = time.perf_counter() - inicio
+
+        print(f"{filas:>12,} {t_anterior:>12.3f} s {t_nuevo:>12.3f} s {t_anterior / t_nuevo:>11.1f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Limpiar porcentajes de Madnight")
+    parser.add_argument('entrada', nargs='?', default='Datos/MadnightPullRequests.csv')
+    parser.add_argument('salida', nargs='?', default='Datos_procesados/MadnightPullRequests_cleaned.csv')
+    parser.add_argument('--columnas', nargs='+', default=['Porcentaje'])
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    parser.add_argument('--benchmark', action='store_true', help="Comparar ambas versiones")
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.filas)
+    else:
+        inicio = time.perf_counter()
+        reporte = limpiar_csv_por_bloques(args.entrada, args.salida, args.columnas, args.chunksize)
+        print(f"{args.salida}: {reporte['bloques']} bloque(s) en {time.perf_counter() - inicio:.2f} s")
+        imprimir_reporte(reporte)
@@ -1,35 +1,63 @@
-import pandas as pd
+# El medidor de arranque se crea antes que cualquier import pesado
+from startup_timer import StartupTimer
+TIEMPOS_ARRANQUE = StartupTimer()
+
+import os
+import sys
+import threading
+import time
 import plotly.graph_objects as go
 import plotly.express as px
 import dash
-from dash import Dash, dcc, html, dash_table, Input, Output, State, callback_context
+from dash import Dash, dcc, html, dash_table, Input, Output, State, callback_context, ClientsideFunction
+from flask import request
 import numpy as np
+import pandas as pd
 from plotly.subplots import make_subplots
+from build_pipeline import LENGUAJES_TIOBE
+from data_repository import fijar_repositorio, get_repository, liberar_repositorio
+from data_reload import recarga_datos
+from pr_cube import PullRequestCube
+from tiobe_matrix import RatingMatrix, construir_matriz_tiobe
+from figure_cache import cached_figure, figure_cache
+from submuestreo import MODO_LINEAS, puntos_por_serie, submuestrear, usar_webgl
+from tendencias import obtener_tendencias
+from ranking_historico import obtener_historial_ranking
+from pronostico import MESES_PRONOSTICO, obtener_pronostico
+from lenguajes import COLUMNA_CODIGO, codificar
+from historial_trending import HISTORIAL_DIR, HistorialTrending, ventana
+from indice_repos import METRICAS_REPOS, IndiceRepos
+from busqueda_repos import TABLAS_BUSQUEDA, IndiceBusqueda
+from tabla_indicadores import FILAS_POR_PAGINA, CacheLRU, TablaIndicadores, usar_modo_servidor
+from resaltado_seleccion import (
+    SELECCION_CLIENTE, SELECCION_PARCIAL, aplicar_a_figura, cambios_barras, cambios_barras_de, cambios_heatmap,
+    cambios_heatmap_de, cambios_lineas, cambios_lineas_de, cambios_medidores, cambios_medidores_de,
+    como_patch, reglas_tabla,
+)
+
+# Modo de arranque perezoso: el agente IA (anthropic/dotenv), los datos y las
+# figuras iniciales se preparan después de que el servidor está escuchando.
+# Se activa con CODETRENDS_LAZY_STARTUP=1 o con `python main.py --lazy`.
+LAZY_STARTUP = os.getenv('CODETRENDS_LAZY_STARTUP', '0') == '1' or '--lazy' in sys.argv
 
-# Importar agente IA (manejo de error si no esta configurado)
-try:
-    from ai_agent import CodeTrendsAgent
-    AI_AVAILABLE = True
-except Exception as e:
-    AI_AVAILABLE = False
-    print(f"Agente IA no disponible: {e}")
+# El cliente HTTP del agente IA (conexiones abiertas, hilos) no debe heredarse
+# por fork: con el preload de gunicorn (wsgi.py) cada worker crea el suyo
+AGENTE_POR_WORKER = os.getenv('CODETRENDS_AGENTE_POR_WORKER', '0') == '1'
+
+TIEMPOS_ARRANQUE.marcar('imports')
 
 # =========================
 # 1) Cargar y preparar datos
 # =========================
 
-# Datos de Series de Tiempo y Rating Promedio
-rating_promedio_df = pd.read_csv("Datos_procesados/Rating_promedio.csv")
-time_series_df = pd.read_csv("Datos/Series_de_Tiempo.csv")
-time_series_df['Date'] = pd.to_datetime(time_series_df['Date'])
-
-# Datos de GitHub Trending
-df_stats_lang = pd.read_csv('Datos_procesados/Estadisticas_lenguajes.csv')
-df_top_repos = pd.read_csv('Datos_procesados/Top_repos_clean.csv')
-df_repos_lang = pd.read_csv('Datos_procesados/Repos_por_lenguaje_clean.csv')
+# Todos los datasets se obtienen del repositorio compartido (get_repository()):
+# se cargan bajo demanda desde los snapshots columnares, existen una sola vez
+# por proceso y son los mismos que usa el agente IA. Son vistas sin copia:
+# las escrituras en el lugar se hacen sobre df.copy() (vista_compartida).
 
-# Datos de Pull Requests
-df_original = pd.read_csv('Datos_procesados/MadnightPullRequests_cleaned.csv')
+# Las funciones que construyen figuras se memoizan con @cached_figure
+# (figure_cache.py) según sus argumentos y la versión de los datos, por eso
+# los callbacks las llaman sin pasar DataFrames.
 
 # Filtro de lenguajes específicos para Pull Requests
 LENGUAJES_SELECCIONADOS = [
@@ -38,92 +66,302 @@ LENGUAJES_SELECCIONADOS = [
     'MATLAB', 'PHP', 'Go', 'Kotlin'
 ]
 
-df = df_original[df_original['Lenguaje'].isin(LENGUAJES_SELECCIONADOS)].copy()
+# Las mismas listas como códigos canónicos (lenguajes.py): los filtros y
+# cruces entre fuentes comparan enteros, sin depender de cómo escribe cada
+# fuente el nombre del lenguaje
+CODIGOS_SELECCIONADOS = codificar(LENGUAJES_SELECCIONADOS)
+CODIGOS_TIOBE = codificar(LENGUAJES_TIOBE)
+
+
+def obtener_cubo_pr():
+    """
+    Cubo (año, trimestre, lenguaje) con todos los lenguajes de Madnight; se
+    construye una sola vez por versión de datos y los gráficos de Pull
+    Requests lo cortan según CODIGOS_SELECCIONADOS
+    """
+    return get_repository().derived(
+        'cubo_pull_requests',
+        lambda repositorio: PullRequestCube.desde_dataframe(repositorio.get('pull_requests'))
+    )
+
+
+def construir_historial_trending(repositorio):
+    """Builder del derivado 'historial_trending' de un repositorio"""
+    return HistorialTrending(os.path.join(repositorio.base_dir, HISTORIAL_DIR))
+
+
+def obtener_historial_trending():
+    """
+    Índice del historial de GitHub Trending (historial_trending.py); las
+    particiones de cada día se abren recién cuando un gráfico las pide
+    """
+    return get_repository().derived('historial_trending', construir_historial_trending)
+
+
+# Ventanas del selector de snapshots de GitHub Trending (además de cada día)
+VENTANAS_TRENDING = {'ultimos-7': 'Últimos 7 Días', 'ultimos-30': 'Últimos 30 Días'}
+
+
+def repos_trending(tabla, periodo='actual'):
+    """
+    Repositorios de GitHub Trending de un periodo.
+
+    Args:
+        tabla: 'top_repos_clean' o 'repos_lenguaje_clean'
+        periodo: 'actual' (último scraping, Datos_procesados), una fecha
+            'YYYY-MM-DD' o una clave de VENTANAS_TRENDING
+
+    Returns:
+        DataFrame con las columnas de la tabla; los periodos del historial
+        traen la última observación de cada repositorio y Dias (días en trending)
+    """
+    if periodo == 'actual':
+        return get_repository().get(tabla)
+    historial = obtener_historial_trending()
+    return historial.ultimos(tabla, *ventana(periodo, historial.fechas(tabla)))
+
+
+def obtener_indice_repos(periodo='actual'):
+    """
+    Índice del top N por lenguaje (indice_repos.py) de los repositorios de un
+    periodo; el del último scraping se construye una sola vez por versión de
+    datos, el de un día o ventana del historial al pedirlo (el gráfico queda
+    en la caché de figuras)
+    """
+    if periodo == 'actual':
+        return get_repository().derived(
+            'indice_repos',
+            lambda repositorio: IndiceRepos(repositorio.get('repos_lenguaje_clean'))
+        )
+    return IndiceRepos(repos_trending('repos_lenguaje_clean', periodo))
+
+
+def obtener_busqueda_repos():
+    """
+    Índice de búsqueda por prefijo y subcadena (busqueda_repos.py) de todos
+    los repositorios de trending: los del último scraping y los del
+    historial, uno por usuario/repositorio
+    """
+    return get_repository().derived(
+        'busqueda_repos',
+        lambda repositorio: IndiceBusqueda.desde_tablas(
+            [repositorio.get(tabla) for tabla in TABLAS_BUSQUEDA]
+            + [repositorio.derived('historial_trending', construir_historial_trending).ultimos(tabla)
+               for tabla in TABLAS_BUSQUEDA]
+        )
+    )
+
+
+def opcion_busqueda(repo):
+    """Opción del buscador para un resultado de IndiceBusqueda.buscar"""
+    lenguaje = f" · {repo['Language']}" if repo['Language'] else ''
+    return {'label': f"{repo['User']}/{repo['Repository']}{lenguaje} · ★ {repo['NumberOfStar']:,}",
+            'value': f"{repo['User']}/{repo['Repository']}"}
+
+
+def velocidad_trending(periodo='actual'):
+    """
+    Estrellas y forks por día de cada lenguaje (historial_trending.py): el
+    último snapshot para 'actual' o el promedio de un día o ventana
+    """
+    historial = obtener_historial_trending()
+    fechas = historial.fechas('repos_lenguaje_clean')
+    if periodo == 'actual':
+        # Sin snapshots no hay particiones y el resultado queda vacío
+        desde = hasta = fechas[-1] if fechas else None
+    else:
+        desde, hasta = ventana(periodo, fechas)
+    return historial.velocidad_lenguajes('repos_lenguaje_clean', desde, hasta)
+
+
+def etiqueta_periodo_trending(periodo):
+    """Texto del periodo para los títulos ('' para el último scraping)"""
+    if periodo == 'actual':
+        return ''
+    return f" - {VENTANAS_TRENDING.get(periodo, periodo)}"
+
+
+def opciones_periodo_trending():
+    """Opciones del selector: último scraping, ventanas y cada día del historial (más reciente primero)"""
+    fechas = obtener_historial_trending().fechas('top_repos_clean')
+    opciones = [{'label': 'Último Scraping', 'value': 'actual'}]
+    if fechas:
+        opciones += [{'label': etiqueta, 'value': valor} for valor, etiqueta in VENTANAS_TRENDING.items()]
+        opciones += [{'label': fecha, 'value': fecha} for fecha in reversed(fechas)]
+    return opciones
+
+
+def obtener_matriz_tiobe():
+    """
+    Matriz lenguaje x observación mensual de Series_de_Tiempo; se pivotea una
+    sola vez por versión de datos
+    """
+    return get_repository().derived('matriz_tiobe', construir_matriz_tiobe)
 
 
 # ============================================================================
 # SECCIÓN 1: FUNCIONES PARA ANÁLISIS DE SERIES DE TIEMPO Y POPULARIDAD
 # ============================================================================
 
-def getIndicadorAnio(df, anio1='2024', anio2='2025', selected_language=None):
+# Estilos condicionales base de la tabla de indicadores
+ESTILOS_TABLA_INDICADOR = [
+    # Filas alternas con fondo azul muy claro
+    {
+        "if": {"row_index": "odd"},
+        "backgroundColor": "#f7fbff"
+    },
+    # Indicador positivo - azul claro
+    {
+        "if": {
+            "filter_query": "{Indicador} > 0",
+            "column_id": "Indicador",
+        },
+        "backgroundColor": "#c6dbef",
+        "color": "#084594",
+        "fontWeight": "bold",
+    },
+    # Indicador negativo - rojo suave que combina
+    {
+        "if": {
+            "filter_query": "{Indicador} < 0",
+            "column_id": "Indicador",
+        },
+        "backgroundColor": "#fee5d9",
+        "color": "#a50f15",
+        "fontWeight": "bold",
+    },
+    # Indicador neutro (0)
+    {
+        "if": {
+            "filter_query": "{Indicador} = 0",
+            "column_id": "Indicador",
+        },
+        "backgroundColor": "#f0f0f0",
+        "color": "#636363",
+        "fontWeight": "bold",
+    },
+]
+
+
+MESES_CORTOS = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+
+
+def periodo_anio(anio):
+    """Periodo (mes inicial, mes final) de un año completo, en ordinales año * 12 + mes - 1"""
+    return int(anio) * 12, int(anio) * 12 + 11
+
+
+def etiqueta_periodo(mes1, mes2):
+    """'2020' para un año completo; si no 'Mar 2020', 'Mar-Sep 2020' o 'Mar 2020-Feb 2021'"""
+    anio1, m1 = divmod(int(mes1), 12)
+    anio2, m2 = divmod(int(mes2), 12)
+    if anio1 == anio2 and m1 == 0 and m2 == 11:
+        return str(anio1)
+    if mes1 == mes2:
+        return f'{MESES_CORTOS[m1]} {anio1}'
+    if anio1 == anio2:
+        return f'{MESES_CORTOS[m1]}-{MESES_CORTOS[m2]} {anio1}'
+    return f'{MESES_CORTOS[m1]} {anio1}-{MESES_CORTOS[m2]} {anio2}'
+
+
+def calcular_indicadores(df, anio1, anio2):
+    """Filas de la tabla de indicadores, ordenadas por Indicador descendente"""
+    df_anio = df[['Language', anio1, anio2]].copy()
+    df_anio['Indicador'] = (df_anio[anio2] - df_anio[anio1]).round(2)
+    return df_anio.sort_values(by="Indicador",ascending=False)
+
+
+def indicadores_periodos(matriz, periodo1, periodo2):
+    """
+    Filas de la tabla de indicadores para dos rangos de meses cualesquiera.
+
+    El rating promedio de cada periodo sale de las sumas acumuladas de la
+    matriz TIOBE (O(1) por lenguaje), sin Rating_promedio.csv. Con años
+    completos coincide con las columnas anuales de ese archivo.
+    """
+    columna1, columna2 = etiqueta_periodo(*periodo1), etiqueta_periodo(*periodo2)
+    if columna2 == columna1:
+        columna2 = f'{columna2} (2)'
+    incluidos = np.isin(matriz.codigos, CODIGOS_TIOBE)
+    # El redondeo intermedio quita el error de las restas de sumas acumuladas
+    # antes de redondear a 2 decimales (p. ej. 2.14500000001 -> 2.145)
+    df_periodos = pd.DataFrame({
+        'Language': matriz.lenguajes[incluidos],
+        columna1: matriz.promedio_meses(*periodo1)[incluidos].round(9).round(2),
+        columna2: matriz.promedio_meses(*periodo2)[incluidos].round(9).round(2),
+    }).sort_values('Language', ignore_index=True)
+    return calcular_indicadores(df_periodos, columna1, columna2)
+
+
+# Tablas de indicadores guardadas por versión de datos (pares de periodos más usados)
+TABLAS_INDICADORES_POR_VERSION = 16
+
+
+def obtener_tabla_indicadores(periodo1, periodo2):
+    """
+    Tabla de indicadores de dos periodos con sus índices de orden (modo
+    servidor). Cada versión de datos guarda las TABLAS_INDICADORES_POR_VERSION
+    más usadas: los pares de meses del slider son demasiados para que cada
+    uno sea un derivado permanente que además se reconstruye en cada recarga.
+    """
+    repositorio = get_repository()
+    tablas = repositorio.derived('tablas_indicadores', lambda _: CacheLRU(TABLAS_INDICADORES_POR_VERSION))
+    return tablas.obtener(
+        (tuple(periodo1), tuple(periodo2)),
+        lambda: TablaIndicadores.desde_dataframe(indicadores_periodos(
+            repositorio.derived('matriz_tiobe', construir_matriz_tiobe), periodo1, periodo2))
+    )
+
+
+def getIndicadorAnio(df=None, anio1='2024', anio2='2025', selected_language=None, periodo1=None, periodo2=None):
     """
     ¿Cuál fue el porcentaje de aumento o disminución en la popularidad
     de cada lenguaje de programación en el periodo seleccionado?
+
+    Compara dos rangos de meses (periodo1 y periodo2, por defecto los años
+    anio1 y anio2 completos). Con un DataFrame de columnas anuales (df) se
+    usan esas columnas directamente.
+
+    Con más lenguajes que FILAS_POR_PAGINA (o CODETRENDS_TABLA_SERVIDOR=1) la
+    paginación, el orden y el filtro se hacen en el servidor
+    (paginar_tabla_indicadores) y la tabla solo lleva la primera página.
     """
-    df_anio = df[['Language', anio1, anio2]].copy()
-    df_anio['Indicador'] = (df_anio[anio2] - df_anio[anio1]).round(2)
-    df_anio = df_anio.sort_values(by="Indicador",ascending=False)
-
-    # Estilos condicionales base
-    style_data_conditional = [
-        # Filas alternas con fondo azul muy claro
-        {
-            "if": {"row_index": "odd"},
-            "backgroundColor": "#f7fbff"
-        },
-        # Indicador positivo - azul claro
-        {
-            "if": {
-                "filter_query": "{Indicador} > 0",
-                "column_id": "Indicador",
-            },
-            "backgroundColor": "#c6dbef",
-            "color": "#084594",
-            "fontWeight": "bold",
-        },
-        # Indicador negativo - rojo suave que combina
-        {
-            "if": {
-                "filter_query": "{Indicador} < 0",
-                "column_id": "Indicador",
-            },
-            "backgroundColor": "#fee5d9",
-            "color": "#a50f15",
-            "fontWeight": "bold",
-        },
-        # Indicador neutro (0)
-        {
-            "if": {
-                "filter_query": "{Indicador} = 0",
-                "column_id": "Indicador",
-            },
-            "backgroundColor": "#f0f0f0",
-            "color": "#636363",
-            "fontWeight": "bold",
-        },
-    ]
+    if df is None:
+        periodo1 = periodo1 or periodo_anio(anio1)
+        periodo2 = periodo2 or periodo_anio(anio2)
+        df_indicadores = indicadores_periodos(obtener_matriz_tiobe(), periodo1, periodo2)
+    else:
+        df_indicadores = calcular_indicadores(df, anio1, anio2)
+    _, columna1, columna2, _ = df_indicadores.columns
 
-    # Si hay un lenguaje seleccionado, resaltar esa fila y atenuar las demás
-    if selected_language:
-        style_data_conditional.append({
-            "if": {
-                "filter_query": f"{{Language}} = '{selected_language}'",
-            },
-            "backgroundColor": "#2171b5",
-            "color": "white",
-            "fontWeight": "bold",
-        })
-        # Atenuar las filas no seleccionadas
-        for lang in df_anio['Language'].unique():
-            if lang != selected_language:
-                style_data_conditional.append({
-                    "if": {
-                        "filter_query": f"{{Language}} = '{lang}'",
-                    },
-                    "opacity": "0.4",
-                })
+    if usar_modo_servidor(len(df_indicadores)):
+        if df is None:
+            tabla_indicadores = obtener_tabla_indicadores(periodo1, periodo2)
+        else:
+            tabla_indicadores = TablaIndicadores.desde_dataframe(df_indicadores)
+        data, page_count = tabla_indicadores.pagina(0, FILAS_POR_PAGINA)
+        modo = dict(
+            page_action="custom", page_current=0, page_size=FILAS_POR_PAGINA, page_count=page_count,
+            sort_action="custom", sort_by=[], filter_action="custom", filter_query='',
+        )
+    else:
+        data = df_indicadores.to_dict("records")
+        modo = dict(sort_action="native")
+
+    # Estilos base más el resaltado de la fila seleccionada (las demás atenuadas)
+    style_data_conditional = ESTILOS_TABLA_INDICADOR + reglas_tabla(selected_language)
 
     table = dash_table.DataTable(
         id='tabla-indicador',
         columns=[
             {"name": "Lenguaje", "id": "Language"},
-            {"name": anio1, "id": anio1, "type": "numeric"},
-            {"name": anio2, "id": anio2, "type": "numeric"},
+            {"name": columna1, "id": columna1, "type": "numeric"},
+            {"name": columna2, "id": columna2, "type": "numeric"},
             {"name": "Indicador (%)", "id": "Indicador", "type": "numeric"},
         ],
-        data=df_anio.to_dict("records"),
-        sort_action="native",
+        data=data,
         sort_mode="single",
+        **modo,
         row_selectable=False,
         cell_selectable=True,
         style_table={
@@ -158,33 +396,145 @@ def getIndicadorAnio(df, anio1='2024', anio2='2025', selected_language=None):
 
     return table
 
-def create_line_chart(df, anio1=2020, anio2=2025, selected_language=None):
+# Traza extra con la serie completa del lenguaje seleccionado (modo WebGL)
+UID_SERIE_COMPLETA = 'serie-completa'
+
+# Marca y color de cada tipo de evento detectado (deteccion_eventos.py)
+MARCAS_EVENTO = {
+    'sube': ('▲', '#1a9850'),
+    'baja': ('▼', '#d73027'),
+    'anomalia': ('◆', '#ff7f0e'),
+}
+
+
+def obtener_eventos(fuente):
+    """
+    Eventos de una fuente ('tiobe' o 'pull_requests'). Se detectan al
+    construir Datos_procesados (build_pipeline.py); aquí solo se leen.
+    """
+    eventos = get_repository().get('eventos')
+    return eventos[eventos['Fuente'] == fuente]
+
+
+def anotacion_evento(evento, x, y, desplazamiento):
+    """
+    Anotación de un evento con el detalle en el hover: los cambios de nivel
+    van `desplazamiento` píxeles arriba del punto y las anomalías debajo,
+    para que no se tapen si coinciden
+    """
+    if evento.Tipo == 'anomalia':
+        marca, color = MARCAS_EVENTO['anomalia']
+        detalle = f"{evento.Lenguaje}: anomalía en {evento.Periodo} ({evento.Valor:.2f}%, se esperaba {evento.Referencia:.2f}%)"
+    else:
+        marca, color = MARCAS_EVENTO['sube' if evento.Nivel >= evento.Referencia else 'baja']
+        detalle = (f"{evento.Lenguaje}: cambio de nivel en {evento.Periodo} "
+                   f"({evento.Referencia:.2f}% → {evento.Nivel:.2f}%)")
+    return dict(x=x, y=y, text=marca, hovertext=detalle, showarrow=False, font=dict(size=14, color=color),
+                yshift=-desplazamiento if evento.Tipo == 'anomalia' else desplazamiento)
+
+
+def cambios_serie_completa(figura, df, anio1, anio2, seleccionado):
+    """
+    Gráfico de tendencia en modo WebGL: la última traza lleva la serie
+    completa del lenguaje seleccionado (las demás están submuestreadas), con
+    su color y el estilo resaltado; sin selección queda vacía.
+    """
+    datos = figura['data'] if isinstance(figura, dict) else figura.to_plotly_json()['data']
+    extra = len(datos) - 1
+    color = next((traza['line']['color'] for traza in datos[:-1] if traza.get('name') == seleccionado), None)
+    if color is None:
+        vacia = [(('data', extra, 'x'), []), (('data', extra, 'y'), []), (('data', extra, 'name'), ''),
+                 (('data', extra, 'line', 'color'), None), (('data', extra, 'marker', 'color'), None)]
+        # Mismo estilo que cualquier traza no seleccionada
+        return vacia + [(('data', extra) + ruta[2:], valor) for ruta, valor in cambios_lineas([''], seleccionado)]
+    serie = df[(df['Year'] >= anio1) & (df['Year'] <= anio2) & (df['Language'] == seleccionado)]
+    return [
+        (('data', extra, 'x'), serie['Date'].dt.strftime('%Y-%m-%d').tolist()),
+        (('data', extra, 'y'), serie['Rating'].tolist()),
+        (('data', extra, 'name'), seleccionado),
+        (('data', extra, 'line', 'color'), color),
+        (('data', extra, 'marker', 'color'), color),
+        (('data', extra, 'line', 'width'), 4),
+        (('data', extra, 'marker', 'size'), 10),
+        (('data', extra, 'opacity'), None),
+    ]
+
+@cached_figure
+def create_line_chart(df=None, anio1=2020, anio2=2025, selected_language=None):
     """
     ¿Cómo ha sido el histórico de popularidad de cada uno de los lenguajes
     de programación seleccionados a lo largo del tiempo?
     """
+    origen_repositorio = df is None
+    if df is None:
+        df = get_repository().get('series_tiempo')
     # Filtrar datos por rango de años
     df_filtered = df[(df['Year'] >= anio1) & (df['Year'] <= anio2)].copy()
 
+    # Con muchos puntos: trazas WebGL y cada serie reducida con LTTB
+    # (submuestreo.py); el lenguaje seleccionado se dibuja completo en una
+    # traza extra al final (cambios_serie_completa)
+    webgl = usar_webgl(len(df_filtered))
+    if webgl:
+        umbral = puntos_por_serie(df_filtered['Language'].nunique())
+        df_filtered = submuestrear(df_filtered, 'Language', 'Date', 'Rating', umbral)
+
+    # El pronóstico (pronostico.py) continúa las series de los datos del
+    # repositorio cuando el rango llega hasta el último año con datos
+    con_pronostico = (origen_repositorio and MESES_PRONOSTICO > 0 and len(df) > 0
+                      and anio2 >= df['Year'].max())
+    titulo = f'Tendencia de Popularidad de Lenguajes de Programación ({anio1}-{anio2})'
+    if con_pronostico:
+        titulo += f' y Pronóstico a {MESES_PRONOSTICO} Meses'
+
     fig = px.line(
         df_filtered,
         x='Date',
         y='Rating',
         color='Language',
-        title=f'Tendencia de Popularidad de Lenguajes de Programación ({anio1}-{anio2})',
+        title=titulo,
         color_discrete_sequence=px.colors.qualitative.Light24,
-        markers=True
+        markers=True,
+        render_mode='webgl' if webgl else 'auto'
     )
 
+    # Pronóstico: línea punteada del color de cada lenguaje, con el intervalo
+    # del 95% en el hover; se resalta junto con su serie (mismo nombre)
+    if con_pronostico:
+        pronostico = obtener_pronostico()
+        traza = go.Scattergl if webgl else go.Scatter
+        for serie in list(fig.data):
+            fechas, media, inferior, superior = pronostico.serie(serie.name)
+            if np.isnan(media[1:]).all():
+                continue
+            fig.add_trace(traza(
+                x=fechas, y=media, name=serie.name, mode='lines', legendgroup=serie.legendgroup,
+                showlegend=False, line=dict(color=serie.line.color, dash='dash'), marker=dict(symbol='circle'),
+                customdata=np.column_stack([inferior, superior]),
+                hovertemplate='Language=%{fullData.name}<br>Date=%{x}<br>Pronóstico=%{y:.2f}'
+                              '<br>Intervalo 95%: %{customdata[0]:.2f} - %{customdata[1]:.2f}<extra></extra>'
+            ))
+
+    if webgl:
+        fig.add_trace(go.Scattergl(
+            x=[], y=[], name='', uid=UID_SERIE_COMPLETA, mode='lines+markers',
+            marker=dict(symbol='circle'), line=dict(dash='solid'), showlegend=False,
+            hovertemplate='Language=%{fullData.name}<br>Date=%{x}<br>Rating=%{y}<extra></extra>'
+        ))
+
     # Si hay un lenguaje seleccionado, resaltar solo ese
-    if selected_language:
-        for trace in fig.data:
-            if trace.name == selected_language:
-                trace.line.width = 4
-                trace.marker.size = 10
-            else:
-                trace.opacity = 0.2
-                trace.line.width = 1
+    aplicar_a_figura(fig, cambios_lineas([trace.name for trace in fig.data], selected_language))
+    if webgl:
+        aplicar_a_figura(fig, cambios_serie_completa(fig, df, anio1, anio2, selected_language))
+
+    # Cambios de nivel y anomalías detectados en el rango
+    if origen_repositorio:
+        eventos = obtener_eventos('tiobe')
+        anios_evento = eventos['Fecha'].dt.year
+        en_grafico = eventos[(anios_evento >= anio1) & (anios_evento <= anio2)
+                             & eventos[COLUMNA_CODIGO].isin(df_filtered[COLUMNA_CODIGO].unique())]
+        for evento in en_grafico.itertuples():
+            fig.add_annotation(**anotacion_evento(evento, evento.Fecha, evento.Valor, 10))
 
     fig.update_layout(
         legend=dict(
@@ -206,60 +556,36 @@ def create_line_chart(df, anio1=2020, anio2=2025, selected_language=None):
 
     return fig
 
-def get_monthly_winners(df, year1=2020, year2=2025, selected_language=None):
+@cached_figure
+def get_monthly_winners(df=None, year1=2020, year2=2025, selected_language=None):
     """
     ¿Cuál es el lenguaje de programación con más apariciones en el Top 1
     a lo largo de todos los años registrados?
     """
-    df_filtered = df[(df['Year'] >= int(year1)) & (df['Year'] <= int(year2))].copy()
-    df_filtered['Month'] = df_filtered["Date"].dt.strftime("%B")
-    idx = df_filtered.groupby(["Year", "Month"])["Rating"].idxmax().reset_index(drop=True)
-    winners = df_filtered.loc[idx, ["Year", "Month", "Language"]].copy()
-    counts = (
-        winners.groupby(["Language"])
-        .size()
-        .reset_index(name="Top1_Count").sort_values(by="Top1_Count", ascending=False)
+    # Ganador de cada observación mensual (argmax sobre la matriz); cada fecha
+    # cuenta por separado aunque dos caigan en el mismo mes calendario
+    matriz = obtener_matriz_tiobe() if df is None else RatingMatrix.desde_dataframe(df)
+    lenguajes_top1, conteos_top1 = matriz.conteo_top1(year1, year2)
+    counts = pd.DataFrame({'Language': lenguajes_top1, 'Top1_Count': conteos_top1})
+
+    fig = px.bar(
+        counts,
+        x='Language',
+        y='Top1_Count',
+        title=f'Número de Veces que Cada Lenguaje Fue el Mejor Calificado ({year1}-{year2})',
+        color='Top1_Count',
+        color_continuous_scale='blues',
+        text='Top1_Count'
+    )
+    fig.update_traces(
+        textfont=dict(size=15, color='black', family='Arial Black'),
+        textposition='outside'
     )
 
-    # Crear colores personalizados si hay un lenguaje seleccionado
-    if selected_language:
-        colors_list = []
-        opacities = []
-        for lang in counts['Language']:
-            if lang == selected_language:
-                colors_list.append('#084594')  # Azul oscuro para seleccionado
-                opacities.append(1)
-            else:
-                colors_list.append('#c6dbef')  # Azul claro para no seleccionados
-                opacities.append(0.3)
-
-        fig = go.Figure(data=[go.Bar(
-            x=counts['Language'],
-            y=counts['Top1_Count'],
-            text=counts['Top1_Count'],
-            marker=dict(color=colors_list, opacity=opacities),
-            textfont=dict(size=15, color='black', family='Arial Black'),
-            textposition='outside'
-        )])
-        fig.update_layout(
-            title=f'Número de Veces que Cada Lenguaje Fue el Mejor Calificado ({year1}-{year2})',
-            xaxis_title='Language',
-            yaxis_title='Top1_Count'
-        )
-    else:
-        fig = px.bar(
-            counts,
-            x='Language',
-            y='Top1_Count',
-            title=f'Número de Veces que Cada Lenguaje Fue el Mejor Calificado ({year1}-{year2})',
-            color='Top1_Count',
-            color_continuous_scale='blues',
-            text='Top1_Count'
-        )
-        fig.update_traces(
-            textfont=dict(size=15, color='black', family='Arial Black'),
-            textposition='outside'
-        )
+    # Si hay un lenguaje seleccionado, resaltar su barra y atenuar las demás
+    aplicar_a_figura(fig, cambios_barras(
+        counts['Language'], counts['Top1_Count'], selected_language, eje_color=True
+    ))
 
     fig.update_layout(
         paper_bgcolor='rgba(0,0,0,0)',
@@ -273,51 +599,122 @@ def get_monthly_winners(df, year1=2020, year2=2025, selected_language=None):
     )
     return fig
 
+@cached_figure
+def crear_bump_chart(anio1=2020, anio2=2025, top=10, selected_language=None):
+    """
+    ¿Cómo han cambiado las posiciones de los lenguajes del top en el
+    ranking TIOBE mes a mes?
+    """
+    # Posiciones ya ordenadas una vez por versión de datos (ranking_historico.py);
+    # cada traza solo trae los meses en que el lenguaje cambia de posición
+    historial = obtener_historial_ranking()
+    paleta = px.colors.qualitative.Light24
+    fig = go.Figure()
+    for lenguaje, fechas, posiciones in historial.trayectorias(top, anio1, anio2):
+        color = paleta[historial.indice(lenguaje) % len(paleta)]
+        fig.add_trace(go.Scattergl(
+            x=fechas, y=posiciones, name=lenguaje, mode='lines+markers',
+            line=dict(color=color), marker=dict(color=color),
+            hovertemplate='Language=%{fullData.name}<br>Fecha=%{x}<br>Posición=%{y}<extra></extra>'
+        ))
+
+    # Si hay un lenguaje seleccionado, resaltar solo ese
+    aplicar_a_figura(fig, cambios_lineas([trace.name for trace in fig.data], selected_language))
+
+    fig.update_layout(
+        title=f'Posición en el Ranking TIOBE ({anio1}-{anio2})',
+        yaxis=dict(title='Posición', autorange='reversed', dtick=1),
+        xaxis=dict(title='Date'),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.25,
+            xanchor="center",
+            x=0.5
+        ),
+        margin=dict(l=40, r=40, t=60, b=100),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title_x=0.5,
+        title_xanchor='center',
+        title_font={'size': 12, 'color': '#08306b'}
+    )
+    return fig
+
 # ============================================================================
 # SECCIÓN 2: FUNCIONES PARA GITHUB TRENDING
 # ============================================================================
 
-def crear_grafico_promedio_estrellas(selected_language=None):
+# Modos del gráfico 1: métrica -> (columna de velocidad_trending, título)
+METRICAS_VELOCIDAD = {
+    'estrellas_dia': ('EstrellasDia', 'Estrellas por Día'),
+    'forks_dia': ('ForksDia', 'Forks por Día'),
+}
+
+
+@cached_figure
+def crear_grafico_promedio_estrellas(selected_language=None, metrica='promedio', periodo='actual'):
     """
-    Gráfico 1: Promedio de Estrellas por Lenguaje
+    Gráfico 1: Promedio de Estrellas por Lenguaje, o los lenguajes cuyos
+    repositorios ganan más estrellas/forks por día (METRICAS_VELOCIDAD)
+    según el historial de trending
     """
-    top_10 = df_stats_lang.nlargest(10, 'Promedio_Stars')
-
-    # Crear colores y opacidades basados en selección
-    if selected_language and selected_language in top_10['Language'].values:
-        colors_list = ['#084594' if lang == selected_language else '#c6dbef' for lang in top_10['Language']]
-        opacities = [1 if lang == selected_language else 0.3 for lang in top_10['Language']]
+    if metrica in METRICAS_VELOCIDAD:
+        columna, nombre_metrica = METRICAS_VELOCIDAD[metrica]
+        top_10 = velocidad_trending(periodo).nlargest(10, columna)
+        valores = top_10[columna]
+        texto = valores.apply(lambda x: f'{x:,.1f}')
+        hover = f'{nombre_metrica}: %{{y:,.1f}}<br>Observaciones: %{{customdata}}<br>'
+        customdata = top_10['Repos']
+        titulo = f'{nombre_metrica} por Lenguaje{etiqueta_periodo_trending(periodo)}'
     else:
-        colors_list = top_10['Promedio_Stars']
-        opacities = [1] * len(top_10)
+        df_stats_lang = get_repository().get('estadisticas_github')
+        top_10 = df_stats_lang.nlargest(10, 'Promedio_Stars')
+        valores = top_10['Promedio_Stars']
+        texto = valores.apply(lambda x: f'{x:,.0f}')
+        hover = 'Promedio de Estrellas: %{y:,.0f}<br>'
+        customdata = None
+        nombre_metrica = 'Promedio de Estrellas'
+        titulo = 'Promedio de Estrellas por Lenguaje'
 
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
         x=top_10['Language'],
-        y=top_10['Promedio_Stars'],
-        text=top_10['Promedio_Stars'].apply(lambda x: f'{x:,.0f}'),
+        y=valores,
+        text=texto,
         textposition='inside',
         marker=dict(
-            color=colors_list if selected_language else top_10['Promedio_Stars'],
-            colorscale='blues' if not selected_language else None,
-            showscale=False,
-            opacity=opacities if selected_language else None
+            color=valores,
+            colorscale='blues',
+            showscale=False
         ),
+        customdata=customdata,
         hovertemplate='<b>%{x}</b><br>' +
-                      'Promedio de Estrellas: %{y:,.0f}<br>' +
+                      hover +
                       '<extra></extra>'
     ))
 
+    # Resaltar el lenguaje seleccionado si está entre los 10 primeros
+    aplicar_a_figura(fig, cambios_barras(
+        top_10['Language'], valores, selected_language, solo_si_presente=True
+    ))
+
+    if top_10.empty:
+        fig.add_annotation(
+            text='Se necesitan al menos dos snapshots del historial de trending',
+            showarrow=False, x=0.5, y=0.5, xref='paper', yref='paper', font=dict(size=13, color='#6b7a99')
+        )
+
     fig.update_layout(
         title={
-            'text': '<b>Promedio de Estrellas por Lenguaje</b>',
+            'text': f'<b>{titulo}</b>',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 18, 'color': '#08306b'}
         },
         xaxis_title='Lenguaje de Programación',
-        yaxis_title='Promedio de Estrellas',
+        yaxis_title=nombre_metrica,
         height=450,
         plot_bgcolor='rgba(247, 251, 255, 0.5)',
         paper_bgcolor='white',
@@ -328,11 +725,18 @@ def crear_grafico_promedio_estrellas(selected_language=None):
 
     return fig
 
-def crear_grafico_top_repositorios():
+@cached_figure
+def crear_grafico_top_repositorios(periodo='actual'):
     """
-    Gráfico 2: Top 10 Repositorios Más Populares
+    Gráfico 2: Top 10 Repositorios Más Populares (del último scraping o de
+    un día o ventana del historial)
     """
+    df_top_repos = repos_trending('top_repos_clean', periodo)
     top_repos = df_top_repos.nlargest(10, 'NumberOfStar').sort_values('NumberOfStar')
+    # En las ventanas del historial también se muestran los días en trending
+    hover = [top_repos['Language'], top_repos['User'], top_repos['NumberOfFork']]
+    if periodo in VENTANAS_TRENDING:
+        hover.append(top_repos['Dias'])
 
     fig = go.Figure()
 
@@ -348,18 +752,19 @@ def crear_grafico_top_repositorios():
             showscale=False,
             colorbar=dict(title="Número de<br>Estrellas")
         ),
-        customdata=np.column_stack((top_repos['Language'], top_repos['User'], top_repos['NumberOfFork'])),
+        customdata=np.column_stack(hover),
         hovertemplate='<b>%{y}</b><br>' +
                       'Estrellas: %{x:,}<br>' +
                       'Lenguaje: %{customdata[0]}<br>' +
                       'Usuario: %{customdata[1]}<br>' +
                       'Forks: %{customdata[2]:,}<br>' +
+                      ('Días en trending: %{customdata[3]}<br>' if periodo in VENTANAS_TRENDING else '') +
                       '<extra></extra>'
     ))
 
     fig.update_layout(
         title={
-            'text': '<b>Top 10 Repositorios Más Populares (GitHub Trending)</b>',
+            'text': f'<b>Top 10 Repositorios Más Populares (GitHub Trending){etiqueta_periodo_trending(periodo)}</b>',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 18, 'color': '#08306b'}
@@ -376,24 +781,39 @@ def crear_grafico_top_repositorios():
 
     return fig
 
-def crear_dropdown_repos_por_lenguaje():
+@cached_figure
+def crear_grafico_repos_lenguaje(lenguaje='Python', periodo='actual', top=5, orden='estrellas', destacado=None):
     """
-    Gráfico 3: Top 5 Repositorios por Lenguaje con Estrellas y Forks
+    Gráfico 3: Top N Repositorios de un lenguaje con Estrellas y Forks (del
+    último scraping o de un día o ventana del historial), ordenados por
+    estrellas o por forks (una clave de METRICAS_REPOS). destacado es el
+    'usuario/repositorio' elegido en el buscador: se marca con borde y, si
+    no entra en el top, se agrega al final.
     """
-    lenguajes = sorted(df_repos_lang['Language'].unique())
-    lenguaje_inicial = 'Python'
-    repos_inicial = df_repos_lang[df_repos_lang['Language'] == lenguaje_inicial].nlargest(5, 'NumberOfStar')
+    indice = obtener_indice_repos(periodo)
+    repos = indice.top(lenguaje, top, orden)
+    marcador_estrellas, marcador_forks = dict(color='#4292c6'), dict(color='#9ecae1')
+    if destacado:
+        usuario, _, repositorio = destacado.partition('/')
+        fila = indice.posicion(lenguaje, usuario, repositorio)
+        if fila is not None:
+            filas = indice.offsets(lenguaje, top, orden)
+            if fila not in filas:
+                filas = np.append(filas, fila)
+            repos = indice.df.iloc[filas]
+            borde = dict(color='#08306b', width=[3 if f == fila else 0 for f in filas])
+            marcador_estrellas['line'] = marcador_forks['line'] = borde
 
     fig = go.Figure()
 
     # Barra de Estrellas
     fig.add_trace(go.Bar(
         name='Estrellas',
-        x=repos_inicial['Repository'],
-        y=repos_inicial['NumberOfStar'],
-        text=repos_inicial['NumberOfStar'].apply(lambda x: f'{x:,}'),
+        x=repos['Repository'],
+        y=repos['NumberOfStar'],
+        text=repos['NumberOfStar'].apply(lambda x: f'{x:,}'),
         textposition='outside',
-        marker=dict(color='#4292c6'),  # Azul medio de la paleta Blues
+        marker=marcador_estrellas,  # Azul medio de la paleta Blues
         hovertemplate='<b>%{x}</b><br>' +
                       'Estrellas: %{y:,}<br>' +
                       '<extra></extra>'
@@ -402,11 +822,11 @@ def crear_dropdown_repos_por_lenguaje():
     # Barra de Forks
     fig.add_trace(go.Bar(
         name='Forks',
-        x=repos_inicial['Repository'],
-        y=repos_inicial['NumberOfFork'],
-        text=repos_inicial['NumberOfFork'].apply(lambda x: f'{x:,}'),
+        x=repos['Repository'],
+        y=repos['NumberOfFork'],
+        text=repos['NumberOfFork'].apply(lambda x: f'{x:,}'),
         textposition='outside',
-        marker=dict(color='#9ecae1'),  # Azul claro secundario de la paleta Blues
+        marker=marcador_forks,  # Azul claro secundario de la paleta Blues
         hovertemplate='<b>%{x}</b><br>' +
                       'Forks: %{y:,}<br>' +
                       '<extra></extra>'
@@ -414,7 +834,8 @@ def crear_dropdown_repos_por_lenguaje():
 
     fig.update_layout(
         title={
-            'text': f'<b>Top 5 Repositorios de {lenguaje_inicial}</b>',
+            'text': f'<b>Top {top} Repositorios de {lenguaje}'
+                    f'{" por Forks" if orden == "forks" else ""}{etiqueta_periodo_trending(periodo)}</b>',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 18, 'color': '#08306b'}
@@ -438,53 +859,40 @@ def crear_dropdown_repos_por_lenguaje():
         )
     )
 
-    return fig, lenguajes
+    return fig
+
+def crear_dropdown_repos_por_lenguaje():
+    """
+    Gráfico 3 inicial (Python) y lista de lenguajes para el dropdown
+    """
+    lenguajes = sorted(obtener_indice_repos().lenguajes)
+    return crear_grafico_repos_lenguaje('Python'), lenguajes
 
 # ============================================================================
 # SECCIÓN 3: FUNCIONES PARA PULL REQUESTS
 # ============================================================================
 
+@cached_figure
 def crear_grafico_top_lenguajes():
     """
     ¿Cuál es el lenguaje de programación con más pull request en el Top 1?
     """
-    top1_df = df[df['Ranking'] == 1].copy()
-
-    top1_por_anio = (
-        top1_df
-        .groupby(['Año', 'Lenguaje'])
-        .size()
-        .reset_index(name='Veces_Top1_en_Anio')
-    )
-
-    top1_anual = (
-        top1_por_anio
-        .sort_values(['Año', 'Veces_Top1_en_Anio'], ascending=[True, False])
-        .groupby('Año')
-        .head(1)
-    )
-
-    top1_count = (
-        top1_anual
-        .groupby('Lenguaje')
-        .size()
-        .reset_index(name='Años_en_Top1')
-        .sort_values('Años_en_Top1', ascending=True)
-    )
+    # Lenguaje con más trimestres en el puesto 1 de cada año, contado por lenguaje
+    lenguajes_top1, anios_top1 = obtener_cubo_pr().anios_en_top1(CODIGOS_SELECCIONADOS)
 
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
-        y=top1_count['Lenguaje'],
-        x=top1_count['Años_en_Top1'],
+        y=lenguajes_top1,
+        x=anios_top1,
         orientation='h',
         marker=dict(
-            color=top1_count['Años_en_Top1'],
+            color=anios_top1,
             colorscale='blues',
             showscale=False,
             colorbar=dict(title="Años<br>Top 1")
         ),
-        text=top1_count['Años_en_Top1'],
+        text=anios_top1,
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>' +
                       'Años en Top 1: %{x}<br>' +
@@ -513,7 +921,7 @@ def crear_grafico_top_lenguajes():
         margin=dict(l=100, r=50, t=80, b=50)
     )
 
-    max_count = top1_count['Años_en_Top1'].max()
+    max_count = anios_top1.max()
     fig.add_vline(x=max_count, line_dash="dash", line_color="#2171b5",
                   annotation_text=f"Máximo: {max_count}",
                   annotation_position="top right",
@@ -521,87 +929,45 @@ def crear_grafico_top_lenguajes():
 
     return fig
 
+@cached_figure
 def crear_heatmap_quarters(anio_seleccionado='Todos', num_lenguajes=15, selected_language=None):
     """
     ¿Cuál es el porcentaje de pull requests por trimestres?
     """
     if anio_seleccionado == 'Todos':
-        df_filtered = df.copy()
         titulo_anio = "Todos los Años (2020-2024)"
     else:
-        df_filtered = df[df['Año'] == int(anio_seleccionado)].copy()
         titulo_anio = f"Año {anio_seleccionado}"
 
-    if anio_seleccionado == 'Todos':
-        df_filtered['Periodo'] = df_filtered['Año'].astype(str) + '-Q' + df_filtered['Quarter'].astype(str)
-    else:
-        df_filtered['Periodo'] = 'Q' + df_filtered['Quarter'].astype(str)
-
-    heatmap_data = df_filtered.pivot_table(
-        index='Lenguaje',
-        columns='Periodo',
-        values='Porcentaje',
-        aggfunc='mean'
+    # Matriz lenguaje x periodo ordenada por promedio (corte del cubo)
+    top = num_lenguajes if num_lenguajes < len(LENGUAJES_SELECCIONADOS) else None
+    z_values, periodos, lenguajes_heatmap = obtener_cubo_pr().heatmap(
+        anio_seleccionado, CODIGOS_SELECCIONADOS, top
     )
 
-    heatmap_data = heatmap_data.fillna(0)
-
-    if anio_seleccionado != 'Todos':
-        quarter_order = ['Q1', 'Q2', 'Q3', 'Q4']
-        heatmap_data = heatmap_data[[col for col in quarter_order if col in heatmap_data.columns]]
-
-    heatmap_data['promedio'] = heatmap_data.mean(axis=1)
-    heatmap_data = heatmap_data.sort_values('promedio', ascending=False)
-
-    if num_lenguajes < 15:
-        heatmap_data = heatmap_data.head(num_lenguajes)
-
-    heatmap_data = heatmap_data.drop('promedio', axis=1)
-
-    # Crear colores personalizados si hay un lenguaje seleccionado
-    if selected_language and selected_language in heatmap_data.index:
-        # Crear una matriz de opacidades
-        z_values = heatmap_data.values
-        shapes = []
-
-        for i, lang in enumerate(heatmap_data.index):
-            if lang != selected_language:
-                # Agregar un rectángulo semi-transparente sobre las filas no seleccionadas
-                shapes.append(dict(
-                    type="rect",
-                    xref="x",
-                    yref="y",
-                    x0=-0.5,
-                    x1=len(heatmap_data.columns) - 0.5,
-                    y0=i - 0.5,
-                    y1=i + 0.5,
-                    fillcolor="rgba(255, 255, 255, 0.7)",
-                    line=dict(width=0),
-                    layer="above"
-                ))
-
-        fig = go.Figure(data=go.Heatmap(
-            z=z_values,
-            x=heatmap_data.columns,
-            y=heatmap_data.index,
-            colorscale='blues',
-            text=np.round(z_values, 2),
-            texttemplate='%{text}%',
-            textfont={"size": 11, "color": "black"},
-            colorbar=dict(title="Porcentaje<br>PR (%)")
-        ))
-        fig.update_layout(shapes=shapes)
+    fig = go.Figure(data=go.Heatmap(
+        z=z_values,
+        x=periodos,
+        y=lenguajes_heatmap,
+        colorscale='blues',
+        text=np.round(z_values, 2),
+        texttemplate='%{text}%',
+        textfont={"size": 11, "color": "black"},
+        colorbar=dict(title="Porcentaje<br>PR (%)")
+    ))
+
+    # Si hay un lenguaje seleccionado, velo semitransparente sobre las demás filas
+    aplicar_a_figura(fig, cambios_heatmap(lenguajes_heatmap, len(periodos), selected_language))
+
+    # Cambios de nivel y anomalías de las celdas visibles (sobre el porcentaje)
+    eventos = obtener_eventos('pull_requests')
+    if anio_seleccionado == 'Todos':
+        columna_evento = eventos['Periodo']
     else:
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values,
-            x=heatmap_data.columns,
-            y=heatmap_data.index,
-            colorscale='blues',
-            text=np.round(heatmap_data.values, 2),
-            texttemplate='%{text}%',
-            textfont={"size": 11, "color": "black"},
-            colorbar=dict(title="Porcentaje<br>PR (%)")
-        ))
+        columna_evento = eventos['Periodo'].str.replace(f'{anio_seleccionado}-', '', regex=False)
+    visibles = eventos[columna_evento.isin(periodos) & np.isin(eventos[COLUMNA_CODIGO], codificar(lenguajes_heatmap))]
+    for evento, periodo in zip(visibles.itertuples(), columna_evento[visibles.index]):
+        fig.add_annotation(**anotacion_evento(evento, periodo, evento.Lenguaje, 12))
 
     # Altura dinámica sincronizada con los medidores
     if num_lenguajes <= 5:
@@ -629,21 +995,23 @@ def crear_heatmap_quarters(anio_seleccionado='Todos', num_lenguajes=15, selected
 
     return fig
 
+@cached_figure
 def crear_medidores_promedio(anio_seleccionado='Todos', num_lenguajes=10, selected_language=None):
     """
     ¿Cuál es el promedio general de pull requests?
     """
     if anio_seleccionado == 'Todos':
-        df_filtered = df.copy()
         titulo_grafico = "<b>Promedio General de Pull Requests por Lenguaje (2020-2024)</b>"
     else:
-        df_filtered = df[df['Año'] == int(anio_seleccionado)].copy()
         titulo_grafico = f"<b>Promedio General de Pull Requests por Lenguaje ({anio_seleccionado})</b>"
 
-    promedio_df = df_filtered.groupby('Lenguaje')['Porcentaje'].mean().reset_index()
-    promedio_df = promedio_df.sort_values('Porcentaje', ascending=False).head(num_lenguajes)
+    # Promedio por lenguaje reduciendo los ejes año/trimestre del cubo
+    lenguajes_top, promedios = obtener_cubo_pr().promedios(
+        anio_seleccionado, CODIGOS_SELECCIONADOS, num_lenguajes
+    )
+    promedio_general = promedios.mean()
 
-    max_val = promedio_df['Porcentaje'].max() * 1.2
+    max_val = promedios.max() * 1.2
 
     # Calcular filas y columnas dinámicamente
     if num_lenguajes <= 5:
@@ -653,81 +1021,52 @@ def crear_medidores_promedio(anio_seleccionado='Todos', num_lenguajes=10, select
         n_cols = 5
         n_rows = (num_lenguajes + 4) // 5  # Redondeo hacia arriba
 
-    # Crear títulos con estilo según selección
-    subplot_titles = []
-    for lang in promedio_df['Lenguaje'].tolist():
-        if selected_language and lang == selected_language:
-            subplot_titles.append(f"<b>{lang}</b>")
-        elif selected_language:
-            subplot_titles.append(f"<span style='opacity:0.3'>{lang}</span>")
-        else:
-            subplot_titles.append(lang)
-
     fig = make_subplots(
         rows=n_rows, cols=n_cols,
         specs=[[{'type': 'indicator'}] * n_cols for _ in range(n_rows)],
-        subplot_titles=subplot_titles
+        subplot_titles=list(lenguajes_top)
     )
 
-    for idx, (_, row) in enumerate(promedio_df.iterrows(), 1):
+    for idx, (lang, porcentaje) in enumerate(zip(lenguajes_top, promedios), 1):
         row_num = (idx - 1) // n_cols + 1
         col_num = (idx - 1) % n_cols + 1
-        lang = row['Lenguaje']
-
-        # Determinar si este indicador está seleccionado
-        is_selected = (selected_language is None) or (lang == selected_language)
-
-        # Colores de la paleta Blues según el porcentaje
-        if row['Porcentaje'] > 10:
-            color = "#084594"  # Azul muy oscuro (alto)
-        elif row['Porcentaje'] > 5:
-            color = "#2171b5"  # Azul oscuro (medio)
-        else:
-            color = "#4292c6"  # Azul medio (bajo)
-
-        # Si no está seleccionado, usar colores más claros/opacos
-        if not is_selected:
-            color = "#deebf7"  # Color muy claro para no seleccionados
-            number_color = '#c6dbef'
-        else:
-            number_color = '#08306b'
 
         fig.add_trace(
             go.Indicator(
+                name=lang,
                 mode="gauge+number+delta",
-                value=row['Porcentaje'],
-                number={'suffix': "%", 'font': {'size': 22, 'color': number_color}},
-                delta={
-                    'reference': promedio_df['Porcentaje'].mean(),
-                    'increasing': {'color': '#084594' if is_selected else '#deebf7'},
-                    'decreasing': {'color': '#9ecae1' if is_selected else '#f7fbff'}
-                },
+                value=porcentaje,
+                number={'suffix': "%", 'font': {'size': 22}},
+                delta={'reference': promedio_general},
                 gauge={
                     'axis': {
                         'range': [None, max_val],
                         'tickwidth': 1,
                         'tickcolor': "#c6dbef",
-                        'tickfont': {'color': '#08306b' if is_selected else '#deebf7', 'size': 10}
+                        'tickfont': {'size': 10}
                     },
-                    'bar': {'color': color, 'thickness': 0.75},
+                    'bar': {'thickness': 0.75},
                     'bgcolor': "#f7fbff",
                     'borderwidth': 2,
-                    'bordercolor': "#c6dbef" if is_selected else "#f7fbff",
                     'steps': [
                         {'range': [0, max_val * 0.33], 'color': '#f7fbff'},
-                        {'range': [max_val * 0.33, max_val * 0.66], 'color': '#deebf7' if is_selected else '#f7fbff'},
-                        {'range': [max_val * 0.66, max_val], 'color': '#c6dbef' if is_selected else '#f7fbff'}
+                        {'range': [max_val * 0.33, max_val * 0.66]},
+                        {'range': [max_val * 0.66, max_val]}
                     ],
                     'threshold': {
-                        'line': {'color': "#2171b5" if is_selected else "#f7fbff", 'width': 3},
+                        'line': {'width': 3},
                         'thickness': 0.75,
-                        'value': promedio_df['Porcentaje'].mean()
+                        'value': promedio_general
                     }
                 }
             ),
             row=row_num, col=col_num
         )
 
+    # Colores de cada medidor (paleta Blues según el porcentaje) y títulos;
+    # con un lenguaje seleccionado los demás quedan atenuados
+    aplicar_a_figura(fig, cambios_medidores(lenguajes_top, promedios, selected_language))
+
     # Altura dinámica sincronizada con el heatmap
     if num_lenguajes <= 5:
         altura = 400
@@ -793,831 +1132,1195 @@ style_user_dict = {
 # Lista de años disponibles
 years = ['2020', '2021', '2022', '2023', '2024', '2025']
 
-# Preparar datos iniciales
-fig_dropdown, lista_lenguajes = crear_dropdown_repos_por_lenguaje()
+def crear_resumen_tendencias(anio1=2020, anio2=2025):
+    """
+    Tarjetas con el resumen de tendencias del rango de años (líder, mayor
+    crecimiento, mayor caída y mayor volatilidad), calculado por el motor de
+    tendencias (tendencias.py) una vez por rango y versión de datos
+    """
+    tendencias = obtener_tendencias(anio1=anio1, anio2=anio2)
+    destacados = tendencias.destacados(cantidad=1)
+    tarjetas = []
+    if destacados['lider'] is not None:
+        i = destacados['lider']
+        tarjetas.append(('Líder del índice', tendencias.lenguajes[i],
+                         f"#1 en {tendencias.top1[i]} de {tendencias.observaciones_top1} meses"))
+    for titulo, clave in (('Mayor crecimiento', 'ascenso'), ('Mayor caída', 'declive')):
+        for i in destacados[clave]:
+            tarjetas.append((titulo, tendencias.lenguajes[i],
+                             f"{tendencias.pendiente[i]:+.2f} puntos/año ({tendencias.cambio[i]:+.2f} en el rango)"))
+    for i in destacados['volatiles']:
+        tarjetas.append(('Más volátil', tendencias.lenguajes[i],
+                         f"±{tendencias.volatilidad[i]:.2f} puntos por mes"))
+
+    return [
+        html.Div(style={
+            "flex": "1",
+            "padding": "15px 20px",
+            "backgroundColor": colors['card'],
+            "borderRadius": "12px",
+            "boxShadow": colors['shadow'],
+            "border": f"1px solid {colors['border_light']}",
+            "textAlign": "center"
+        }, children=[
+            html.Div(titulo, style={"color": colors['text_light'], "fontSize": "13px", "fontWeight": "600"}),
+            html.Div(lenguaje, style={"color": colors['text'], "fontSize": "22px", "fontWeight": "bold",
+                                      "margin": "4px 0"}),
+            html.Div(detalle, style={"color": colors['text_light'], "fontSize": "13px"})
+        ])
+        for titulo, lenguaje, detalle in tarjetas
+    ]
+
+
+# Rango de meses de los sliders de periodo cuando todavía no hay datos cargados
+RANGO_MESES_INICIAL = (periodo_anio(2020)[0], periodo_anio(2025)[1])
 
 # ============================================================================
 # LAYOUT DEL DASHBOARD
 # ============================================================================
 
-app.layout = html.Div(style={'background': colors['background_solid'], 'fontFamily': 'Segoe UI, Arial, sans-serif', 'minHeight': '100vh'}, children=[
-
-    # Store para guardar el lenguaje seleccionado (interactividad tipo Power BI)
-    dcc.Store(id='selected-language-store', data=None),
-
-    # ====================================================================
-    # HEADER PRINCIPAL DEL DASHBOARD
-    # ====================================================================
-    html.Div(style={
-        'background': colors['gradient_primary'],
-        'padding': '50px 30px',
-        'marginBottom': '40px',
-        'boxShadow': colors['shadow_strong'],
-        'borderBottom': f"4px solid {colors['accent_light']}"
-    }, children=[
-        html.H1(
-            'Dashboard - Análisis de Lenguajes de Programación',
-            style={
-                'color': 'white',
-                'textAlign': 'center',
-                'margin': '0',
-                'fontSize': '40px',
-                'fontWeight': '700',
-                'textShadow': '2px 2px 4px rgba(0,0,0,0.2)'
-            }
-        ),
-        html.P(
-            'Tendencias Históricas | Repositorios GitHub | Pull Requests',
-            style={
-                'color': 'white',
-                'textAlign': 'center',
-                'margin': '15px 0 0 0',
-                'fontSize': '18px',
-                'opacity': '0.95',
-                'fontWeight': '400'
-            }
-        ),
-        html.P(
-            'Período 2020-2025',
-            style={
-                'color': colors['accent_light'],
-                'textAlign': 'center',
-                'margin': '10px 0 0 0',
-                'fontSize': '16px',
-                'fontWeight': '500'
-            }
+def crear_slider_periodo(titulo, id_slider, valor, rango_meses):
+    """
+    Slider de un periodo de la tabla de indicadores, con un paso por mes
+    (valores año * 12 + mes - 1) y marcas en cada enero
+    """
+    minimo, maximo = rango_meses
+    return html.Div(style={"marginBottom": "15px"}, children=[
+        html.Label(titulo, style={
+            "fontWeight": "bold",
+            "marginBottom": "8px",
+            "display": "block",
+            "color": colors['text'],
+            "fontSize": "14px"
+        }),
+        dcc.RangeSlider(
+            id=id_slider,
+            min=minimo,
+            max=maximo,
+            step=1,
+            marks={mes: str(mes // 12) for mes in range(minimo, maximo + 1) if mes % 12 == 0},
+            value=list(valor),
+            allowCross=False
         )
-    ]),
+    ])
+
+
+def construir_layout(con_figuras=True):
+    """
+    Construir el layout del dashboard.
 
-    # Contenedor principal
-    html.Div(style={'maxWidth': '1900px', 'margin': '0 auto', 'padding': '20px'}, children=[
+    Args:
+        con_figuras: Si es False se devuelve solo el esqueleto (mismos ids, sin
+            datos ni figuras). Se usa para validar los callbacks en el arranque
+            perezoso sin cargar datos.
+    """
+    if con_figuras:
+        fig_dropdown, lista_lenguajes = crear_dropdown_repos_por_lenguaje()
+        opciones_trending = opciones_periodo_trending()
+        tabla_indicador = getIndicadorAnio(anio1='2020', anio2='2025')
+        fig_tendencia = create_line_chart(anio1=2020, anio2=2025)
+        fig_ganadores = get_monthly_winners(year1=2020, year2=2025)
+        fig_bump = crear_bump_chart(2020, 2025)
+        fig_promedio_estrellas = crear_grafico_promedio_estrellas()
+        fig_top_repositorios = crear_grafico_top_repositorios()
+        fig_top_lenguajes = crear_grafico_top_lenguajes()
+        resumen_tendencias = crear_resumen_tendencias(2020, 2025)
+        meses = obtener_matriz_tiobe().meses
+        rango_meses = (int(meses.min()), int(meses.max())) if len(meses) else RANGO_MESES_INICIAL
+    else:
+        fig_dropdown, lista_lenguajes = {}, []
+        opciones_trending = []
+        tabla_indicador = dash_table.DataTable(id='tabla-indicador')
+        fig_tendencia = fig_ganadores = fig_bump = fig_promedio_estrellas = {}
+        fig_top_repositorios = fig_top_lenguajes = {}
+        rango_meses = RANGO_MESES_INICIAL
+        resumen_tendencias = []
+
+    return html.Div(style={'background': colors['background_solid'], 'fontFamily': 'Segoe UI, Arial, sans-serif', 'minHeight': '100vh'}, children=[
+
+        # Store para guardar el lenguaje seleccionado (interactividad tipo Power BI)
+        dcc.Store(id='selected-language-store', data=None),
+        # Pedido y respuesta de la serie completa del gráfico de tendencia WebGL
+        dcc.Store(id='serie-completa-pedido', data=None),
+        dcc.Store(id='serie-completa-datos', data=None),
 
         # ====================================================================
-        # SECCIÓN 1: ANÁLISIS DE POPULARIDAD Y SERIES DE TIEMPO
+        # HEADER PRINCIPAL DEL DASHBOARD
         # ====================================================================
         html.Div(style={
-            'marginBottom': '50px'
+            'background': colors['gradient_primary'],
+            'padding': '50px 30px',
+            'marginBottom': '40px',
+            'boxShadow': colors['shadow_strong'],
+            'borderBottom': f"4px solid {colors['accent_light']}"
         }, children=[
+            html.H1(
+                'Dashboard - Análisis de Lenguajes de Programación',
+                style={
+                    'color': 'white',
+                    'textAlign': 'center',
+                    'margin': '0',
+                    'fontSize': '40px',
+                    'fontWeight': '700',
+                    'textShadow': '2px 2px 4px rgba(0,0,0,0.2)'
+                }
+            ),
+            html.P(
+                'Tendencias Históricas | Repositorios GitHub | Pull Requests',
+                style={
+                    'color': 'white',
+                    'textAlign': 'center',
+                    'margin': '15px 0 0 0',
+                    'fontSize': '18px',
+                    'opacity': '0.95',
+                    'fontWeight': '400'
+                }
+            ),
+            html.P(
+                'Período 2020-2025',
+                style={
+                    'color': colors['accent_light'],
+                    'textAlign': 'center',
+                    'margin': '10px 0 0 0',
+                    'fontSize': '16px',
+                    'fontWeight': '500'
+                }
+            )
+        ]),
 
-            # Título de la sección
-            html.Div(style={
-                'background': colors['gradient_secondary'],
-                'padding': '20px 30px',
-                'marginBottom': '30px',
-                'borderRadius': '12px',
-                'boxShadow': colors['shadow']
-            }, children=[
-                html.H2(
-                    'Análisis de Popularidad y Tendencias Históricas',
-                    style={
-                        'color': 'white',
-                        'textAlign': 'center',
-                        'margin': '0',
-                        'fontSize': '26px',
-                        'fontWeight': '600'
-                    }
-                )
-            ]),
+        # Contenedor principal
+        html.Div(style={'maxWidth': '1900px', 'margin': '0 auto', 'padding': '20px'}, children=[
 
-            # Contenido de la sección
+            # ====================================================================
+            # SECCIÓN 1: ANÁLISIS DE POPULARIDAD Y SERIES DE TIEMPO
+            # ====================================================================
             html.Div(style={
-                'display': 'flex',
-                'flexDirection': 'column',
-                'gap': '20px'
+                'marginBottom': '50px'
             }, children=[
 
-                # Fila 1: Rango de años centrado
+                # Título de la sección
                 html.Div(style={
-                    "backgroundColor": colors['card'],
-                    "borderRadius": "12px",
-                    "boxShadow": colors['shadow'],
-                    "border": f"1px solid {colors['border_light']}",
-                    "padding": "20px 40px"
+                    'background': colors['gradient_secondary'],
+                    'padding': '20px 30px',
+                    'marginBottom': '30px',
+                    'borderRadius': '12px',
+                    'boxShadow': colors['shadow']
                 }, children=[
-                    html.Label("Rango de Años:", style={
-                        "fontWeight": "bold",
-                        "marginBottom": "15px",
-                        "display": "block",
-                        "textAlign": "center",
-                        "color": colors['text'],
-                        "fontSize": "16px"
-                    }),
-                    dcc.RangeSlider(
-                        id='year-range-slider',
-                        min=2020,
-                        max=2025,
-                        step=1,
-                        marks={year: str(year) for year in range(2020, 2026)},
-                        value=[2020, 2025],
-                        tooltip={"placement": "bottom", "always_visible": False}
+                    html.H2(
+                        'Análisis de Popularidad y Tendencias Históricas',
+                        style={
+                            'color': 'white',
+                            'textAlign': 'center',
+                            'margin': '0',
+                            'fontSize': '26px',
+                            'fontWeight': '600'
+                        }
                     )
                 ]),
 
-                # Fila 2: Tabla a la izquierda y gráficos a la derecha
+                # Contenido de la sección
                 html.Div(style={
                     'display': 'flex',
-                    'gap': '20px',
-                    'alignItems': 'stretch'
+                    'flexDirection': 'column',
+                    'gap': '20px'
                 }, children=[
 
-                    # Columna izquierda: Tabla
+                    # Fila 1: Rango de años centrado
                     html.Div(style={
-                        "flex": "1",
-                        "padding": "20px",
                         "backgroundColor": colors['card'],
                         "borderRadius": "12px",
                         "boxShadow": colors['shadow'],
                         "border": f"1px solid {colors['border_light']}",
-                        "display": "flex",
-                        "flexDirection": "column",
-                        "justifyContent": "center"
+                        "padding": "20px 40px"
                     }, children=[
-                        html.Div(
-                            id='tabla-container',
-                            children=[getIndicadorAnio(rating_promedio_df, '2020', '2025')]
+                        html.Label("Rango de Años:", style={
+                            "fontWeight": "bold",
+                            "marginBottom": "15px",
+                            "display": "block",
+                            "textAlign": "center",
+                            "color": colors['text'],
+                            "fontSize": "16px"
+                        }),
+                        dcc.RangeSlider(
+                            id='year-range-slider',
+                            min=2020,
+                            max=2025,
+                            step=1,
+                            marks={year: str(year) for year in range(2020, 2026)},
+                            value=[2020, 2025],
+                            tooltip={"placement": "bottom", "always_visible": False}
                         )
                     ]),
 
-                    # Columna derecha: Gráficos
+                    # Resumen de tendencias del rango de años
+                    html.Div(
+                        id='resumen-tendencias',
+                        children=resumen_tendencias,
+                        style={'display': 'flex', 'gap': '20px'}
+                    ),
+
+                    # Fila 2: Tabla a la izquierda y gráficos a la derecha
+                    html.Div(style={
+                        'display': 'flex',
+                        'gap': '20px',
+                        'alignItems': 'stretch'
+                    }, children=[
+
+                        # Columna izquierda: Tabla
+                        html.Div(style={
+                            "flex": "1",
+                            "padding": "20px",
+                            "backgroundColor": colors['card'],
+                            "borderRadius": "12px",
+                            "boxShadow": colors['shadow'],
+                            "border": f"1px solid {colors['border_light']}",
+                            "display": "flex",
+                            "flexDirection": "column",
+                            "justifyContent": "center"
+                        }, children=[
+                            # Periodos que compara la tabla, con resolución mensual
+                            crear_slider_periodo('Periodo base:', 'periodo-base-slider',
+                                                 periodo_anio(2020), rango_meses),
+                            crear_slider_periodo('Periodo comparado:', 'periodo-comparado-slider',
+                                                 periodo_anio(2025), rango_meses),
+                            html.Div(
+                                id='tabla-container',
+                                children=[tabla_indicador]
+                            )
+                        ]),
+
+                        # Columna derecha: Gráficos
+                        html.Div(style={
+                            "flex": "1",
+                            "padding": "20px",
+                            "backgroundColor": colors['card'],
+                            "borderRadius": "12px",
+                            "boxShadow": colors['shadow'],
+                            "border": f"1px solid {colors['border_light']}",
+                            "display": "flex",
+                            "flexDirection": "column",
+                            "justifyContent": "space-between"
+                        }, children=[
+                            # Gráfico de serie de tiempo
+                            html.Div(
+                                id='timeseries-container',
+                                children=[dcc.Graph(id='grafico-line-chart', figure=fig_tendencia)],
+                                style={"flex": "1"}
+                            ),
+                            # Gráfico de ganadores mensuales
+                            html.Div(
+                                id='winners-container',
+                                children=[dcc.Graph(id='grafico-winners', figure=fig_ganadores)],
+                                style={"flex": "1"}
+                            )
+                        ])
+                    ]),
+
+                    # Fila 3: Historial de posiciones (bump chart)
                     html.Div(style={
-                        "flex": "1",
+                        "marginTop": "20px",
                         "padding": "20px",
                         "backgroundColor": colors['card'],
                         "borderRadius": "12px",
                         "boxShadow": colors['shadow'],
-                        "border": f"1px solid {colors['border_light']}",
-                        "display": "flex",
-                        "flexDirection": "column",
-                        "justifyContent": "space-between"
+                        "border": f"1px solid {colors['border_light']}"
                     }, children=[
-                        # Gráfico de serie de tiempo
-                        html.Div(
-                            id='timeseries-container',
-                            children=[dcc.Graph(figure=create_line_chart(time_series_df, 2020, 2025))],
-                            style={"flex": "1"}
-                        ),
-                        # Gráfico de ganadores mensuales
-                        html.Div(
-                            id='winners-container',
-                            children=[dcc.Graph(figure=get_monthly_winners(time_series_df, 2020, 2025))],
-                            style={"flex": "1"}
-                        )
+                        html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
+                            html.Label(
+                                'Historial de Posiciones:',
+                                style={
+                                    'fontSize': '16px',
+                                    'fontWeight': 'bold',
+                                    'color': colors['text']
+                                }
+                            ),
+                            dcc.Dropdown(
+                                id='dropdown-top-bump',
+                                options=[
+                                    {'label': 'Top 3 Lenguajes', 'value': 3},
+                                    {'label': 'Top 5 Lenguajes', 'value': 5},
+                                    {'label': 'Top 10 Lenguajes', 'value': 10},
+                                    {'label': 'Todos', 'value': 0}
+                                ],
+                                value=10,
+                                clearable=False,
+                                style={
+                                    'width': '200px',
+                                    'fontSize': '14px'
+                                }
+                            )
+                        ]),
+                        dcc.Graph(id='grafico-bump', figure=fig_bump)
                     ])
                 ])
-            ])
-        ]),
-
-        # ====================================================================
-        # SECCIÓN 2: ACTIVIDAD EN REPOSITORIOS (GITHUB TRENDING)
-        # ====================================================================
-        html.Div(style={
-            'marginBottom': '50px'
-        }, children=[
-
-            # Título de la sección
-            html.Div(style={
-                'background': colors['gradient_secondary'],
-                'padding': '20px 30px',
-                'marginBottom': '30px',
-                'borderRadius': '12px',
-                'boxShadow': colors['shadow']
-            }, children=[
-                html.H2(
-                    'Actividad en Repositorios (GitHub Trending)',
-                    style={
-                        'color': 'white',
-                        'textAlign': 'center',
-                        'margin': '0',
-                        'fontSize': '26px',
-                        'fontWeight': '600'
-                    }
-                )
             ]),
 
-            # Gráficos 1 y 2: Promedio de Estrellas y Top Repositorios
+            # ====================================================================
+            # SECCIÓN 2: ACTIVIDAD EN REPOSITORIOS (GITHUB TRENDING)
+            # ====================================================================
             html.Div(style={
-                'display': 'grid',
-                'gridTemplateColumns': '1fr 1fr',
-                'gap': '25px',
-                'marginBottom': '25px'
+                'marginBottom': '50px'
             }, children=[
-                # Gráfico 1: Promedio de Estrellas
-                html.Div(style={
-                    'backgroundColor': colors['card'],
-                    'padding': '25px',
-                    'borderRadius': '12px',
-                    'boxShadow': colors['shadow']
-                }, children=[
-                    dcc.Graph(
-                        id='grafico-promedio-estrellas',
-                        figure=crear_grafico_promedio_estrellas(),
-                        config={'displayModeBar': False}
-                    )
-                ]),
 
-                # Gráfico 2: Top Repositorios
+                # Título de la sección
                 html.Div(style={
-                    'backgroundColor': colors['card'],
-                    'padding': '25px',
+                    'background': colors['gradient_secondary'],
+                    'padding': '20px 30px',
+                    'marginBottom': '30px',
                     'borderRadius': '12px',
                     'boxShadow': colors['shadow']
                 }, children=[
-                    dcc.Graph(
-                        id='grafico-top-repositorios',
-                        figure=crear_grafico_top_repositorios(),
-                        config={'displayModeBar': False}
+                    html.H2(
+                        'Actividad en Repositorios (GitHub Trending)',
+                        style={
+                            'color': 'white',
+                            'textAlign': 'center',
+                            'margin': '0',
+                            'fontSize': '26px',
+                            'fontWeight': '600'
+                        }
                     )
-                ])
-            ]),
-
-            # Gráfico 3: Dropdown Interactivo
-            html.Div(style={
-                'backgroundColor': colors['card'],
-                'padding': '25px',
-                'borderRadius': '12px',
-                'boxShadow': colors['shadow']
-            }, children=[
-                html.Label(
-                    'Seleccionar Lenguaje de Programación:',
-                    style={
-                        'fontSize': '14px',
-                        'fontWeight': 'bold',
-                        'marginBottom': '10px',
-                        'display': 'block',
-                        'color': colors['text']
-                    }
-                ),
-                dcc.Dropdown(
-                    id='dropdown-lenguaje',
-                    options=[{'label': lang, 'value': lang} for lang in lista_lenguajes],
-                    value='Python',
-                    style={'marginBottom': '20px'}
-                ),
-                dcc.Graph(
-                    id='grafico-repos-por-lenguaje',
-                    figure=fig_dropdown,
-                    config={'displayModeBar': False}
-                )
-            ])
-        ]),
-
-        # ====================================================================
-        # SECCIÓN 3: ANÁLISIS DE PULL REQUESTS
-        # ====================================================================
-        html.Div(children=[
-
-            # Título de la sección
-            html.Div(style={
-                'background': colors['gradient_secondary'],
-                'padding': '20px 30px',
-                'marginBottom': '30px',
-                'borderRadius': '12px',
-                'boxShadow': colors['shadow']
-            }, children=[
-                html.H2(
-                    'Análisis de Pull Requests en GitHub',
-                    style={
-                        'color': 'white',
-                        'textAlign': 'center',
-                        'margin': '0',
-                        'fontSize': '26px',
-                        'fontWeight': '600'
-                    }
-                )
-            ]),
-            # Pregunta 1: Gráfico de Barras Top
-            html.Div(style={
-                'backgroundColor': colors['card'],
-                'padding': '25px',
-                'marginBottom': '30px',
-                'borderRadius': '12px',
-                'boxShadow': colors['shadow']
-            }, children=[
-                dcc.Graph(
-                    id='grafico-top-lenguajes',
-                    figure=crear_grafico_top_lenguajes(),
-                    config={'displayModeBar': False}
-                )
-            ]),
+                ]),
 
-            # Contenedor principal: Dropdowns + Gráficos
-            html.Div(style={
-                'display': 'flex',
-                'flexDirection': 'column',
-                'gap': '20px',
-                'marginBottom': '30px'
-            }, children=[
-                # Fila 1: Dropdowns centrados
+                # Selector de snapshot: último scraping, un día o una ventana del historial
                 html.Div(style={
-                    'backgroundColor': colors['card'],
-                    'padding': '20px',
-                    'borderRadius': '12px',
-                    'boxShadow': colors['shadow'],
                     'display': 'flex',
-                    'justifyContent': 'center',
                     'alignItems': 'center',
-                    'gap': '30px',
-                    'flexWrap': 'wrap'
+                    'gap': '10px',
+                    'marginBottom': '25px'
                 }, children=[
-                    html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
-                        html.Label(
-                            'Año:',
-                            style={
-                                'fontSize': '16px',
-                                'fontWeight': 'bold',
-                                'color': colors['text']
-                            }
-                        ),
-                        dcc.Dropdown(
-                            id='dropdown-anio',
-                            options=[
-                                {'label': '2020-2024', 'value': 'Todos'},
-                                {'label': '2020', 'value': '2020'},
-                                {'label': '2021', 'value': '2021'},
-                                {'label': '2022', 'value': '2022'},
-                                {'label': '2023', 'value': '2023'},
-                                {'label': '2024', 'value': '2024'}
-                            ],
-                            value='Todos',
-                            clearable=False,
-                            style={
-                                'width': '200px',
-                                'fontSize': '14px'
-                            }
-                        )
-                    ]),
-                    html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
-                        html.Label(
-                            'Mostrar:',
-                            style={
-                                'fontSize': '16px',
-                                'fontWeight': 'bold',
-                                'color': colors['text']
-                            }
-                        ),
-                        dcc.Dropdown(
-                            id='dropdown-num-lenguajes',
-                            options=[
-                                {'label': 'Top 5 Lenguajes', 'value': 5},
-                                {'label': 'Top 10 Lenguajes', 'value': 10},
-                                {'label': 'Todos (15)', 'value': 15}
-                            ],
-                            value=15,
-                            clearable=False,
-                            style={
-                                'width': '200px',
-                                'fontSize': '14px'
-                            }
-                        )
-                    ])
+                    html.Label(
+                        'Snapshot de Trending:',
+                        style={
+                            'fontSize': '14px',
+                            'fontWeight': 'bold',
+                            'color': colors['text']
+                        }
+                    ),
+                    dcc.Dropdown(
+                        id='dropdown-periodo-trending',
+                        options=opciones_trending,
+                        value='actual',
+                        clearable=False,
+                        style={
+                            'width': '220px',
+                            'fontSize': '14px'
+                        }
+                    )
                 ]),
 
-                # Fila 2: Dos gráficos lado a lado (50% cada uno)
+                # Gráficos 1 y 2: Promedio de Estrellas y Top Repositorios
                 html.Div(style={
-                    'display': 'flex',
-                    'flexDirection': 'row',
-                    'gap': '20px',
-                    'width': '100%',
-                    'alignItems': 'stretch'
+                    'display': 'grid',
+                    'gridTemplateColumns': '1fr 1fr',
+                    'gap': '25px',
+                    'marginBottom': '25px'
                 }, children=[
-                    # Gráfico Heatmap
+                    # Gráfico 1: Promedio de Estrellas
                     html.Div(style={
-                        'width': '50%',
                         'backgroundColor': colors['card'],
                         'padding': '25px',
                         'borderRadius': '12px',
-                        'boxShadow': colors['shadow'],
-                        'boxSizing': 'border-box',
-                        'display': 'flex',
-                        'flexDirection': 'column',
-                        'justifyContent': 'center'
+                        'boxShadow': colors['shadow']
                     }, children=[
+                        dcc.RadioItems(
+                            id='radio-metrica-estrellas',
+                            options=[
+                                {'label': 'Promedio de Estrellas', 'value': 'promedio'},
+                                {'label': 'Estrellas por Día', 'value': 'estrellas_dia'},
+                                {'label': 'Forks por Día', 'value': 'forks_dia'}
+                            ],
+                            value='promedio',
+                            inline=True,
+                            inputStyle={'marginRight': '5px', 'marginLeft': '15px'},
+                            style={'fontSize': '14px', 'color': colors['text']}
+                        ),
                         dcc.Graph(
-                            id='heatmap-quarters',
-                            config={'displayModeBar': False},
-                            style={'height': '100%'}
+                            id='grafico-promedio-estrellas',
+                            figure=fig_promedio_estrellas,
+                            config={'displayModeBar': False}
                         )
                     ]),
 
-                    # Gráfico Medidores
+                    # Gráfico 2: Top Repositorios
                     html.Div(style={
-                        'width': '50%',
                         'backgroundColor': colors['card'],
                         'padding': '25px',
                         'borderRadius': '12px',
-                        'boxShadow': colors['shadow'],
-                        'boxSizing': 'border-box',
-                        'display': 'flex',
-                        'flexDirection': 'column',
-                        'justifyContent': 'center'
+                        'boxShadow': colors['shadow']
                     }, children=[
                         dcc.Graph(
-                            id='medidores-promedio',
-                            config={'displayModeBar': False},
-                            style={'height': '100%'}
+                            id='grafico-top-repositorios',
+                            figure=fig_top_repositorios,
+                            config={'displayModeBar': False}
                         )
                     ])
+                ]),
+
+                # Gráfico 3: Dropdown Interactivo
+                html.Div(style={
+                    'backgroundColor': colors['card'],
+                    'padding': '25px',
+                    'borderRadius': '12px',
+                    'boxShadow': colors['shadow']
+                }, children=[
+                    html.Label(
+                        'Buscar Repositorio o Usuario:',
+                        style={
+                            'fontSize': '14px',
+                            'fontWeight': 'bold',
+                            'marginBottom': '10px',
+                            'display': 'block',
+                            'color': colors['text']
+                        }
+                    ),
+                    dcc.Dropdown(
+                        id='buscador-repos',
+                        options=[],
+                        placeholder='usuario/repositorio (prefijo o parte del nombre)',
+                        searchable=True,
+                        clearable=True,
+                        style={'marginBottom': '15px'}
+                    ),
+                    html.Label(
+                        'Seleccionar Lenguaje de Programación:',
+                        style={
+                            'fontSize': '14px',
+                            'fontWeight': 'bold',
+                            'marginBottom': '10px',
+                            'display': 'block',
+                            'color': colors['text']
+                        }
+                    ),
+                    dcc.Dropdown(
+                        id='dropdown-lenguaje',
+                        options=[{'label': lang, 'value': lang} for lang in lista_lenguajes],
+                        value='Python',
+                        style={'marginBottom': '15px'}
+                    ),
+                    html.Div(style={
+                        'display': 'flex',
+                        'alignItems': 'center',
+                        'gap': '15px',
+                        'marginBottom': '20px'
+                    }, children=[
+                        html.Label('Mostrar:', style={'fontSize': '14px', 'fontWeight': 'bold', 'color': colors['text']}),
+                        dcc.Dropdown(
+                            id='dropdown-top-repos',
+                            options=[{'label': f'Top {n}', 'value': n} for n in (3, 5, 10, 20)],
+                            value=5,
+                            clearable=False,
+                            style={'width': '120px'}
+                        ),
+                        dcc.RadioItems(
+                            id='radio-orden-repos',
+                            options=[{'label': f'Ordenar por {metrica.capitalize()}', 'value': metrica}
+                                     for metrica in METRICAS_REPOS],
+                            value='estrellas',
+                            inline=True,
+                            inputStyle={'marginRight': '5px', 'marginLeft': '15px'},
+                            style={'fontSize': '14px', 'color': colors['text']}
+                        )
+                    ]),
+                    dcc.Graph(
+                        id='grafico-repos-por-lenguaje',
+                        figure=fig_dropdown,
+                        config={'displayModeBar': False}
+                    )
                 ])
-            ])
-        ]),
+            ]),
 
-        # ====================================================================
-        # CHATBOT FLOTANTE (ESTILO COPILOT)
-        # ====================================================================
-        # Store para controlar si el chat está abierto o cerrado
-        dcc.Store(id='chat-open-store', data=False),
-        dcc.Store(id='chat-history-store', data=[]),
-
-        # Contenedor flotante del chatbot
-        html.Div(id='chatbot-container', style={
-            'position': 'fixed',
-            'bottom': '30px',
-            'right': '30px',
-            'zIndex': '9999'
-        }, children=[
-            # Botón circular para abrir/cerrar el chat
-            html.Button(
-                id='chat-toggle-button',
-                children=[
-                    html.Div(id='chat-toggle-icon', children='💬', style={
-                        'fontSize': '28px',
-                        'lineHeight': '1'
-                    })
-                ],
-                style={
-                    'width': '60px',
-                    'height': '60px',
-                    'borderRadius': '50%',
-                    'border': 'none',
-                    'background': colors['gradient_primary'],
-                    'color': 'white',
-                    'cursor': 'pointer',
-                    'boxShadow': '0 4px 20px rgba(33, 113, 181, 0.4)',
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'justifyContent': 'center',
-                    'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
-                }
-            ),
+            # ====================================================================
+            # SECCIÓN 3: ANÁLISIS DE PULL REQUESTS
+            # ====================================================================
+            html.Div(children=[
 
-            # Panel del chat (inicialmente oculto)
-            html.Div(id='chat-panel', style={
-                'display': 'none',
-                'position': 'absolute',
-                'bottom': '75px',
-                'right': '0',
-                'width': '380px',
-                'height': '500px',
-                'backgroundColor': colors['card'],
-                'borderRadius': '16px',
-                'boxShadow': '0 10px 40px rgba(33, 113, 181, 0.3)',
-                'border': f"1px solid {colors['border_light']}",
-                'overflow': 'hidden',
-                'flexDirection': 'column'
-            }, children=[
-                # Header del chat
+                # Título de la sección
                 html.Div(style={
-                    'background': colors['gradient_primary'],
-                    'padding': '15px 20px',
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'justifyContent': 'space-between'
+                    'background': colors['gradient_secondary'],
+                    'padding': '20px 30px',
+                    'marginBottom': '30px',
+                    'borderRadius': '12px',
+                    'boxShadow': colors['shadow']
                 }, children=[
-                    html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
-                        html.Span('🤖', style={'fontSize': '24px'}),
-                        html.Div([
-                            html.H4('CodeTrends AI', style={
-                                'color': 'white',
-                                'margin': '0',
-                                'fontSize': '16px',
-                                'fontWeight': '600'
-                            }),
-                            html.Span('Asistente de Lenguajes', style={
-                                'color': '#c6dbef',
-                                'fontSize': '11px'
-                            })
-                        ])
-                    ]),
-                    html.Button(
-                        'Limpiar',
-                        id='clear-button',
+                    html.H2(
+                        'Análisis de Pull Requests en GitHub',
                         style={
-                            'padding': '5px 12px',
-                            'borderRadius': '15px',
-                            'border': '1px solid rgba(255,255,255,0.3)',
-                            'backgroundColor': 'transparent',
                             'color': 'white',
-                            'cursor': 'pointer',
-                            'fontSize': '11px'
+                            'textAlign': 'center',
+                            'margin': '0',
+                            'fontSize': '26px',
+                            'fontWeight': '600'
                         }
                     )
                 ]),
+                # Pregunta 1: Gráfico de Barras Top
+                html.Div(style={
+                    'backgroundColor': colors['card'],
+                    'padding': '25px',
+                    'marginBottom': '30px',
+                    'borderRadius': '12px',
+                    'boxShadow': colors['shadow']
+                }, children=[
+                    dcc.Graph(
+                        id='grafico-top-lenguajes',
+                        figure=fig_top_lenguajes,
+                        config={'displayModeBar': False}
+                    )
+                ]),
 
-                # Preguntas rápidas
+                # Contenedor principal: Dropdowns + Gráficos
                 html.Div(style={
-                    'padding': '10px 15px',
-                    'backgroundColor': '#f7fbff',
-                    'borderBottom': f"1px solid {colors['border_light']}",
                     'display': 'flex',
-                    'gap': '6px',
-                    'flexWrap': 'wrap',
-                    'justifyContent': 'center'
+                    'flexDirection': 'column',
+                    'gap': '20px',
+                    'marginBottom': '30px'
                 }, children=[
-                    html.Button('2025?', id='quick-q1', style={
-                        'padding': '4px 10px', 'borderRadius': '12px',
-                        'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
-                        'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
-                    }),
-                    html.Button('Py vs JS', id='quick-q2', style={
-                        'padding': '4px 10px', 'borderRadius': '12px',
-                        'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
-                        'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
-                    }),
-                    html.Button('Para IA', id='quick-q3', style={
-                        'padding': '4px 10px', 'borderRadius': '12px',
-                        'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
-                        'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
-                    }),
-                    html.Button('Rust/Go?', id='quick-q4', style={
-                        'padding': '4px 10px', 'borderRadius': '12px',
-                        'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
-                        'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
-                    }),
-                ]),
+                    # Fila 1: Dropdowns centrados
+                    html.Div(style={
+                        'backgroundColor': colors['card'],
+                        'padding': '20px',
+                        'borderRadius': '12px',
+                        'boxShadow': colors['shadow'],
+                        'display': 'flex',
+                        'justifyContent': 'center',
+                        'alignItems': 'center',
+                        'gap': '30px',
+                        'flexWrap': 'wrap'
+                    }, children=[
+                        html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
+                            html.Label(
+                                'Año:',
+                                style={
+                                    'fontSize': '16px',
+                                    'fontWeight': 'bold',
+                                    'color': colors['text']
+                                }
+                            ),
+                            dcc.Dropdown(
+                                id='dropdown-anio',
+                                options=[
+                                    {'label': '2020-2024', 'value': 'Todos'},
+                                    {'label': '2020', 'value': '2020'},
+                                    {'label': '2021', 'value': '2021'},
+                                    {'label': '2022', 'value': '2022'},
+                                    {'label': '2023', 'value': '2023'},
+                                    {'label': '2024', 'value': '2024'}
+                                ],
+                                value='Todos',
+                                clearable=False,
+                                style={
+                                    'width': '200px',
+                                    'fontSize': '14px'
+                                }
+                            )
+                        ]),
+                        html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
+                            html.Label(
+                                'Mostrar:',
+                                style={
+                                    'fontSize': '16px',
+                                    'fontWeight': 'bold',
+                                    'color': colors['text']
+                                }
+                            ),
+                            dcc.Dropdown(
+                                id='dropdown-num-lenguajes',
+                                options=[
+                                    {'label': 'Top 5 Lenguajes', 'value': 5},
+                                    {'label': 'Top 10 Lenguajes', 'value': 10},
+                                    {'label': 'Todos (15)', 'value': 15}
+                                ],
+                                value=15,
+                                clearable=False,
+                                style={
+                                    'width': '200px',
+                                    'fontSize': '14px'
+                                }
+                            )
+                        ])
+                    ]),
 
-                # Área de historial del chat
-                html.Div(
-                    id='chat-history',
-                    style={
-                        'flex': '1',
-                        'overflowY': 'auto',
-                        'padding': '15px',
-                        'backgroundColor': '#f7fbff',
-                        'height': '280px'
-                    },
-                    children=[
-                        html.Div([
-                            html.Strong("AI: ", style={'color': colors['accent'], 'fontSize': '12px'}),
-                            html.Span(
-                                "Hola! Soy tu asistente. Pregunta sobre tendencias de lenguajes 2020-2025.",
-                                style={'color': colors['text'], 'fontSize': '13px'}
+                    # Fila 2: Dos gráficos lado a lado (50% cada uno)
+                    html.Div(style={
+                        'display': 'flex',
+                        'flexDirection': 'row',
+                        'gap': '20px',
+                        'width': '100%',
+                        'alignItems': 'stretch'
+                    }, children=[
+                        # Gráfico Heatmap
+                        html.Div(style={
+                            'width': '50%',
+                            'backgroundColor': colors['card'],
+                            'padding': '25px',
+                            'borderRadius': '12px',
+                            'boxShadow': colors['shadow'],
+                            'boxSizing': 'border-box',
+                            'display': 'flex',
+                            'flexDirection': 'column',
+                            'justifyContent': 'center'
+                        }, children=[
+                            dcc.Graph(
+                                id='heatmap-quarters',
+                                config={'displayModeBar': False},
+                                style={'height': '100%'}
                             )
-                        ], style={
-                            'marginBottom': '8px', 'padding': '10px',
-                            'backgroundColor': 'white', 'borderRadius': '10px',
-                            'boxShadow': '0 1px 3px rgba(0,0,0,0.08)'
+                        ]),
+
+                        # Gráfico Medidores
+                        html.Div(style={
+                            'width': '50%',
+                            'backgroundColor': colors['card'],
+                            'padding': '25px',
+                            'borderRadius': '12px',
+                            'boxShadow': colors['shadow'],
+                            'boxSizing': 'border-box',
+                            'display': 'flex',
+                            'flexDirection': 'column',
+                            'justifyContent': 'center'
+                        }, children=[
+                            dcc.Graph(
+                                id='medidores-promedio',
+                                config={'displayModeBar': False},
+                                style={'height': '100%'}
+                            )
+                        ])
+                    ])
+                ])
+            ]),
+
+            # ====================================================================
+            # CHATBOT FLOTANTE (ESTILO COPILOT)
+            # ====================================================================
+            # Store para controlar si el chat está abierto o cerrado
+            dcc.Store(id='chat-open-store', data=False),
+            dcc.Store(id='chat-history-store', data=[]),
+
+            # Contenedor flotante del chatbot
+            html.Div(id='chatbot-container', style={
+                'position': 'fixed',
+                'bottom': '30px',
+                'right': '30px',
+                'zIndex': '9999'
+            }, children=[
+                # Botón circular para abrir/cerrar el chat
+                html.Button(
+                    id='chat-toggle-button',
+                    children=[
+                        html.Div(id='chat-toggle-icon', children='💬', style={
+                            'fontSize': '28px',
+                            'lineHeight': '1'
                         })
-                    ]
+                    ],
+                    style={
+                        'width': '60px',
+                        'height': '60px',
+                        'borderRadius': '50%',
+                        'border': 'none',
+                        'background': colors['gradient_primary'],
+                        'color': 'white',
+                        'cursor': 'pointer',
+                        'boxShadow': '0 4px 20px rgba(33, 113, 181, 0.4)',
+                        'display': 'flex',
+                        'alignItems': 'center',
+                        'justifyContent': 'center',
+                        'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
+                    }
                 ),
 
-                # Input y botón de enviar
-                html.Div(style={
-                    'padding': '12px 15px',
-                    'borderTop': f"1px solid {colors['border_light']}",
-                    'backgroundColor': 'white',
-                    'display': 'flex',
-                    'gap': '8px'
+                # Panel del chat (inicialmente oculto)
+                html.Div(id='chat-panel', style={
+                    'display': 'none',
+                    'position': 'absolute',
+                    'bottom': '75px',
+                    'right': '0',
+                    'width': '380px',
+                    'height': '500px',
+                    'backgroundColor': colors['card'],
+                    'borderRadius': '16px',
+                    'boxShadow': '0 10px 40px rgba(33, 113, 181, 0.3)',
+                    'border': f"1px solid {colors['border_light']}",
+                    'overflow': 'hidden',
+                    'flexDirection': 'column'
                 }, children=[
-                    dcc.Input(
-                        id='chat-input',
-                        type='text',
-                        placeholder='Escribe tu pregunta...',
+                    # Header del chat
+                    html.Div(style={
+                        'background': colors['gradient_primary'],
+                        'padding': '15px 20px',
+                        'display': 'flex',
+                        'alignItems': 'center',
+                        'justifyContent': 'space-between'
+                    }, children=[
+                        html.Div(style={'display': 'flex', 'alignItems': 'center', 'gap': '10px'}, children=[
+                            html.Span('🤖', style={'fontSize': '24px'}),
+                            html.Div([
+                                html.H4('CodeTrends AI', style={
+                                    'color': 'white',
+                                    'margin': '0',
+                                    'fontSize': '16px',
+                                    'fontWeight': '600'
+                                }),
+                                html.Span('Asistente de Lenguajes', style={
+                                    'color': '#c6dbef',
+                                    'fontSize': '11px'
+                                })
+                            ])
+                        ]),
+                        html.Button(
+                            'Limpiar',
+                            id='clear-button',
+                            style={
+                                'padding': '5px 12px',
+                                'borderRadius': '15px',
+                                'border': '1px solid rgba(255,255,255,0.3)',
+                                'backgroundColor': 'transparent',
+                                'color': 'white',
+                                'cursor': 'pointer',
+                                'fontSize': '11px'
+                            }
+                        )
+                    ]),
+
+                    # Preguntas rápidas
+                    html.Div(style={
+                        'padding': '10px 15px',
+                        'backgroundColor': '#f7fbff',
+                        'borderBottom': f"1px solid {colors['border_light']}",
+                        'display': 'flex',
+                        'gap': '6px',
+                        'flexWrap': 'wrap',
+                        'justifyContent': 'center'
+                    }, children=[
+                        html.Button('2025?', id='quick-q1', style={
+                            'padding': '4px 10px', 'borderRadius': '12px',
+                            'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
+                            'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
+                        }),
+                        html.Button('Py vs JS', id='quick-q2', style={
+                            'padding': '4px 10px', 'borderRadius': '12px',
+                            'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
+                            'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
+                        }),
+                        html.Button('Para IA', id='quick-q3', style={
+                            'padding': '4px 10px', 'borderRadius': '12px',
+                            'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
+                            'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
+                        }),
+                        html.Button('Rust/Go?', id='quick-q4', style={
+                            'padding': '4px 10px', 'borderRadius': '12px',
+                            'border': f"1px solid {colors['accent']}", 'backgroundColor': 'white',
+                            'color': colors['accent'], 'cursor': 'pointer', 'fontSize': '10px'
+                        }),
+                    ]),
+
+                    # Área de historial del chat
+                    html.Div(
+                        id='chat-history',
                         style={
                             'flex': '1',
-                            'padding': '10px 14px',
-                            'borderRadius': '20px',
-                            'border': f"1px solid {colors['border_light']}",
-                            'fontSize': '13px',
-                            'outline': 'none'
+                            'overflowY': 'auto',
+                            'padding': '15px',
+                            'backgroundColor': '#f7fbff',
+                            'height': '280px'
                         },
-                        debounce=True
+                        children=[
+                            html.Div([
+                                html.Strong("AI: ", style={'color': colors['accent'], 'fontSize': '12px'}),
+                                html.Span(
+                                    "Hola! Soy tu asistente. Pregunta sobre tendencias de lenguajes 2020-2025.",
+                                    style={'color': colors['text'], 'fontSize': '13px'}
+                                )
+                            ], style={
+                                'marginBottom': '8px', 'padding': '10px',
+                                'backgroundColor': 'white', 'borderRadius': '10px',
+                                'boxShadow': '0 1px 3px rgba(0,0,0,0.08)'
+                            })
+                        ]
                     ),
-                    html.Button(
-                        '➤',
-                        id='send-button',
-                        style={
-                            'width': '40px',
-                            'height': '40px',
-                            'borderRadius': '50%',
-                            'border': 'none',
-                            'background': colors['gradient_primary'],
-                            'color': 'white',
-                            'cursor': 'pointer',
-                            'fontSize': '16px',
-                            'display': 'flex',
-                            'alignItems': 'center',
-                            'justifyContent': 'center'
-                        }
-                    )
-                ]),
 
-                # Estado de carga
-                dcc.Loading(
-                    id='loading-chat',
-                    type='dot',
-                    color=colors['accent'],
-                    children=[html.Div(id='chat-loading-output')]
-                )
-            ])
-        ]),
+                    # Input y botón de enviar
+                    html.Div(style={
+                        'padding': '12px 15px',
+                        'borderTop': f"1px solid {colors['border_light']}",
+                        'backgroundColor': 'white',
+                        'display': 'flex',
+                        'gap': '8px'
+                    }, children=[
+                        dcc.Input(
+                            id='chat-input',
+                            type='text',
+                            placeholder='Escribe tu pregunta...',
+                            style={
+                                'flex': '1',
+                                'padding': '10px 14px',
+                                'borderRadius': '20px',
+                                'border': f"1px solid {colors['border_light']}",
+                                'fontSize': '13px',
+                                'outline': 'none'
+                            },
+                            debounce=True
+                        ),
+                        html.Button(
+                            '➤',
+                            id='send-button',
+                            style={
+                                'width': '40px',
+                                'height': '40px',
+                                'borderRadius': '50%',
+                                'border': 'none',
+                                'background': colors['gradient_primary'],
+                                'color': 'white',
+                                'cursor': 'pointer',
+                                'fontSize': '16px',
+                                'display': 'flex',
+                                'alignItems': 'center',
+                                'justifyContent': 'center'
+                            }
+                        )
+                    ]),
 
-        # ====================================================================
-        # FOOTER
-        # ====================================================================
-        html.Div(style={
-            'background': colors['gradient_primary'],
-            'padding': '40px 20px',
-            'marginTop': '50px',
-            'color': 'white',
-            'boxShadow': '0 -4px 20px rgba(102, 126, 234, 0.2)'
-        }, children=[
-            # Contenedor principal del footer
+                    # Estado de carga
+                    dcc.Loading(
+                        id='loading-chat',
+                        type='dot',
+                        color=colors['accent'],
+                        children=[html.Div(id='chat-loading-output')]
+                    )
+                ])
+            ]),
+
+            # ====================================================================
+            # FOOTER
+            # ====================================================================
             html.Div(style={
-                'maxWidth': '1400px',
-                'margin': '0 auto',
-                'display': 'flex',
-                'justifyContent': 'space-between',
-                'flexWrap': 'wrap',
-                'gap': '40px'
+                'background': colors['gradient_primary'],
+                'padding': '40px 20px',
+                'marginTop': '50px',
+                'color': 'white',
+                'boxShadow': '0 -4px 20px rgba(102, 126, 234, 0.2)'
             }, children=[
-                # Columna izquierda: Integrantes del equipo
+                # Contenedor principal del footer
                 html.Div(style={
-                    'flex': '1',
-                    'minWidth': '300px'
+                    'maxWidth': '1400px',
+                    'margin': '0 auto',
+                    'display': 'flex',
+                    'justifyContent': 'space-between',
+                    'flexWrap': 'wrap',
+                    'gap': '40px'
                 }, children=[
-                    html.H3('Integrantes del Equipo', style={
-                        'marginBottom': '15px',
-                        'fontSize': '19px',
-                        'color': '#c6dbef',
-                        'fontWeight': '600',
-                        'letterSpacing': '0.5px'
-                    }),
-                    html.Div([
-                        html.A('🔗 Angelo Zurita',
-                            href='https://github.com/aszurita',
-                            target='_blank',
-                            style=style_user_dict),
-                        html.A('🔗 José Marin',
-                            href='https://github.com/JoseM0lina',
-                            target='_blank',
-                            style=style_user_dict),
-                        html.A('🔗 Dhamar Quishpe Rivera',
-                            href='https://github.com/dquishpe',
-                            target='_blank',
-                            style=style_user_dict)
+                    # Columna izquierda: Integrantes del equipo
+                    html.Div(style={
+                        'flex': '1',
+                        'minWidth': '300px'
+                    }, children=[
+                        html.H3('Integrantes del Equipo', style={
+                            'marginBottom': '15px',
+                            'fontSize': '19px',
+                            'color': '#c6dbef',
+                            'fontWeight': '600',
+                            'letterSpacing': '0.5px'
+                        }),
+                        html.Div([
+                            html.A('🔗 Angelo Zurita',
+                                href='https://github.com/aszurita',
+                                target='_blank',
+                                style=style_user_dict),
+                            html.A('🔗 José Marin',
+                                href='https://github.com/JoseM0lina',
+                                target='_blank',
+                                style=style_user_dict),
+                            html.A('🔗 Dhamar Quishpe Rivera',
+                                href='https://github.com/dquishpe',
+                                target='_blank',
+                                style=style_user_dict)
+                        ])
+                    ]),
+
+                    # Columna derecha: Sobre el Dashboard
+                    html.Div(style={
+                        'flex': '1',
+                        'minWidth': '300px'
+                    }, children=[
+                        html.H3('Sobre el Dashboard', style={
+                            'marginBottom': '15px',
+                            'fontSize': '19px',
+                            'color': '#c6dbef',
+                            'fontWeight': '600',
+                            'letterSpacing': '0.5px'
+                        }),
+                        html.P(
+                            'Dashboard interactivo que analiza tendencias de lenguajes de programación '
+                            'mediante datos de popularidad histórica, actividad en repositorios de GitHub '
+                            'y análisis de Pull Requests del período 2020-2025.',
+                            style={
+                                'fontSize': '14px',
+                                'lineHeight': '1.6',
+                                'margin': '0'
+                            }
+                        )
                     ])
                 ]),
 
-                # Columna derecha: Sobre el Dashboard
+                # Línea divisoria
+                html.Hr(style={
+                    'border': 'none',
+                    'borderTop': '1px solid rgba(255,255,255,0.1)',
+                    'margin': '30px 0 20px 0'
+                }),
+
+                # Copyright
                 html.Div(style={
-                    'flex': '1',
-                    'minWidth': '300px'
+                    'textAlign': 'center',
+                    'fontSize': '12px',
+                    'opacity': '0.7'
                 }, children=[
-                    html.H3('Sobre el Dashboard', style={
-                        'marginBottom': '15px',
-                        'fontSize': '19px',
-                        'color': '#c6dbef',
-                        'fontWeight': '600',
-                        'letterSpacing': '0.5px'
-                    }),
-                    html.P(
-                        'Dashboard interactivo que analiza tendencias de lenguajes de programación '
-                        'mediante datos de popularidad histórica, actividad en repositorios de GitHub '
-                        'y análisis de Pull Requests del período 2020-2025.',
-                        style={
-                            'fontSize': '14px',
-                            'lineHeight': '1.6',
-                            'margin': '0'
-                        }
-                    )
+                    html.P('© 2025 | Proyecto de Análisis de Datos | Grupo 12', style={'margin': '0'}),
+                    html.P('Tecnología: Python • Dash • Plotly • Pandas', style={'margin': '5px 0 0 0'})
                 ])
-            ]),
-
-            # Línea divisoria
-            html.Hr(style={
-                'border': 'none',
-                'borderTop': '1px solid rgba(255,255,255,0.1)',
-                'margin': '30px 0 20px 0'
-            }),
-
-            # Copyright
-            html.Div(style={
-                'textAlign': 'center',
-                'fontSize': '12px',
-                'opacity': '0.7'
-            }, children=[
-                html.P('© 2025 | Proyecto de Análisis de Datos | Grupo 12', style={'margin': '0'}),
-                html.P('Tecnología: Python • Dash • Plotly • Pandas', style={'margin': '5px 0 0 0'})
             ])
         ])
     ])
-])
+
+
+_layout_servido = None
+_layout_lock = threading.Lock()
+
+
+def servir_layout():
+    """
+    Layout para el arranque perezoso: se construye en la primera petición
+    (o en segundo plano al iniciar el servidor) y luego se reutiliza.
+    """
+    global _layout_servido
+    if _layout_servido is None:
+        with _layout_lock:
+            if _layout_servido is None:
+                with TIEMPOS_ARRANQUE.medir('carga_datos', diferida=True):
+                    get_repository().warm()
+                with TIEMPOS_ARRANQUE.medir('layout', diferida=True):
+                    _layout_servido = construir_layout()
+                print(TIEMPOS_ARRANQUE.reporte())
+    return _layout_servido
+
+
+if LAZY_STARTUP:
+    app.validation_layout = construir_layout(con_figuras=False)
+else:
+    with TIEMPOS_ARRANQUE.medir('carga_datos'):
+        get_repository().warm()
+    with TIEMPOS_ARRANQUE.medir('layout'):
+        _layout_servido = construir_layout()
+# El layout se sirve como función en ambos modos para que una recarga de
+# datos (data_reload.py) pueda reemplazar las figuras iniciales
+app.layout = servir_layout
+
+
+# Cada petición (página o callback) trabaja con un único repositorio de datos,
+# aunque durante ella se publique una versión nueva
+@app.server.before_request
+def fijar_datos_peticion():
+    fijar_repositorio()
+
+
+@app.server.teardown_request
+def liberar_datos_peticion(_error=None):
+    liberar_repositorio()
 
 # ============================================================================
 # CALLBACKS PARA INTERACTIVIDAD
 # ============================================================================
 
-# Callback para actualizar la tabla y gráficos cuando cambia el rango de años
+def rango_anios(year_range):
+    """Años del RangeSlider (2020-2025 si no hay un rango válido)"""
+    if year_range and len(year_range) == 2:
+        return year_range[0], year_range[1]
+    return 2020, 2025
+
+
+# Con el resaltado clientside (assets/resaltado_seleccion.js) los callbacks
+# del servidor no reaccionan a los clics de selección: solo la leen como State
+# cuando otro control obliga a reconstruir la figura
+ENTRADA_SELECCION = (State if SELECCION_CLIENTE else Input)('selected-language-store', 'data')
+
+
+def callback_seleccion_servidor(*args, **kwargs):
+    """
+    Registrar un callback de selección en el servidor solo si el resaltado no
+    se hace en el navegador (CODETRENDS_SELECCION_CLIENTE=0)
+    """
+    if SELECCION_CLIENTE:
+        return lambda funcion: funcion
+    return app.callback(*args, **kwargs)
+
+
+def solo_cambio_seleccion():
+    """
+    True si el callback se disparó únicamente por un cambio del lenguaje
+    seleccionado: basta con enviar el resaltado como Patch sobre la figura
+    que ya está en el navegador (resaltado_seleccion.py)
+    """
+    return SELECCION_PARCIAL and set(callback_context.triggered_prop_ids) == {'selected-language-store.data'}
+
+
+# Callback para actualizar los periodos de la tabla y los gráficos cuando
+# cambia el rango de años: la tabla compara por defecto el primer y el último año
 @app.callback(
-    Output('tabla-container', 'children'),
+    Output('periodo-base-slider', 'value'),
+    Output('periodo-comparado-slider', 'value'),
     Output('timeseries-container', 'children'),
     Output('winners-container', 'children'),
+    Output('resumen-tendencias', 'children'),
     Input('year-range-slider', 'value')
 )
 def update_section1(year_range):
     """
-    Actualiza la tabla y los gráficos cuando cambia el rango de años
+    Actualiza los periodos de la tabla, los gráficos y el resumen de
+    tendencias cuando cambia el rango de años
     """
-    if year_range and len(year_range) == 2:
-        year1, year2 = str(year_range[0]), str(year_range[1])
-        tabla = getIndicadorAnio(rating_promedio_df, year1, year2)
-        line_chart = dcc.Graph(figure=create_line_chart(time_series_df, year_range[0], year_range[1]))
-        winners_chart = dcc.Graph(figure=get_monthly_winners(time_series_df, year_range[0], year_range[1]))
-        return tabla, line_chart, winners_chart
-    tabla = getIndicadorAnio(rating_promedio_df, '2020', '2025')
-    line_chart = dcc.Graph(figure=create_line_chart(time_series_df, 2020, 2025))
-    winners_chart = dcc.Graph(figure=get_monthly_winners(time_series_df, 2020, 2025))
-    return tabla, line_chart, winners_chart
+    year1, year2 = rango_anios(year_range)
+    line_chart = dcc.Graph(id='grafico-line-chart', figure=create_line_chart(anio1=year1, anio2=year2))
+    winners_chart = dcc.Graph(id='grafico-winners', figure=get_monthly_winners(year1=year1, year2=year2))
+    return (list(periodo_anio(year1)), list(periodo_anio(year2)), line_chart, winners_chart,
+            crear_resumen_tendencias(year1, year2))
+
+# Callback para actualizar la tabla cuando cambia alguno de sus periodos
+@app.callback(
+    Output('tabla-container', 'children'),
+    Input('periodo-base-slider', 'value'),
+    Input('periodo-comparado-slider', 'value')
+)
+def update_tabla_periodos(periodo_base, periodo_comparado):
+    """
+    Compara el rating promedio de dos rangos de meses cualesquiera
+    """
+    return getIndicadorAnio(periodo1=tuple(periodo_base), periodo2=tuple(periodo_comparado))
+
+# Callback de la tabla de indicadores en modo servidor: página, orden y filtro
+@app.callback(
+    Output('tabla-indicador', 'data'),
+    Output('tabla-indicador', 'page_count'),
+    Input('tabla-indicador', 'page_current'),
+    Input('tabla-indicador', 'page_size'),
+    Input('tabla-indicador', 'sort_by'),
+    Input('tabla-indicador', 'filter_query'),
+    State('tabla-indicador', 'page_action'),
+    State('periodo-base-slider', 'value'),
+    State('periodo-comparado-slider', 'value'),
+    prevent_initial_call=True
+)
+def paginar_tabla_indicadores(page_current, page_size, sort_by, filter_query, page_action,
+                              periodo_base, periodo_comparado):
+    """
+    Entrega solo la página visible de la tabla; con paginación nativa (pocos
+    lenguajes) DataTable lo resuelve en el navegador y no se actualiza nada
+    """
+    if page_action != 'custom':
+        return dash.no_update, dash.no_update
+    tabla_indicadores = obtener_tabla_indicadores(tuple(periodo_base), tuple(periodo_comparado))
+    return tabla_indicadores.pagina(page_current or 0, page_size or FILAS_POR_PAGINA, sort_by, filter_query)
 
 # Callback para actualizar el gráfico de repositorios por lenguaje
 @app.callback(
     Output('grafico-repos-por-lenguaje', 'figure'),
-    Input('dropdown-lenguaje', 'value')
+    [Input('dropdown-lenguaje', 'value'),
+     Input('dropdown-periodo-trending', 'value'),
+     Input('dropdown-top-repos', 'value'),
+     Input('radio-orden-repos', 'value'),
+     Input('buscador-repos', 'value')]
 )
-def actualizar_grafico_lenguaje(lenguaje_seleccionado):
+def actualizar_grafico_lenguaje(lenguaje_seleccionado, periodo, top, orden, repo_buscado):
     """
-    Actualiza el gráfico cuando se selecciona un lenguaje diferente
+    Actualiza el gráfico cuando se selecciona un lenguaje, un snapshot, la
+    cantidad de repositorios, la métrica de orden o un repositorio del buscador
     """
-    repos = df_repos_lang[df_repos_lang['Language'] == lenguaje_seleccionado].nlargest(5, 'NumberOfStar')
+    return crear_grafico_repos_lenguaje(lenguaje_seleccionado, periodo or 'actual', top or 5, orden or 'estrellas',
+                                        repo_buscado)
 
-    fig = go.Figure()
-
-    # Barra de Estrellas
-    fig.add_trace(go.Bar(
-        name='Estrellas',
-        x=repos['Repository'],
-        y=repos['NumberOfStar'],
-        text=repos['NumberOfStar'].apply(lambda x: f'{x:,}'),
-        textposition='outside',
-        marker=dict(color='#4292c6'),  # Azul medio de la paleta Blues
-        hovertemplate='<b>%{x}</b><br>' +
-                      'Estrellas: %{y:,}<br>' +
-                      '<extra></extra>'
-    ))
 
-    # Barra de Forks
-    fig.add_trace(go.Bar(
-        name='Forks',
-        x=repos['Repository'],
-        y=repos['NumberOfFork'],
-        text=repos['NumberOfFork'].apply(lambda x: f'{x:,}'),
-        textposition='outside',
-        marker=dict(color='#9ecae1'),  # Azul claro secundario de la paleta Blues
-        hovertemplate='<b>%{x}</b><br>' +
-                      'Forks: %{y:,}<br>' +
-                      '<extra></extra>'
-    ))
+# Callback del autocompletado: opciones según lo que se escribe en el buscador
+@app.callback(
+    Output('buscador-repos', 'options'),
+    Input('buscador-repos', 'search_value'),
+    State('buscador-repos', 'value'),
+    prevent_initial_call=True
+)
+def autocompletar_repos(texto, repo_buscado):
+    """
+    Los 10 repositorios con más estrellas cuyo nombre o usuario empieza con el
+    texto o lo contiene; el repositorio ya elegido se conserva entre las opciones
+    """
+    if not texto:
+        return dash.no_update
+    busqueda = obtener_busqueda_repos()
+    opciones = [opcion_busqueda(repo) for repo in busqueda.buscar(texto)]
+    elegido = busqueda.obtener(repo_buscado) if repo_buscado else None
+    if elegido and all(opcion['value'] != repo_buscado for opcion in opciones):
+        opciones.append(opcion_busqueda(elegido))
+    return opciones
+
+
+# Callback para llevar el lenguaje del repositorio buscado a la selección
+# global (el dropdown y el gráfico de repositorios por lenguaje la siguen)
+@app.callback(
+    Output('selected-language-store', 'data', allow_duplicate=True),
+    Input('buscador-repos', 'value'),
+    prevent_initial_call=True
+)
+def seleccionar_repo_buscado(repo_buscado):
+    """
+    Selecciona el lenguaje del repositorio elegido en el buscador
+    """
+    repo = obtener_busqueda_repos().obtener(repo_buscado) if repo_buscado else None
+    if repo is None or not repo['Language']:
+        return dash.no_update
+    return repo['Language']
 
-    fig.update_layout(
-        title={
-            'text': f'<b>Top 5 Repositorios de {lenguaje_seleccionado}</b>',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'color': '#08306b'}
-        },
-        xaxis_title='Repositorio',
-        yaxis_title='Cantidad',
-        height=450,
-        plot_bgcolor='rgba(247, 251, 255, 0.5)',
-        paper_bgcolor='white',
-        font=dict(size=11, color='#08306b'),
-        hovermode='closest',
-        margin=dict(l=60, r=50, t=80, b=100),
-        xaxis={'tickangle': -45},
-        barmode='group',
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
+# Callback para cambiar el snapshot del top de repositorios
+@app.callback(
+    Output('grafico-top-repositorios', 'figure'),
+    Input('dropdown-periodo-trending', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_top_repositorios(periodo):
+    """
+    Top 10 de repositorios del último scraping o de un día o ventana del historial
+    """
+    return crear_grafico_top_repositorios(periodo or 'actual')
 
-    return fig
+# Callback para actualizar el historial de posiciones
+@app.callback(
+    Output('grafico-bump', 'figure'),
+    [Input('year-range-slider', 'value'),
+     Input('dropdown-top-bump', 'value'),
+     ENTRADA_SELECCION]
+)
+def actualizar_bump_chart(year_range, top, selected_language):
+    """
+    Callback que actualiza el bump chart cuando cambia el rango de años, la
+    cantidad de lenguajes o el lenguaje seleccionado
+    """
+    year1, year2 = rango_anios(year_range)
+    # 0 = todos los lenguajes de la matriz
+    top = top or len(obtener_historial_ranking().lenguajes)
+    if solo_cambio_seleccion():
+        return como_patch(cambios_lineas_de(crear_bump_chart(year1, year2, top), selected_language))
+    return crear_bump_chart(year1, year2, top, selected_language)
 
 # Callback para actualizar el heatmap
 @app.callback(
     Output('heatmap-quarters', 'figure'),
     [Input('dropdown-anio', 'value'),
      Input('dropdown-num-lenguajes', 'value'),
-     Input('selected-language-store', 'data')]
+     ENTRADA_SELECCION]
 )
 def actualizar_heatmap(anio_seleccionado, num_lenguajes, selected_language):
     """
     Callback que actualiza el heatmap cuando se selecciona un año diferente
     o cuando cambia el lenguaje seleccionado
     """
+    if solo_cambio_seleccion():
+        return como_patch(cambios_heatmap_de(crear_heatmap_quarters(anio_seleccionado, num_lenguajes), selected_language))
     return crear_heatmap_quarters(anio_seleccionado, num_lenguajes, selected_language)
 
 # Callback para actualizar los medidores
@@ -1625,13 +2328,15 @@ def actualizar_heatmap(anio_seleccionado, num_lenguajes, selected_language):
     Output('medidores-promedio', 'figure'),
     [Input('dropdown-anio', 'value'),
      Input('dropdown-num-lenguajes', 'value'),
-     Input('selected-language-store', 'data')]
+     ENTRADA_SELECCION]
 )
 def actualizar_medidores(anio_seleccionado, num_lenguajes, selected_language):
     """
     Callback que actualiza los medidores cuando se selecciona un año diferente,
     se cambia el número de lenguajes o cuando cambia el lenguaje seleccionado
     """
+    if solo_cambio_seleccion():
+        return como_patch(cambios_medidores_de(crear_medidores_promedio(anio_seleccionado, num_lenguajes), selected_language))
     return crear_medidores_promedio(anio_seleccionado, num_lenguajes, selected_language)
 
 
@@ -1640,7 +2345,7 @@ def actualizar_medidores(anio_seleccionado, num_lenguajes, selected_language):
 # ============================================================================
 
 # Callback para actualizar el store cuando se hace clic en la tabla
-@app.callback(
+@callback_seleccion_servidor(
     Output('selected-language-store', 'data'),
     [Input('tabla-indicador', 'active_cell'),
      Input('grafico-promedio-estrellas', 'clickData')],
@@ -1673,11 +2378,12 @@ def update_selected_language(active_cell, click_data_stars, table_data, current_
     return current_selection
 
 
-# Callback para actualizar Sección 1 con selección de lenguaje
-@app.callback(
-    Output('tabla-container', 'children', allow_duplicate=True),
-    Output('timeseries-container', 'children', allow_duplicate=True),
-    Output('winners-container', 'children', allow_duplicate=True),
+# Callback para actualizar Sección 1 con selección de lenguaje: solo cambian
+# los estilos de la tabla y el resaltado de los gráficos ya dibujados
+@callback_seleccion_servidor(
+    Output('tabla-indicador', 'style_data_conditional'),
+    Output('grafico-line-chart', 'figure'),
+    Output('grafico-winners', 'figure'),
     [Input('selected-language-store', 'data')],
     [State('year-range-slider', 'value')],
     prevent_initial_call=True
@@ -1686,45 +2392,91 @@ def update_section1_with_selection(selected_language, year_range):
     """
     Actualiza la sección 1 cuando cambia el lenguaje seleccionado
     """
-    if year_range and len(year_range) == 2:
-        year1, year2 = str(year_range[0]), str(year_range[1])
-        tabla = getIndicadorAnio(rating_promedio_df, year1, year2, selected_language)
-        line_chart = dcc.Graph(
-            figure=create_line_chart(time_series_df, year_range[0], year_range[1], selected_language),
-            id='grafico-line-chart'
-        )
-        winners_chart = dcc.Graph(
-            figure=get_monthly_winners(time_series_df, year_range[0], year_range[1], selected_language),
-            id='grafico-winners'
+    year1, year2 = rango_anios(year_range)
+    estilos_tabla = ESTILOS_TABLA_INDICADOR + reglas_tabla(selected_language)
+    if SELECCION_PARCIAL:
+        line_chart = create_line_chart(anio1=year1, anio2=year2)
+        winners_chart = get_monthly_winners(year1=year1, year2=year2)
+        return (
+            estilos_tabla,
+            como_patch(cambios_lineas_de(line_chart, selected_language)),
+            como_patch(cambios_barras_de(winners_chart, selected_language)),
         )
-        return tabla, line_chart, winners_chart
+    return (
+        estilos_tabla,
+        create_line_chart(anio1=year1, anio2=year2, selected_language=selected_language),
+        get_monthly_winners(year1=year1, year2=year2, selected_language=selected_language),
+    )
 
-    tabla = getIndicadorAnio(rating_promedio_df, '2020', '2025', selected_language)
-    line_chart = dcc.Graph(
-        figure=create_line_chart(time_series_df, 2020, 2025, selected_language),
-        id='grafico-line-chart'
+
+# Serie completa del lenguaje seleccionado en el gráfico de tendencia WebGL:
+# el resaltado lo hace el navegador o el callback de arriba, pero la serie sin
+# submuestrear solo la tiene el servidor. El navegador la pide solo si la
+# figura tiene la traza que la recibe (con menos puntos que el presupuesto no
+# la tiene, y el clic no sale del navegador) y descarta la respuesta si la
+# selección o el rango cambiaron mientras tanto (dos clics seguidos). Con
+# CODETRENDS_LINEAS_MODO=svg no hay submuestreo y nada de esto se registra.
+if MODO_LINEAS != 'svg':
+    app.clientside_callback(
+        ClientsideFunction('resaltado', 'pedirSerieCompleta'),
+        Output('serie-completa-pedido', 'data'),
+        Input('selected-language-store', 'data'),
+        [State('grafico-line-chart', 'figure'),
+         State('year-range-slider', 'value')],
+        prevent_initial_call=True
+    )
+
+    @app.callback(
+        Output('serie-completa-datos', 'data'),
+        Input('serie-completa-pedido', 'data'),
+        prevent_initial_call=True
     )
-    winners_chart = dcc.Graph(
-        figure=get_monthly_winners(time_series_df, 2020, 2025, selected_language),
-        id='grafico-winners'
+    def update_line_chart_resolution(pedido):
+        """
+        Cambios de la traza de la serie completa para el lenguaje pedido, con
+        la selección y el rango del pedido para que el navegador los compare
+        """
+        year1, year2 = rango_anios(pedido['rango'])
+        line_chart = create_line_chart(anio1=year1, anio2=year2)
+        if not line_chart['data'] or line_chart['data'][-1].get('uid') != UID_SERIE_COMPLETA:
+            return dash.no_update
+        cambios = cambios_serie_completa(
+            line_chart, get_repository().get('series_tiempo'), year1, year2, pedido['lenguaje'])
+        return dict(pedido, trazas=len(line_chart['data']), cambios=cambios)
+
+    app.clientside_callback(
+        ClientsideFunction('resaltado', 'serieCompleta'),
+        Output('grafico-line-chart', 'figure', allow_duplicate=True),
+        Input('serie-completa-datos', 'data'),
+        [State('selected-language-store', 'data'),
+         State('grafico-line-chart', 'figure'),
+         State('year-range-slider', 'value')],
+        prevent_initial_call=True
     )
-    return tabla, line_chart, winners_chart
 
 
-# Callback para actualizar gráfico de estrellas con selección
+# Callback para actualizar gráfico de estrellas (métrica, snapshot y selección)
 @app.callback(
     Output('grafico-promedio-estrellas', 'figure'),
-    [Input('selected-language-store', 'data')]
+    [Input('radio-metrica-estrellas', 'value'),
+     Input('dropdown-periodo-trending', 'value'),
+     ENTRADA_SELECCION],
+    prevent_initial_call=True
 )
-def update_stars_chart(selected_language):
+def update_stars_chart(metrica, periodo, selected_language):
     """
-    Actualiza el gráfico de promedio de estrellas con el lenguaje seleccionado
+    Actualiza el gráfico de estrellas cuando cambia la métrica, el snapshot
+    de trending o el lenguaje seleccionado
     """
-    return crear_grafico_promedio_estrellas(selected_language)
+    metrica, periodo = metrica or 'promedio', periodo or 'actual'
+    if solo_cambio_seleccion():
+        return como_patch(cambios_barras_de(crear_grafico_promedio_estrellas(None, metrica, periodo),
+                                            selected_language, solo_si_presente=True))
+    return crear_grafico_promedio_estrellas(selected_language, metrica, periodo)
 
 
 # Callback para sincronizar el dropdown de lenguaje con la selección
-@app.callback(
+@callback_seleccion_servidor(
     Output('dropdown-lenguaje', 'value'),
     [Input('selected-language-store', 'data')],
     [State('dropdown-lenguaje', 'options')],
@@ -1742,19 +2494,85 @@ def sync_dropdown_with_selection(selected_language, dropdown_options):
     return dash.no_update
 
 
+# Resaltado de la selección en el navegador: un clic no llega al servidor.
+# Las funciones están en assets/resaltado_seleccion.js y dan el mismo
+# resultado que los callbacks del servidor de arriba.
+if SELECCION_CLIENTE:
+    app.clientside_callback(
+        ClientsideFunction('resaltado', 'seleccionar'),
+        Output('selected-language-store', 'data'),
+        [Input('tabla-indicador', 'active_cell'),
+         Input('grafico-promedio-estrellas', 'clickData')],
+        [State('tabla-indicador', 'data'),
+         State('selected-language-store', 'data')],
+        prevent_initial_call=True
+    )
+    app.clientside_callback(
+        ClientsideFunction('resaltado', 'tabla'),
+        Output('tabla-indicador', 'style_data_conditional'),
+        Input('selected-language-store', 'data'),
+        State('tabla-indicador', 'style_data_conditional'),
+        prevent_initial_call=True
+    )
+    # estrellas, bump, heatmap y medidores también los actualiza el servidor cuando cambian sus controles
+    for funcion, grafico, compartido in (('lineas', 'grafico-line-chart', False),
+                                         ('ganadores', 'grafico-winners', False),
+                                         ('estrellas', 'grafico-promedio-estrellas', True),
+                                         ('lineas', 'grafico-bump', True),
+                                         ('heatmap', 'heatmap-quarters', True),
+                                         ('medidores', 'medidores-promedio', True)):
+        app.clientside_callback(
+            ClientsideFunction('resaltado', funcion),
+            Output(grafico, 'figure', allow_duplicate=compartido),
+            Input('selected-language-store', 'data'),
+            State(grafico, 'figure'),
+            prevent_initial_call=True
+        )
+    app.clientside_callback(
+        ClientsideFunction('resaltado', 'sincronizarDropdown'),
+        Output('dropdown-lenguaje', 'value'),
+        Input('selected-language-store', 'data'),
+        State('dropdown-lenguaje', 'options'),
+        prevent_initial_call=True
+    )
+
+
 # ============================================================================
 # CALLBACKS PARA EL CHATBOT IA
 # ============================================================================
 
-# Inicializar agente IA (solo si esta disponible)
-ai_agent = None
-if AI_AVAILABLE:
-    try:
-        ai_agent = CodeTrendsAgent()
-        print("CodeTrends AI Agent inicializado correctamente!")
-    except Exception as e:
-        print(f"Error inicializando agente IA: {e}")
-        AI_AVAILABLE = False
+# Agente IA: se importa e inicializa en el primer uso (arranque perezoso),
+# en cada worker después del fork (gunicorn.conf.py) o durante el arranque
+# normal, antes de levantar el servidor
+_agente = None
+_agente_error = None
+_agente_lock = threading.Lock()
+
+
+def obtener_agente():
+    """
+    Obtener el agente IA, importándolo e inicializándolo la primera vez.
+
+    Returns:
+        Instancia de CodeTrendsAgent, o None si no está disponible
+    """
+    global _agente, _agente_error
+    if _agente is None and _agente_error is None:
+        with _agente_lock:
+            if _agente is None and _agente_error is None:
+                with TIEMPOS_ARRANQUE.medir('agente_ia', diferida=LAZY_STARTUP or AGENTE_POR_WORKER):
+                    try:
+                        from ai_agent import CodeTrendsAgent
+                        _agente = CodeTrendsAgent()
+                        print("CodeTrends AI Agent inicializado correctamente!")
+                    except Exception as e:
+                        _agente_error = e
+                        print(f"Agente IA no disponible: {e}")
+    return _agente
+
+
+if not (LAZY_STARTUP or AGENTE_POR_WORKER):
+    obtener_agente()
 
 
 # Callback para abrir/cerrar el panel del chat
@@ -1861,8 +2679,8 @@ def handle_chat(send_clicks, enter_submit, clear_clicks,
 
     # Manejar boton de limpiar
     if triggered_id == 'clear-button':
-        if ai_agent:
-            ai_agent.clear_history()
+        if _agente:
+            _agente.clear_history()
         initial_message = html.Div([
             html.Strong("AI: ", style={'color': '#4292c6', 'fontSize': '12px'}),
             html.Span(
@@ -1896,9 +2714,10 @@ def handle_chat(send_clicks, enter_submit, clear_clicks,
     ], style=user_style)
 
     # Obtener respuesta de la IA
-    if ai_agent and AI_AVAILABLE:
+    agente = obtener_agente()
+    if agente:
         try:
-            ai_response = ai_agent.query(message)
+            ai_response = agente.query(message)
         except Exception as e:
             ai_response = f"Lo siento, ocurrio un error: {str(e)}"
     else:
@@ -1926,5 +2745,58 @@ def handle_chat(send_clicks, enter_submit, clear_clicks,
     return new_children, '', history_data, ""
 
 
+@app.server.route('/_arranque')
+def reporte_arranque():
+    """Tiempos de arranque por fase (incluye las fases diferidas)"""
+    return {'lazy': LAZY_STARTUP, 'fases': TIEMPOS_ARRANQUE.fases()}
+
+
+@app.server.route('/_cache_figuras')
+def reporte_cache_figuras():
+    """Aciertos, fallos y bytes usados por la cache de figuras"""
+    return figure_cache.stats()
+
+
+@recarga_datos.al_recargar
+def actualizar_por_recarga(nuevo, anterior):
+    """Descartar lo construido con la versión anterior de los datos"""
+    global _layout_servido
+    figure_cache.invalidar(nuevo.version)
+    if _layout_servido is not None:
+        # Se arma completo y luego se reemplaza la referencia
+        _layout_servido = construir_layout()
+    if _agente is not None:
+        _agente.recargar_datos(nuevo)
+
+
+@app.server.route('/api/buscar')
+def api_buscar():
+    """
+    Búsqueda de repositorios para el autocompletado: /api/buscar?q=texto&limite=10
+    """
+    texto = request.args.get('q', '')
+    try:
+        limite = min(max(int(request.args.get('limite', 10)), 1), 50)
+    except ValueError:
+        limite = 10
+    busqueda = obtener_busqueda_repos()
+    inicio = time.perf_counter()
+    resultados = busqueda.buscar(texto, limite)
+    return {'consulta': texto, 'resultados': resultados, 'ms': round((time.perf_counter() - inicio) * 1000, 3)}
+
+
+@app.server.route('/_datos')
+def reporte_datos():
+    """Versión de datos vigente y recargas en caliente realizadas"""
+    return recarga_datos.estado()
+
+
 if __name__ == '__main__':
+    if LAZY_STARTUP:
+        # Las figuras iniciales se construyen en segundo plano mientras el
+        # servidor empieza a escuchar; la primera petición espera si aún no terminan
+        threading.Thread(target=servir_layout, daemon=True).start()
+    # Revisión periódica de la versión de datos (CODETRENDS_RELOAD_SEGUNDOS, 0 = apagada)
+    recarga_datos.iniciar()
+    print(TIEMPOS_ARRANQUE.reporte())
     app.run(debug=False, port=8050)
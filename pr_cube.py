@@ -0,0 +1,172 @@
+# ===========================================
+# PullRequestCube - Cubo denso de Pull Requests
+# ===========================================
+#
+# Los datos limpios de Madnight se precalculan una sola vez en arrays densos
+# con ejes (año, trimestre, lenguaje). El heatmap, los medidores y el top 1
+# se obtienen cortando y reduciendo ejes del cubo, sin filtrar ni pivotear
+# DataFrames en cada callback.
+
+import numpy as np
+
+from lenguajes import SIN_CODIGO, codificar
+
+TRIMESTRES = np.array([1, 2, 3, 4])
+
+
+class PullRequestCube:
+    """
+    Cubo (año, trimestre, lenguaje) con el porcentaje y el ranking de PRs.
+
+    Attributes:
+        anios: Años del eje 0 (ordenados)
+        lenguajes: Lenguajes del eje 2 (orden alfabético)
+        codigos: Código canónico de cada lenguaje (lenguajes.py)
+        porcentajes: float64 (años, 4, lenguajes); NaN donde no hay dato
+        rankings: int32 (años, 4, lenguajes); 0 donde no hay dato
+    """
+
+    def __init__(self, anios, lenguajes, porcentajes, rankings):
+        self.anios = anios
+        self.lenguajes = lenguajes
+        self.porcentajes = porcentajes
+        self.rankings = rankings
+        self.codigos = codificar(lenguajes)
+        # Por código, así los lenguajes pedidos se encuentran con cualquier
+        # alias; los que no están en el catálogo, por su nombre
+        self._indice_lenguaje = {}
+        for i, clave in enumerate(self._claves(lenguajes, self.codigos)):
+            self._indice_lenguaje.setdefault(clave, i)
+        self._indice_anio = {int(anio): i for i, anio in enumerate(anios)}
+
+    @staticmethod
+    def _claves(lenguajes, codigos):
+        return [nombre if codigo == SIN_CODIGO else codigo for nombre, codigo in zip(lenguajes, codigos.tolist())]
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """
+        Construir el cubo a partir de MadnightPullRequests_cleaned.
+
+        Args:
+            df: DataFrame con columnas Año, Quarter, Ranking, Lenguaje, Porcentaje
+        """
+        anios, i_anio = np.unique(df['Año'].to_numpy(), return_inverse=True)
+        lenguajes, i_lang = np.unique(df['Lenguaje'].to_numpy(dtype=str), return_inverse=True)
+        i_trim = df['Quarter'].to_numpy() - 1
+
+        porcentajes = np.full((len(anios), len(TRIMESTRES), len(lenguajes)), np.nan)
+        rankings = np.zeros(porcentajes.shape, dtype=np.int32)
+        porcentajes[i_anio, i_trim, i_lang] = df['Porcentaje'].to_numpy(dtype=float)
+        rankings[i_anio, i_trim, i_lang] = df['Ranking'].to_numpy()
+        return cls(anios, lenguajes.astype(object), porcentajes, rankings)
+
+    @property
+    def nbytes(self):
+        return self.porcentajes.nbytes + self.rankings.nbytes
+
+    def indices_lenguajes(self, lenguajes=None):
+        """
+        Índices (en orden alfabético) de los lenguajes pedidos que existen en
+        el cubo; se piden por nombre (cualquier alias) o directamente por código
+        """
+        if lenguajes is None:
+            return np.arange(len(self.lenguajes))
+        lenguajes = np.asarray(lenguajes)
+        if np.issubdtype(lenguajes.dtype, np.integer):
+            claves = lenguajes.tolist()
+        else:
+            claves = self._claves(lenguajes, codificar(lenguajes))
+        return np.array(sorted({self._indice_lenguaje[clave] for clave in claves
+                                if clave in self._indice_lenguaje}), dtype=np.intp)
+
+    def _corte(self, anio, i_langs):
+        """Cortar el cubo por año ('Todos' = todos los años) y lenguajes"""
+        if anio == 'Todos':
+            return self.porcentajes[:, :, i_langs], self.anios
+        i_anio = self._indice_anio.get(int(anio))
+        if i_anio is None:
+            return self.porcentajes[:0, :, i_langs], self.anios[:0]
+        return self.porcentajes[i_anio:i_anio + 1, :, i_langs], self.anios[i_anio:i_anio + 1]
+
+    def heatmap(self, anio='Todos', lenguajes=None, top=None):
+        """
+        Matriz lenguaje x periodo para el heatmap de trimestres.
+
+        Solo incluye periodos y lenguajes con al menos un dato; los huecos se
+        rellenan con 0 y las filas se ordenan por su promedio descendente.
+
+        Args:
+            anio: 'Todos' o un año concreto
+            lenguajes: Lenguajes a considerar (None = todos los del cubo)
+            top: Cantidad máxima de filas (None = todas)
+
+        Returns:
+            Tupla (matriz, etiquetas_periodo, nombres_lenguaje)
+        """
+        i_langs = self.indices_lenguajes(lenguajes)
+        corte, anios = self._corte(anio, i_langs)
+
+        # (periodos, lenguajes) con periodos en orden (año, trimestre)
+        plano = corte.reshape(-1, len(i_langs))
+        presentes = ~np.isnan(plano)
+        columnas = presentes.any(axis=1)
+        filas = presentes.any(axis=0)
+
+        matriz = np.nan_to_num(plano[columnas][:, filas].T, nan=0.0)
+        if anio == 'Todos':
+            etiquetas = [f'{a}-Q{q}' for a in anios for q in TRIMESTRES]
+        else:
+            etiquetas = [f'Q{q}' for q in TRIMESTRES]
+        etiquetas = [e for e, presente in zip(etiquetas, columnas) if presente]
+        nombres = self.lenguajes[i_langs[filas]]
+
+        if matriz.shape[1]:
+            orden = np.argsort(-matriz.mean(axis=1), kind='stable')
+        else:
+            orden = np.arange(len(nombres))
+        if top is not None:
+            orden = orden[:top]
+        return matriz[orden], etiquetas, nombres[orden]
+
+    def promedios(self, anio='Todos', lenguajes=None, top=None):
+        """
+        Promedio de porcentaje de PRs por lenguaje (solo sobre periodos con dato).
+
+        Returns:
+            Tupla (nombres_lenguaje, promedios) ordenada de mayor a menor
+        """
+        i_langs = self.indices_lenguajes(lenguajes)
+        corte, _ = self._corte(anio, i_langs)
+        plano = corte.reshape(-1, len(i_langs))
+
+        conteo = (~np.isnan(plano)).sum(axis=0)
+        suma = np.nansum(plano, axis=0)
+        con_datos = conteo > 0
+        valores = suma[con_datos] / conteo[con_datos]
+        nombres = self.lenguajes[i_langs[con_datos]]
+
+        orden = np.argsort(-valores, kind='stable')
+        if top is not None:
+            orden = orden[:top]
+        return nombres[orden], valores[orden]
+
+    def anios_en_top1(self, lenguajes=None):
+        """
+        Cantidad de años en que cada lenguaje fue el que más trimestres ocupó el
+        puesto 1 (considerando solo los lenguajes pedidos).
+
+        Returns:
+            Tupla (nombres_lenguaje, conteos) ordenada de menor a mayor
+        """
+        i_langs = self.indices_lenguajes(lenguajes)
+        # Veces en el puesto 1 por (año, lenguaje)
+        veces = (self.rankings[:, :, i_langs] == 1).sum(axis=1)
+        anios_con_top1 = veces.any(axis=1)
+        # Empates: gana el primero en orden alfabético
+        ganadores = veces[anios_con_top1].argmax(axis=1)
+
+        conteos = np.bincount(ganadores, minlength=len(i_langs))
+        con_top1 = np.flatnonzero(conteos)
+        orden = con_top1[np.argsort(conteos[con_top1], kind='stable')]
+        return self.lenguajes[i_langs[orden]], conteos[orden]
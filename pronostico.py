@@ -0,0 +1,214 @@
+# ===========================================
+# PronosticoTIOBE - Pronóstico del rating TIOBE de todos los lenguajes
+# ===========================================
+#
+# Suavizamiento exponencial de Holt con tendencia amortiguada (nivel +
+# tendencia aditiva que se apaga con phi) ajustado a la vez para todos los
+# lenguajes: el recorrido en el tiempo es un solo bucle sobre arrays
+# (combinaciones de parámetros x lenguajes), nunca un bucle por lenguaje. Cada
+# lenguaje se queda con la terna (alpha, beta, phi) de la grilla que menor
+# error cuadrático tiene a un paso, y el intervalo de predicción sale de
+# la varianza de ese error. Es una estructura derivada del repositorio de
+# datos: se ajusta una vez por versión de datos (también en cada recarga) y
+# el gráfico de tendencia y el agente IA leen el mismo pronóstico.
+#
+# Horizonte del gráfico: CODETRENDS_PRONOSTICO_MESES (por defecto 12, entre
+# 0 y HORIZONTE_MAXIMO; 0 lo oculta).
+#
+# Uso:
+#   python pronostico.py    # pronóstico a 12 meses, validación y benchmark con 50 lenguajes x 25 años
+
+import os
+
+import numpy as np
+
+from data_repository import get_repository
+from tiobe_matrix import construir_matriz_tiobe
+
+# Meses hacia adelante que se calculan (el gráfico y el agente toman una parte)
+HORIZONTE_MAXIMO = 24
+MESES_PRONOSTICO = min(int(os.getenv('CODETRENDS_PRONOSTICO_MESES', '12')), HORIZONTE_MAXIMO)
+
+# Grilla de parámetros de suavizamiento (nivel y tendencia)
+ALPHAS = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9])
+BETAS = np.array([0.01, 0.05, 0.1, 0.2, 0.3, 0.5])
+# phi = 1 es la tendencia lineal de Holt; con phi < 1 se aplana a largo plazo
+PHIS = np.array([0.8, 0.9, 0.95, 0.98, 1.0])
+
+# Cuantil normal del intervalo de predicción del 95%
+Z_INTERVALO = 1.96
+
+
+def ajustar_holt(ratings, alphas, betas, phis):
+    """
+    Recorrer las series con cada terna (alpha, beta, phi) a la vez.
+
+    Las observaciones sin dato (NaN) no actualizan el modelo: el nivel avanza
+    con la tendencia. La primera observación fija el nivel, la segunda la
+    tendencia; el error se acumula desde la tercera.
+
+    Args:
+        ratings: (lenguajes, observaciones)
+        alphas, betas, phis: (combinaciones,) parámetros de cada combinación
+
+    Returns:
+        Tupla (nivel, tendencia, suma de errores al cuadrado, cantidad de
+        errores), cada uno (combinaciones, lenguajes)
+    """
+    alphas = alphas[:, None]
+    betas = betas[:, None]
+    phis = phis[:, None]
+    forma = (len(alphas), ratings.shape[0])
+    nivel = np.zeros(forma)
+    tendencia = np.zeros(forma)
+    sse = np.zeros(forma)
+    vistos = np.zeros(ratings.shape[0], dtype=np.int64)
+    for y in ratings.T:
+        con_dato = ~np.isnan(y)
+        primera = con_dato & (vistos == 0)
+        segunda = con_dato & (vistos == 1)
+        resto = con_dato & (vistos >= 2)
+
+        prediccion = nivel + phis * tendencia
+        error = np.where(resto, y - prediccion, 0.0)
+        sse += error ** 2
+        nuevo_nivel = prediccion + alphas * error
+        tendencia = np.where(segunda, y - nivel, phis * tendencia + alphas * betas * error)
+        nivel = np.where(primera | segunda, y, nuevo_nivel)
+        vistos += con_dato
+    return nivel, tendencia, sse, np.maximum(vistos - 2, 0)
+
+
+class PronosticoTIOBE:
+    """
+    Pronóstico mensual del rating de cada lenguaje hasta HORIZONTE_MAXIMO meses.
+
+    Los arrays están alineados con `lenguajes`; NaN para los lenguajes con
+    menos de tres observaciones. Las bandas se recortan en 0 (no hay ratings
+    negativos).
+
+    Attributes:
+        fechas: datetime64 del primer día de cada mes pronosticado
+        media: (lenguajes, horizonte) pronóstico puntual
+        inferior, superior: (lenguajes, horizonte) intervalo de predicción del 95%
+        alpha, beta, phi: Parámetros elegidos por lenguaje
+        sigma: Desviación del error a un paso por lenguaje
+        ultima_fecha, ultimo: Última observación de cada lenguaje (de donde
+            arranca la línea punteada)
+    """
+
+    def __init__(self, matriz, horizonte=HORIZONTE_MAXIMO):
+        self.lenguajes = matriz.lenguajes
+        self._indice_lenguaje = {lang: i for i, lang in enumerate(self.lenguajes)}
+        ratings = matriz.ratings
+
+        # Todas las combinaciones de la grilla en un solo recorrido
+        malla_alpha, malla_beta, malla_phi = (m.ravel() for m in np.meshgrid(ALPHAS, BETAS, PHIS, indexing='ij'))
+        nivel, tendencia, sse, errores = ajustar_holt(ratings, malla_alpha, malla_beta, malla_phi)
+        mejor = np.argmin(sse, axis=0)
+        columnas = np.arange(len(self.lenguajes))
+        self.alpha = malla_alpha[mejor]
+        self.beta = malla_beta[mejor]
+        self.phi = malla_phi[mejor]
+        nivel, tendencia = nivel[mejor, columnas], tendencia[mejor, columnas]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.sigma = np.where(errores > 0, np.sqrt(sse[mejor, columnas] / errores), np.nan)
+
+        # La tendencia suma phi + phi² + ... + phi^h a h pasos (h con phi = 1);
+        # varianza: sigma² (1 + sum_{j<h} alpha² (1 + beta phi_j)²)
+        pasos = np.arange(1, horizonte + 1)
+        phi_h = np.cumsum(self.phi[:, None] ** pasos[None, :], axis=1)
+        aporte = (self.alpha[:, None] * (1 + self.beta[:, None] * phi_h[:, :-1])) ** 2
+        varianza = np.hstack([np.zeros((len(self.lenguajes), 1)), np.cumsum(aporte, axis=1)]) + 1
+        margen = Z_INTERVALO * self.sigma[:, None] * np.sqrt(varianza)
+        media = nivel[:, None] + phi_h * tendencia[:, None]
+        media[np.isnan(self.sigma)] = np.nan
+        self.media = np.clip(media, 0, None)
+        self.inferior = np.clip(media - margen, 0, None)
+        self.superior = np.clip(media + margen, 0, None)
+
+        ultimo_mes = matriz.fechas[-1].astype('datetime64[M]') if len(matriz.fechas) else np.datetime64('NaT', 'M')
+        self.fechas = (ultimo_mes + pasos).astype('datetime64[ns]')
+        con_dato = ~np.isnan(ratings)
+        ultima = ratings.shape[1] - 1 - np.argmax(con_dato[:, ::-1], axis=1)
+        self.ultima_fecha = matriz.fechas[ultima] if len(matriz.fechas) else matriz.fechas
+        self.ultimo = ratings[columnas, ultima] if len(matriz.fechas) else np.full(len(columnas), np.nan)
+
+    @property
+    def nbytes(self):
+        return self.media.nbytes + self.inferior.nbytes + self.superior.nbytes + self.fechas.nbytes
+
+    def serie(self, lenguaje, meses=MESES_PRONOSTICO):
+        """
+        Pronóstico de un lenguaje listo para dibujar.
+
+        Returns:
+            Tupla (fechas, media, inferior, superior): la última observación
+            (intervalo nulo) seguida de los primeros `meses` pronosticados
+        """
+        i = self._indice_lenguaje[lenguaje]
+        ultimo = self.ultimo[i:i + 1]
+        return (np.concatenate([self.ultima_fecha[i:i + 1], self.fechas[:meses]]),
+                np.concatenate([ultimo, self.media[i, :meses]]),
+                np.concatenate([ultimo, self.inferior[i, :meses]]),
+                np.concatenate([ultimo, self.superior[i, :meses]]))
+
+    def texto_insights(self, meses=12):
+        """Resumen en texto para el prompt del agente IA"""
+        meses = min(meses, len(self.fechas))
+        if not meses:
+            return ""
+        h = meses - 1
+        orden = [i for i in np.argsort(-self.media[:, h], kind='stable') if not np.isnan(self.media[i, h])]
+        lineas = [f"PRONOSTICO TIOBE A {meses} MESES ({str(self.fechas[h])[:7]}, Holt con tendencia amortiguada, "
+                  f"intervalo del 95%):"]
+        for i in orden:
+            lineas.append(f"- {self.lenguajes[i]}: {self.ultimo[i]:.2f}% -> {self.media[i, h]:.2f}% "
+                          f"({self.inferior[i, h]:.2f}% a {self.superior[i, h]:.2f}%)")
+        return "\n".join(lineas)
+
+
+def obtener_pronostico(repositorio=None):
+    """Pronóstico de todos los lenguajes, ajustado una sola vez por versión de datos"""
+    repositorio = repositorio or get_repository()
+    return repositorio.derived(
+        'pronostico',
+        lambda repo: PronosticoTIOBE(repo.derived('matriz_tiobe', construir_matriz_tiobe))
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    from tiobe_matrix import RatingMatrix
+
+    repositorio = get_repository()
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    pronostico = obtener_pronostico(repositorio)
+    print(pronostico.texto_insights())
+
+    # Validación: ajustar sin los últimos 12 meses y comparar con lo observado
+    reservado = 12
+    recorte = RatingMatrix(matriz.lenguajes, matriz.fechas[:-reservado], matriz.ratings[:, :-reservado])
+    prueba = PronosticoTIOBE(recorte, reservado)
+    real = matriz.ratings[:, -reservado:]
+    ingenuo = np.abs(real - recorte.ratings[:, -1:]).mean()
+    cubiertos = ((real >= prueba.inferior) & (real <= prueba.superior)).mean()
+    print(f"\nÚltimos {reservado} meses fuera del ajuste: error medio Holt "
+          f"{np.abs(real - prueba.media).mean():.2f} puntos (último valor repetido: {ingenuo:.2f}); "
+          f"{cubiertos:.0%} de las observaciones dentro del intervalo del 95%")
+
+    # Benchmark: 50 lenguajes, 25 años de observaciones mensuales
+    rng = np.random.default_rng(11)
+    fechas = pd.date_range('2001-01-01', '2025-12-01', freq='MS')
+    ratings = np.clip(np.cumsum(rng.normal(0, 0.3, (50, len(fechas))), axis=1) + rng.uniform(1, 15, (50, 1)), 0.1, None)
+    ratings[:5, :60] = np.nan  # lenguajes que entran al ranking más tarde
+    sintetica = RatingMatrix(np.array([f'Lenguaje{i:02d}' for i in range(50)], dtype=object),
+                             fechas.to_numpy(), ratings)
+    inicio = time.perf_counter()
+    grande = PronosticoTIOBE(sintetica)
+    duracion = (time.perf_counter() - inicio) * 1000
+    print(f"Ajuste de 50 lenguajes x {len(fechas)} observaciones, {len(ALPHAS) * len(BETAS) * len(PHIS)} combinaciones "
+          f"de parámetros, {HORIZONTE_MAXIMO} meses: {duracion:.1f} ms")
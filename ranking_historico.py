@@ -0,0 +1,197 @@
+# ===========================================
+# HistorialRanking - Posición mensual de cada lenguaje en el índice TIOBE
+# ===========================================
+#
+# get_monthly_winners solo conoce el #1 de cada mes. Aquí se ordenan todos los
+# lenguajes en cada observación una sola vez por versión de datos (argsort
+# sobre la matriz lenguaje x mes de tiobe_matrix.RatingMatrix) y se guarda la
+# matriz de posiciones. Con ella las preguntas del tipo "¿cuántos meses
+# estuvo X en el top 3?" o "¿cuándo superó C a Java?" son comparaciones sobre
+# arrays, y el bump chart del dashboard se arma sin volver a ordenar.
+#
+# Uso:
+#   python ranking_historico.py    # consultas de ejemplo y benchmark con 50 lenguajes x 25 años
+
+import numpy as np
+
+from data_repository import get_repository
+from tiobe_matrix import RatingMatrix, construir_matriz_tiobe
+
+
+class HistorialRanking:
+    """
+    Posición (1 = mejor calificado) de cada lenguaje en cada observación.
+
+    Los empates se resuelven por el orden de los lenguajes en la matriz, igual
+    que el argmax de los ganadores mensuales, así que la posición 1 coincide
+    siempre con get_monthly_winners.
+
+    Attributes:
+        lenguajes: Lenguajes del eje 0 (los de la matriz)
+        fechas: datetime64 de cada observación
+        anios: Año de cada observación
+        posiciones: int16 (lenguajes, observaciones); 0 donde el lenguaje no tiene dato
+    """
+
+    def __init__(self, matriz):
+        self.lenguajes = matriz.lenguajes
+        self.fechas = matriz.fechas
+        self.anios = matriz.anios
+        self._indice_lenguaje = {lang: i for i, lang in enumerate(self.lenguajes)}
+
+        ratings = matriz.ratings
+        sin_dato = np.isnan(ratings)
+        # Orden descendente estable por columna: los NaN quedan al final
+        orden = np.argsort(-np.where(sin_dato, -np.inf, ratings), axis=0, kind='stable')
+        posiciones = np.empty(ratings.shape, dtype=np.int16)
+        lugares = np.broadcast_to(np.arange(1, ratings.shape[0] + 1, dtype=np.int16)[:, None], ratings.shape)
+        np.put_along_axis(posiciones, orden, lugares, axis=0)
+        posiciones[sin_dato] = 0
+        self.posiciones = posiciones
+
+    @property
+    def nbytes(self):
+        return self.posiciones.nbytes + self.fechas.nbytes + self.anios.nbytes
+
+    def indice(self, lenguaje):
+        """Fila de un lenguaje en la matriz (KeyError si no está)"""
+        return self._indice_lenguaje[lenguaje]
+
+    def columnas(self, anio1=None, anio2=None):
+        """Slice de observaciones con anio1 <= año <= anio2 (todas si no hay rango)"""
+        if anio1 is None:
+            return slice(0, len(self.fechas))
+        inicio = np.searchsorted(self.anios, int(anio1), side='left')
+        fin = np.searchsorted(self.anios, int(anio2), side='right')
+        return slice(inicio, fin)
+
+    def meses_en_top(self, k, anio1=None, anio2=None):
+        """
+        Observaciones en que cada lenguaje estuvo entre los k primeros.
+
+        Returns:
+            Array alineado con lenguajes
+        """
+        corte = self.posiciones[:, self.columnas(anio1, anio2)]
+        return ((corte > 0) & (corte <= k)).sum(axis=1)
+
+    def cambios_posicion(self, lenguaje, anio1=None, anio2=None):
+        """
+        Cambios de posición de un lenguaje entre observaciones seguidas.
+
+        Returns:
+            Lista de (fecha, posición anterior, posición nueva)
+        """
+        rango = self.columnas(anio1, anio2)
+        serie = self.posiciones[self.indice(lenguaje), rango]
+        fechas = self.fechas[rango]
+        cambios = np.flatnonzero((serie[1:] != serie[:-1]) & (serie[1:] > 0) & (serie[:-1] > 0)) + 1
+        return [(fechas[t], int(serie[t - 1]), int(serie[t])) for t in cambios]
+
+    def adelantamientos(self, lenguaje_a, lenguaje_b, anio1=None, anio2=None):
+        """
+        Momentos en que uno de los dos lenguajes pasó al otro.
+
+        Returns:
+            Lista de (fecha, lenguaje que sube, lenguaje superado), comparando
+            solo observaciones en las que ambos tienen dato
+        """
+        rango = self.columnas(anio1, anio2)
+        a = self.posiciones[self.indice(lenguaje_a), rango]
+        b = self.posiciones[self.indice(lenguaje_b), rango]
+        ambos = np.flatnonzero((a > 0) & (b > 0))
+        adelante_a = a[ambos] < b[ambos]
+        cruces = np.flatnonzero(adelante_a[1:] != adelante_a[:-1]) + 1
+        fechas = self.fechas[rango][ambos]
+        return [
+            (fechas[t], lenguaje_a, lenguaje_b) if adelante_a[t] else (fechas[t], lenguaje_b, lenguaje_a)
+            for t in cruces
+        ]
+
+    def trayectorias(self, top, anio1=None, anio2=None):
+        """
+        Datos del bump chart: posición de cada lenguaje que estuvo en el top
+        del rango, con solo el primer y el último punto de cada tramo en la
+        misma posición (los intermedios son la misma línea horizontal).
+
+        Returns:
+            Lista de (lenguaje, fechas, posiciones) con NaN donde el lenguaje
+            está fuera del top o sin dato (corta la línea)
+        """
+        rango = self.columnas(anio1, anio2)
+        corte = self.posiciones[:, rango].astype(float)
+        corte[(corte == 0) | (corte > top)] = np.nan
+        fechas = self.fechas[rango]
+        resultado = []
+        for i in np.flatnonzero(~np.isnan(corte).all(axis=1)):
+            serie = corte[i]
+            anterior = np.concatenate([[np.inf], serie[:-1]])
+            siguiente = np.concatenate([serie[1:], [np.inf]])
+            # NaN != NaN: los tramos fuera del top se comparan aparte
+            igual_anterior = (serie == anterior) | (np.isnan(serie) & np.isnan(anterior))
+            igual_siguiente = (serie == siguiente) | (np.isnan(serie) & np.isnan(siguiente))
+            conservar = ~(igual_anterior & igual_siguiente)
+            resultado.append((self.lenguajes[i], fechas[conservar], serie[conservar]))
+        # Orden de la leyenda: posición al final del rango (mejores primero)
+        ultima = [p[~np.isnan(p)][-1] for _, _, p in resultado]
+        return [resultado[i] for i in np.argsort(ultima, kind='stable')]
+
+    def texto_insights(self, k=3):
+        """Resumen en texto para el prompt del agente IA"""
+        meses = self.meses_en_top(k)
+        orden = [i for i in np.argsort(-meses, kind='stable') if meses[i]]
+        lineas = [f"- Observaciones en el top {k} (de {len(self.fechas)}): "
+                  + ', '.join(f"{self.lenguajes[i]} {meses[i]}" for i in orden)]
+        # Adelantamientos entre los lenguajes que pasaron por el top
+        cruces = []
+        for n, a in enumerate(orden):
+            for b in orden[n + 1:]:
+                cruces += self.adelantamientos(self.lenguajes[a], self.lenguajes[b])
+        if cruces:
+            cruces.sort(key=lambda cruce: cruce[0])
+            lineas.append(f"- Adelantamientos entre lenguajes del top {k}: " + '; '.join(
+                f"{str(np.datetime64(fecha, 'M'))} {sube} supera a {superado}" for fecha, sube, superado in cruces))
+        return "\n".join(lineas)
+
+
+def obtener_historial_ranking(repositorio=None):
+    """Matriz de posiciones mensuales, calculada una sola vez por versión de datos"""
+    repositorio = repositorio or get_repository()
+    return repositorio.derived(
+        'historial_ranking',
+        lambda repo: HistorialRanking(repo.derived('matriz_tiobe', construir_matriz_tiobe))
+    )
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    import pandas as pd
+
+    historial = obtener_historial_ranking()
+    print(f"{len(historial.lenguajes)} lenguajes x {len(historial.fechas)} observaciones "
+          f"({historial.nbytes / 1024:.1f} KB)")
+    print(historial.texto_insights())
+    print("Cambios de posición de Java:", [(str(f)[:10], a, b) for f, a, b in historial.cambios_posicion('Java')][:6])
+
+    # Benchmark: 50 lenguajes, 25 años de observaciones mensuales
+    rng = np.random.default_rng(5)
+    fechas = pd.date_range('2001-01-01', '2025-12-01', freq='MS')
+    ratings = np.clip(np.cumsum(rng.normal(0, 0.3, (50, len(fechas))), axis=1) + rng.uniform(1, 15, (50, 1)), 0.1, None)
+    sintetica = RatingMatrix(np.array([f'Lenguaje{i:02d}' for i in range(50)], dtype=object),
+                             fechas.to_numpy(), ratings)
+    inicio = time.perf_counter()
+    grande = HistorialRanking(sintetica)
+    construir = (time.perf_counter() - inicio) * 1000
+    inicio = time.perf_counter()
+    grande.meses_en_top(3)
+    grande.adelantamientos('Lenguaje00', 'Lenguaje01')
+    consultas = (time.perf_counter() - inicio) * 1000
+    for top in (10, 50):
+        trayectorias = grande.trayectorias(top)
+        puntos = sum(len(f) for _, f, _ in trayectorias)
+        bytes_json = len(json.dumps([[str(x) for x in f] + p.tolist() for _, f, p in trayectorias]))
+        print(f"Sintético 50 x {len(fechas)}: top {top}: {len(trayectorias)} lenguajes, {puntos:,} puntos "
+              f"de {len(trayectorias) * len(fechas):,} ({bytes_json / 1024:.0f} KB)")
+    print(f"Construir: {construir:.2f} ms; consultas: {consultas:.3f} ms")
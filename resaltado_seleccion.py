@@ -0,0 +1,336 @@
+# ===========================================
+# Resaltado de Selección - Cambios parciales de figuras
+# ===========================================
+#
+# Seleccionar un lenguaje (clic en la tabla o en el gráfico de estrellas) solo
+# cambia opacidades, colores, anchos y títulos de figuras que ya están en el
+# navegador. Cada función de este módulo describe ese resaltado como una lista
+# de cambios (ruta, valor) sobre la figura sin selección; valor None elimina la
+# propiedad. La misma lista sirve para:
+#   - construir la figura completa (aplicar_a_figura), y
+#   - enviar solo los cambios al navegador como dash.Patch (como_patch).
+# Así la figura parcheada y la construida completa son siempre iguales.
+#
+# Modos:
+#   CODETRENDS_SELECCION_CLIENTE=1 (por defecto): el resaltado se hace en el
+#       navegador (assets/resaltado_seleccion.js), sin ir al servidor.
+#   CODETRENDS_SELECCION_CLIENTE=0: lo hace el servidor, como Patch
+#       (CODETRENDS_SELECCION_PARCIAL=1, por defecto) o con las figuras
+#       completas (CODETRENDS_SELECCION_PARCIAL=0).
+#
+# Uso:
+#   python resaltado_seleccion.py    # bytes de la figura completa vs el Patch
+#   python -m pytest tests/test_resaltado_seleccion.py    # Patch, JS (con node) y figura completa coinciden
+
+import json
+import os
+import shutil
+import subprocess
+
+from dash import Patch
+
+SELECCION_CLIENTE = os.getenv('CODETRENDS_SELECCION_CLIENTE', '1') == '1'
+SELECCION_PARCIAL = os.getenv('CODETRENDS_SELECCION_PARCIAL', '1') == '1'
+
+SCRIPT_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'resaltado_seleccion.js')
+
+# Colores de la paleta Blues usados en el resaltado
+AZUL_SELECCION = '#084594'
+AZUL_ATENUADO = '#c6dbef'
+
+
+def aplicar_a_figura(fig, cambios):
+    """Aplicar los cambios a un go.Figure (None restablece la propiedad)"""
+    for ruta, valor in cambios:
+        objeto = fig
+        for clave in ruta[:-1]:
+            objeto = objeto[clave]
+        objeto[ruta[-1]] = valor
+    return fig
+
+
+def aplicar_a_dict(figura, cambios):
+    """Aplicar los cambios a una figura serializada, como lo hace el navegador con un Patch"""
+    for ruta, valor in cambios:
+        objeto = figura
+        for clave in ruta[:-1]:
+            if isinstance(objeto, dict):
+                objeto = objeto.setdefault(clave, {})
+            else:
+                objeto = objeto[clave]
+        if valor is None:
+            objeto.pop(ruta[-1], None)
+        else:
+            objeto[ruta[-1]] = valor
+    return figura
+
+
+def como_patch(cambios):
+    """Convertir los cambios en un dash.Patch"""
+    patch = Patch()
+    for ruta, valor in cambios:
+        objeto = patch
+        for clave in ruta[:-1]:
+            objeto = objeto[clave]
+        if valor is None:
+            del objeto[ruta[-1]]
+        else:
+            objeto[ruta[-1]] = valor
+    return patch
+
+
+# ============================================================================
+# CAMBIOS POR FIGURA
+# ============================================================================
+
+def cambios_lineas(nombres, seleccionado):
+    """
+    Serie de tiempo TIOBE: línea gruesa para el lenguaje seleccionado y las
+    demás tenues.
+
+    Args:
+        nombres: Nombre de cada traza (un lenguaje por traza)
+    """
+    cambios = []
+    for i, nombre in enumerate(nombres):
+        if not seleccionado:
+            ancho, marcador, opacidad = None, None, None
+        elif nombre == seleccionado:
+            ancho, marcador, opacidad = 4, 10, None
+        else:
+            ancho, marcador, opacidad = 1, None, 0.2
+        cambios += [
+            (('data', i, 'line', 'width'), ancho),
+            (('data', i, 'marker', 'size'), marcador),
+            (('data', i, 'opacity'), opacidad),
+        ]
+    return cambios
+
+
+def cambios_barras(categorias, valores, seleccionado, eje_color=False, solo_si_presente=False):
+    """
+    Gráfico de barras de una sola traza coloreado por valor: la barra del
+    lenguaje seleccionado en azul oscuro y las demás claras y tenues.
+
+    Args:
+        categorias: Lenguaje de cada barra (eje x)
+        valores: Valor de cada barra, que es el color sin selección
+        eje_color: True si la figura usa layout.coloraxis (px.bar con color);
+            se oculta su barra de colores mientras hay selección
+        solo_si_presente: Si el lenguaje no está entre las barras, dejar la
+            figura sin selección en lugar de atenuar todas
+    """
+    if seleccionado and (seleccionado in list(categorias) or not solo_si_presente):
+        colores = [AZUL_SELECCION if c == seleccionado else AZUL_ATENUADO for c in categorias]
+        opacidades = [1 if c == seleccionado else 0.3 for c in categorias]
+        escala = False
+    else:
+        colores, opacidades, escala = list(valores), None, None
+
+    cambios = [
+        (('data', 0, 'marker', 'color'), colores),
+        (('data', 0, 'marker', 'opacity'), opacidades),
+    ]
+    if eje_color:
+        cambios.append((('layout', 'coloraxis', 'showscale'), escala))
+    return cambios
+
+
+def cambios_heatmap(lenguajes, num_periodos, seleccionado):
+    """
+    Heatmap de Pull Requests: un velo blanco sobre las filas no seleccionadas.
+
+    Args:
+        lenguajes: Lenguaje de cada fila (eje y)
+        num_periodos: Cantidad de columnas (eje x)
+    """
+    if not seleccionado or seleccionado not in list(lenguajes):
+        return [(('layout', 'shapes'), None)]
+    velos = [
+        dict(
+            type="rect",
+            xref="x",
+            yref="y",
+            x0=-0.5,
+            x1=num_periodos - 0.5,
+            y0=i - 0.5,
+            y1=i + 0.5,
+            fillcolor="rgba(255, 255, 255, 0.7)",
+            line=dict(width=0),
+            layer="above"
+        )
+        for i, lang in enumerate(lenguajes) if lang != seleccionado
+    ]
+    return [(('layout', 'shapes'), velos)]
+
+
+def color_medidor(porcentaje):
+    """Color de la barra de un medidor según el porcentaje (paleta Blues)"""
+    if porcentaje > 10:
+        return "#084594"  # Azul muy oscuro (alto)
+    if porcentaje > 5:
+        return "#2171b5"  # Azul oscuro (medio)
+    return "#4292c6"  # Azul medio (bajo)
+
+
+def estilo_medidor(porcentaje, activo):
+    """
+    Colores de un medidor (go.Indicator) activo o atenuado.
+
+    Returns:
+        Lista de (ruta dentro de la traza, valor)
+    """
+    return [
+        (('number', 'font', 'color'), '#08306b' if activo else '#c6dbef'),
+        (('delta', 'increasing', 'color'), '#084594' if activo else '#deebf7'),
+        (('delta', 'decreasing', 'color'), '#9ecae1' if activo else '#f7fbff'),
+        (('gauge', 'axis', 'tickfont', 'color'), '#08306b' if activo else '#deebf7'),
+        (('gauge', 'bar', 'color'), color_medidor(porcentaje) if activo else "#deebf7"),
+        (('gauge', 'bordercolor'), "#c6dbef" if activo else "#f7fbff"),
+        (('gauge', 'steps', 1, 'color'), '#deebf7' if activo else '#f7fbff'),
+        (('gauge', 'steps', 2, 'color'), '#c6dbef' if activo else '#f7fbff'),
+        (('gauge', 'threshold', 'line', 'color'), "#2171b5" if activo else "#f7fbff"),
+    ]
+
+
+def titulo_medidor(lenguaje, seleccionado):
+    """Título del subgráfico de un medidor: en negrita si está seleccionado, tenue si no"""
+    if seleccionado and lenguaje == seleccionado:
+        return f"<b>{lenguaje}</b>"
+    if seleccionado:
+        return f"<span style='opacity:0.3'>{lenguaje}</span>"
+    return lenguaje
+
+
+def cambios_medidores(lenguajes, porcentajes, seleccionado):
+    """
+    Medidores de Pull Requests: el del lenguaje seleccionado conserva sus
+    colores y los demás se atenúan (todos si el lenguaje no está entre ellos).
+
+    Args:
+        lenguajes: Lenguaje de cada medidor (mismo orden que las trazas y
+            los títulos de los subgráficos)
+        porcentajes: Valor de cada medidor
+    """
+    cambios = []
+    for i, (lang, porcentaje) in enumerate(zip(lenguajes, porcentajes)):
+        activo = (not seleccionado) or (lang == seleccionado)
+        cambios += [(('data', i) + ruta, valor) for ruta, valor in estilo_medidor(porcentaje, activo)]
+        cambios.append((('layout', 'annotations', i, 'text'), titulo_medidor(lang, seleccionado)))
+    return cambios
+
+
+def reglas_tabla(seleccionado):
+    """
+    Reglas de style_data_conditional para la selección en la tabla de
+    indicadores: la fila seleccionada resaltada y una sola regla que atenúa
+    todas las demás.
+    """
+    if not seleccionado:
+        return []
+    return [
+        {
+            "if": {"filter_query": f"{{Language}} = '{seleccionado}'"},
+            "backgroundColor": "#2171b5",
+            "color": "white",
+            "fontWeight": "bold",
+        },
+        {
+            "if": {"filter_query": f"{{Language}} != '{seleccionado}'"},
+            "opacity": "0.4",
+        },
+    ]
+
+
+# ============================================================================
+# CAMBIOS A PARTIR DE LAS FIGURAS YA SERIALIZADAS
+# ============================================================================
+# Los callbacks reciben la figura sin selección desde la cache de figuras
+# (dict) y de ahí sacan lo que necesita cada resaltado.
+
+def cambios_lineas_de(figura, seleccionado):
+    return cambios_lineas([traza.get('name') for traza in figura['data']], seleccionado)
+
+
+def cambios_barras_de(figura, seleccionado, solo_si_presente=False):
+    traza = figura['data'][0]
+    return cambios_barras(traza.get('x', []), traza.get('y', []), seleccionado,
+                          'coloraxis' in figura['layout'], solo_si_presente)
+
+
+def cambios_heatmap_de(figura, seleccionado):
+    traza = figura['data'][0]
+    return cambios_heatmap(traza['y'], len(traza['x']), seleccionado)
+
+
+def cambios_medidores_de(figura, seleccionado):
+    lenguajes = [traza.get('name') for traza in figura['data']]
+    porcentajes = [traza['value'] for traza in figura['data']]
+    return cambios_medidores(lenguajes, porcentajes, seleccionado)
+
+
+# Valor que devuelven las funciones cuando no hay que actualizar la salida
+# (window.dash_clientside.no_update en el navegador)
+NO_ACTUALIZAR_JS = '__no_update__'
+
+# Programa de node que aplica una función de assets/resaltado_seleccion.js a
+# cada lista de argumentos recibida por stdin
+_EJECUTAR_JS = """
+globalThis.window = {dash_clientside: {no_update: '%s'}};
+const resaltado = require(process.argv[1]);
+let entrada = '';
+process.stdin.on('data', d => { entrada += d; });
+process.stdin.on('end', () => {
+    const {funcion, casos} = JSON.parse(entrada);
+    process.stdout.write(JSON.stringify(casos.map(argumentos => resaltado[funcion](...argumentos))));
+});
+""" % NO_ACTUALIZAR_JS
+
+
+def resaltar_con_js(funcion, casos):
+    """
+    Ejecutar el resaltado clientside con node.
+
+    Args:
+        funcion: Nombre de la función en window.dash_clientside.resaltado
+        casos: Lista de argumentos de cada llamada, p. ej. (selección, figura o estilos)
+
+    Returns:
+        Lista de resultados, o None si node no está instalado
+    """
+    node = shutil.which('node')
+    if node is None:
+        return None
+    salida = subprocess.run(
+        [node, '-e', _EJECUTAR_JS, SCRIPT_JS], input=json.dumps({'funcion': funcion, 'casos': casos}),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout)
+
+
+if __name__ == "__main__":
+    # Bytes enviados por selección: figura completa vs Patch. Que el Patch, el
+    # resaltado en JS y la figura completa coinciden lo verifica
+    # tests/test_resaltado_seleccion.py
+    from plotly.io.json import to_json_plotly
+
+    import main
+
+    casos = [
+        ('serie de tiempo', main.create_line_chart, cambios_lineas_de, {'anio1': 2020, 'anio2': 2025}),
+        ('ganadores', main.get_monthly_winners, cambios_barras_de, {'year1': 2021, 'year2': 2024}),
+        ('estrellas', main.crear_grafico_promedio_estrellas,
+         lambda figura, sel: cambios_barras_de(figura, sel, solo_si_presente=True), {}),
+        ('heatmap', main.crear_heatmap_quarters, cambios_heatmap_de,
+         {'anio_seleccionado': 'Todos', 'num_lenguajes': 10}),
+        ('medidores', main.crear_medidores_promedio, cambios_medidores_de,
+         {'anio_seleccionado': 2023, 'num_lenguajes': 10}),
+    ]
+
+    print(f"{'figura':<16} {'selección':<12} {'figura completa':>16} {'patch':>10}")
+    for nombre, builder, cambios_de, kwargs in casos:
+        base = json.loads(to_json_plotly(builder.sin_cache(**kwargs)))
+        for seleccionado in ('Python', 'C', 'Cobol', None):
+            bytes_figura = len(to_json_plotly(builder.sin_cache(selected_language=seleccionado, **kwargs)))
+            bytes_patch = len(json.dumps(como_patch(cambios_de(base, seleccionado)).to_plotly_json()))
+            print(f"{nombre:<16} {str(seleccionado):<12} {bytes_figura:>14,} B {bytes_patch:>8,} B")
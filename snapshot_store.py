@@ -0,0 +1,282 @@
+# ===========================================
+# Snapshot Store - Cache columnar de los CSV
+# ===========================================
+#
+# Cada CSV se compila la primera vez a un archivo binario columnar (.npz de
+# numpy) con los tipos ya resueltos: fechas como datetime64, enteros como
+# int64 y columnas de texto con codificación de diccionario. Las siguientes
+# cargas leen el binario directamente y solo se reconstruye cuando cambia el
+# contenido del CSV fuente (se compara mtime/tamaño y, si difieren, el hash).
+# Los datasets con columna de lenguaje reciben además el código canónico de
+# lenguajes.py (int16) ya calculado.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from escritura_atomica import escribir_atomico
+from lenguajes import COLUMNA_CODIGO, VERSION_CATALOGO, codificar
+
+# Carpeta donde se guardan los snapshots (se puede cambiar por variable de entorno)
+SNAPSHOT_DIR = os.getenv('CODETRENDS_SNAPSHOT_DIR', 'Datos_cache')
+
+# Versión del formato; si cambia, todos los snapshots se regeneran
+FORMATO_VERSION = 2
+
+# Máxima proporción de valores únicos para codificar texto como diccionario
+_MAX_RATIO_DICCIONARIO = 0.5
+
+
+def hash_archivo(path, chunk_size=1 << 20):
+    """Calcular el SHA-256 del contenido de un archivo"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(chunk_size), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _nombre_snapshot(csv_path):
+    """Nombre estable del snapshot a partir de la ruta del CSV"""
+    relativo = os.path.normpath(csv_path).replace(os.sep, '__')
+    return os.path.splitext(relativo)[0]
+
+
+def _rutas_snapshot(csv_path, snapshot_dir):
+    base = os.path.join(snapshot_dir, _nombre_snapshot(csv_path))
+    return base + '.npz', base + '.json'
+
+
+def _codificar_columna(nombre, serie, arrays):
+    """
+    Convertir una columna de pandas en arrays numpy sin objetos Python.
+
+    Solo se agrega un array auxiliar ('<clave>_aux') cuando la columna lo
+    necesita (categorías o máscara de nulos), porque cada miembro del .npz
+    tiene un costo fijo de lectura.
+
+    Returns:
+        Descripción del tipo de la columna para los metadatos
+    """
+    clave = f'c{len(arrays)}'
+    descripcion = {'nombre': nombre, 'clave': clave, 'aux': False}
+
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        arrays[clave] = serie.cat.codes.to_numpy()
+        arrays[clave + '_aux'] = serie.cat.categories.astype(str).to_numpy(dtype=str)
+        return dict(descripcion, tipo='category', aux=True)
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        arrays[clave] = serie.to_numpy(dtype='datetime64[ns]').view('int64')
+        return dict(descripcion, tipo='datetime')
+
+    if serie.dtype == object:
+        nulos = serie.isna().to_numpy()
+        valores = serie.where(~nulos, '').astype(str)
+        codigos, categorias = pd.factorize(valores, sort=False)
+        if len(categorias) <= max(1, int(len(valores) * _MAX_RATIO_DICCIONARIO)):
+            # Texto repetitivo (lenguajes, usuarios): se guarda como diccionario
+            codigos = codigos.astype(np.int32)
+            codigos[nulos] = -1
+            arrays[clave] = codigos
+            arrays[clave + '_aux'] = categorias.to_numpy(dtype=str)
+            return dict(descripcion, tipo='string_dict', aux=True)
+        arrays[clave] = valores.to_numpy(dtype=str)
+        if nulos.any():
+            arrays[clave + '_aux'] = nulos
+            descripcion['aux'] = True
+        return dict(descripcion, tipo='string')
+
+    arrays[clave] = serie.to_numpy()
+    return dict(descripcion, tipo='numeric')
+
+
+def _decodificar_columna(columna, datos, categorias_pedidas):
+    """Reconstruir los valores de una columna a partir del snapshot"""
+    valores = datos[columna['clave']]
+    extra = datos[columna['clave'] + '_aux'] if columna['aux'] else None
+    tipo = columna['tipo']
+
+    if tipo == 'datetime':
+        return valores.view('datetime64[ns]')
+
+    if tipo in ('category', 'string_dict'):
+        if tipo == 'category' or columna['nombre'] in categorias_pedidas:
+            return pd.Categorical.from_codes(valores, categories=extra)
+        if len(extra):
+            resultado = extra.astype(object).take(np.maximum(valores, 0))
+        else:
+            resultado = np.empty(len(valores), dtype=object)
+        resultado[valores < 0] = np.nan
+        return resultado
+
+    if tipo == 'string':
+        resultado = valores.astype(object)
+        if extra is not None:
+            resultado[extra] = np.nan
+        return resultado
+
+    return valores
+
+
+def _opciones(parse_dates, categories, lenguaje=None):
+    opciones = {
+        'formato': FORMATO_VERSION,
+        'parse_dates': sorted(parse_dates),
+        'categories': sorted(categories),
+    }
+    if lenguaje:
+        # Un cambio en el catálogo cambia los códigos guardados
+        opciones['lenguaje'] = [lenguaje, VERSION_CATALOGO]
+    return opciones
+
+
+def compilar_snapshot(csv_path, parse_dates=(), categories=(), snapshot_dir=None, sha256=None, lenguaje=None):
+    """
+    Leer un CSV, tipar sus columnas y guardar el snapshot columnar.
+
+    Args:
+        csv_path: Ruta del CSV fuente
+        parse_dates: Columnas que se convierten a datetime64
+        categories: Columnas que se materializan como categóricas
+        snapshot_dir: Carpeta de snapshots (por defecto SNAPSHOT_DIR)
+        sha256: Hash del CSV si ya se calculó
+        lenguaje: Columna con el nombre del lenguaje; agrega COLUMNA_CODIGO
+
+    Returns:
+        DataFrame ya tipado
+    """
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    os.makedirs(snapshot_dir, exist_ok=True)
+    npz_path, meta_path = _rutas_snapshot(csv_path, snapshot_dir)
+
+    stat = os.stat(csv_path)
+    df = pd.read_csv(csv_path)
+    for columna in parse_dates:
+        df[columna] = pd.to_datetime(df[columna])
+    for columna in categories:
+        df[columna] = df[columna].astype('category')
+    if lenguaje:
+        df[COLUMNA_CODIGO] = codificar(df[lenguaje])
+
+    arrays = {}
+    columnas = [_codificar_columna(nombre, df[nombre], arrays) for nombre in df.columns]
+
+    meta = {
+        'fuente': os.path.normpath(csv_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256 or hash_archivo(csv_path),
+        'opciones': _opciones(parse_dates, categories, lenguaje),
+        'filas': len(df),
+        'columnas': columnas,
+    }
+
+    escribir_atomico(npz_path, lambda f: np.savez(f, **arrays))
+    escribir_atomico(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode('utf-8')))
+    return df
+
+
+def _leer_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def estado_snapshot(csv_path, parse_dates=(), categories=(), snapshot_dir=None, lenguaje=None):
+    """
+    Revisar si el snapshot de un CSV sigue vigente.
+
+    Returns:
+        Tupla (vigente, meta, sha256). sha256 solo se calcula si mtime/tamaño
+        cambiaron, para que el caso común no lea el CSV.
+    """
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    npz_path, meta_path = _rutas_snapshot(csv_path, snapshot_dir)
+    meta = _leer_meta(meta_path)
+
+    if meta is None or not os.path.exists(npz_path):
+        return False, None, None
+    if meta.get('opciones') != _opciones(parse_dates, categories, lenguaje):
+        return False, meta, None
+
+    stat = os.stat(csv_path)
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True, meta, meta['sha256']
+
+    # mtime distinto: solo se reconstruye si el contenido realmente cambió
+    sha256 = hash_archivo(csv_path)
+    if sha256 != meta['sha256']:
+        return False, meta, sha256
+
+    meta['mtime_ns'] = stat.st_mtime_ns
+    meta['size'] = stat.st_size
+    escribir_atomico(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode('utf-8')))
+    return True, meta, sha256
+
+
+def load_csv(csv_path, parse_dates=(), categories=(), snapshot_dir=None, lenguaje=None):
+    """
+    Cargar un CSV a través de su snapshot columnar.
+
+    Si el snapshot no existe o el CSV cambió, se compila de nuevo; en otro
+    caso se lee el binario sin parsear texto ni fechas.
+
+    Args:
+        csv_path: Ruta del CSV fuente
+        parse_dates: Columnas a convertir a fechas
+        categories: Columnas a materializar como categóricas
+        lenguaje: Columna con el nombre del lenguaje (agrega COLUMNA_CODIGO)
+
+    Returns:
+        DataFrame con los tipos ya resueltos
+    """
+    parse_dates, categories = tuple(parse_dates), tuple(categories)
+    vigente, meta, sha256 = estado_snapshot(csv_path, parse_dates, categories, snapshot_dir, lenguaje)
+    if not vigente:
+        return compilar_snapshot(csv_path, parse_dates, categories, snapshot_dir, sha256, lenguaje)
+
+    npz_path, _ = _rutas_snapshot(csv_path, snapshot_dir or SNAPSHOT_DIR)
+    try:
+        with np.load(npz_path, allow_pickle=False) as datos:
+            columnas = {
+                columna['nombre']: _decodificar_columna(columna, datos, categories)
+                for columna in meta['columnas']
+            }
+    except (OSError, KeyError, ValueError):
+        # Snapshot corrupto o incompleto: se regenera desde el CSV
+        return compilar_snapshot(csv_path, parse_dates, categories, snapshot_dir, sha256, lenguaje)
+
+    return pd.DataFrame(columnas, index=pd.RangeIndex(meta['filas']))
+
+
+def fuente_sha256(csv_path, snapshot_dir=None):
+    """Hash del CSV según el snapshot vigente (o calculado si no hay snapshot)"""
+    _, meta_path = _rutas_snapshot(csv_path, snapshot_dir or SNAPSHOT_DIR)
+    meta = _leer_meta(meta_path)
+    if meta is not None:
+        stat = os.stat(csv_path)
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return meta['sha256']
+    return hash_archivo(csv_path)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # Compilar (o verificar) los snapshots de todos los CSV indicados
+    rutas = sys.argv[1:] or [
+        os.path.join(carpeta, nombre)
+        for carpeta in ('Datos', 'Datos_procesados')
+        for nombre in sorted(os.listdir(carpeta)) if nombre.endswith('.csv')
+    ]
+    for ruta in rutas:
+        inicio = time.perf_counter()
+        df = load_csv(ruta)
+        print(f"{ruta}: {len(df)} filas en {(time.perf_counter() - inicio) * 1000:.1f} ms")
@@ -0,0 +1,69 @@
+# ===========================================
+# Startup Timer - Reporte de tiempos de arranque
+# ===========================================
+#
+# Mide las fases del arranque del dashboard (imports, carga de datos,
+# construcción del layout, agente IA). Solo usa la librería estándar para
+# poder importarse antes que cualquier dependencia pesada.
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Acumula la duración de cada fase del arranque.
+
+    Las fases pueden marcarse de forma secuencial (marcar) o medirse como
+    bloques (medir). Las fases diferidas son las que ocurren después de que
+    el servidor ya está escuchando (modo de arranque perezoso).
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self._ultima_marca = self.inicio
+        self._fases = []
+        self._lock = threading.Lock()
+
+    def _registrar(self, fase, segundos, diferida):
+        with self._lock:
+            self._fases.append({
+                'fase': fase,
+                'ms': round(segundos * 1000, 1),
+                'diferida': diferida,
+            })
+
+    def marcar(self, fase):
+        """Registrar una fase que duró desde la marca anterior hasta ahora"""
+        ahora = time.perf_counter()
+        self._registrar(fase, ahora - self._ultima_marca, False)
+        self._ultima_marca = ahora
+
+    @contextmanager
+    def medir(self, fase, diferida=False):
+        """Medir la duración de un bloque como una fase"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fin = time.perf_counter()
+            self._registrar(fase, fin - inicio, diferida)
+            if not diferida:
+                self._ultima_marca = fin
+
+    def fases(self):
+        """Lista de fases registradas (copias de los dicts)"""
+        with self._lock:
+            return [dict(fase) for fase in self._fases]
+
+    def reporte(self):
+        """Reporte de texto con una línea por fase"""
+        fases = self.fases()
+        total_arranque = sum(f['ms'] for f in fases if not f['diferida'])
+        lineas = ["Reporte de arranque:"]
+        for f in fases:
+            sufijo = '  (diferida)' if f['diferida'] else ''
+            lineas.append(f"  {f['fase']:<20} {f['ms']:>9.1f} ms{sufijo}")
+        lineas.append(f"  {'total hasta servir':<20} {total_arranque:>9.1f} ms")
+        return "\n".join(lineas)
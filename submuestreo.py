@@ -0,0 +1,137 @@
+# ===========================================
+# Submuestreo - Series de tiempo con presupuesto de puntos (LTTB)
+# ===========================================
+#
+# El gráfico de tendencia TIOBE dibuja un marcador por observación mensual y
+# por lenguaje. Con el histórico completo (2001+) y decenas de lenguajes el
+# navegador deja de responder, así que ese gráfico pasa a trazas WebGL y cada
+# serie se reduce con Largest-Triangle-Three-Buckets: se conservan los puntos
+# que más área aportan a la forma de la curva (picos y valles incluidos).
+#
+# El presupuesto es para todo el gráfico y se reparte entre las series, por eso
+# la reducción depende del rango de años elegido: con un rango corto cada
+# serie cabe completa; con uno largo cada punto dibujado resume varios meses.
+#
+# Modo: CODETRENDS_LINEAS_MODO=auto (por defecto: WebGL y submuestreo cuando
+# el rango tiene más puntos que el presupuesto), webgl (siempre) o svg (nunca).
+# Presupuesto: CODETRENDS_LINEAS_PUNTOS (por defecto 2000 puntos por gráfico).
+#
+# Uso:
+#   python submuestreo.py    # benchmark con 50 lenguajes, 2001-2025
+
+import os
+
+import numpy as np
+
+MODO_LINEAS = os.getenv('CODETRENDS_LINEAS_MODO', 'auto')
+PRESUPUESTO_PUNTOS = int(os.getenv('CODETRENDS_LINEAS_PUNTOS', '2000'))
+# Por debajo de este mínimo la serie pierde su forma; se dibuja completa
+MINIMO_POR_SERIE = 24
+
+
+def usar_webgl(total_puntos):
+    """Decidir si el gráfico de tendencia usa WebGL y submuestreo"""
+    if MODO_LINEAS == 'auto':
+        return total_puntos > PRESUPUESTO_PUNTOS
+    return MODO_LINEAS == 'webgl'
+
+
+def puntos_por_serie(num_series):
+    """Parte del presupuesto que le toca a cada serie"""
+    return max(MINIMO_POR_SERIE, PRESUPUESTO_PUNTOS // max(num_series, 1))
+
+
+def lttb(x, y, umbral):
+    """
+    Índices de los puntos que conserva Largest-Triangle-Three-Buckets.
+
+    Args:
+        x: Valores del eje x, crecientes (fechas como datetime64 o números)
+        y: Valores de la serie
+        umbral: Cantidad de puntos a conservar (incluye el primero y el último)
+
+    Returns:
+        Array de índices crecientes; todos si la serie ya cabe en el umbral
+    """
+    n = len(y)
+    if umbral >= n or umbral < 3:
+        return np.arange(n)
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    x = x.astype(float)
+    y = np.asarray(y, dtype=float)
+
+    # n - 2 puntos interiores repartidos en umbral - 2 cubetas
+    bordes = np.linspace(1, n - 1, umbral - 1).astype(int)
+    indices = np.empty(umbral, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+    for cubeta in range(umbral - 2):
+        inicio, fin = bordes[cubeta], bordes[cubeta + 1]
+        # Tercer vértice: promedio de la cubeta siguiente (o el último punto)
+        if cubeta + 2 < len(bordes):
+            siguiente = slice(fin, bordes[cubeta + 2])
+            x_c, y_c = x[siguiente].mean(), y[siguiente].mean()
+        else:
+            x_c, y_c = x[-1], y[-1]
+        x_a, y_a = x[anterior], y[anterior]
+        areas = np.abs((x_a - x_c) * (y[inicio:fin] - y_a) - (x_a - x[inicio:fin]) * (y_c - y_a))
+        anterior = inicio + int(np.argmax(areas))
+        indices[cubeta + 1] = anterior
+    return indices
+
+
+def submuestrear(df, columna_serie, columna_x, columna_y, umbral, conservar=None):
+    """
+    Reducir cada serie de un DataFrame largo a `umbral` puntos con LTTB.
+
+    Args:
+        df: Filas ordenadas por columna_x dentro de cada serie
+        columna_serie: Columna que identifica la serie (p. ej. Language)
+        conservar: Serie que se deja completa (el lenguaje seleccionado)
+
+    Returns:
+        DataFrame con las filas conservadas, en el orden original
+    """
+    posiciones = []
+    for serie, filas in df.groupby(columna_serie, sort=False).indices.items():
+        if serie == conservar:
+            posiciones.append(filas)
+        else:
+            elegidos = lttb(df[columna_x].to_numpy()[filas], df[columna_y].to_numpy()[filas], umbral)
+            posiciones.append(filas[elegidos])
+    if not posiciones:
+        return df
+    return df.iloc[np.sort(np.concatenate(posiciones))]
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    rng = np.random.default_rng(3)
+    fechas = pd.date_range('2001-01-01', '2025-12-01', freq='MS')
+    filas = []
+    for i in range(50):
+        rating = np.clip(np.cumsum(rng.normal(0, 0.4, len(fechas))) + rng.uniform(1, 15), 0.1, None)
+        filas.append(pd.DataFrame({'Language': f'Lenguaje{i:02d}', 'Date': fechas, 'Rating': rating}))
+    df = pd.concat(filas, ignore_index=True)
+    df['Year'] = df['Date'].dt.year
+
+    print(f"50 lenguajes, {len(fechas)} observaciones por lenguaje; presupuesto {PRESUPUESTO_PUNTOS} puntos")
+    print(f"{'rango':>10} {'puntos':>8} {'dibujados':>10} {'por serie':>10} {'error máx':>10} {'tiempo':>9}")
+    for anio1 in (2021, 2016, 2011, 2001):
+        rango = df[df['Year'] >= anio1]
+        umbral = puntos_por_serie(rango['Language'].nunique())
+        inicio = time.perf_counter()
+        reducido = submuestrear(rango, 'Language', 'Date', 'Rating', umbral)
+        duracion = (time.perf_counter() - inicio) * 1000
+        # Error de la curva reducida respecto a la original (interpolación lineal)
+        error = 0.0
+        for lenguaje, serie in rango.groupby('Language'):
+            puntos = reducido[reducido['Language'] == lenguaje]
+            aproximada = np.interp(serie['Date'].astype(np.int64), puntos['Date'].astype(np.int64), puntos['Rating'])
+            error = max(error, float(np.abs(aproximada - serie['Rating']).max()))
+        print(f"{anio1:>5}-2025 {len(rango):>8,} {len(reducido):>10,} {umbral:>10} {error:>10.2f} {duracion:>6.1f} ms")
@@ -0,0 +1,296 @@
+# ===========================================
+# TablaIndicadores - Paginación, orden y filtro en el servidor
+# ===========================================
+#
+# La tabla de indicadores (tabla-indicador) manda al navegador todas sus filas
+# cuando la paginación, el orden y el filtro son nativos de DataTable. Con
+# muchos lenguajes (todo el ranking TIOBE) el modo servidor manda solo la
+# página visible: las filas de cada rango de años se guardan como columnas
+# numpy con un índice de orden precalculado por columna, así que ordenar es
+# tomar ese índice y filtrar es una máscara booleana, sin sort por petición.
+#
+# Modo: CODETRENDS_TABLA_SERVIDOR=auto (por defecto: servidor cuando hay más
+# lenguajes que filas por página), 1 (siempre) o 0 (nunca).
+#
+# Uso:
+#   python tabla_indicadores.py    # benchmark con 100, 1.000 y 10.000 lenguajes
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MODO_SERVIDOR = os.getenv('CODETRENDS_TABLA_SERVIDOR', 'auto')
+FILAS_POR_PAGINA = int(os.getenv('CODETRENDS_TABLA_FILAS_POR_PAGINA', '15'))
+
+# Máscaras de filter_query guardadas por tabla (las últimas usadas)
+MASCARAS_POR_TABLA = 32
+
+# Operadores del filtro de DataTable -> comparación
+_OPERADORES = {
+    '=': 'eq', 'eq': 'eq', '!=': 'ne', 'ne': 'ne',
+    '<': 'lt', 'lt': 'lt', '<=': 'le', 'le': 'le',
+    '>': 'gt', 'gt': 'gt', '>=': 'ge', 'ge': 'ge',
+    'contains': 'contains', 'datestartswith': 'startswith',
+}
+_UFUNC = {'eq': 'equal', 'ne': 'not_equal', 'lt': 'less', 'le': 'less_equal', 'gt': 'greater', 'ge': 'greater_equal'}
+_PARTE_FILTRO = re.compile(r'^\s*\{(?P<columna>[^}]+)\}\s+(?P<operador>\S+)\s+(?P<valor>.+?)\s*$')
+
+
+def usar_modo_servidor(num_filas):
+    """Decidir si la tabla usa paginación en el servidor"""
+    if MODO_SERVIDOR == 'auto':
+        return num_filas > FILAS_POR_PAGINA
+    return MODO_SERVIDOR == '1'
+
+
+def _interpretar_parte(parte):
+    """
+    Interpretar una condición del filtro ('{Indicador} > 0', '{Language} icontains py').
+
+    Returns:
+        Tupla (columna, comparación, valor, sensible a mayúsculas) o None si
+        la condición no se reconoce
+    """
+    coincidencia = _PARTE_FILTRO.match(parte)
+    if coincidencia is None:
+        return None
+    operador = coincidencia.group('operador').lower()
+    sensible = True
+    # Variantes 's' (sensible) e 'i' (insensible) de cada operador de texto
+    if operador not in _OPERADORES and operador[:1] in ('s', 'i') and operador[1:] in _OPERADORES:
+        sensible = operador[0] == 's'
+        operador = operador[1:]
+    if operador not in _OPERADORES:
+        return None
+    valor = coincidencia.group('valor')
+    if len(valor) >= 2 and valor[0] == valor[-1] and valor[0] in '"\'`':
+        valor = valor[1:-1]
+    return coincidencia.group('columna'), _OPERADORES[operador], valor, sensible
+
+
+class CacheLRU:
+    """
+    Cache acotada (las entradas menos usadas salen primero) y segura entre
+    hilos: los workers gthread comparten los objetos del repositorio de datos.
+    Los valores se calculan fuera del lock; si dos hilos piden a la vez la
+    misma clave, ambos la calculan y queda una.
+    """
+
+    def __init__(self, maximo=32):
+        self.maximo = maximo
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(int(getattr(valor, 'nbytes', 0)) for valor in self._entradas.values())
+
+    def obtener(self, clave, calcular):
+        """Valor guardado para clave, o calcular() (que se guarda)"""
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                return self._entradas[clave]
+        valor = calcular()
+        with self._lock:
+            self._entradas[clave] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+        return valor
+
+
+class TablaIndicadores:
+    """
+    Filas de la tabla de indicadores de un rango de años.
+
+    Attributes:
+        columnas: Nombre de columna -> array (object para texto, float64 para números)
+        orden: Nombre de columna -> índices de las filas ordenadas ascendente
+            (orden estable; los NaN al final)
+        orden_desc: Igual que orden, descendente
+        orden_base: Orden por defecto (Indicador descendente, como la tabla nativa)
+    """
+
+    def __init__(self, columnas, orden_base):
+        self.columnas = columnas
+        self.orden_base = orden_base
+        self.orden = {}
+        self.orden_desc = {}
+        self._texto = {}
+        self._mascaras = CacheLRU(MASCARAS_POR_TABLA)
+        for nombre, valores in columnas.items():
+            if valores.dtype == object:
+                texto = valores.astype(str)
+                self._texto[nombre] = (texto.tolist(), np.char.lower(texto).tolist())
+                self.orden[nombre] = np.argsort(texto, kind='stable')
+                # Descendente estable: los empates conservan el orden original
+                self.orden_desc[nombre] = (len(texto) - 1 - np.argsort(texto[::-1], kind='stable'))[::-1]
+            else:
+                self.orden[nombre] = np.argsort(valores, kind='stable')
+                self.orden_desc[nombre] = np.argsort(-valores, kind='stable')
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """
+        Args:
+            df: Filas ya en el orden por defecto (columnas Language, años e Indicador)
+        """
+        columnas = {}
+        for nombre in df.columns:
+            serie = df[nombre]
+            if serie.dtype == object:
+                columnas[nombre] = serie.to_numpy(dtype=object)
+            else:
+                columnas[nombre] = serie.to_numpy(dtype=float)
+        return cls(columnas, np.arange(len(df)))
+
+    def __len__(self):
+        return len(self.orden_base)
+
+    @property
+    def nbytes(self):
+        total = self.orden_base.nbytes
+        total += sum(i.nbytes for i in self.orden.values()) + sum(i.nbytes for i in self.orden_desc.values())
+        for valores in self.columnas.values():
+            total += valores.nbytes
+            if valores.dtype == object:
+                total += sum(len(v) for v in valores.astype(str))
+        return total
+
+    def filtrar(self, filter_query):
+        """
+        Máscara de las filas que cumplen filter_query (sintaxis de DataTable,
+        condiciones unidas con &&). Las condiciones no reconocidas se ignoran.
+        Las últimas máscaras se guardan: cambiar de página no vuelve a filtrar.
+        La tabla se comparte entre los hilos del servidor, así que la caché es
+        una CacheLRU y las máscaras que devuelve no se deben modificar.
+        """
+        return self._mascaras.obtener(filter_query, lambda: self._calcular_mascara(filter_query))
+
+    def _calcular_mascara(self, filter_query):
+        mascara = np.ones(len(self), dtype=bool)
+        for parte in (filter_query or '').split(' && '):
+            condicion = _interpretar_parte(parte)
+            if condicion is None or condicion[0] not in self.columnas:
+                continue
+            columna, comparacion, valor, sensible = condicion
+            valores = self.columnas[columna]
+
+            if columna in self._texto or comparacion in ('contains', 'startswith'):
+                if columna in self._texto:
+                    original, minusculas = self._texto[columna]
+                else:
+                    original = [_valor_texto(v) for v in valores]
+                    minusculas = [t.lower() for t in original]
+                texto = original if sensible else minusculas
+                if not sensible:
+                    valor = valor.lower()
+                if comparacion == 'contains':
+                    cumple = [valor in t for t in texto]
+                elif comparacion == 'startswith':
+                    cumple = [t.startswith(valor) for t in texto]
+                else:
+                    cumple = getattr(np, _UFUNC[comparacion])(np.array(texto), valor)
+                mascara &= np.asarray(cumple, dtype=bool)
+                continue
+
+            try:
+                numero = float(valor)
+            except ValueError:
+                mascara[:] = False
+                continue
+            with np.errstate(invalid='ignore'):
+                mascara &= getattr(np, _UFUNC[comparacion])(valores, numero)
+
+        return mascara
+
+    def indices(self, sort_by=None, filter_query=''):
+        """Índices de las filas filtradas en el orden pedido"""
+        if sort_by:
+            indices = self.orden_desc if sort_by[0].get('direction') == 'desc' else self.orden
+            orden = indices[sort_by[0]['column_id']]
+        else:
+            orden = self.orden_base
+        if filter_query:
+            orden = orden[self.filtrar(filter_query)[orden]]
+        return orden
+
+    def pagina(self, page_current=0, page_size=FILAS_POR_PAGINA, sort_by=None, filter_query=''):
+        """
+        Filas de una página.
+
+        Returns:
+            Tupla (registros de la página, cantidad de páginas)
+        """
+        orden = self.indices(sort_by, filter_query)
+        page_count = max(1, -(-len(orden) // page_size))
+        inicio = min(page_current or 0, page_count - 1) * page_size
+        seleccion = orden[inicio:inicio + page_size]
+        registros = [
+            {nombre: _valor_json(valores[i]) for nombre, valores in self.columnas.items()}
+            for i in seleccion
+        ]
+        return registros, page_count
+
+
+def _valor_texto(valor):
+    # Números como los muestra la tabla (5.0 -> '5')
+    return '' if np.isnan(valor) else f'{valor:g}'
+
+
+def _valor_json(valor):
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    def indicadores_sinteticos(n, semilla=7):
+        rng = np.random.default_rng(semilla)
+        df = pd.DataFrame({
+            'Language': [f'Lenguaje{i:05d}' for i in range(n)],
+            '2020': rng.uniform(0, 20, n).round(2),
+            '2025': rng.uniform(0, 20, n).round(2),
+        })
+        df['Indicador'] = (df['2025'] - df['2020']).round(2)
+        return df.sort_values(by='Indicador', ascending=False)
+
+    def pagina_pandas(df, page_current, page_size, sort_by, filter_query):
+        # Ruta sin índices: filtrar y ordenar el DataFrame en cada petición
+        filtrado = df[df['Language'].str.contains('1')] if filter_query else df
+        if sort_by:
+            filtrado = filtrado.sort_values(sort_by[0]['column_id'], ascending=sort_by[0]['direction'] == 'asc',
+                                            kind='stable')
+        return filtrado.iloc[page_current * page_size:(page_current + 1) * page_size].to_dict('records')
+
+    consulta = {'page_current': 1, 'page_size': FILAS_POR_PAGINA,
+                'sort_by': [{'column_id': '2025', 'direction': 'desc'}],
+                'filter_query': '{Language} contains 1'}
+    print(f"{'lenguajes':>10} {'tabla completa':>15} {'una página':>11} {'pandas':>10} {'índices':>10}")
+    for n in (100, 1_000, 10_000):
+        df = indicadores_sinteticos(n)
+        tabla = TablaIndicadores.desde_dataframe(df)
+        registros, _ = tabla.pagina(**consulta)
+
+        completa = len(json.dumps(df.to_dict('records')))
+        pagina = len(json.dumps(registros))
+        tiempos = []
+        for funcion in (lambda: pagina_pandas(df, **consulta), lambda: tabla.pagina(**consulta)):
+            inicio = time.perf_counter()
+            for _ in range(50):
+                funcion()
+            tiempos.append((time.perf_counter() - inicio) / 50 * 1000)
+        print(f"{n:>10,} {completa:>13,} B {pagina:>9,} B {tiempos[0]:>7.2f} ms {tiempos[1]:>7.2f} ms")
@@ -0,0 +1,243 @@
+# ===========================================
+# TendenciasTIOBE - Estadísticas de tendencia de todos los lenguajes
+# ===========================================
+#
+# Calcula en una sola pasada vectorizada sobre la matriz lenguaje x mes
+# (tiobe_matrix.RatingMatrix) las estadísticas que antes se escribían a mano
+# en los insights del agente IA: media móvil, pendiente por mínimos cuadrados,
+# CAGR, volatilidad, observaciones como #1 y fechas de pico y valle. El
+# resultado es una estructura derivada del repositorio de datos, así que se
+# calcula una vez por versión de datos (y por rango de años) y el dashboard y
+# el agente leen los mismos números.
+#
+# Uso:
+#   python tendencias.py    # resumen por lenguaje y texto para el agente
+
+import numpy as np
+import pandas as pd
+
+from data_repository import get_repository
+from tiobe_matrix import construir_matriz_tiobe
+
+# Ventana de la media móvil, en observaciones mensuales
+VENTANA_MEDIA_MOVIL = 12
+
+DIAS_POR_ANIO = 365.25
+
+
+class TendenciasTIOBE:
+    """
+    Estadísticas de tendencia por lenguaje sobre un rango de la matriz TIOBE.
+
+    Todos los arrays están alineados con `lenguajes`; NaN donde el lenguaje no
+    tiene datos suficientes (p. ej. la pendiente con menos de dos observaciones).
+
+    Attributes:
+        fechas: datetime64 de las observaciones del rango
+        media_movil: (lenguajes, observaciones) media de las últimas
+            VENTANA_MEDIA_MOVIL observaciones (NaN hasta completar la ventana)
+        primero, ultimo: Primer y último rating del rango
+        cambio: ultimo - primero, en puntos porcentuales
+        pendiente: Pendiente de mínimos cuadrados, en puntos por año
+        cagr: Tasa de crecimiento anual compuesta entre primero y ultimo
+        volatilidad: Desviación estándar del cambio entre observaciones seguidas
+        top1: Observaciones en que el lenguaje fue el mejor calificado
+        pico, fecha_pico, valle, fecha_valle: Máximo y mínimo del rango y sus fechas
+    """
+
+    def __init__(self, matriz, anio1=None, anio2=None, ventana=VENTANA_MEDIA_MOVIL):
+        if anio1 is None:
+            rango = slice(0, len(matriz.fechas))
+        else:
+            rango = matriz.columnas(anio1, anio2)
+        ratings = matriz.ratings[:, rango]
+        self.lenguajes = matriz.lenguajes
+        self.fechas = matriz.fechas[rango]
+        self.ventana = ventana
+        num_lenguajes, num_obs = ratings.shape
+        con_dato = ~np.isnan(ratings)
+        cuenta = con_dato.sum(axis=1)
+        valores = np.where(con_dato, ratings, 0.0)
+
+        # Media móvil con sumas acumuladas (ignora los NaN dentro de la ventana)
+        suma = np.hstack([np.zeros((num_lenguajes, 1)), np.cumsum(valores, axis=1)])
+        conteo = np.hstack([np.zeros((num_lenguajes, 1)), np.cumsum(con_dato, axis=1)])
+        self.media_movil = np.full(ratings.shape, np.nan)
+        if num_obs >= ventana:
+            suma_ventana = suma[:, ventana:] - suma[:, :-ventana]
+            conteo_ventana = conteo[:, ventana:] - conteo[:, :-ventana]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.media_movil[:, ventana - 1:] = np.where(conteo_ventana > 0, suma_ventana / conteo_ventana, np.nan)
+
+        # Primera y última observación con dato de cada lenguaje
+        hay_datos = cuenta > 0
+        i_primero = np.argmax(con_dato, axis=1)
+        i_ultimo = num_obs - 1 - np.argmax(con_dato[:, ::-1], axis=1)
+        filas = np.arange(num_lenguajes)
+        self.primero = np.where(hay_datos, ratings[filas, i_primero] if num_obs else np.nan, np.nan)
+        self.ultimo = np.where(hay_datos, ratings[filas, i_ultimo] if num_obs else np.nan, np.nan)
+        self.cambio = self.ultimo - self.primero
+
+        # Pendiente de mínimos cuadrados con el tiempo en años
+        anios = (self.fechas - self.fechas[0]) / np.timedelta64(1, 'D') / DIAS_POR_ANIO if num_obs else np.zeros(0)
+        x = np.where(con_dato, anios, 0.0)
+        suma_x, suma_y = x.sum(axis=1), valores.sum(axis=1)
+        suma_xx, suma_xy = (x * x).sum(axis=1), (x * valores).sum(axis=1)
+        denominador = cuenta * suma_xx - suma_x ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.pendiente = np.where((cuenta >= 2) & (denominador > 0),
+                                      (cuenta * suma_xy - suma_x * suma_y) / denominador, np.nan)
+
+            # CAGR entre la primera y la última observación
+            duracion = np.where(hay_datos, anios[i_ultimo] - anios[i_primero] if num_obs else 0.0, 0.0)
+            valido = (duracion > 0) & (self.primero > 0) & (self.ultimo > 0)
+            self.cagr = np.where(valido, (self.ultimo / self.primero) ** (1 / np.where(valido, duracion, 1)) - 1,
+                                 np.nan)
+
+        # Volatilidad: desviación del cambio entre observaciones seguidas
+        cambios = np.diff(ratings, axis=1)
+        validos = ~np.isnan(cambios)
+        n_cambios = validos.sum(axis=1)
+        cambios = np.where(validos, cambios, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = cambios.sum(axis=1) / n_cambios
+            varianza = (np.where(validos, cambios - media[:, None], 0.0) ** 2).sum(axis=1) / (n_cambios - 1)
+        self.volatilidad = np.where(n_cambios >= 2, np.sqrt(varianza), np.nan)
+
+        # Observaciones como #1 (mismo criterio que el gráfico de ganadores)
+        columnas_con_dato = con_dato.any(axis=0)
+        ganadores = np.argmax(np.where(con_dato, ratings, -np.inf)[:, columnas_con_dato], axis=0)
+        self.top1 = np.bincount(ganadores, minlength=num_lenguajes)
+        self.observaciones_top1 = int(columnas_con_dato.sum())
+
+        # Pico y valle de cada lenguaje
+        i_pico = np.argmax(np.where(con_dato, ratings, -np.inf), axis=1)
+        i_valle = np.argmin(np.where(con_dato, ratings, np.inf), axis=1)
+        self.pico = np.where(hay_datos, ratings[filas, i_pico] if num_obs else np.nan, np.nan)
+        self.valle = np.where(hay_datos, ratings[filas, i_valle] if num_obs else np.nan, np.nan)
+        sin_fecha = np.datetime64('NaT')
+        self.fecha_pico = np.where(hay_datos, self.fechas[i_pico] if num_obs else sin_fecha, sin_fecha)
+        self.fecha_valle = np.where(hay_datos, self.fechas[i_valle] if num_obs else sin_fecha, sin_fecha)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, nombre).nbytes for nombre in (
+            'media_movil', 'primero', 'ultimo', 'cambio', 'pendiente', 'cagr', 'volatilidad',
+            'top1', 'pico', 'valle', 'fecha_pico', 'fecha_valle'))
+
+    def resumen(self):
+        """DataFrame con una fila por lenguaje, ordenado por el último rating"""
+        return pd.DataFrame({
+            'Language': self.lenguajes,
+            'Primero': self.primero,
+            'Ultimo': self.ultimo,
+            'Cambio': self.cambio,
+            'Pendiente_anual': self.pendiente,
+            'CAGR': self.cagr,
+            'Volatilidad': self.volatilidad,
+            'Meses_top1': self.top1,
+            'Pico': self.pico,
+            'Fecha_pico': self.fecha_pico,
+            'Valle': self.valle,
+            'Fecha_valle': self.fecha_valle,
+        }).sort_values('Ultimo', ascending=False, ignore_index=True)
+
+    def destacados(self, cantidad=3):
+        """
+        Lenguajes destacados del rango.
+
+        Returns:
+            Dict con 'lider' (más observaciones como #1) y listas de índices
+            'ascenso' y 'declive' (mayor y menor pendiente) y 'volatiles'
+        """
+        pendientes = np.where(np.isnan(self.pendiente), 0.0, self.pendiente)
+        volatilidad = np.where(np.isnan(self.volatilidad), -np.inf, self.volatilidad)
+        orden = np.argsort(-pendientes, kind='stable')
+        return {
+            'lider': int(np.argmax(self.top1)) if self.observaciones_top1 else None,
+            'ascenso': [int(i) for i in orden[:cantidad] if pendientes[i] > 0],
+            'declive': [int(i) for i in orden[::-1][:cantidad] if pendientes[i] < 0],
+            'volatiles': [int(i) for i in np.argsort(-volatilidad, kind='stable')[:cantidad]
+                          if np.isfinite(volatilidad[i])],
+        }
+
+    def describir(self, i):
+        """Frase con las estadísticas de un lenguaje"""
+        texto = (f"{self.lenguajes[i]}: {self.primero[i]:.2f}% -> {self.ultimo[i]:.2f}% "
+                 f"({self.cambio[i]:+.2f} puntos), pendiente {self.pendiente[i]:+.2f} puntos/año")
+        if not np.isnan(self.cagr[i]):
+            texto += f", CAGR {self.cagr[i] * 100:+.1f}%"
+        texto += (f", volatilidad {self.volatilidad[i]:.2f}, pico {self.pico[i]:.2f}% "
+                  f"({_mes(self.fecha_pico[i])}), valle {self.valle[i]:.2f}% ({_mes(self.fecha_valle[i])})")
+        return texto
+
+    def texto_insights(self):
+        """Resumen en texto para el prompt del agente IA, calculado con los datos vigentes"""
+        if not len(self.fechas):
+            return "No hay observaciones TIOBE en el rango."
+        destacados = self.destacados()
+        lineas = [f"ESTADISTICAS CALCULADAS DEL INDICE TIOBE ({_mes(self.fechas[0])} a {_mes(self.fechas[-1])}, "
+                  f"{len(self.fechas)} observaciones mensuales):"]
+        lider = destacados['lider']
+        if lider is not None:
+            lineas.append(f"- Lider: {self.lenguajes[lider]}, #1 en {self.top1[lider]} de "
+                          f"{self.observaciones_top1} observaciones ({self.top1[lider] / self.observaciones_top1:.1%})")
+            otros = [f"{self.lenguajes[i]} ({self.top1[i]})" for i in np.argsort(-self.top1, kind='stable')
+                     if self.top1[i] and i != lider]
+            if otros:
+                lineas.append(f"- Otros lenguajes que fueron #1: {', '.join(otros)}")
+        for titulo, clave, valores, formato in (
+                ('En ascenso (mayor pendiente)', 'ascenso', self.pendiente, '{:+.2f} puntos/año'),
+                ('En declive (menor pendiente)', 'declive', self.pendiente, '{:+.2f} puntos/año'),
+                ('Mas volatiles', 'volatiles', self.volatilidad, 'volatilidad {:.2f}')):
+            if destacados[clave]:
+                detalle = ', '.join(f"{self.lenguajes[i]} ({formato.format(valores[i])})" for i in destacados[clave])
+                lineas.append(f"- {titulo}: {detalle}")
+        lineas.append("- Todos los lenguajes (ultimo rating):")
+        lineas += [f"    {self.describir(i)}" for i in np.argsort(-np.nan_to_num(self.ultimo, nan=-1), kind='stable')
+                   if not np.isnan(self.ultimo[i])]
+        return "\n".join(lineas)
+
+
+def _mes(fecha):
+    return 'sin fecha' if np.isnat(fecha) else str(np.datetime64(fecha, 'M'))
+
+
+def obtener_tendencias(repositorio=None, anio1=None, anio2=None):
+    """
+    Estadísticas de tendencia de todo el histórico (o de un rango de años),
+    calculadas una sola vez por versión de datos
+    """
+    repositorio = repositorio or get_repository()
+    nombre = 'tendencias' if anio1 is None else f'tendencias:{anio1}:{anio2}'
+    return repositorio.derived(
+        nombre,
+        lambda repo: TendenciasTIOBE(repo.derived('matriz_tiobe', construir_matriz_tiobe), anio1, anio2)
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    repositorio = get_repository()
+    df = repositorio.get('series_tiempo')
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+
+    inicio = time.perf_counter()
+    tendencias = TendenciasTIOBE(matriz)
+    duracion = (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    for lenguaje, serie in df.groupby('Language'):
+        x = (serie['Date'] - serie['Date'].iloc[0]).dt.days.to_numpy() / DIAS_POR_ANIO
+        np.polyfit(x, serie['Rating'], 1)
+        serie['Rating'].diff().std()
+        serie['Rating'].rolling(VENTANA_MEDIA_MOVIL).mean()
+    duracion_groupby = (time.perf_counter() - inicio) * 1000
+
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(tendencias.resumen().round(3).to_string(index=False))
+    print()
+    print(tendencias.texto_insights())
+    print(f"\n{len(matriz.lenguajes)} lenguajes: {duracion:.2f} ms en una pasada "
+          f"vs {duracion_groupby:.2f} ms por lenguaje con pandas ({tendencias.nbytes / 1024:.1f} KB)")
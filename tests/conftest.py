@@ -0,0 +1,51 @@
+# Configuración común de las pruebas: los módulos están en la raíz del
+# repositorio y leen los datos con rutas relativas (Datos/, Datos_procesados/)
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+# Los snapshots y la cache de figuras del repositorio del proceso (el que usa
+# main.py al importarse) van a una carpeta temporal: las pruebas no escriben
+# en Datos_cache/. Se fija antes de importar los módulos, que leen las
+# variables al cargarse.
+CACHE_PRUEBAS = tempfile.mkdtemp(prefix='codetrends_pruebas_')
+os.environ['CODETRENDS_SNAPSHOT_DIR'] = CACHE_PRUEBAS
+os.environ['CODETRENDS_FIGURE_CACHE_PATH'] = os.path.join(CACHE_PRUEBAS, 'figuras.sqlite')
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(CACHE_PRUEBAS, ignore_errors=True)
+
+
+@pytest.fixture
+def copia_datos(tmp_path):
+    """Copia de Datos/, Datos_procesados/ e Historial/ para modificarlos sin tocar los originales"""
+    for carpeta in ('Datos', 'Datos_procesados', 'Historial'):
+        shutil.copytree(os.path.join(RAIZ, carpeta), tmp_path / carpeta)
+    return tmp_path
+
+
+@pytest.fixture
+def repositorio_restaurado():
+    """Repositorio compartido del proceso restaurado al terminar la prueba"""
+    from data_repository import reemplazar_repositorio, repositorio_vigente
+
+    anterior = repositorio_vigente()
+    yield
+    reemplazar_repositorio(anterior)
+
+
+@pytest.fixture(scope='session')
+def repositorio(tmp_path_factory):
+    """Repositorio de los datos del proyecto, con los snapshots en una carpeta temporal"""
+    from data_repository import DataRepository
+
+    return DataRepository(RAIZ, snapshot_dir=str(tmp_path_factory.mktemp('snapshots')))
@@ -0,0 +1,35 @@
+from build_pipeline import PIPELINE, construir, leer_manifest, niveles
+
+
+def _estados(reporte):
+    return {fila['nodo']: fila['estado'] for fila in reporte}
+
+
+def test_niveles_respetan_las_dependencias():
+    posicion = {nodo: i for i, nivel in enumerate(niveles()) for nodo in nivel}
+    productor = {nodo['salida']: nombre for nombre, nodo in PIPELINE.items()}
+    for nombre, nodo in PIPELINE.items():
+        for entrada in nodo['entradas']:
+            if entrada in productor:
+                assert posicion[productor[entrada]] < posicion[nombre], (nombre, entrada)
+
+
+def test_reconstruye_solo_lo_que_cambia(copia_datos):
+    base_dir = str(copia_datos)
+    construir(base_dir=base_dir)
+    version = leer_manifest(copia_datos / 'Datos_procesados' / 'manifest.json')['version']
+    assert set(_estados(construir(base_dir=base_dir)).values()) == {'al día'}
+
+    # Un cambio en las series TIOBE reconstruye sus dos nodos; el resto sigue al día
+    with open(copia_datos / 'Datos' / 'Series_de_Tiempo.csv', 'a', encoding='utf-8') as f:
+        f.write('\n')
+    estados = _estados(construir(base_dir=base_dir))
+    reconstruidos = {nodo for nodo, estado in estados.items() if estado == 'reconstruido'}
+    assert reconstruidos == {'rating_promedio', 'eventos'}
+    assert leer_manifest(copia_datos / 'Datos_procesados' / 'manifest.json')['version'] != version
+
+
+def test_objetivos_incluyen_sus_dependientes(copia_datos):
+    reporte = construir(['repos_lenguaje_clean'], forzar=True, base_dir=str(copia_datos))
+    assert set(_estados(reporte)) == {'repos_lenguaje_clean', 'estadisticas_github', 'promedio_estrellas',
+                                      'distribucion_lenguajes'}
@@ -0,0 +1,79 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import main
+from busqueda_repos import IndiceBusqueda
+from data_repository import DataRepository, reemplazar_repositorio
+
+
+def _quitar_repositorio(base, usuario, repositorio):
+    for archivo in ('Top_repos_clean.csv', 'Repos_por_lenguaje_clean.csv'):
+        ruta = base / 'Datos_procesados' / archivo
+        df = pd.read_csv(ruta)
+        df[(df['User'] != usuario) | (df['Repository'] != repositorio)].to_csv(ruta, index=False)
+
+
+def test_indice_de_busqueda_usa_el_historial_de_su_repositorio(copia_datos, repositorio_restaurado, tmp_path):
+    actual = DataRepository('.', snapshot_dir=str(tmp_path))
+    reemplazar_repositorio(actual)
+    assert main.obtener_busqueda_repos().obtener('OpenBMB/VoxCPM') is not None
+
+    # Candidato sin ese repositorio ni historial: sus derivados se construyen
+    # a partir de los del repositorio actual sin fijarlo en el hilo
+    _quitar_repositorio(copia_datos, 'OpenBMB', 'VoxCPM')
+    shutil.rmtree(copia_datos / 'Historial')
+    candidato = DataRepository(str(copia_datos), snapshot_dir=str(copia_datos / 'Datos_cache'))
+    candidato.construir_derivados_de(actual)
+
+    assert candidato._derivados['busqueda_repos'].obtener('OpenBMB/VoxCPM') is None
+    assert candidato._derivados['historial_trending'].fechas('top_repos_clean') == []
+
+
+def _repos_sinteticos(total=50_000):
+    rng = np.random.default_rng(24)
+    silabas = np.array(['ai', 'py', 'go', 'js', 'rs', 'net', 'web', 'ml', 'db', 'kit', 'lab', 'hub',
+                        'dev', 'app', 'api', 'cli', 'ui', 'io', 'core', 'data', 'fast', 'open'])
+    partes = rng.integers(0, len(silabas), (total, 4))
+    usuarios = pd.Series(silabas[partes[:, 0]]).str.cat(rng.integers(0, 5_000, total).astype(str))
+    nombres = (pd.Series(silabas[partes[:, 1]]) + '-' + silabas[partes[:, 2]] + silabas[partes[:, 3]]
+               + '-' + rng.integers(0, 100, total).astype(str))
+    return pd.DataFrame({
+        'User': usuarios, 'Repository': nombres,
+        'Language': np.array(['Python', 'Go', 'Rust', None], dtype=object)[rng.integers(0, 4, total)],
+        'NumberOfStar': rng.integers(0, 200_000, total),
+    }).drop_duplicates(['User', 'Repository']).sort_values('NumberOfStar', ascending=False, kind='stable')
+
+
+def test_resultados_contienen_la_consulta_y_no_falta_ninguno():
+    repos = _repos_sinteticos()
+    indice = IndiceBusqueda(repos)
+    textos = (repos['User'] + '/' + repos['Repository']).str.lower().reset_index(drop=True)
+    for consulta in ['net-kit', 'kitlab', 'data499', 'Core', 'zzz', 'hub-ai']:
+        contienen = textos[textos.str.contains(consulta.lower(), regex=False)]
+        obtenidos = [f"{r['User']}/{r['Repository']}".lower() for r in indice.buscar(consulta)]
+        assert set(obtenidos) <= set(contienen), consulta
+        assert len(obtenidos) == min(10, len(contienen)), consulta
+
+
+def test_prefijos_primero_y_de_mayor_a_menor_estrellas():
+    indice = IndiceBusqueda(_repos_sinteticos())
+    resultados = indice.buscar('fast', limite=20)
+    prefijo = [r['Repository'].startswith('fast') or r['User'].startswith('fast') for r in resultados]
+    assert prefijo == sorted(prefijo, reverse=True)
+    estrellas = [r['NumberOfStar'] for r, p in zip(resultados, prefijo) if p]
+    assert estrellas == sorted(estrellas, reverse=True)
+    assert indice.buscar('') == []
+
+
+def test_desde_tablas_un_repositorio_por_usuario_y_nombre():
+    tablas = [
+        pd.DataFrame({'User': ['a', 'b'], 'Repository': ['x', 'y'], 'Language': [None, 'Go'],
+                      'NumberOfStar': [5, 7], 'Extra': [0, 0]}),
+        pd.DataFrame({'User': ['a'], 'Repository': ['x'], 'Language': ['Rust'], 'NumberOfStar': [9]}),
+    ]
+    indice = IndiceBusqueda.desde_tablas(tablas)
+    assert indice.obtener('A/X') == {'User': 'a', 'Repository': 'x', 'Language': 'Rust', 'NumberOfStar': 9}
+    assert len(indice.repos) == 2
+    assert IndiceBusqueda.desde_tablas([]).buscar('abc') == []
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from data_repository import DataRepository
+
+
+def test_no_cambia_opciones_globales_de_pandas():
+    assert not pd.get_option('mode.copy_on_write')
+
+
+def test_vistas_comparten_datos_sin_alterar_el_dataset(tmp_path):
+    repositorio = DataRepository('.', snapshot_dir=str(tmp_path))
+    vista = repositorio.get('ranking_tiobe')
+    original = repositorio._frames['ranking_tiobe']
+    assert np.shares_memory(vista['Rank Dec 2025'].to_numpy(), original['Rank Dec 2025'].to_numpy())
+
+    vista['Extra'] = 1
+    vista['Rank Dec 2025'] = 0
+    assert 'Extra' not in original
+    assert (original['Rank Dec 2025'] > 0).all()
+    assert 'Extra' not in repositorio.get('ranking_tiobe')
+
+
+def test_escrituras_en_el_lugar_llegan_al_dataset_compartido(tmp_path):
+    # La vista no protege los datos (vista_compartida): por eso quien escribe
+    # en el lugar trabaja sobre df.copy()
+    repositorio = DataRepository('.', snapshot_dir=str(tmp_path))
+    repositorio.get('ranking_tiobe').loc[0, 'Rank Dec 2025'] = -1
+    assert repositorio.get('ranking_tiobe').loc[0, 'Rank Dec 2025'] == -1
+
+    copia = repositorio.get('ranking_tiobe').copy()
+    copia.loc[1, 'Rank Dec 2025'] = -1
+    assert repositorio.get('ranking_tiobe').loc[1, 'Rank Dec 2025'] > 0
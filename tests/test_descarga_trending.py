@@ -0,0 +1,53 @@
+import gzip
+import os
+import time
+
+import pytest
+
+from descarga_trending import (ARCHIVO_TOP_LENGUAJES, ARCHIVO_TOP_REPOS, FIXTURES_DIR, archivo_fixture, descargar,
+                               rutas_trending, servidor_fixtures)
+
+CONEXIONES = 4
+
+
+@pytest.fixture
+def servidor():
+    """Servidor local con los HTML guardados de GitHub Trending, sin latencia"""
+    servidor, contadores = servidor_fixtures(FIXTURES_DIR, 0)
+    try:
+        yield servidor, contadores, f"http://127.0.0.1:{servidor.server_address[1]}"
+    finally:
+        servidor.shutdown()
+
+
+def test_primera_descarga_igual_al_scraper(servidor, tmp_path):
+    _, contadores, base_url = servidor
+    reporte, escritos, abiertas = descargar(base_url, str(tmp_path), CONEXIONES)
+    assert sorted(escritos) == sorted([ARCHIVO_TOP_REPOS, ARCHIVO_TOP_LENGUAJES])
+    for archivo in (ARCHIVO_TOP_REPOS, ARCHIVO_TOP_LENGUAJES):
+        with open(tmp_path / archivo, 'rb') as f, \
+                open(os.path.join(FIXTURES_DIR, os.path.basename(archivo)), 'rb') as esperado:
+            assert f.read() == esperado.read(), archivo
+    assert all(pagina['estado'] == 'descargada' for pagina in reporte)
+    assert abiertas <= CONEXIONES and contadores['conexiones'] <= CONEXIONES
+
+
+def test_segunda_descarga_sin_cambios_y_pagina_modificada(servidor, tmp_path):
+    servidor, contadores, base_url = servidor
+    descargar(base_url, str(tmp_path), CONEXIONES)
+    modificado = os.stat(tmp_path / ARCHIVO_TOP_REPOS).st_mtime_ns
+
+    # Sin cambios en el servidor: solo 304 y los CSV no se reescriben
+    reporte, escritos, _ = descargar(base_url, str(tmp_path), CONEXIONES)
+    assert all(pagina['estado'] == 'sin cambios' for pagina in reporte) and not escritos
+    assert contadores['200'] == len(reporte) and contadores['304'] == len(reporte)
+    assert os.stat(tmp_path / ARCHIVO_TOP_REPOS).st_mtime_ns == modificado
+
+    # Cambia una página: solo esa se vuelve a bajar; el contenido parseado es el mismo
+    nombre = archivo_fixture(rutas_trending()[11])
+    with gzip.open(os.path.join(FIXTURES_DIR, nombre), 'rb') as f:
+        servidor.contenidos[nombre] = f.read().replace(b'</article>', b'</article>\n', 1)
+    servidor.modificado[nombre] = time.time()
+    reporte, escritos, _ = descargar(base_url, str(tmp_path), CONEXIONES)
+    assert [pagina['estado'] for pagina in reporte].count('descargada') == 1
+    assert not escritos
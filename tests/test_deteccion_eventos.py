@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from deteccion_eventos import COLUMNAS, anomalias, cambios_de_nivel, detectar_eventos
+
+
+def _paseo(semilla, periodos=120):
+    rng = np.random.default_rng(semilla)
+    return np.cumsum(rng.normal(0, 0.2, periodos)) + 10
+
+
+def test_cambio_de_nivel_sintetico():
+    serie = _paseo(2)
+    serie[60:] += 4
+    _, columna, antes, despues, _ = cambios_de_nivel(serie[None, :], 6, 2.0, 1.0)
+    assert list(columna) == [60]
+    assert despues[0] - antes[0] > 3
+
+
+def test_ventanas_con_huecos_no_se_evaluan():
+    serie = _paseo(2)
+    serie[60:] += 4
+    serie[58] = np.nan
+    _, columna, *_ = cambios_de_nivel(serie[None, :], 6, 2.0, 1.0)
+    assert 60 not in columna
+
+
+def test_anomalia_de_un_periodo():
+    serie = _paseo(5)
+    serie[40] += 3
+    # Las vecinas se desvían la mitad del pico: el mínimo de 2 deja solo el pico
+    _, columna, esperado, puntuacion = anomalias(serie[None, :], 4.0, 2.0)
+    assert list(columna) == [40]
+    assert np.isclose(esperado[0], (serie[39] + serie[41]) / 2) and puntuacion[0] > 0
+
+
+def test_eventos_del_dataset():
+    eventos = detectar_eventos(pd.read_csv('Datos/Series_de_Tiempo.csv'),
+                               pd.read_csv('Datos_procesados/MadnightPullRequests_cleaned.csv'))
+    assert list(eventos.columns) == COLUMNAS
+    assert set(eventos['Fuente']) <= {'tiobe', 'pull_requests'}
+    assert set(eventos['Tipo']) <= {'cambio_nivel', 'anomalia'}
+    ordenados = eventos.sort_values(['Fuente', 'Fecha', 'Lenguaje'], kind='stable')
+    pd.testing.assert_frame_equal(eventos, ordenados.reset_index(drop=True))
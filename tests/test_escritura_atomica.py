@@ -0,0 +1,42 @@
+import json
+import os
+import stat
+
+import pytest
+
+from build_pipeline import MANIFEST_PATH, construir
+from escritura_atomica import PERMISOS_ARCHIVO, archivo_atomico, escribir_atomico
+
+
+def _permisos(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_permisos_de_la_umask(tmp_path):
+    path = tmp_path / 'sub' / 'datos.bin'
+    escribir_atomico(str(path), lambda f: f.write(b'hola'))
+    assert path.read_bytes() == b'hola'
+    assert _permisos(path) == PERMISOS_ARCHIVO
+    assert os.listdir(tmp_path / 'sub') == ['datos.bin']
+
+
+def test_error_conserva_el_archivo_anterior(tmp_path):
+    path = tmp_path / 'datos.csv'
+    path.write_text('anterior')
+    with pytest.raises(RuntimeError):
+        with archivo_atomico(str(path)) as tmp:
+            with open(tmp, 'w') as f:
+                f.write('a medias')
+            raise RuntimeError
+    assert path.read_text() == 'anterior'
+    assert os.listdir(tmp_path) == ['datos.csv']
+
+
+def test_pipeline_escribe_salidas_y_manifest_atomicamente(copia_datos):
+    os.remove(copia_datos / MANIFEST_PATH)
+    construir(objetivos=['top_repos_clean'], forzar=True, base_dir=str(copia_datos))
+    manifest = copia_datos / MANIFEST_PATH
+    assert json.loads(manifest.read_text(encoding='utf-8'))['nodos']
+    assert _permisos(manifest) == PERMISOS_ARCHIVO
+    assert _permisos(copia_datos / 'Datos_procesados' / 'Top_repos_clean.csv') == PERMISOS_ARCHIVO
+    assert not [n for n in os.listdir(copia_datos / 'Datos_procesados') if n.endswith('.tmp')]
@@ -0,0 +1,53 @@
+import figure_cache
+from figure_cache import _DiscoSQLite
+
+
+def test_lecturas_del_disco_no_escriben(tmp_path):
+    disco = _DiscoSQLite(str(tmp_path / 'figuras.sqlite'), max_bytes=1000)
+    disco.put('v1:a', 'v1', 'x' * 10)
+    conexion = disco._conexion()
+    cambios = conexion.total_changes
+
+    assert disco.get('v1:a') == 'x' * 10
+    assert disco.get('v1:b') is None
+    assert conexion.total_changes == cambios
+    # Los contadores acumulados se ven en stats y se vuelcan en el siguiente put
+    assert (disco.stats()['hits'], disco.stats()['misses']) == (1, 1)
+    disco.put('v1:c', 'v1', 'y' * 10)
+    assert (disco.stats()['hits'], disco.stats()['misses']) == (1, 1)
+    assert dict(conexion.execute('SELECT nombre, valor FROM contadores').fetchall()) == {'hits': 1, 'misses': 1}
+
+
+def test_expulsa_segun_los_accesos_acumulados(tmp_path):
+    disco = _DiscoSQLite(str(tmp_path / 'figuras.sqlite'), max_bytes=25)
+    disco.put('v1:a', 'v1', 'a' * 10)
+    disco.put('v1:b', 'v1', 'b' * 10)
+    assert disco.get('v1:a') is not None  # a pasa a ser la más reciente
+    disco.put('v1:c', 'v1', 'c' * 10)
+    assert disco.get('v1:a') is not None
+    assert disco.get('v1:b') is None
+    assert disco.stats()['expulsiones'] == 1
+
+
+def test_un_proceso_que_solo_lee_vuelca_cada_tanto(tmp_path, monkeypatch):
+    disco = _DiscoSQLite(str(tmp_path / 'figuras.sqlite'), max_bytes=1000)
+    disco.put('v1:a', 'v1', 'x' * 10)
+    lector = _DiscoSQLite(disco.path, max_bytes=1000)
+    assert lector.get('v1:a') is not None
+    assert disco.stats()['hits'] == 0  # todavía en la memoria del lector
+
+    monkeypatch.setattr(figure_cache, 'DISCO_VOLCADO_SEGUNDOS', 0)
+    assert lector.get('v1:a') is not None
+    assert disco.stats()['hits'] == 2
+
+
+def test_la_huella_solo_depende_de_los_modulos_de_figuras(tmp_path):
+    for nombre in ('main.py', 'lenguajes.py', 'wsgi.py'):
+        (tmp_path / nombre).write_text('x = 1\n')
+    huella = figure_cache._huella_codigo(str(tmp_path))
+
+    (tmp_path / 'wsgi.py').write_text('x = 2\n')
+    (tmp_path / 'benchmark_servidor.py').write_text('x = 3\n')
+    assert figure_cache._huella_codigo(str(tmp_path)) == huella
+    (tmp_path / 'lenguajes.py').write_text('x = 2\n')
+    assert figure_cache._huella_codigo(str(tmp_path)) != huella
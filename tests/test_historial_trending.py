@@ -0,0 +1,55 @@
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from historial_trending import CLAVE, HISTORIAL_DIR, TABLAS, HistorialTrending, ingerir
+
+TABLA = 'repos_lenguaje_clean'
+
+
+def _ingestas(carpeta, dias, ritmo):
+    """Un snapshot por día en el que cada repositorio gana `ritmo` estrellas diarias"""
+    spec = TABLAS[TABLA]
+    base = pd.read_csv(spec['fuente'])
+    os.makedirs(carpeta / os.path.dirname(spec['fuente']), exist_ok=True)
+    reportes = []
+    for n, dia in enumerate(dias):
+        base.assign(NumberOfStar=base['NumberOfStar'] + ritmo * n).to_csv(carpeta / spec['fuente'], index=False)
+        reportes.append(ingerir(dia, base_dir=str(carpeta), tablas={TABLA: spec}))
+    return base, reportes
+
+
+def test_velocidad_diaria_y_reingesta(tmp_path):
+    base = pd.read_csv(TABLAS[TABLA]['fuente'])
+    ritmo = np.random.default_rng(7).integers(0, 500, len(base))
+    dias = [(date(2025, 1, 1) + timedelta(days=i)).isoformat() for i in range(5)]
+    base, reportes = _ingestas(tmp_path, dias, ritmo)
+    assert all(reporte[0]['estado'] == 'agregado' for reporte in reportes)
+
+    historial = HistorialTrending(str(tmp_path / HISTORIAL_DIR))
+    assert historial.fechas(TABLA) == dias
+    ultimo = historial.leer(TABLA, dias[-1], dias[-1])
+    # ingerir se queda con la primera fila de cada repositorio
+    esperado = base.assign(Ritmo=ritmo).drop_duplicates(CLAVE)
+    combinado = ultimo.merge(esperado[CLAVE + ['Ritmo']], on=CLAVE)
+    assert len(combinado) == len(ultimo)
+    assert np.allclose(combinado['EstrellasDia'], combinado['Ritmo'])
+
+    # El mismo CSV (mismo hash) no se vuelve a agregar
+    assert ingerir(dias[-1], base_dir=str(tmp_path), tablas={TABLA: TABLAS[TABLA]})[0]['estado'] == 'ya registrado'
+
+
+def test_ventanas_y_ultimos(tmp_path):
+    base = pd.read_csv(TABLAS[TABLA]['fuente'])
+    dias = [(date(2025, 3, 1) + timedelta(days=i)).isoformat() for i in range(4)]
+    _ingestas(tmp_path, dias, np.full(len(base), 10))
+    historial = HistorialTrending(str(tmp_path / HISTORIAL_DIR))
+
+    assert [p['fecha'] for p in historial.particiones(TABLA, dias[1], dias[2])] == dias[1:3]
+    ventana = historial.leer(TABLA, dias[1], dias[2])
+    assert set(ventana['Fecha']) == {pd.Timestamp(dias[1]), pd.Timestamp(dias[2])}
+    ultimos = historial.ultimos(TABLA, dias[0], dias[-1])
+    assert not ultimos.duplicated(CLAVE).any()
+    assert historial.leer(TABLA, '2030-01-01', '2030-01-02').empty
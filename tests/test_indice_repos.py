@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from indice_repos import METRICAS_REPOS, IndiceRepos
+from lenguajes import CATALOGO, COLUMNA_CODIGO, codificar
+
+
+def _verificar_contra_nlargest(df, indice, tamanos=(1, 3, 5, 10, 50)):
+    # Mismos valores en el mismo orden y mismas filas; nlargest no garantiza
+    # el orden entre empates cuando n cubre todo el lenguaje
+    for lenguaje in indice.lenguajes:
+        for metrica, columna in METRICAS_REPOS.items():
+            for n in tamanos:
+                esperado = df[df['Language'] == lenguaje].nlargest(n, columna)
+                obtenido = indice.top(lenguaje, n, metrica)
+                assert (obtenido[columna].to_numpy() == esperado[columna].to_numpy()).all(), (lenguaje, metrica, n)
+                assert set(obtenido.index) == set(esperado.index), (lenguaje, metrica, n)
+
+
+def test_slices_coinciden_con_nlargest(repositorio):
+    df = repositorio.get('repos_lenguaje_clean')
+    indice = IndiceRepos(df)
+    _verificar_contra_nlargest(df, indice)
+    assert sum(indice.cantidad(lenguaje) for lenguaje in indice.lenguajes) == len(df)
+
+
+def test_slices_coinciden_con_nlargest_con_empates():
+    rng = np.random.default_rng(9)
+    filas = 20_000
+    df = pd.DataFrame({
+        'Language': np.array(CATALOGO, dtype=object)[rng.integers(0, 20, filas)],
+        'NumberOfStar': rng.integers(0, 50, filas),
+        'NumberOfFork': rng.integers(0, 10, filas),
+    })
+    df[COLUMNA_CODIGO] = codificar(df['Language'])
+    _verificar_contra_nlargest(df, IndiceRepos(df), tamanos=(1, 5, 20))
+
+
+def test_alias_y_lenguajes_sin_repositorios(repositorio):
+    indice = IndiceRepos(repositorio.get('repos_lenguaje_clean'))
+    assert indice.offsets('cpp', 5).tolist() == indice.offsets('C++', 5).tolist()
+    assert len(indice.top('Cobol', 5)) == 0
+    assert indice.posicion('Cobol', 'x', 'y') is None
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from data_repository import DATASETS
+from lenguajes import ALIAS, CATALOGO, COLUMNA_CODIGO, SIN_CODIGO, codificar, codigo, desconocidos, nombre, normalizar
+
+
+def test_grafias_de_cada_fuente_dan_el_mismo_codigo():
+    slugs_scraper = ["python", "c", "cpp", "c%23", "java", "javascript", "assembly", "r", "perl", "fortran",
+                     "rust", "matlab", "php", "go", "kotlin"]
+    assert [nombre(c) for c in codificar(slugs_scraper)] == list(CATALOGO[:15])
+    assert codigo('Assembly language') == codigo('Assembly')
+    assert codigo('Visual Basic .NET') == codigo('Visual Basic')
+
+
+def test_catalogo_sin_nombres_repetidos():
+    assert len(set(map(normalizar, CATALOGO))) == len(CATALOGO)
+    for alias, destino in ALIAS.items():
+        assert codigo(alias) == codigo(destino) != SIN_CODIGO, alias
+
+
+def test_nulos_y_desconocidos():
+    assert codificar([None, np.nan, 'Markdown', 'Python']).tolist() == [SIN_CODIGO, SIN_CODIGO, SIN_CODIGO, 0]
+    assert desconocidos(['Markdown', 'python', None, 'Markdown']) == ['Markdown']
+
+
+def test_filtro_por_codigo_equivale_al_filtro_por_texto():
+    rng = np.random.default_rng(3)
+    textos = pd.Series(np.array(CATALOGO, dtype=object)[rng.integers(0, len(CATALOGO), 10_000)])
+    buscados = ['Python', 'C', 'C++', 'C#', 'Java', 'JavaScript']
+    assert (textos.isin(buscados).to_numpy() == np.isin(codificar(textos), codificar(buscados))).all()
+
+
+def test_datasets_traen_el_codigo_de_su_columna_de_lenguaje(repositorio):
+    for nombre_dataset, spec in DATASETS.items():
+        if spec.get('lenguaje') is None:
+            continue
+        df = repositorio.get(nombre_dataset)
+        assert (df[COLUMNA_CODIGO].to_numpy() == codificar(df[spec['lenguaje']])).all(), nombre_dataset
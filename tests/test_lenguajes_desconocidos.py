@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from historial_trending import HistorialTrending, ingerir, resumen_lenguajes
+from indice_repos import IndiceRepos
+from lenguajes import CATALOGO, COLUMNA_CODIGO, SIN_CODIGO, codificar, codigos_grupo
+
+LENGUAJES = ['Python', 'HTML', 'Jupyter Notebook', 'html', 'Python', None, 'Jupyter Notebook']
+
+
+def _repos():
+    df = pd.DataFrame({
+        'User': [f'u{i}' for i in range(len(LENGUAJES))],
+        'Repository': [f'r{i}' for i in range(len(LENGUAJES))],
+        'Language': LENGUAJES,
+        'NumberOfStar': [10, 50, 40, 30, 20, 5, 60],
+        'NumberOfFork': [1, 2, 3, 4, 5, 6, 7],
+    })
+    df[COLUMNA_CODIGO] = codificar(df['Language'])
+    return df
+
+
+def test_codigos_grupo_separa_los_desconocidos():
+    codigos, desconocidos = codigos_grupo(LENGUAJES)
+    assert desconocidos == {'html': len(CATALOGO), 'jupyter notebook': len(CATALOGO) + 1}
+    assert codigos.tolist() == [0, len(CATALOGO), len(CATALOGO) + 1, len(CATALOGO), 0, SIN_CODIGO,
+                                len(CATALOGO) + 1]
+
+
+def test_indice_repos_no_junta_los_desconocidos():
+    indice = IndiceRepos(_repos())
+    assert indice.top('HTML', 5)['Repository'].tolist() == ['r1', 'r3']
+    assert indice.top('Jupyter Notebook', 5)['Repository'].tolist() == ['r6', 'r2']
+    assert indice.cantidad('Python') == 2
+    assert indice.cantidad('Markdown') == 0
+    assert indice.posicion('html', 'u3', 'r3') == 3
+
+
+def test_resumen_lenguajes_no_junta_los_desconocidos():
+    df = _repos().assign(EstrellasDia=np.arange(len(LENGUAJES), dtype=float), ForksDia=1.0)
+    resumen = resumen_lenguajes(df).set_index('Language')
+    assert resumen.loc['HTML', 'EstrellasDia'] == 1 + 3
+    assert resumen.loc['HTML', 'Repos'] == 2
+    assert resumen.loc['Jupyter Notebook', 'EstrellasDia'] == 2 + 6
+    assert resumen.loc['Python', 'Repos'] == 2
+    assert (resumen.loc[['HTML', 'Jupyter Notebook'], COLUMNA_CODIGO] == SIN_CODIGO).all()
+
+
+def test_velocidad_lenguajes_no_junta_los_desconocidos(tmp_path):
+    tablas = {'repos': {'fuente': 'repos.csv', 'captura': 'repos.csv'}}
+    columnas = ['Repository', 'User', 'URL', 'Language', 'NumberOfStar', 'NumberOfFork']
+    for dia, extra in (('2026-01-01', 0), ('2026-01-02', 10)):
+        repos = _repos().assign(URL='', NumberOfStar=lambda df: df['NumberOfStar'] + extra * df.index)
+        repos[columnas].to_csv(tmp_path / 'repos.csv', index=False)
+        ingerir(dia, base_dir=str(tmp_path), directorio='historial', tablas=tablas)
+
+    velocidades = HistorialTrending(str(tmp_path / 'historial')).velocidad_lenguajes('repos').set_index('Language')
+    # Estrellas por día de cada repositorio: 10 * su posición
+    assert velocidades.loc['HTML', 'EstrellasDia'] == (10 + 30) / 2
+    assert velocidades.loc['Jupyter Notebook', 'EstrellasDia'] == (20 + 60) / 2
+    assert velocidades.loc['Python', 'EstrellasDia'] == (0 + 40) / 2
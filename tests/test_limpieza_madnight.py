@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from limpieza_madnight import (MOTIVO_NO_NUMERICO, MOTIVO_VACIO, _datos_sinteticos, limpiar_csv_por_bloques,
+                               limpiar_dataframe, limpiar_porcentaje, limpiar_porcentajes)
+
+
+def test_vectorizada_coincide_con_fila_a_fila():
+    serie = _datos_sinteticos(10_000)
+    valores, _ = limpiar_porcentajes(serie)
+    pd.testing.assert_series_equal(serie.apply(limpiar_porcentaje).astype(float), valores, check_names=False)
+
+
+def test_motivos_de_las_filas_en_cero():
+    # Los nulos del CSV llegan como NaN y se mantienen
+    serie = pd.Series(['12.5abc', '', 'n/a', np.nan, '3'], dtype=object)
+    valores, motivos = limpiar_porcentajes(serie)
+    assert valores.iloc[0] == 12.5 and valores.iloc[4] == 3.0
+    assert pd.isna(valores.iloc[3])
+    assert motivos.to_dict() == {1: MOTIVO_VACIO, 2: MOTIVO_NO_NUMERICO}
+
+
+def test_por_bloques_coincide_con_una_pasada(tmp_path):
+    entrada = tmp_path / 'entrada.csv'
+    df = pd.DataFrame({'Lenguaje': 'Python', 'Porcentaje': _datos_sinteticos(5_000, semilla=3)})
+    df.to_csv(entrada, index=False)
+
+    reporte = limpiar_csv_por_bloques(entrada, tmp_path / 'salida.csv', chunksize=700)
+    esperado, reporte_completo = limpiar_dataframe(pd.read_csv(entrada, dtype={'Porcentaje': str}))
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'salida.csv'), esperado)
+    assert reporte['bloques'] == 8
+    assert reporte['en_cero'] == reporte_completo['en_cero'] and reporte['nulos'] == reporte_completo['nulos']
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from pronostico import PronosticoTIOBE, obtener_pronostico
+from tiobe_matrix import RatingMatrix, construir_matriz_tiobe
+
+
+def holt_por_lenguaje(y, alpha, beta, phi):
+    # Referencia escalar (un lenguaje, sin NaN) para validar el recorrido vectorizado
+    nivel, tendencia, sse = y[1], y[1] - y[0], 0.0
+    for valor in y[2:]:
+        error = valor - (nivel + phi * tendencia)
+        sse += error ** 2
+        nivel, tendencia = nivel + phi * tendencia + alpha * error, phi * tendencia + alpha * beta * error
+    return nivel, tendencia, sse
+
+
+def test_recorrido_vectorizado_coincide_con_el_escalar(repositorio):
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    pronostico = obtener_pronostico(repositorio)
+    for i, lenguaje in enumerate(matriz.lenguajes):
+        nivel, tendencia, sse = holt_por_lenguaje(matriz.ratings[i], pronostico.alpha[i], pronostico.beta[i],
+                                                  pronostico.phi[i])
+        # La media se recorta en 0 (un rating no puede ser negativo)
+        assert (np.isclose(nivel + pronostico.phi[i] * tendencia, pronostico.media[i, 0])
+                or pronostico.media[i, 0] == 0), lenguaje
+        assert np.isclose(np.sqrt(sse / (matriz.ratings.shape[1] - 2)), pronostico.sigma[i]), lenguaje
+
+
+def test_bandas_ordenadas_y_lenguajes_que_entran_tarde():
+    rng = np.random.default_rng(11)
+    fechas = pd.date_range('2015-01-01', '2024-12-01', freq='MS')
+    ratings = np.clip(np.cumsum(rng.normal(0, 0.3, (6, len(fechas))), axis=1) + rng.uniform(1, 15, (6, 1)), 0.1, None)
+    ratings[0, :60] = np.nan
+    matriz = RatingMatrix(np.array([f'L{i}' for i in range(6)], dtype=object), fechas.to_numpy(), ratings)
+    pronostico = PronosticoTIOBE(matriz, 12)
+
+    assert pronostico.media.shape == (6, 12)
+    assert (pronostico.inferior <= pronostico.media).all() and (pronostico.media <= pronostico.superior).all()
+    # El intervalo se ensancha con el horizonte
+    assert (np.diff(pronostico.superior - pronostico.inferior, axis=1) >= -1e-9).all()
+    assert pronostico.fechas[0] == np.datetime64('2025-01-01')
+    # El lenguaje que entra tarde se ajusta solo con sus observaciones
+    nivel, tendencia, _ = holt_por_lenguaje(ratings[0, 60:], pronostico.alpha[0], pronostico.beta[0],
+                                            pronostico.phi[0])
+    assert np.isclose(max(nivel + pronostico.phi[0] * tendencia, 0), pronostico.media[0, 0])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from ranking_historico import HistorialRanking
+from tiobe_matrix import RatingMatrix, construir_matriz_tiobe
+
+
+def test_posicion_1_coincide_con_los_ganadores_mensuales(repositorio):
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    historial = HistorialRanking(matriz)
+    _, ganadores = matriz.ganadores(matriz.anios.min(), matriz.anios.max())
+    assert (historial.posiciones[ganadores, np.arange(len(ganadores))] == 1).all()
+
+
+def test_posiciones_coinciden_con_rank_de_pandas(repositorio):
+    df = repositorio.get('series_tiempo')
+    historial = HistorialRanking(repositorio.derived('matriz_tiobe', construir_matriz_tiobe))
+    rangos = df.assign(Pos=df.groupby('Date')['Rating'].rank(ascending=False, method='min'))
+    for fila in rangos.sample(200, random_state=1).itertuples():
+        t = np.searchsorted(historial.fechas, np.datetime64(fila.Date))
+        # Sin empates en la fecha, el rank 'min' es la posición exacta
+        if (df[df['Date'] == fila.Date]['Rating'] == fila.Rating).sum() == 1:
+            assert historial.posiciones[historial.indice(fila.Language), t] == fila.Pos
+
+
+def _sintetico():
+    fechas = pd.date_range('2024-01-01', periods=4, freq='MS').to_numpy()
+    ratings = np.array([[3.0, 2.0, 1.0, 1.0],
+                        [2.0, 3.0, 3.0, np.nan],
+                        [1.0, 1.0, 2.0, 2.0]])
+    return HistorialRanking(RatingMatrix(np.array(['A', 'B', 'C'], dtype=object), fechas, ratings))
+
+
+def test_cambios_adelantamientos_y_trayectorias():
+    historial = _sintetico()
+    assert historial.posiciones.tolist() == [[1, 2, 3, 2], [2, 1, 1, 0], [3, 3, 2, 1]]
+    assert [(a, b) for _, a, b in historial.cambios_posicion('A')] == [(1, 2), (2, 3), (3, 2)]
+    assert [(sube, superado) for _, sube, superado in historial.adelantamientos('A', 'B')] == [('B', 'A')]
+    assert historial.meses_en_top(1).tolist() == [1, 2, 1]
+    # Top 2: la leyenda va por la última posición dentro del top; los tramos
+    # en la misma posición solo conservan sus extremos
+    trayectorias = {lenguaje: posiciones for lenguaje, _, posiciones in historial.trayectorias(2)}
+    assert list(trayectorias) == ['B', 'C', 'A']
+    np.testing.assert_array_equal(trayectorias['B'], [2, 1, 1, np.nan])
+    np.testing.assert_array_equal(trayectorias['C'], [np.nan, np.nan, 2, 1])
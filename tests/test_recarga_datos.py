@@ -0,0 +1,57 @@
+import os
+
+from data_reload import RecargaDatos
+from data_repository import DataRepository, get_repository, reemplazar_repositorio
+
+
+def _filas_ranking(repositorio):
+    return len(repositorio.get('ranking_tiobe'))
+
+
+def _filas_ranking_global(_repositorio):
+    # Builder que ignora su argumento y lee el repositorio "actual", como los
+    # derivados que dependen de otros derivados a través de get_repository()
+    return len(get_repository().get('ranking_tiobe'))
+
+
+def _agregar_fila_ranking(base):
+    ranking = os.path.join(base, 'Datos', 'RankingTIOBE2025.csv')
+    with open(ranking, encoding='utf-8') as f:
+        ultima = f.readlines()[-1]
+    with open(ranking, 'a', encoding='utf-8') as f:
+        f.write(ultima)
+
+
+def test_recarga_reconstruye_derivados_con_los_datos_nuevos(copia_datos, repositorio_restaurado):
+    original = DataRepository(str(copia_datos), snapshot_dir=str(copia_datos / 'Datos_cache')).warm()
+    reemplazar_repositorio(original)
+    version = original.version  # se calcula al pedirla: antes de modificar los datos
+    antes = _filas_ranking(original)
+    assert original.derived('filas', _filas_ranking) == antes
+    assert original.derived('filas_global', _filas_ranking_global) == antes
+
+    _agregar_fila_ranking(copia_datos)
+    recarga = RecargaDatos(intervalo=0)
+    oyentes = []
+    recarga.al_recargar(lambda nuevo, anterior: oyentes.append((nuevo, anterior)))
+    assert not recarga.revisar()  # primera vez: sin confirmar
+    assert recarga.revisar()
+
+    nuevo = get_repository()
+    assert nuevo is not original and nuevo.version != version
+    assert oyentes == [(nuevo, original)]
+    # Los derivados del repositorio nuevo se construyeron durante la recarga con sus datos
+    assert nuevo._derivados['filas'] == antes + 1
+    assert nuevo._derivados['filas_global'] == antes + 1
+    # El repositorio anterior queda intacto para los callbacks que lo tenían fijado
+    assert original.derived('filas_global', _filas_ranking_global) == antes
+
+
+def test_sin_cambios_no_recarga(copia_datos, repositorio_restaurado):
+    original = DataRepository(str(copia_datos), snapshot_dir=str(copia_datos / 'Datos_cache'))
+    reemplazar_repositorio(original)
+    original.version
+    recarga = RecargaDatos(intervalo=0)
+    assert not recarga.revisar()
+    assert not recarga.revisar()
+    assert get_repository() is original
@@ -0,0 +1,143 @@
+import copy
+import json
+import shutil
+
+import pytest
+from plotly.io.json import to_json_plotly
+
+import main
+import submuestreo
+from resaltado_seleccion import (NO_ACTUALIZAR_JS, SELECCION_CLIENTE, aplicar_a_dict, cambios_barras_de,
+                                 cambios_heatmap_de, cambios_lineas_de, cambios_medidores_de, reglas_tabla,
+                                 resaltar_con_js)
+
+# Secuencia de clics: seleccionar, cambiar de lenguaje, uno ausente, deseleccionar
+SELECCIONES = ('Python', 'C', 'Cobol', None)
+
+sin_node = pytest.mark.skipif(shutil.which('node') is None, reason="node no está instalado")
+
+
+def _completa(builder, **kwargs):
+    return json.loads(to_json_plotly(builder.sin_cache(**kwargs)))
+
+
+def _serie_completa_de(figura, seleccionado):
+    # Serie de tiempo en modo WebGL: la serie completa llega aparte
+    # (update_line_chart_resolution), tanto con resaltado clientside como sin él
+    if figura['data'] and figura['data'][-1].get('uid') == main.UID_SERIE_COMPLETA:
+        return main.cambios_serie_completa(figura, main.get_repository().get('series_tiempo'),
+                                           2020, 2025, seleccionado)
+    return []
+
+
+def _nada(figura, seleccionado):
+    return []
+
+
+# (función JS, builder, cambios de la figura, cambios que agrega el servidor, argumentos)
+CASOS = {
+    'serie de tiempo': ('lineas', main.create_line_chart, cambios_lineas_de, _serie_completa_de,
+                        {'anio1': 2020, 'anio2': 2025}),
+    # Mismo resaltado que la serie de tiempo sobre otras trazas (Scattergl con
+    # colores propios y solo los meses en que cambia la posición)
+    'bump': ('lineas', main.crear_bump_chart, cambios_lineas_de, _nada, {'anio1': 2020, 'anio2': 2025, 'top': 10}),
+    'bump con todos': ('lineas', main.crear_bump_chart, cambios_lineas_de, _nada,
+                       {'anio1': 2021, 'anio2': 2024, 'top': 40}),
+    'ganadores': ('ganadores', main.get_monthly_winners, cambios_barras_de, _nada, {'year1': 2021, 'year2': 2024}),
+    'estrellas': ('estrellas', main.crear_grafico_promedio_estrellas,
+                  lambda figura, sel: cambios_barras_de(figura, sel, solo_si_presente=True), _nada, {}),
+    'heatmap': ('heatmap', main.crear_heatmap_quarters, cambios_heatmap_de, _nada,
+                {'anio_seleccionado': 'Todos', 'num_lenguajes': 10}),
+    'medidores': ('medidores', main.crear_medidores_promedio, cambios_medidores_de, _nada,
+                  {'anio_seleccionado': 2023, 'num_lenguajes': 10}),
+}
+
+
+@pytest.fixture(scope='module')
+def figuras():
+    """Figura sin selección y figura completa de cada selección, por caso"""
+    return {nombre: (_completa(builder, **kwargs),
+                     [_completa(builder, selected_language=sel, **kwargs) for sel in SELECCIONES])
+            for nombre, (_, builder, _, _, kwargs) in CASOS.items()}
+
+
+@pytest.mark.parametrize('nombre', CASOS)
+def test_patch_coincide_con_la_figura_completa(nombre, figuras):
+    _, _, cambios_de, cambios_servidor_de, _ = CASOS[nombre]
+    base, esperadas = figuras[nombre]
+    actual = copy.deepcopy(base)
+    for seleccionado, esperada in zip(SELECCIONES, esperadas):
+        aplicar_a_dict(actual, cambios_de(base, seleccionado) + cambios_servidor_de(base, seleccionado))
+        assert actual == esperada, seleccionado
+
+
+@sin_node
+@pytest.mark.parametrize('nombre', CASOS)
+def test_resaltado_clientside_coincide_con_el_servidor(nombre, figuras):
+    funcion_js, _, _, cambios_servidor_de, _ = CASOS[nombre]
+    base, esperadas = figuras[nombre]
+    # En el navegador cada resaltado parte de la figura que dejó el anterior
+    anteriores = [base] + esperadas[:-1]
+    resultado_js = resaltar_con_js(funcion_js, [[sel, fig] for sel, fig in zip(SELECCIONES, anteriores)])
+    for seleccionado, obtenida, esperada in zip(SELECCIONES, resultado_js, esperadas):
+        aplicar_a_dict(obtenida, cambios_servidor_de(base, seleccionado))
+        assert obtenida == esperada, seleccionado
+
+
+@sin_node
+def test_reglas_de_la_tabla_clientside_coinciden_con_el_servidor():
+    estilos = [main.ESTILOS_TABLA_INDICADOR + reglas_tabla(sel) for sel in SELECCIONES]
+    anteriores = [main.ESTILOS_TABLA_INDICADOR] + estilos[:-1]
+    assert resaltar_con_js('tabla', [[sel, prev] for sel, prev in zip(SELECCIONES, anteriores)]) == estilos
+
+
+@pytest.mark.skipif(not SELECCION_CLIENTE, reason="resaltado en el servidor (CODETRENDS_SELECCION_CLIENTE=0)")
+def test_ningun_callback_del_servidor_escucha_la_seleccion():
+    escuchan = [salida for salida, callback in main.app.callback_map.items()
+                if 'callback' in callback
+                and {'id': 'selected-language-store', 'property': 'data'} in callback['inputs']]
+    assert escuchan == []
+
+
+@pytest.fixture(scope='module')
+def tendencia_webgl():
+    """Gráfico de tendencia con submuestreo (la traza de la serie completa al final)"""
+    anterior, submuestreo.MODO_LINEAS = submuestreo.MODO_LINEAS, 'webgl'
+    try:
+        return _completa(main.create_line_chart, anio1=2020, anio2=2025)
+    finally:
+        submuestreo.MODO_LINEAS = anterior
+
+
+@sin_node
+def test_sin_serie_completa_el_clic_no_sale_del_navegador(figuras, tendencia_webgl):
+    rango = [2020, 2025]
+    sin_submuestreo, _ = figuras['serie de tiempo']
+    assert sin_submuestreo['data'][-1].get('uid') != main.UID_SERIE_COMPLETA
+    pedidos = resaltar_con_js('pedirSerieCompleta', [[sel, sin_submuestreo, rango] for sel in SELECCIONES])
+    assert pedidos == [NO_ACTUALIZAR_JS] * len(SELECCIONES)
+
+    pedidos = resaltar_con_js('pedirSerieCompleta', [[sel, tendencia_webgl, rango] for sel in SELECCIONES])
+    assert pedidos == [{'lenguaje': sel, 'rango': rango} for sel in SELECCIONES]
+
+
+@sin_node
+def test_respuesta_vieja_de_la_serie_completa_se_descarta(tendencia_webgl):
+    rango = [2020, 2025]
+    series = main.get_repository().get('series_tiempo')
+
+    def respuesta(lenguaje):
+        return {'lenguaje': lenguaje, 'rango': rango, 'trazas': len(tendencia_webgl['data']),
+                'cambios': main.cambios_serie_completa(tendencia_webgl, series, 2020, 2025, lenguaje)}
+
+    python = copy.deepcopy(tendencia_webgl)
+    aplicar_a_dict(python, respuesta('Python')['cambios'])
+    # Clic en Python y luego en C: la respuesta de Python llega con C ya seleccionado
+    aplicada, vieja, otro_rango = resaltar_con_js('serieCompleta', [
+        [respuesta('Python'), 'Python', tendencia_webgl, rango],
+        [respuesta('Python'), 'C', tendencia_webgl, rango],
+        [respuesta('Python'), 'Python', tendencia_webgl, [2021, 2025]],
+    ])
+    assert json.loads(json.dumps(aplicada)) == json.loads(json.dumps(python))
+    assert aplicada['data'][-1]['name'] == 'Python' and len(aplicada['data'][-1]['x']) > 0
+    assert vieja == otro_rango == NO_ACTUALIZAR_JS
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from lenguajes import COLUMNA_CODIGO, codificar
+from snapshot_store import estado_snapshot, load_csv
+
+
+def test_snapshot_igual_al_csv(tmp_path):
+    ruta = 'Datos/Series_de_Tiempo.csv'
+    esperado = pd.read_csv(ruta, parse_dates=['Date'])
+    primera = load_csv(ruta, parse_dates=['Date'], snapshot_dir=str(tmp_path))
+    assert estado_snapshot(ruta, ('Date',), (), str(tmp_path))[0]
+    segunda = load_csv(ruta, parse_dates=['Date'], snapshot_dir=str(tmp_path))
+    for df in (primera, segunda):
+        pd.testing.assert_frame_equal(df, esperado)
+
+
+def test_categorias_y_codigo_de_lenguaje(tmp_path):
+    ruta = 'Datos/MadnightPullRequests.csv'
+    esperado = pd.read_csv(ruta)
+    # La primera carga compila el snapshot y la segunda lo lee
+    for _ in range(2):
+        df = load_csv(ruta, categories=['Lenguaje'], snapshot_dir=str(tmp_path), lenguaje='Lenguaje')
+        assert isinstance(df['Lenguaje'].dtype, pd.CategoricalDtype)
+        assert (df['Lenguaje'].astype(object) == esperado['Lenguaje']).all()
+        assert (df[COLUMNA_CODIGO].to_numpy() == codificar(esperado['Lenguaje'])).all()
+
+
+def test_se_recompila_si_el_csv_cambia(tmp_path):
+    ruta = tmp_path / 'datos.csv'
+    pd.DataFrame({'Language': ['Python', 'C'], 'Rating': [1.5, 2.5]}).to_csv(ruta, index=False)
+    snapshots = str(tmp_path / 'cache')
+    assert load_csv(str(ruta), snapshot_dir=snapshots)['Rating'].tolist() == [1.5, 2.5]
+
+    pd.DataFrame({'Language': ['Python', 'C', 'Go'], 'Rating': [1.5, 2.5, 3.5]}).to_csv(ruta, index=False)
+    assert not estado_snapshot(str(ruta), snapshot_dir=snapshots)[0]
+    assert load_csv(str(ruta), snapshot_dir=snapshots)['Language'].tolist() == ['Python', 'C', 'Go']
+
+    # Mismo contenido con otra fecha de modificación: sigue vigente
+    os.utime(ruta, ns=(0, 0))
+    assert estado_snapshot(str(ruta), snapshot_dir=snapshots)[0]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from submuestreo import lttb, submuestrear
+
+
+def test_lttb_conserva_extremos_y_la_cantidad_pedida():
+    rng = np.random.default_rng(3)
+    fechas = pd.date_range('2001-01-01', periods=300, freq='MS').to_numpy()
+    y = np.cumsum(rng.normal(0, 0.4, 300))
+    indices = lttb(fechas, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 299
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_conserva_el_pico():
+    y = np.zeros(200)
+    y[123] = 10
+    assert 123 in lttb(np.arange(200), y, 20)
+
+
+def test_lttb_devuelve_todo_si_la_serie_cabe():
+    assert lttb(np.arange(10), np.arange(10.0), 10).tolist() == list(range(10))
+    assert lttb(np.arange(10), np.arange(10.0), 2).tolist() == list(range(10))
+
+
+def test_submuestrear_deja_completa_la_serie_conservada():
+    fechas = pd.date_range('2001-01-01', periods=120, freq='MS')
+    rng = np.random.default_rng(4)
+    df = pd.concat([pd.DataFrame({'Language': lenguaje, 'Date': fechas, 'Rating': rng.normal(5, 1, 120)})
+                    for lenguaje in ('Python', 'C', 'Go')], ignore_index=True)
+    reducido = submuestrear(df, 'Language', 'Date', 'Rating', 30, conservar='C')
+    assert reducido['Language'].value_counts().to_dict() == {'C': 120, 'Python': 30, 'Go': 30}
+    assert reducido.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(reducido, df.loc[reducido.index])
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from data_reload import RecargaDatos
+from data_repository import DataRepository, get_repository, reemplazar_repositorio
+from tabla_indicadores import FILAS_POR_PAGINA, MASCARAS_POR_TABLA, CacheLRU, TablaIndicadores
+
+
+def test_cache_lru_acotada():
+    cache = CacheLRU(maximo=2)
+    calculos = []
+
+    def calcular(clave):
+        calculos.append(clave)
+        return clave * 10
+
+    assert cache.obtener(1, lambda: calcular(1)) == 10
+    assert cache.obtener(2, lambda: calcular(2)) == 20
+    assert cache.obtener(1, lambda: calcular(1)) == 10  # 1 pasa a ser la más reciente
+    assert cache.obtener(3, lambda: calcular(3)) == 30  # sale 2
+    assert len(cache) == 2
+    assert cache.obtener(1, lambda: calcular(1)) == 10
+    assert cache.obtener(2, lambda: calcular(2)) == 20
+    assert calculos == [1, 2, 3, 2]
+
+
+def _indicadores_sinteticos(n, semilla=7):
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({
+        'Language': [f'Lenguaje{i:05d}' for i in range(n)],
+        '2020': rng.uniform(0, 20, n).round(2),
+        '2025': rng.uniform(0, 20, n).round(2),
+    })
+    df['Indicador'] = (df['2025'] - df['2020']).round(2)
+    return df.sort_values(by='Indicador', ascending=False)
+
+
+# filter_query -> mismo filtro en pandas
+FILTROS = {
+    '': lambda df: df,
+    '{Language} contains 1': lambda df: df[df['Language'].str.contains('1')],
+    '{2025} > 10 && {Indicador} < 0': lambda df: df[(df['2025'] > 10) & (df['Indicador'] < 0)],
+}
+
+
+@pytest.mark.parametrize('filter_query', FILTROS)
+@pytest.mark.parametrize('sort_by', [[], [{'column_id': '2025', 'direction': 'desc'}],
+                                     [{'column_id': 'Indicador', 'direction': 'asc'}]])
+def test_pagina_coincide_con_pandas(filter_query, sort_by):
+    df = _indicadores_sinteticos(5_000)
+    tabla = TablaIndicadores.desde_dataframe(df)
+    esperado = FILTROS[filter_query](df)
+    if sort_by:
+        esperado = esperado.sort_values(sort_by[0]['column_id'], ascending=sort_by[0]['direction'] == 'asc',
+                                        kind='stable')
+    for pagina in (0, 1, 7):
+        registros, paginas = tabla.pagina(pagina, FILAS_POR_PAGINA, sort_by, filter_query)
+        inicio = min(pagina, paginas - 1) * FILAS_POR_PAGINA
+        assert registros == esperado.iloc[inicio:inicio + FILAS_POR_PAGINA].to_dict('records'), pagina
+        assert paginas == max(1, -(-len(esperado) // FILAS_POR_PAGINA))
+
+
+def _valor_python(tabla, anio):
+    fila = list(tabla.columnas['Language']).index('Python')
+    return float(tabla.columnas[str(anio)][fila])
+
+
+def test_tablas_por_version_acotadas(repositorio_restaurado, tmp_path):
+    repositorio = DataRepository('.', snapshot_dir=str(tmp_path))
+    reemplazar_repositorio(repositorio)
+    for mes in range(main.TABLAS_INDICADORES_POR_VERSION + 5):
+        main.obtener_tabla_indicadores((2024 * 12, 2024 * 12 + mes % 12), main.periodo_anio(2025 + mes // 12))
+    assert len(repositorio.derived('tablas_indicadores', None)) == main.TABLAS_INDICADORES_POR_VERSION
+
+
+def test_recarga_reconstruye_tablas_de_indicadores(copia_datos, repositorio_restaurado):
+    original = DataRepository(str(copia_datos), snapshot_dir=str(copia_datos / 'Datos_cache')).warm()
+    reemplazar_repositorio(original)
+    original.version
+    periodos = (main.periodo_anio(2024), main.periodo_anio(2025))
+    antes = _valor_python(main.obtener_tabla_indicadores(*periodos), 2025)
+
+    series = copia_datos / 'Datos' / 'Series_de_Tiempo.csv'
+    df = pd.read_csv(series)
+    df['Rating'] += 5
+    df.to_csv(series, index=False)
+    recarga = RecargaDatos(intervalo=0)
+    assert not recarga.revisar()
+    assert recarga.revisar()
+
+    assert get_repository() is not original
+    despues = _valor_python(main.obtener_tabla_indicadores(*periodos), 2025)
+    assert despues == pytest.approx(antes + 5)
+    # El repositorio anterior conserva su tabla
+    reemplazar_repositorio(original)
+    assert _valor_python(main.obtener_tabla_indicadores(*periodos), 2025) == antes
+
+
+def test_filtrar_en_paralelo_con_cache_acotada(repositorio_restaurado, tmp_path):
+    reemplazar_repositorio(DataRepository('.', snapshot_dir=str(tmp_path)))
+    tabla = main.obtener_tabla_indicadores(main.periodo_anio(2024), main.periodo_anio(2025))
+    consultas = [f'{{2025}} > {umbral}' for umbral in range(MASCARAS_POR_TABLA * 2)]
+    esperado = {c: tabla._calcular_mascara(c) for c in consultas}
+
+    def filtrar(consulta):
+        return consulta, tabla.filtrar(consulta)
+
+    with ThreadPoolExecutor(max_workers=8) as ejecutor:
+        for consulta, mascara in ejecutor.map(filtrar, consultas * 20):
+            assert (mascara == esperado[consulta]).all()
+    assert len(tabla._mascaras) == MASCARAS_POR_TABLA
@@ -0,0 +1,29 @@
+import numpy as np
+
+from tendencias import DIAS_POR_ANIO, VENTANA_MEDIA_MOVIL, TendenciasTIOBE
+from tiobe_matrix import construir_matriz_tiobe
+
+
+def test_estadisticas_coinciden_con_pandas_por_lenguaje(repositorio):
+    df = repositorio.get('series_tiempo')
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    tendencias = TendenciasTIOBE(matriz)
+    for i, lenguaje in enumerate(matriz.lenguajes):
+        serie = df[df['Language'] == lenguaje].sort_values('Date')
+        x = (serie['Date'] - serie['Date'].iloc[0]).dt.days.to_numpy() / DIAS_POR_ANIO
+        assert np.isclose(tendencias.pendiente[i], np.polyfit(x, serie['Rating'], 1)[0]), lenguaje
+        assert np.isclose(tendencias.volatilidad[i], serie['Rating'].diff().std()), lenguaje
+        assert np.isclose(tendencias.media_movil[i, -1], serie['Rating'].tail(VENTANA_MEDIA_MOVIL).mean()), lenguaje
+        assert tendencias.fecha_pico[i] == serie.loc[serie['Rating'].idxmax(), 'Date'], lenguaje
+        assert np.isclose(tendencias.cambio[i], serie['Rating'].iloc[-1] - serie['Rating'].iloc[0]), lenguaje
+
+
+def test_rango_de_anios(repositorio):
+    df = repositorio.get('series_tiempo')
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    tendencias = TendenciasTIOBE(matriz, 2022, 2024)
+    for i, lenguaje in enumerate(matriz.lenguajes):
+        serie = df[(df['Language'] == lenguaje) & df['Year'].between(2022, 2024)].sort_values('Date')
+        assert np.isclose(tendencias.primero[i], serie['Rating'].iloc[0]), lenguaje
+        assert np.isclose(tendencias.ultimo[i], serie['Rating'].iloc[-1]), lenguaje
+        assert np.isclose(tendencias.pico[i], serie['Rating'].max()), lenguaje
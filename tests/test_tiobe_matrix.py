@@ -0,0 +1,28 @@
+import numpy as np
+
+from tiobe_matrix import RatingMatrix, construir_matriz_tiobe
+
+
+def test_promedio_de_meses_coincide_con_groupby(repositorio):
+    df = repositorio.get('series_tiempo')
+    matriz = RatingMatrix.desde_dataframe(df)
+    for (anio1, mes1), (anio2, mes2) in [((2021, 3), (2023, 9)), ((2001, 1), (2025, 12)), ((2024, 5), (2024, 5))]:
+        rango = df[(df['Date'].dt.year * 12 + df['Date'].dt.month >= anio1 * 12 + mes1)
+                   & (df['Date'].dt.year * 12 + df['Date'].dt.month <= anio2 * 12 + mes2)]
+        esperado = rango.groupby('Language', sort=False)['Rating'].mean().reindex(matriz.lenguajes).to_numpy()
+        obtenido = matriz.promedio_meses(anio1 * 12 + mes1 - 1, anio2 * 12 + mes2 - 1)
+        assert np.allclose(obtenido, esperado, equal_nan=True), (anio1, mes1, anio2, mes2)
+
+
+def test_ganadores_y_conteo_top1_coinciden_con_idxmax(repositorio):
+    df = repositorio.get('series_tiempo')
+    matriz = repositorio.derived('matriz_tiobe', construir_matriz_tiobe)
+    rango = df[(df['Year'] >= 2020) & (df['Year'] <= 2025)]
+    por_fecha = rango.loc[rango.groupby('Date')['Rating'].idxmax()]
+    _, ganadores = matriz.ganadores(2020, 2025)
+    assert matriz.lenguajes[ganadores].tolist() == por_fecha['Language'].tolist()
+
+    nombres, conteos = matriz.conteo_top1(2020, 2025)
+    esperado = por_fecha['Language'].value_counts()
+    assert dict(zip(nombres, conteos.tolist())) == esperado.to_dict()
+    assert conteos.tolist() == sorted(conteos.tolist(), reverse=True)
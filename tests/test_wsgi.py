@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+# wsgi.py precarga todo y congela el GC al importarse: se prueba en otro proceso
+PRECARGA = """
+import wsgi, main
+assert main._agente is None and main._agente_error is None, 'el agente se creó antes del fork'
+"""
+
+
+def test_la_precarga_no_crea_el_agente_en_el_maestro():
+    resultado = subprocess.run([sys.executable, '-c', PRECARGA], capture_output=True, text=True, timeout=120)
+    assert resultado.returncode == 0, resultado.stderr
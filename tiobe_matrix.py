@@ -0,0 +1,173 @@
+# ===========================================
+# RatingMatrix - Matriz lenguaje x mes del índice TIOBE
+# ===========================================
+#
+# Series_de_Tiempo se pivotea una sola vez a un array float64 denso
+# (lenguajes x observaciones) con un índice de fechas alineado. Los cortes por
+# rango de años, los ganadores de cada mes y los conteos de Top 1 se calculan
+# con slicing y argmax sobre el array, sin groupby ni strftime por callback.
+# Las sumas acumuladas por lenguaje dan el rating promedio de cualquier rango
+# de meses con dos restas (O(1) por lenguaje).
+
+import numpy as np
+import pandas as pd
+
+from lenguajes import codificar
+
+
+class RatingMatrix:
+    """
+    Matriz (lenguaje, observación) con el rating TIOBE.
+
+    Cada columna es una observación mensual con su fecha real; las columnas
+    están ordenadas por fecha, así que un rango de años es un slice contiguo.
+
+    Attributes:
+        lenguajes: Lenguajes del eje 0 (orden de aparición en el CSV)
+        codigos: Código canónico de cada lenguaje (lenguajes.py)
+        fechas: datetime64 de cada columna (ordenadas)
+        anios: Año de cada columna
+        meses: Ordinal (año * 12 + mes - 1) de cada columna
+        ratings: float64 (lenguajes, observaciones); NaN donde no hay dato
+        suma_acumulada: float64 (lenguajes, observaciones + 1); suma de los
+            ratings anteriores a cada columna (los NaN cuentan 0)
+        conteo_acumulado: int64 con la misma forma; observaciones con dato
+    """
+
+    def __init__(self, lenguajes, fechas, ratings):
+        self.lenguajes = lenguajes
+        self.fechas = fechas
+        self.ratings = ratings
+        calendario = pd.DatetimeIndex(fechas)
+        self.anios = calendario.year.to_numpy()
+        self.meses = self.anios * 12 + calendario.month.to_numpy() - 1
+        self._indice_lenguaje = {lang: i for i, lang in enumerate(lenguajes)}
+        self.codigos = codificar(lenguajes)
+        con_dato = ~np.isnan(ratings)
+        ceros = np.zeros((len(lenguajes), 1))
+        self.suma_acumulada = np.hstack([ceros, np.cumsum(np.where(con_dato, ratings, 0.0), axis=1)])
+        self.conteo_acumulado = np.hstack([ceros.astype(np.int64), np.cumsum(con_dato, axis=1)])
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """
+        Construir la matriz a partir de Series_de_Tiempo.
+
+        Args:
+            df: DataFrame con columnas Language, Date (datetime) y Rating
+        """
+        # El orden de aparición de los lenguajes decide los empates en argmax,
+        # igual que idxmax sobre el CSV original
+        i_lang, lenguajes = pd.factorize(df['Language'], sort=False)
+        fechas, i_fecha = np.unique(df['Date'].to_numpy(dtype='datetime64[ns]'), return_inverse=True)
+
+        ratings = np.full((len(lenguajes), len(fechas)), np.nan)
+        ratings[i_lang, i_fecha] = df['Rating'].to_numpy(dtype=float)
+        return cls(np.asarray(lenguajes, dtype=object), fechas, ratings)
+
+    @property
+    def nbytes(self):
+        return (self.ratings.nbytes + self.fechas.nbytes + self.meses.nbytes
+                + self.suma_acumulada.nbytes + self.conteo_acumulado.nbytes)
+
+    def columnas(self, anio1, anio2):
+        """Slice de columnas con anio1 <= año <= anio2"""
+        inicio = np.searchsorted(self.anios, int(anio1), side='left')
+        fin = np.searchsorted(self.anios, int(anio2), side='right')
+        return slice(inicio, fin)
+
+    def columnas_meses(self, mes1, mes2):
+        """Slice de columnas con mes1 <= mes <= mes2 (ordinales año * 12 + mes - 1)"""
+        inicio = np.searchsorted(self.meses, int(mes1), side='left')
+        fin = np.searchsorted(self.meses, int(mes2), side='right')
+        return slice(inicio, fin)
+
+    def promedio_meses(self, mes1, mes2):
+        """
+        Rating promedio de cada lenguaje entre dos meses (inclusive).
+
+        Returns:
+            Array alineado con lenguajes; NaN si el lenguaje no tiene datos en el rango
+        """
+        rango = self.columnas_meses(mes1, mes2)
+        suma = self.suma_acumulada[:, rango.stop] - self.suma_acumulada[:, rango.start]
+        conteo = self.conteo_acumulado[:, rango.stop] - self.conteo_acumulado[:, rango.start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(conteo > 0, suma / conteo, np.nan)
+
+    def ganadores(self, anio1, anio2):
+        """
+        Lenguaje con mayor rating en cada observación del rango.
+
+        Returns:
+            Tupla (meses, indices_lenguaje) alineada con las columnas del rango;
+            las observaciones sin ningún dato se omiten
+        """
+        rango = self.columnas(anio1, anio2)
+        corte = self.ratings[:, rango]
+        con_datos = ~np.isnan(corte).all(axis=0)
+        if not con_datos.any():
+            return self.meses[rango][con_datos], np.array([], dtype=np.intp)
+        return self.meses[rango][con_datos], np.nanargmax(corte[:, con_datos], axis=0)
+
+    def conteo_top1(self, anio1, anio2):
+        """
+        Veces que cada lenguaje fue el mejor calificado en el rango.
+
+        Returns:
+            Tupla (nombres_lenguaje, conteos) ordenada de mayor a menor
+            (solo lenguajes con al menos un Top 1)
+        """
+        _, ganadores = self.ganadores(anio1, anio2)
+        conteos = np.bincount(ganadores, minlength=len(self.lenguajes))
+        con_top1 = np.flatnonzero(conteos)
+        # Empates en el conteo: orden alfabético, como groupby(Language)
+        alfabetico = con_top1[np.argsort(self.lenguajes[con_top1].astype(str), kind='stable')]
+        orden = alfabetico[np.argsort(-conteos[alfabetico], kind='stable')]
+        return self.lenguajes[orden], conteos[orden]
+
+
+def construir_matriz_tiobe(repositorio):
+    """Constructor de la estructura derivada 'matriz_tiobe' del repositorio de datos"""
+    return RatingMatrix.desde_dataframe(repositorio.get('series_tiempo'))
+
+
+if __name__ == "__main__":
+    import time
+
+    from data_repository import get_repository
+
+    df = get_repository().get('series_tiempo')
+    matriz = RatingMatrix.desde_dataframe(df)
+    print(f"Matriz: {matriz.ratings.shape[0]} lenguajes x {matriz.ratings.shape[1]} observaciones "
+          f"({matriz.nbytes / 1024:.1f} KB)")
+
+    def conteo_groupby(anio1, anio2):
+        # Ruta anterior: agrupar por (Year, nombre del mes) en cada llamada
+        filtrado = df[(df['Year'] >= anio1) & (df['Year'] <= anio2)].copy()
+        filtrado['Month'] = filtrado['Date'].dt.strftime('%B')
+        idx = filtrado.groupby(['Year', 'Month'])['Rating'].idxmax()
+        return filtrado.loc[idx, 'Language'].value_counts()
+
+    repeticiones = 50
+    for nombre, funcion in (('groupby', conteo_groupby), ('matriz', matriz.conteo_top1)):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion(2020, 2025)
+        print(f"{nombre:<8} {(time.perf_counter() - inicio) / repeticiones * 1000:8.3f} ms por consulta")
+
+    # Promedio por rango de meses: groupby sobre el rango vs sumas acumuladas
+    mes1, mes2 = 2021 * 12 + 2, 2023 * 12 + 8
+    def promedio_groupby():
+        rango = df[(df['Date'] >= '2021-03-01') & (df['Date'] < '2023-10-01')]
+        return rango.groupby('Language', sort=False)['Rating'].mean()
+
+    for nombre, funcion in (('groupby', promedio_groupby), ('acumulada', lambda: matriz.promedio_meses(mes1, mes2))):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        print(f"{nombre:<9} {(time.perf_counter() - inicio) / repeticiones * 1000:7.3f} ms por promedio de meses")
+
+    nombres, conteos = matriz.conteo_top1(2020, 2025)
+    print("Top 1 por observación:", dict(zip(nombres, conteos.tolist())))
+    print("Top 1 agrupando por nombre de mes:", conteo_groupby(2020, 2025).to_dict())
@@ -0,0 +1,57 @@
+# ===========================================
+# WSGI - Punto de entrada para producción
+# ===========================================
+#
+# `python main.py` levanta el servidor de desarrollo de Flask: un solo proceso
+# en el que todos los callbacks compiten por el mismo GIL. Este módulo expone el
+# servidor WSGI de la app (`server`) para gunicorn (ver gunicorn.conf.py).
+#
+# Con preload_app, gunicorn importa este módulo una sola vez en el proceso
+# maestro: ahí se cargan todos los datasets, las estructuras derivadas y el
+# layout, y después se congelan los objetos (gc.freeze) para que el recolector
+# de basura no los toque. Los workers se crean con fork y comparten esas
+# páginas de memoria copy-on-write en lugar de cargar cada uno su copia.
+#
+# El agente IA es la excepción: su cliente de la API abre conexiones que no
+# se pueden compartir entre procesos, así que no se crea en el maestro sino
+# en cada worker, en post_fork (gunicorn.conf.py).
+#
+# Uso:
+#   gunicorn -c gunicorn.conf.py wsgi:server
+#   python benchmark_servidor.py    # servidor de desarrollo vs gunicorn
+
+import gc
+import os
+
+# El arranque perezoso difiere la carga hasta después del fork (cada worker
+# cargaría su copia), así que aquí siempre se carga todo antes
+os.environ['CODETRENDS_LAZY_STARTUP'] = '0'
+os.environ['CODETRENDS_AGENTE_POR_WORKER'] = '1'
+
+from main import TIEMPOS_ARRANQUE, app, get_repository, obtener_cubo_pr, obtener_matriz_tiobe
+
+server = app.server
+
+
+def precargar():
+    """Dejar cargado en el proceso maestro todo lo que comparten los workers"""
+    repositorio = get_repository().warm()
+    obtener_cubo_pr()
+    obtener_matriz_tiobe()
+    # La primera petición hace la configuración de Dash (scripts, validación de
+    # callbacks y del layout); se hace aquí para que no la repita cada worker
+    with server.test_client() as cliente:
+        cliente.get('/')
+
+    # Lo que existe hasta ahora queda fuera de las colecciones del GC: sin
+    # esto, cada recolección en un worker escribiría en los encabezados de los
+    # objetos compartidos y copiaría sus páginas
+    gc.collect()
+    gc.freeze()
+    return repositorio
+
+
+precargar()
+print(f"Datos precargados (versión {get_repository().version}); "
+      f"{gc.get_freeze_count():,} objetos congelados")
+print(TIEMPOS_ARRANQUE.reporte())